@@ -192,8 +192,8 @@ for script in scripts/*.py; do
     if [ -f "$script" ]; then
         basename_script=$(basename "$script")
 
-        # Salta utils.py e check_elements.py
-        if [[ "$basename_script" == "utils.py" ]] || [[ "$basename_script" == "check_elements.py" ]]; then
+        # Salta i moduli di supporto e i passaggi finali (ottimizzazione SVG, manifest)
+        if [[ " utils.py check_elements.py block_diagrams.py schematics.py optimize_svgs.py image_manifest.py " =~ " ${basename_script} " ]]; then
             continue
         fi
 
@@ -214,6 +214,26 @@ for script in scripts/*.py; do
     fi
 done
 
+# Ottimizzazione degli SVG generati (coordinate, stili, metadati)
+printf "%-45s" "Ottimizzazione SVG..."
+if [ "$VERBOSE" = true ]; then
+    echo ""
+    python scripts/optimize_svgs.py || log_warn "Ottimizzazione SVG non riuscita"
+elif python scripts/optimize_svgs.py > /dev/null 2>&1; then
+    echo -e "${GREEN}OK${NC}"
+else
+    echo -e "${YELLOW}SALTATA${NC}"
+fi
+
+# Manifest delle immagini e delle varianti, per le immagini responsive del sito
+printf "%-45s" "Manifest immagini..."
+if python scripts/image_manifest.py > /dev/null 2>&1; then
+    echo -e "${GREEN}OK${NC}"
+else
+    FAILED=$((FAILED + 1))
+    echo -e "${RED}ERRORE${NC}"
+fi
+
 # Riepilogo
 echo ""
 echo "========================================"
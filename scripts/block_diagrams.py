@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Schemi a blocchi dichiarativi con impaginazione automatica.
+
+Uno schema e' descritto come dati (DiagramSpec: blocchi, collegamenti,
+gruppi, note, legenda), in Python o in JSON, senza coordinate: i blocchi
+stanno su righe (0 = catena principale, positive sopra, negative sotto) e la
+colonna di ciascuno e' ricavata dai collegamenti come in un grafo a livelli.
+Lungo una riga ogni collegamento sposta il blocco di destinazione di una
+colonna; fra righe diverse (oscillatore sotto il mixer, antenna sopra il
+preselettore) la destinazione puo' restare nella stessa colonna, e i blocchi
+senza ingressi vengono allineati a quelli che alimentano. I collegamenti
+all'indietro (AGC, anelli di reazione) non contano per le colonne e
+passano sopra o sotto la riga.
+
+layout_diagram calcola posizioni e percorsi ed e' in cache (le specifiche
+sono immutabili e confrontabili); draw_diagram disegna tutto con
+utils.BlockDiagram e la palette utils.COLORS_BLOCK_DIAGRAM.
+"""
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from matplotlib.patches import FancyBboxPatch
+
+from utils import BACKGROUNDS, COLORS_BLOCK_DIAGRAM, BlockDiagram, draw_legend
+
+# Distanza fra bordo del blocco e inizio/fine dei collegamenti
+GAP_X = 0.005
+GAP_Y = 0.01
+
+ROUTES = ('auto', 'h', 'v', 'hv', 'vh', 'above', 'below')
+
+
+@dataclass(frozen=True)
+class Block:
+    """Blocco dello schema."""
+
+    id: str
+    label: str
+    sublabel: str = ''
+    color: str = 'mixer'            # chiave della palette o colore matplotlib
+    row: float = 0                  # 0 = catena principale, +1 sopra, -1 sotto
+    col: Optional[float] = None     # None = calcolata dai collegamenti
+    w: Optional[float] = None       # dimensioni (None = quelle dello schema)
+    h: Optional[float] = None
+    note: str = ''                  # etichetta riquadrata sopra il blocco
+
+
+@dataclass(frozen=True)
+class Edge:
+    """Collegamento orientato fra due blocchi."""
+
+    source: str
+    target: str
+    label: str = ''                 # testo semplice accanto al percorso
+    note: str = ''                  # etichetta riquadrata sopra il tratto
+    color: Optional[str] = None     # None = colore predefinito delle frecce
+    style: Optional[str] = None     # '-|>', '->', '-' (senza punta), ...
+    linewidth: Optional[float] = None
+    mutation_scale: Optional[float] = None
+    route: str = 'auto'             # vedi ROUTES
+
+
+@dataclass(frozen=True)
+class Group:
+    """Riquadro tratteggiato attorno a un insieme di blocchi."""
+
+    label: str
+    members: Tuple[str, ...]
+    color: str = '#64748b'
+
+
+@dataclass(frozen=True)
+class Info:
+    """Riquadro di testo in coordinate degli assi (0-1)."""
+
+    text: str
+    x: float
+    y: float
+    color: str = '#1e40af'
+    border: str = '#3b82f6'
+    fontsize: float = 9
+    fontweight: str = 'normal'
+    ha: str = 'center'
+
+
+@dataclass(frozen=True)
+class DiagramSpec:
+    """Schema a blocchi completo; le coordinate sono frazioni degli assi."""
+
+    title: str
+    blocks: Tuple[Block, ...]
+    edges: Tuple[Edge, ...] = ()
+    groups: Tuple[Group, ...] = ()
+    infos: Tuple[Info, ...] = ()
+    subtitle: str = ''
+    # Coppie (colore o chiave della palette, etichetta)
+    legend: Tuple[Tuple[str, str], ...] = ()
+    legend_pos: Tuple[float, float] = (0.62, 0.08)
+    legend_spacing: Optional[float] = None     # None = in base alle etichette
+    # Colori aggiuntivi o sostituiti rispetto a COLORS_BLOCK_DIAGRAM
+    palette: Tuple[Tuple[str, str], ...] = ()
+    # Argomenti aggiuntivi di BlockDiagram (fontsize, boxstyle, label_dy, ...)
+    style: Tuple[Tuple[str, Any], ...] = ()
+    figsize: Tuple[float, float] = (16, 10)
+    background: str = 'light_slate'     # chiave di BACKGROUNDS o colore
+    title_color: str = '#1a365d'
+    title_y: Tuple[float, float] = (0.96, 0.92)
+    title_size: Tuple[float, float] = (20, 12)
+    x_range: Tuple[float, float] = (0.1, 0.9)
+    y_main: float = 0.55
+    row_pitch: float = 0.2
+    block_w: float = 0.11
+    block_h: float = 0.08
+    note_dy: float = 0.07
+    note_colors: Tuple[str, str] = ('#fef3c7', '#d4a574')
+
+
+@dataclass(frozen=True)
+class DiagramLayout:
+    """Risultato di layout_diagram."""
+
+    # id -> (x, y, w, h), con (x, y) centro del blocco
+    boxes: Dict[str, Tuple[float, float, float, float]]
+    # Un percorso (lista di punti) per collegamento, nell'ordine di spec.edges
+    routes: Tuple[Tuple[Tuple[float, float], ...], ...]
+    # id -> colonna
+    columns: Dict[str, float] = field(default_factory=dict)
+
+
+def _tuple(value):
+    """Liste (anche annidate) lette da JSON come tuple, per specifiche confrontabili."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_tuple(v) for v in value)
+    return value
+
+
+def diagram_from_dict(data: Dict[str, Any]) -> DiagramSpec:
+    """
+    Costruisce una DiagramSpec da un dizionario (es. letto da JSON).
+
+    I collegamenti possono essere dizionari o coppie [sorgente, destinazione];
+    palette e style possono essere dizionari.
+
+    Example:
+        >>> spec = diagram_from_dict({'title': 'Catena', 'blocks': [
+        ...     {'id': 'a', 'label': 'A'}, {'id': 'b', 'label': 'B'}], 'edges': [['a', 'b']]})
+        >>> spec.edges[0].target, spec.x_range
+        ('b', (0.1, 0.9))
+    """
+    data = dict(data)
+    try:
+        data['blocks'] = tuple(Block(**b) for b in data['blocks'])
+        data['edges'] = tuple(Edge(*e) if isinstance(e, (list, tuple)) else Edge(**e)
+                              for e in data.get('edges', ()))
+        data['groups'] = tuple(Group(**{**g, 'members': tuple(g['members'])})
+                               for g in data.get('groups', ()))
+        data['infos'] = tuple(Info(**i) for i in data.get('infos', ()))
+        for key in ('palette', 'style'):
+            if isinstance(data.get(key), dict):
+                data[key] = tuple(data[key].items())
+        spec = DiagramSpec(**{key: _tuple(value) for key, value in data.items()})
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Specifica di schema non valida: {e}") from None
+    _validate(spec)
+    return spec
+
+
+@lru_cache(maxsize=None)
+def _load_diagram(path: str, mtime: float) -> DiagramSpec:
+    with open(path, encoding='utf-8') as f:
+        return diagram_from_dict(json.load(f))
+
+
+def load_diagram(path) -> DiagramSpec:
+    """Legge una DiagramSpec da un file JSON (in cache finche' il file non cambia)."""
+    path = Path(path)
+    return _load_diagram(str(path), path.stat().st_mtime)
+
+
+def _validate(spec: DiagramSpec) -> None:
+    ids = [b.id for b in spec.blocks]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"Blocchi duplicati: {', '.join(duplicates)}")
+    known = set(ids)
+    for edge in spec.edges:
+        for name in (edge.source, edge.target):
+            if name not in known:
+                raise ValueError(f"Collegamento {edge.source} -> {edge.target}: "
+                                 f"blocco sconosciuto {name!r}")
+        if edge.route not in ROUTES:
+            raise ValueError(f"Percorso sconosciuto: {edge.route!r} "
+                             f"(disponibili: {', '.join(ROUTES)})")
+    for group in spec.groups:
+        unknown = [m for m in group.members if m not in known]
+        if unknown:
+            raise ValueError(f"Gruppo {group.label!r}: blocchi sconosciuti {', '.join(unknown)}")
+
+
+def _back_edges(spec: DiagramSpec) -> set:
+    """Indici dei collegamenti che chiudono un anello (visita in profondita')."""
+    out: Dict[str, List[Tuple[int, str]]] = {b.id: [] for b in spec.blocks}
+    for i, edge in enumerate(spec.edges):
+        out[edge.source].append((i, edge.target))
+
+    back, state = set(), {}
+    for root in out:
+        if root in state:
+            continue
+        state[root] = 'open'
+        stack = [(root, iter(out[root]))]
+        while stack:
+            node, children = stack[-1]
+            for i, child in children:
+                if state.get(child) == 'open':
+                    back.add(i)
+                elif child not in state:
+                    state[child] = 'open'
+                    stack.append((child, iter(out[child])))
+                    break
+            else:
+                state[node] = 'done'
+                stack.pop()
+    return back
+
+
+def _columns(spec: DiagramSpec, back: set) -> Dict[str, float]:
+    """Colonna di ogni blocco: cammino piu' lungo, poi sorgenti verso destra."""
+    rows = {b.id: b.row for b in spec.blocks}
+    fixed = {b.id: b.col for b in spec.blocks if b.col is not None}
+    preds: Dict[str, List[Tuple[str, int]]] = {b.id: [] for b in spec.blocks}
+    succs: Dict[str, List[Tuple[str, int]]] = {b.id: [] for b in spec.blocks}
+    for i, edge in enumerate(spec.edges):
+        if i in back or edge.source == edge.target:
+            continue
+        step = 1 if rows[edge.source] == rows[edge.target] else 0
+        preds[edge.target].append((edge.source, step))
+        succs[edge.source].append((edge.target, step))
+
+    # Ordine topologico stabile (ordine di dichiarazione a parita')
+    pending = {node: len(p) for node, p in preds.items()}
+    order = [node for node in preds if pending[node] == 0]
+    for node in order:
+        for child, _ in succs[node]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                order.append(child)
+
+    columns = {}
+    for node in order:
+        columns[node] = fixed.get(node, max((columns[p] + step for p, step in preds[node]),
+                                            default=0))
+    for node in reversed(order):
+        if node not in fixed and not preds[node] and succs[node]:
+            columns[node] = min(columns[c] - step for c, step in succs[node])
+    return columns
+
+
+def _route(kind: str, src, dst, rows, pitch) -> Tuple[Tuple[float, float], ...]:
+    (xs, ys, ws, hs), (xt, yt, wt, ht) = src, dst
+    row_s, row_t = rows
+    if kind == 'auto':
+        if row_s == row_t:
+            kind = 'h' if xt > xs else 'above'
+        elif abs(xt - xs) < 1e-9:
+            kind = 'v'
+        else:
+            # Il tratto orizzontale corre sulla riga piu' lontana dalla catena principale
+            kind = 'hv' if abs(row_s) >= abs(row_t) else 'vh'
+
+    sx = 1 if xt >= xs else -1
+    sy = 1 if yt >= ys else -1
+    if kind == 'h':
+        return ((xs + sx * (ws / 2 + GAP_X), ys), (xt - sx * (wt / 2 + GAP_X), ys))
+    if kind == 'v':
+        return ((xs, ys + sy * (hs / 2 + GAP_Y)), (xs, yt - sy * (ht / 2 + GAP_Y)))
+    if kind == 'hv':
+        return ((xs + sx * (ws / 2 + GAP_X), ys), (xt, ys), (xt, yt - sy * (ht / 2 + GAP_Y)))
+    if kind == 'vh':
+        return ((xs, ys + sy * (hs / 2 + GAP_Y)), (xs, yt), (xt - sx * (wt / 2 + GAP_X), yt))
+    # Anello sopra o sotto la riga, entrando dallo stesso lato
+    side = 1 if kind == 'above' else -1
+    y_loop = max(ys + side * hs / 2, yt + side * ht / 2, key=lambda y: side * y) + side * 0.3 * pitch
+    return ((xs, ys + side * (hs / 2 + GAP_Y)), (xs, y_loop), (xt, y_loop),
+            (xt, yt + side * (ht / 2 + GAP_Y)))
+
+
+@lru_cache(maxsize=None)
+def layout_diagram(spec: DiagramSpec) -> DiagramLayout:
+    """
+    Posizioni dei blocchi e percorsi dei collegamenti.
+
+    Le colonne sono distribuite uniformemente su spec.x_range, le righe a
+    passo spec.row_pitch attorno a spec.y_main.
+
+    Example:
+        >>> spec = DiagramSpec('Mixer', (
+        ...     Block('rf', 'RF'), Block('mix', 'MIXER'), Block('if', 'IF'),
+        ...     Block('lo', 'OSC', row=-1)),
+        ...     (Edge('rf', 'mix'), Edge('mix', 'if'), Edge('lo', 'mix')))
+        >>> layout = layout_diagram(spec)
+        >>> [round(layout.boxes[b][0], 2) for b in ('rf', 'mix', 'lo')]
+        [0.1, 0.5, 0.5]
+        >>> layout.routes[2]
+        ((0.5, 0.4), (0.5, 0.5))
+    """
+    _validate(spec)
+    back = _back_edges(spec)
+    columns = _columns(spec, back)
+    last = max(columns.values(), default=0) or 1
+    x0, x1 = spec.x_range
+
+    boxes = {}
+    for block in spec.blocks:
+        x = x0 + (x1 - x0) * columns[block.id] / last
+        y = spec.y_main + block.row * spec.row_pitch
+        boxes[block.id] = (round(x, 9), round(y, 9), block.w or spec.block_w,
+                           block.h or spec.block_h)
+
+    rows = {b.id: b.row for b in spec.blocks}
+    routes = []
+    for edge in spec.edges:
+        points = _route(edge.route, boxes[edge.source], boxes[edge.target],
+                        (rows[edge.source], rows[edge.target]), spec.row_pitch)
+        routes.append(tuple((round(x, 9), round(y, 9)) for x, y in points))
+    return DiagramLayout(boxes, tuple(routes), columns)
+
+
+def _anchor(points) -> Tuple[float, float, bool]:
+    """Centro del tratto piu' lungo di un percorso e se il tratto e' orizzontale."""
+    segments = list(zip(points[:-1], points[1:]))
+    (xa, ya), (xb, yb) = max(segments, key=lambda s: abs(s[1][0] - s[0][0]) + abs(s[1][1] - s[0][1]))
+    return (xa + xb) / 2, (ya + yb) / 2, abs(xb - xa) >= abs(yb - ya)
+
+
+def draw_diagram(ax, spec: DiagramSpec) -> DiagramLayout:
+    """
+    Disegna lo schema negli assi (limiti 0-1, senza assi).
+
+    Restituisce il layout, per aggiungere annotazioni specifiche accanto ai
+    blocchi.
+    """
+    layout = layout_diagram(spec)
+    palette = {**COLORS_BLOCK_DIAGRAM, **dict(spec.palette)}
+    style = dict(spec.style)
+    style.setdefault('border_color', palette['border'])
+    style.setdefault('shadow_color', palette['shadow'])
+    diagram = BlockDiagram(ax, spec.block_w, spec.block_h, **style)
+
+    ax.set_facecolor(BACKGROUNDS.get(spec.background, spec.background))
+    ax.text(0.5, spec.title_y[0], spec.title, fontsize=spec.title_size[0], fontweight='bold',
+            ha='center', transform=ax.transAxes, color=spec.title_color)
+    if spec.subtitle:
+        ax.text(0.5, spec.title_y[1], spec.subtitle, fontsize=spec.title_size[1],
+                ha='center', transform=ax.transAxes, color='#4a5568')
+
+    notes = []
+    for block in spec.blocks:
+        x, y, w, h = layout.boxes[block.id]
+        diagram.block(x, y, block.label, block.sublabel, palette.get(block.color, block.color), w, h)
+        if block.note:
+            notes.append((x, y + spec.note_dy, block.note))
+
+    for edge, points in zip(spec.edges, layout.routes):
+        color = edge.color or diagram.arrow_color
+        xs, ys = zip(*points)
+        if edge.style == '-':
+            diagram.line(xs, ys, color, edge.linewidth)
+        else:
+            if len(points) > 2:
+                diagram.line(xs[:-1], ys[:-1], color, edge.linewidth)
+            diagram.arrow(*points[-2], *points[-1], color, edge.linewidth, edge.style,
+                          edge.mutation_scale)
+        x, y, horizontal = _anchor(points)
+        if edge.note:
+            notes.append((x, y + spec.note_dy, edge.note))
+        if edge.label:
+            if horizontal:
+                ax.text(x, y + 0.02, edge.label, fontsize=9, fontweight='bold', color=color,
+                        ha='center', va='bottom')
+            else:
+                ax.text(x + 0.01, y, edge.label, fontsize=9, fontweight='bold', color=color,
+                        ha='left', va='center')
+
+    face, border = spec.note_colors
+    for x, y, text in notes:
+        ax.text(x, y, text, fontsize=8, ha='center', va='center', fontweight='bold',
+                bbox=dict(boxstyle='round,pad=0.2', facecolor=face, edgecolor=border, linewidth=0.8))
+
+    for group in spec.groups:
+        members = [layout.boxes[m] for m in group.members]
+        x_lo = min(x - w / 2 for x, _, w, _ in members) - 0.02
+        x_hi = max(x + w / 2 for x, _, w, _ in members) + 0.02
+        y_lo = min(y - h / 2 for _, y, _, h in members) - 0.02
+        y_hi = max(y + h / 2 for _, y, _, h in members) + 0.04
+        ax.add_patch(FancyBboxPatch((x_lo, y_lo), x_hi - x_lo, y_hi - y_lo,
+                                    boxstyle='round,pad=0,rounding_size=0.01', facecolor='none',
+                                    edgecolor=group.color, linewidth=1.2, linestyle='--', zorder=0))
+        ax.text(x_lo + 0.008, y_hi - 0.012, group.label, fontsize=8, fontweight='bold',
+                color=group.color, ha='left', va='center')
+
+    for info in spec.infos:
+        ax.text(info.x, info.y, info.text, fontsize=info.fontsize, fontweight=info.fontweight,
+                ha=info.ha, va='center', color=info.color, linespacing=1.4,
+                bbox=dict(boxstyle='round,pad=0.4', facecolor='white', edgecolor=info.border,
+                          linewidth=2))
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    if spec.legend:
+        draw_legend(ax, *spec.legend_pos, [(palette.get(c, c), label) for c, label in spec.legend],
+                    spacing=spec.legend_spacing)
+
+    diagram.render()
+    ax.axis('off')
+    return layout
@@ -0,0 +1,10 @@
+"""
+Modelli di calcolo numerico (NumPy) usati dagli script di generazione immagini.
+
+I moduli di questo package non producono figure: calcolano grandezze
+(frequenze, livelli, impedenze, ...) in forma vettoriale, cosi' che gli script
+generate_*.py e plot_*.py possano disegnare i grafici a partire da dati
+calcolati invece che da valori scritti a mano.
+
+Convenzioni: unita' SI (Hz, ohm, F, H, W), array NumPy con broadcasting.
+"""
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Sintesi di reti di adattamento d'impedenza a L, Pi e T.
+
+Una rete senza perdite trasforma il carico Z_L = R_L + j X_L nella resistenza
+della sorgente R0 (tipicamente i 50 ohm del trasmettitore). Le soluzioni sono
+in forma chiusa e vettoriali: impedenze di carico, frequenze e Q vengono
+combinati per broadcasting, cosi' decine di migliaia di carichi si risolvono
+con poche operazioni NumPy.
+
+Ogni elemento e' descritto dalla sua reattanza X (ohm): X > 0 e' un
+induttore, X < 0 un condensatore. Per gli elementi in parallelo X = -1/B,
+con B suscettanza; X infinita indica un elemento assente (circuito aperto).
+
+Topologie, elementi elencati dalla sorgente verso il carico:
+
+    L-shunt-load    serie, parallelo    (parallelo lato carico, R_L "alta")
+    L-shunt-source  parallelo, serie    (parallelo lato sorgente, R_L "bassa")
+    pi              parallelo, serie, parallelo
+    T               serie, parallelo, serie
+
+Le L hanno due soluzioni (segno della reattanza intermedia) e Q fissato dal
+rapporto delle resistenze; Pi e T sono due L affiancate attraverso una
+resistenza virtuale scelta in base al Q desiderato e hanno quattro soluzioni.
+
+Per un accordatore reale, con componenti variabili entro escursioni finite,
+coverage decide quali carichi sono adattabili e con quale regolazione.
+MatchResult.network restituisce una soluzione come rete a due porte, per
+calcolarne la banda di adattamento e l'attenuazione delle armoniche.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from calcoli.reti import Element, Network
+
+
+SERIES = 'series'
+SHUNT = 'shunt'
+
+# Disposizione degli elementi dalla sorgente al carico
+TOPOLOGIES = {
+    'L-shunt-load': (SERIES, SHUNT),
+    'L-shunt-source': (SHUNT, SERIES),
+    'pi': (SHUNT, SERIES, SHUNT),
+    'T': (SERIES, SHUNT, SERIES),
+}
+
+
+def _layout(topology: str) -> Tuple[str, ...]:
+    try:
+        return TOPOLOGIES[topology]
+    except KeyError:
+        raise ValueError(f"Topologia sconosciuta: {topology!r} "
+                         f"(disponibili: {', '.join(TOPOLOGIES)})") from None
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """
+    Soluzioni di una topologia.
+
+    reactance ha forma (..., S, E): S soluzioni (2 per le L, 4 per Pi e T) ed
+    E elementi dalla sorgente al carico; valid ha forma (..., S) ed e' False
+    dove la soluzione non esiste (reattanze NaN).
+    """
+
+    topology: str
+    f_hz: np.ndarray            # Hz, forma (..., 1, 1) per il broadcasting con reactance
+    reactance: np.ndarray       # ohm
+    valid: np.ndarray
+    q: np.ndarray               # Q di progetto (per le L quello imposto dalle resistenze)
+
+    @property
+    def layout(self) -> Tuple[str, ...]:
+        return _layout(self.topology)
+
+    @property
+    def inductance(self) -> np.ndarray:
+        """Induttanza degli elementi induttivi (H), NaN per i condensatori."""
+        w = 2 * np.pi * self.f_hz
+        with np.errstate(invalid='ignore'):
+            return np.where(self.reactance > 0, self.reactance / w, np.nan)
+
+    @property
+    def capacitance(self) -> np.ndarray:
+        """Capacita' degli elementi capacitivi (F), NaN per gli induttori."""
+        w = 2 * np.pi * self.f_hz
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.reactance < 0, -1 / (w * self.reactance), np.nan)
+
+    @property
+    def lowpass(self) -> np.ndarray:
+        """True per le soluzioni passa-basso: induttori in serie, condensatori in parallelo."""
+        series = np.array([kind == SERIES for kind in self.layout])
+        with np.errstate(invalid='ignore'):
+            ok = np.where(series, self.reactance >= 0, self.reactance <= 0)
+        return self.valid & np.all(ok, axis=-1)
+
+    @property
+    def highpass(self) -> np.ndarray:
+        """True per le soluzioni passa-alto: condensatori in serie, induttori in parallelo."""
+        series = np.array([kind == SERIES for kind in self.layout])
+        with np.errstate(invalid='ignore'):
+            ok = np.where(series, self.reactance <= 0, self.reactance >= 0)
+        return self.valid & np.all(ok, axis=-1)
+
+    def components(self, index) -> Tuple[Tuple[str, str, float], ...]:
+        """
+        Componenti di una singola soluzione.
+
+        Args:
+            index: Indice della soluzione in reactance[..., S, :], es. (k, s)
+
+        Returns:
+            Tupla di (posizione 'series'/'shunt', 'L'/'C', valore in H o F);
+            gli elementi assenti (reattanza nulla in serie o infinita in
+            parallelo) sono omessi
+        """
+        x = self.reactance[index]
+        w = 2 * np.pi * float(np.broadcast_to(self.f_hz[..., 0], self.valid.shape)[index])
+        parts = []
+        for kind, value in zip(self.layout, x):
+            if np.isnan(value):
+                raise ValueError("Soluzione non valida per questo carico")
+            if (kind == SERIES and value == 0) or np.isinf(value):
+                continue
+            parts.append((kind, 'L', value / w) if value > 0 else (kind, 'C', -1 / (w * value)))
+        return tuple(parts)
+
+    def network(self, index) -> Network:
+        """Rete di una singola soluzione, per analizzarla in frequenza (vedi calcoli.reti)."""
+        elements = [Element(kind, l=value) if part == 'L' else Element(kind, c=value)
+                    for kind, part, value in self.components(index)]
+        return Network(elements, label=self.topology)
+
+
+def _l_half_shunt_load(g, b, r, sign):
+    """
+    Parallelo sul carico Y = g + jb, poi serie: porta il carico alla resistenza r.
+
+    Returns:
+        Tupla (reattanza serie, suscettanza parallelo)
+    """
+    with np.errstate(invalid='ignore'):
+        b_tot = sign * np.sqrt(g / r - g ** 2)          # NaN se g r > 1
+    return b_tot * r / g, b_tot - b
+
+
+def _l_half_shunt_source(rl, xl, r, sign):
+    """
+    Serie sul carico Z = rl + j xl, poi parallelo: porta il carico alla resistenza r.
+
+    Returns:
+        Tupla (suscettanza parallelo, reattanza serie)
+    """
+    with np.errstate(invalid='ignore'):
+        x_tot = sign * np.sqrt(rl * (r - rl))           # NaN se rl > r
+    return x_tot / (rl * r), x_tot - xl
+
+
+def _shunt_x(b):
+    """Reattanza equivalente -1/B di un elemento in parallelo."""
+    with np.errstate(divide='ignore'):
+        return -1 / b
+
+
+def l_match(z_load, f_hz, r_source=50.0, topology: str = 'L-shunt-load') -> MatchResult:
+    """
+    Reti a L che adattano z_load a r_source.
+
+    'L-shunt-load' esiste quando Re(1/Z_L) <= 1/R0 (conduttanza del carico
+    bassa, es. R_L > R0), 'L-shunt-source' quando R_L <= R0. La prima
+    soluzione usa la reattanza intermedia positiva, la seconda negativa.
+
+    Args:
+        z_load: Impedenza di carico (ohm, complessa), array di forma qualsiasi
+        f_hz: Frequenza (Hz), combinata per broadcasting
+        r_source: Resistenza della sorgente (ohm)
+        topology: 'L-shunt-load' o 'L-shunt-source'
+
+    Returns:
+        MatchResult con reactance di forma (..., 2, 2)
+
+    Example:
+        >>> m = l_match(200.0, 7.1e6)
+        >>> [round(float(x), 1) for x in m.reactance[0]]          # X serie, X parallelo
+        [86.6, -115.5]
+    """
+    z, f, r0 = np.broadcast_arrays(np.asarray(z_load, dtype=complex),
+                                   np.asarray(f_hz, dtype=float),
+                                   np.asarray(r_source, dtype=float))
+    sign = np.array([1.0, -1.0])
+    z, r0 = z[..., None], r0[..., None]
+    if topology == 'L-shunt-load':
+        y = 1 / z
+        x_s, b_p = _l_half_shunt_load(y.real, y.imag, r0, sign)
+        x = np.stack([x_s, _shunt_x(b_p)], axis=-1)
+        q = np.sqrt(np.maximum(1 / (y.real * r0) - 1, 0.0))
+    elif topology == 'L-shunt-source':
+        b_p, x_s = _l_half_shunt_source(z.real, z.imag, r0, sign)
+        x = np.stack([_shunt_x(b_p), x_s], axis=-1)
+        q = np.sqrt(np.maximum(r0 / z.real - 1, 0.0))
+    else:
+        raise ValueError(f"Topologia a L non valida: {topology!r}")
+    return MatchResult(topology, f[..., None, None], x, ~np.isnan(x).any(axis=-1), q)
+
+
+def pi_match(z_load, f_hz, q, r_source=50.0) -> MatchResult:
+    """
+    Reti a Pi (parallelo, serie, parallelo) con fattore di merito q.
+
+    La resistenza virtuale al centro e' R_v = max(R0, 1/G_L) / (1 + q^2);
+    la soluzione esiste se R_v e' inferiore sia a R0 sia a 1/G_L, cioe' se
+    q e' almeno il Q della L equivalente.
+
+    Args:
+        z_load: Impedenza di carico (ohm, complessa)
+        f_hz: Frequenza (Hz)
+        q: Fattore di merito desiderato
+        r_source: Resistenza della sorgente (ohm)
+
+    Returns:
+        MatchResult con reactance di forma (..., 4, 3)
+    """
+    z, f, q, r0 = np.broadcast_arrays(*(np.asarray(v, dtype=t) for v, t in (
+        (z_load, complex), (f_hz, float), (q, float), (r_source, float))))
+    y = 1 / z
+    r_v = np.maximum(r0, 1 / y.real) / (1 + q ** 2)
+    s_load = np.array([1.0, 1.0, -1.0, -1.0])
+    s_source = np.array([1.0, -1.0, 1.0, -1.0])
+
+    # Lato carico: parallelo + serie fino a R_v; lato sorgente: serie + parallelo da R_v a R0
+    g, b, r_v, r0 = (v[..., None] for v in (y.real, y.imag, r_v, r0))
+    x_load, b_load = _l_half_shunt_load(g, b, r_v, s_load)
+    b_source, x_source = _l_half_shunt_source(r_v, 0.0, r0, s_source)
+    x = np.stack([_shunt_x(b_source), x_source + x_load, _shunt_x(b_load)], axis=-1)
+    valid = ~np.isnan(x).any(axis=-1) & (r_v < r0) & (g * r_v < 1)
+    x = np.where(valid[..., None], x, np.nan)
+    return MatchResult('pi', f[..., None, None], x, valid, q[..., None])
+
+
+def t_match(z_load, f_hz, q, r_source=50.0) -> MatchResult:
+    """
+    Reti a T (serie, parallelo, serie) con fattore di merito q.
+
+    Duale della Pi: la resistenza virtuale e' R_v = min(R0, R_L) (1 + q^2)
+    e deve superare sia R0 sia R_L.
+
+    Args:
+        z_load: Impedenza di carico (ohm, complessa)
+        f_hz: Frequenza (Hz)
+        q: Fattore di merito desiderato
+        r_source: Resistenza della sorgente (ohm)
+
+    Returns:
+        MatchResult con reactance di forma (..., 4, 3)
+    """
+    z, f, q, r0 = np.broadcast_arrays(*(np.asarray(v, dtype=t) for v, t in (
+        (z_load, complex), (f_hz, float), (q, float), (r_source, float))))
+    r_v = np.minimum(r0, z.real) * (1 + q ** 2)
+    s_load = np.array([1.0, 1.0, -1.0, -1.0])
+    s_source = np.array([1.0, -1.0, 1.0, -1.0])
+
+    # Lato carico: serie + parallelo fino a R_v; lato sorgente: parallelo + serie da R_v a R0
+    rl, xl, r_v, r0 = (v[..., None] for v in (z.real, z.imag, r_v, r0))
+    b_load, x_load = _l_half_shunt_source(rl, xl, r_v, s_load)
+    x_source, b_source = _l_half_shunt_load(1 / r_v, 0.0, r0, s_source)
+    x = np.stack([x_source, _shunt_x(b_source + b_load), x_load], axis=-1)
+    valid = ~np.isnan(x).any(axis=-1) & (r_v > r0) & (r_v > rl)
+    x = np.where(valid[..., None], x, np.nan)
+    return MatchResult('T', f[..., None, None], x, valid, q[..., None])
+
+
+def solve(z_load, f_hz, q=3.0, r_source=50.0) -> Dict[str, MatchResult]:
+    """
+    Tutte le soluzioni L, Pi e T per i carichi indicati.
+
+    Returns:
+        Dizionario {topologia: MatchResult} con le chiavi di TOPOLOGIES
+    """
+    return {
+        'L-shunt-load': l_match(z_load, f_hz, r_source, 'L-shunt-load'),
+        'L-shunt-source': l_match(z_load, f_hz, r_source, 'L-shunt-source'),
+        'pi': pi_match(z_load, f_hz, q, r_source),
+        'T': t_match(z_load, f_hz, q, r_source),
+    }
+
+
+def input_impedance(result: MatchResult, z_load) -> np.ndarray:
+    """
+    Impedenza vista dalla sorgente con la rete chiusa su z_load (verifica).
+
+    Returns:
+        Z_in (ohm, complessa) di forma (..., S); R0 + j0 per le soluzioni valide
+    """
+    z = np.asarray(z_load, dtype=complex)[..., None] + 0 * result.reactance[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for kind, x in zip(reversed(result.layout), np.moveaxis(result.reactance, -1, 0)[::-1]):
+            if kind == SERIES:
+                z = z + 1j * x
+            else:
+                z = np.where(np.isinf(x), z, 1 / (1 / z + 1 / (1j * x)))
+    return z
+
+
+def gamma_to_impedance(gamma, z0=50.0) -> np.ndarray:
+    """Impedenza (ohm) corrispondente al coefficiente di riflessione gamma su Z0."""
+    gamma = np.asarray(gamma, dtype=complex)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return z0 * (1 + gamma) / (1 - gamma)
+
+
+def impedance_to_gamma(z, z0=50.0) -> np.ndarray:
+    """Coefficiente di riflessione complesso di z su Z0."""
+    z = np.asarray(z, dtype=complex)
+    return (z - z0) / (z + z0)
+
+
+@dataclass(frozen=True)
+class Tuner:
+    """
+    Accordatore con componenti variabili.
+
+    elements elenca, dalla sorgente al carico come in TOPOLOGIES, il tipo
+    ('L' o 'C') e l'escursione (minimo, massimo) di ciascun componente in H o F.
+    """
+
+    topology: str
+    elements: Tuple[Tuple[str, float, float], ...]
+    label: str = ''
+
+    def reactance_range(self, f_hz) -> np.ndarray:
+        """Escursione delle reattanze (ohm), forma (..., E, 2) con (minima, massima)."""
+        w = 2 * np.pi * np.asarray(f_hz, dtype=float)
+        ranges = []
+        for kind, lo, hi in self.elements:
+            if kind == 'L':
+                ranges.append(np.stack([w * lo, w * hi], axis=-1))
+            else:
+                ranges.append(np.stack([-1 / (w * lo), -1 / (w * hi)], axis=-1))
+        return np.stack(ranges, axis=-2)
+
+
+TUNERS = {
+    'T': Tuner('T', (('C', 20e-12, 250e-12), ('L', 0.2e-6, 25e-6), ('C', 20e-12, 250e-12)),
+               'T passa-alto (C 20-250 pF, L 0.2-25 μH)'),
+    'pi': Tuner('pi', (('C', 20e-12, 1000e-12), ('L', 0.2e-6, 25e-6), ('C', 20e-12, 1000e-12)),
+                'Pi passa-basso (C 20-1000 pF, L 0.2-25 μH)'),
+    'L': Tuner('L-shunt-load', (('L', 0.2e-6, 25e-6), ('C', 20e-12, 1000e-12)),
+               'L passa-basso (L 0.2-25 μH, C 20-1000 pF)'),
+}
+
+
+def tuner(name: str) -> Tuner:
+    """Preset con il nome indicato (vedi TUNERS)."""
+    try:
+        return TUNERS[name]
+    except KeyError:
+        raise ValueError(f"Accordatore sconosciuto: {name!r} "
+                         f"(disponibili: {', '.join(TUNERS)})") from None
+
+
+@dataclass(frozen=True)
+class Coverage:
+    """Carichi adattabili da un accordatore e regolazione scelta (forma dei carichi)."""
+
+    matched: np.ndarray         # True se esiste una regolazione entro le escursioni
+    reactance: np.ndarray       # ohm, forma (..., E); NaN dove non adattabile
+    q: np.ndarray               # Q del nodo piu' caricato (indice delle perdite), NaN se non adattabile
+    f_hz: np.ndarray            # Hz, forma (..., 1)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Valori dei componenti (H o F secondo il tipo), forma (..., E)."""
+        w = 2 * np.pi * self.f_hz
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.reactance > 0, self.reactance / w, -1 / (w * self.reactance))
+
+
+def _in_range(x, limits):
+    """True dove la reattanza x cade nell'intervallo limits[..., 0:2] (estremi in qualsiasi ordine)."""
+    lo = np.minimum(limits[..., 0], limits[..., 1])
+    hi = np.maximum(limits[..., 0], limits[..., 1])
+    with np.errstate(invalid='ignore'):
+        return (x >= lo) & (x <= hi)
+
+
+def _tuner_l(z, r_source, topology, first_kind):
+    """
+    L di un accordatore con tipi di componente fissati.
+
+    Il tipo del primo componente (lato sorgente) determina il segno della
+    soluzione: basta quindi calcolarne una sola.
+
+    Returns:
+        Tupla ((X sorgente, X carico), Q)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if topology == 'L-shunt-load':
+            y = 1 / z
+            sign = 1.0 if first_kind == 'L' else -1.0           # segno della reattanza serie
+            x_s, b_p = _l_half_shunt_load(y.real, y.imag, r_source, sign)
+            return (x_s, _shunt_x(b_p)), np.sqrt(1 / (y.real * r_source) - 1)
+        sign = 1.0 if first_kind == 'C' else -1.0               # segno della suscettanza parallelo
+        b_p, x_s = _l_half_shunt_source(z.real, z.imag, r_source, sign)
+        return (_shunt_x(b_p), x_s), np.sqrt(r_source / z.real - 1)
+
+
+def coverage(
+    tuner: Tuner,
+    z_load,
+    f_hz,
+    r_source=50.0,
+    n_steps: int = 64,
+    chunk: Optional[int] = 16384
+) -> Coverage:
+    """
+    Carichi che l'accordatore riesce ad adattare a r_source.
+
+    Nelle reti a tre elementi il componente lato carico viene esplorato su
+    n_steps valori (spaziati geometricamente nella sua escursione); per
+    ciascuno i due componenti restanti formano una L risolta in forma
+    chiusa. Fra le regolazioni entro le escursioni si sceglie quella con il
+    Q di nodo piu' basso, cioe' con le correnti circolanti e le perdite
+    minori. I carichi sono elaborati a blocchi di chunk elementi per limitare
+    la memoria (n_steps regolazioni per carico).
+
+    Args:
+        tuner: Accordatore (vedi TUNERS)
+        z_load: Impedenze di carico (ohm, complesse), array di forma qualsiasi
+        f_hz: Frequenza (Hz), combinata per broadcasting
+        r_source: Resistenza della sorgente (ohm)
+        n_steps: Valori esplorati per il componente lato carico
+        chunk: Carichi per blocco (None = tutti insieme)
+
+    Returns:
+        Coverage con la forma del broadcasting di z_load e f_hz
+    """
+    layout = _layout(tuner.topology)
+    if len(tuner.elements) != len(layout):
+        raise ValueError(f"La topologia {tuner.topology!r} richiede {len(layout)} componenti")
+    z, f = np.broadcast_arrays(np.asarray(z_load, dtype=complex), np.asarray(f_hz, dtype=float))
+    shape = z.shape
+    z, f = z.ravel(), f.ravel()
+    n_el = len(layout)
+    x_out = np.full((z.size, n_el), np.nan)
+    q_out = np.full(z.size, np.nan)
+
+    step = z.size if chunk is None else max(int(chunk), 1)
+    for start in range(0, z.size, step):
+        sl = slice(start, start + step)
+        zc, fc = z[sl], f[sl]
+        w = 2 * np.pi * fc[:, None]
+        limits = tuner.reactance_range(fc)[:, None]                  # (N, 1, E, 2)
+
+        if n_el == 2:
+            x_pair, q = _tuner_l(zc[:, None], r_source, tuner.topology, tuner.elements[0][0])
+            x = x_pair
+        else:
+            # Componente lato carico: valori geometrici nella sua escursione
+            kind, lo, hi = tuner.elements[-1]
+            values = np.geomspace(lo, hi, n_steps)
+            x_last = w * values if kind == 'L' else -1 / (w * values)   # (N, K)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if layout[-1] == SERIES:
+                    z_mid = zc[:, None] + 1j * x_last
+                    inner = 'L-shunt-load'
+                else:
+                    z_mid = 1 / (1 / zc[:, None] + 1 / (1j * x_last))
+                    inner = 'L-shunt-source'
+                q_mid = np.abs(z_mid.imag) / z_mid.real
+            x_pair, q_inner = _tuner_l(z_mid, r_source, inner, tuner.elements[0][0])
+            x = x_pair + (x_last,)
+            q = np.maximum(q_inner, q_mid)
+
+        ok = np.ones(q.shape, dtype=bool)
+        for e, x_e in enumerate(x):
+            ok &= _in_range(x_e, limits[..., e, :])
+        best = np.argmin(np.where(ok, q, np.inf), axis=-1)
+        rows = np.arange(len(zc))
+        found = ok[rows, best]
+        x_out[sl] = np.where(found[:, None], np.stack([x_e[rows, best] for x_e in x], axis=-1),
+                             np.nan)
+        q_out[sl] = np.where(found, q[rows, best], np.nan)
+
+    return Coverage(
+        matched=~np.isnan(q_out).reshape(shape),
+        reactance=x_out.reshape(shape + (n_el,)),
+        q=q_out.reshape(shape),
+        f_hz=f.reshape(shape)[..., None],
+    )
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Simulazione nel tempo di raddrizzatori con filtro capacitivo e di
+convertitori switching ideali (buck, boost).
+
+Raddrizzatori: trasformatore con resistenza degli avvolgimenti R_s, diodi con
+caduta costante V_F (uno per semionda, due nel ponte), condensatore di filtro
+e carico resistivo e/o a corrente costante. L'integrazione e' di Eulero
+implicito, stabile per qualunque R_s C, e avanza in parallelo su interi array
+di capacita', resistenze e correnti di carico: ogni passo temporale e' una
+manciata di operazioni NumPy su tutti i casi insieme.
+
+Convertitori: forme d'onda a regime in forma chiusa (tratti lineari della
+corrente nell'induttore) in conduzione continua (CCM) e discontinua (DCM),
+anch'esse vettoriali su duty cycle e carichi.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Topologie: (impulsi per periodo di rete, diodi in conduzione in serie)
+RECTIFIERS = {
+    'half-wave': (1, 1),        # semionda
+    'full-wave': (2, 1),        # onda intera con presa centrale
+    'bridge': (2, 2),           # ponte di Graetz
+}
+
+
+def _rectifier_topology(topology: str):
+    try:
+        return RECTIFIERS[topology]
+    except KeyError:
+        raise ValueError(f"Raddrizzatore sconosciuto: {topology!r} "
+                         f"(disponibili: {', '.join(RECTIFIERS)})") from None
+
+
+@dataclass(frozen=True)
+class RectifierResult:
+    """Forme d'onda del raddrizzatore: array di forma (..., T) con T = len(t)."""
+
+    t: np.ndarray               # s
+    v_rectified: np.ndarray     # V, tensione raddrizzata a vuoto (prima dei diodi)
+    v_out: np.ndarray           # V, tensione sul condensatore
+    i_diode: np.ndarray         # A, corrente nei diodi (impulsi di carica)
+    i_load: np.ndarray          # A, corrente nel carico
+
+    @property
+    def ripple(self) -> np.ndarray:
+        """Ondulazione picco-picco (V) nella finestra registrata."""
+        return self.v_out.max(axis=-1) - self.v_out.min(axis=-1)
+
+    @property
+    def v_dc(self) -> np.ndarray:
+        """Tensione media d'uscita (V)."""
+        return self.v_out.mean(axis=-1)
+
+    @property
+    def conduction(self) -> np.ndarray:
+        """Frazione del tempo in cui i diodi conducono (0-1)."""
+        return (self.i_diode > 0).mean(axis=-1)
+
+    @property
+    def i_diode_peak(self) -> np.ndarray:
+        """Corrente di picco nei diodi (A)."""
+        return self.i_diode.max(axis=-1)
+
+
+def rectifier(
+    topology: str,
+    v_rms,
+    c,
+    r_load=np.inf,
+    i_load=0.0,
+    f_hz: float = 50.0,
+    r_source=1.0,
+    v_diode: float = 0.7,
+    n_cycles: int = 10,
+    steps_per_cycle: int = 400,
+    record_cycles=None,
+    start: str = 'zero'
+) -> RectifierResult:
+    """
+    Simula un raddrizzatore con filtro a condensatore.
+
+    Tutti i parametri elettrici vengono combinati per broadcasting: ad esempio
+    c di forma (Nc, 1) e i_load di forma (Ni,) simulano Nc x Ni alimentatori.
+
+    Args:
+        topology: 'half-wave', 'full-wave' o 'bridge'
+        v_rms: Tensione efficace del secondario (V; per 'full-wave' di ogni semi-avvolgimento)
+        c: Capacita' di filtro (F)
+        r_load: Resistenza di carico (ohm, inf = nessuna)
+        i_load: Corrente di carico costante (A), in aggiunta a r_load
+        f_hz: Frequenza di rete (Hz)
+        r_source: Resistenza del trasformatore e dei collegamenti (ohm, > 0)
+        v_diode: Caduta diretta di ciascun diodo (V)
+        n_cycles: Periodi di rete simulati
+        steps_per_cycle: Passi di integrazione per periodo
+        record_cycles: Registra solo gli ultimi periodi indicati (default: tutti)
+        start: 'zero' (condensatore scarico, mostra lo spunto all'accensione)
+               o 'peak' (condensatore carico al picco, regime in 2-3 periodi)
+
+    Returns:
+        RectifierResult con le forme d'onda registrate
+    """
+    pulses, n_diodes = _rectifier_topology(topology)
+    if start not in ('zero', 'peak'):
+        raise ValueError(f"Condizione iniziale sconosciuta: {start!r} (disponibili: zero, peak)")
+    v_rms, c, r_load, i_load, r_source = (
+        np.asarray(x, dtype=float) for x in (v_rms, c, r_load, i_load, r_source))
+    if np.any(r_source <= 0):
+        raise ValueError("La resistenza della sorgente deve essere positiva")
+    shape = np.broadcast_shapes(v_rms.shape, c.shape, r_load.shape, i_load.shape, r_source.shape)
+
+    dt = 1 / (f_hz * steps_per_cycle)
+    n_steps = n_cycles * steps_per_cycle
+    n_rec = n_steps if record_cycles is None else min(record_cycles, n_cycles) * steps_per_cycle
+    t = np.arange(n_steps + 1) * dt
+    t_rec = t[-n_rec:]
+
+    v_peak = v_rms * np.sqrt(2)
+    drop = n_diodes * v_diode
+    sine = np.sin(2 * np.pi * f_hz * t)
+    rectified = np.maximum(sine, 0.0) if pulses == 1 else np.abs(sine)
+
+    g_load = 1 / r_load
+    g_source = 1 / r_source
+    c_dt = c / dt
+    v = np.broadcast_to(np.maximum(v_peak - drop, 0.0) if start == 'peak' else 0.0,
+                        shape).astype(float)
+
+    v_out = np.empty(shape + (n_rec,))
+    i_d = np.empty(shape + (n_rec,))
+    first = n_steps + 1 - n_rec
+    for k in range(n_steps + 1):
+        if k > 0:
+            # Eulero implicito: prima con i diodi in conduzione, poi senza se la
+            # corrente risultante sarebbe negativa
+            v_src = v_peak * rectified[k] - drop
+            v_on = (c_dt * v + g_source * v_src - i_load) / (c_dt + g_source + g_load)
+            v_off = (c_dt * v - i_load) / (c_dt + g_load)
+            v = np.where(v_on < v_src, v_on, np.maximum(v_off, 0.0))
+        if k >= first:
+            v_src = v_peak * rectified[k] - drop
+            v_out[..., k - first] = v
+            i_d[..., k - first] = np.maximum(v_src - v, 0.0) * g_source
+
+    return RectifierResult(
+        t=t_rec,
+        v_rectified=np.broadcast_to(v_peak[..., None] * rectified[-n_rec:], shape + (n_rec,)),
+        v_out=v_out,
+        i_diode=i_d,
+        i_load=v_out * g_load[..., None] + i_load[..., None],
+    )
+
+
+def ripple_estimate(i_load, c, f_hz: float = 50.0, topology: str = 'bridge') -> np.ndarray:
+    """
+    Stima classica dell'ondulazione picco-picco: V_r = I / (f_r C).
+
+    f_r e' la frequenza dell'ondulazione (f per la semionda, 2f per l'onda intera);
+    la formula trascura il tempo di ricarica e sovrastima leggermente.
+    """
+    pulses, _ = _rectifier_topology(topology)
+    return np.asarray(i_load, dtype=float) / (pulses * f_hz * np.asarray(c, dtype=float))
+
+
+@dataclass(frozen=True)
+class ConverterResult:
+    """Forme d'onda a regime di un convertitore: array (..., T) su n_periods periodi."""
+
+    t: np.ndarray               # s
+    v_out: np.ndarray           # V, tensione d'uscita con ondulazione
+    i_inductor: np.ndarray      # A
+    i_diode: np.ndarray         # A
+    ratio: np.ndarray           # V_out / V_in medio
+    ccm: np.ndarray             # True in conduzione continua
+
+    @property
+    def ripple(self) -> np.ndarray:
+        """Ondulazione picco-picco della tensione d'uscita (V)."""
+        return self.v_out.max(axis=-1) - self.v_out.min(axis=-1)
+
+    @property
+    def i_ripple(self) -> np.ndarray:
+        """Ondulazione picco-picco della corrente nell'induttore (A)."""
+        return self.i_inductor.max(axis=-1) - self.i_inductor.min(axis=-1)
+
+
+def _converter(kind, v_in, duty, l, c, r_load, f_sw, n_periods, steps_per_period):
+    v_in, duty, l, c, r_load = (np.asarray(x, dtype=float) for x in (v_in, duty, l, c, r_load))
+    if np.any((duty <= 0) | (duty >= 1)):
+        raise ValueError("Il duty cycle deve essere compreso fra 0 e 1 (esclusi)")
+    period = 1 / f_sw
+    k = 2 * l / (r_load * period)       # parametro di conduzione
+
+    # Rapporto di conversione e limite CCM/DCM
+    if kind == 'buck':
+        ccm = k > 1 - duty
+        ratio = np.where(ccm, duty, 2 / (1 + np.sqrt(1 + 4 * k / duty ** 2)))
+    else:
+        ccm = k > duty * (1 - duty) ** 2
+        ratio = np.where(ccm, 1 / (1 - duty), (1 + np.sqrt(1 + 4 * duty ** 2 / k)) / 2)
+    v_out = ratio * v_in
+    i_out = v_out / r_load
+
+    # Pendenze della corrente nell'induttore (interruttore chiuso / aperto)
+    if kind == 'buck':
+        rise, fall = (v_in - v_out) / l, -v_out / l
+        i_l_avg = i_out
+    else:
+        rise, fall = v_in / l, (v_in - v_out) / l
+        i_l_avg = i_out / (1 - duty)
+    t_on = duty * period
+    i_min = np.where(ccm, i_l_avg - rise * t_on / 2, 0.0)
+    i_peak = i_min + rise * t_on
+
+    t = np.arange(n_periods * steps_per_period) * (period / steps_per_period)
+    tau = np.mod(t, period)
+    on = tau < t_on[..., None]
+    i_l = np.where(on, i_min[..., None] + rise[..., None] * tau,
+                   np.maximum(i_peak[..., None] + fall[..., None] * (tau - t_on[..., None]), 0.0))
+    i_d = np.where(on, 0.0, i_l)
+
+    # Ondulazione d'uscita: integrale della corrente nel condensatore a media nulla
+    i_cap = (i_l if kind == 'buck' else i_d) - i_out[..., None]
+    i_cap = i_cap - i_cap.mean(axis=-1, keepdims=True)
+    v_ripple = np.cumsum(i_cap, axis=-1) * (period / steps_per_period) / c[..., None]
+    v_ripple = v_ripple - v_ripple.mean(axis=-1, keepdims=True)
+
+    return ConverterResult(t=t, v_out=v_out[..., None] + v_ripple, i_inductor=i_l,
+                           i_diode=i_d, ratio=ratio, ccm=ccm)
+
+
+def buck(v_in, duty, l, c, r_load, f_sw: float = 100e3,
+         n_periods: int = 3, steps_per_period: int = 200) -> ConverterResult:
+    """
+    Convertitore buck (abbassatore) ideale a regime.
+
+    V_out = D V_in in conduzione continua; in discontinua la tensione sale
+    verso V_in al diminuire del carico.
+
+    Args:
+        v_in: Tensione d'ingresso (V)
+        duty: Duty cycle D (0-1)
+        l: Induttanza (H)
+        c: Capacita' d'uscita (F)
+        r_load: Resistenza di carico (ohm)
+        f_sw: Frequenza di commutazione (Hz)
+        n_periods: Periodi di commutazione restituiti
+        steps_per_period: Campioni per periodo
+
+    Returns:
+        ConverterResult con forme d'onda di forma broadcast(ingressi) + (T,)
+    """
+    return _converter('buck', v_in, duty, l, c, r_load, f_sw, n_periods, steps_per_period)
+
+
+def boost(v_in, duty, l, c, r_load, f_sw: float = 100e3,
+          n_periods: int = 3, steps_per_period: int = 200) -> ConverterResult:
+    """
+    Convertitore boost (elevatore) ideale a regime.
+
+    V_out = V_in / (1 - D) in conduzione continua. Argomenti come buck.
+    """
+    return _converter('boost', v_in, duty, l, c, r_load, f_sw, n_periods, steps_per_period)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tabella delle allocazioni di frequenza usata per le verifiche di interferenza.
+
+Contiene le bande radioamatoriali, i principali servizi di radiodiffusione e
+i servizi protetti (aeronautico, marittimo, radionavigazione) piu' esposti alle
+emissioni spurie, con un IntervalIndex per sapere in quali allocazioni cade
+una frequenza.
+"""
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from calcoli.intervalli import IntervalIndex
+from calcoli.piano_bande import BAND_PLAN
+
+
+class Allocation(NamedTuple):
+    """Un'allocazione di frequenza [f_min, f_max] in Hz."""
+
+    name: str
+    f_min: float
+    f_max: float
+    service: str
+
+
+# Servizi
+AMATEUR = 'amatoriale'
+BROADCAST = 'radiodiffusione'
+AERONAUTICAL = 'aeronautico'
+MARITIME = 'marittimo'
+RADIONAVIGATION = 'radionavigazione'
+
+ALLOCATIONS = tuple(
+    # Bande radioamatoriali dal piano di banda
+    Allocation(b.name, b.f_min, b.f_max, AMATEUR) for b in BAND_PLAN.bands
+) + (
+    # Radiodiffusione
+    Allocation('Onde lunghe', 148.5e3, 283.5e3, BROADCAST),
+    Allocation('Onde medie', 526.5e3, 1606.5e3, BROADCAST),
+    Allocation('OC 49m', 5.900e6, 6.200e6, BROADCAST),
+    Allocation('OC 41m', 7.200e6, 7.450e6, BROADCAST),
+    Allocation('OC 31m', 9.400e6, 9.900e6, BROADCAST),
+    Allocation('OC 25m', 11.600e6, 12.100e6, BROADCAST),
+    Allocation('OC 19m', 15.100e6, 15.800e6, BROADCAST),
+    Allocation('OC 16m', 17.480e6, 17.900e6, BROADCAST),
+    Allocation('OC 13m', 21.450e6, 21.850e6, BROADCAST),
+    Allocation('OC 11m', 25.670e6, 26.100e6, BROADCAST),
+    Allocation('FM broadcast', 87.5e6, 108.0e6, BROADCAST),
+    Allocation('DAB+ (Banda III)', 174.0e6, 240.0e6, BROADCAST),
+    Allocation('DVB-T (UHF)', 470.0e6, 694.0e6, BROADCAST),
+)
+
+
+def build_index(allocations: Sequence[Allocation] = ALLOCATIONS) -> IntervalIndex:
+    """
+    Costruisce l'indice di intervalli per una tabella di allocazioni.
+
+    Args:
+        allocations: Sequenza di Allocation
+
+    Returns:
+        IntervalIndex con un intervallo per allocazione, nello stesso ordine
+    """
+    return IntervalIndex([a.f_min for a in allocations], [a.f_max for a in allocations])
+
+
+ALLOCATION_INDEX = build_index(ALLOCATIONS)
+
+# Servizi da proteggere dalle armoniche di un trasmettitore radioamatoriale
+PROTECTED_ALLOCATIONS = tuple(a for a in ALLOCATIONS if a.service == BROADCAST) + (
+    Allocation('VOR/ILS', 108.0e6, 117.975e6, AERONAUTICAL),
+    Allocation('Aeronautico VHF', 117.975e6, 137.0e6, AERONAUTICAL),
+    Allocation('Marittimo VHF', 156.0e6, 162.05e6, MARITIME),
+    Allocation('Aeronautico UHF', 225.0e6, 400.0e6, AERONAUTICAL),
+    Allocation('ILS glide path', 328.6e6, 335.4e6, AERONAUTICAL),
+    Allocation('DME/TACAN', 960.0e6, 1215.0e6, RADIONAVIGATION),
+    Allocation('GNSS L1', 1559.0e6, 1610.0e6, RADIONAVIGATION),
+)
+
+PROTECTED_INDEX = build_index(PROTECTED_ALLOCATIONS)
+
+
+def allocation_of(freqs, allocations: Sequence[Allocation] = ALLOCATIONS,
+                  index: IntervalIndex = ALLOCATION_INDEX) -> np.ndarray:
+    """
+    Nome della prima allocazione che contiene ogni frequenza ('' se nessuna).
+
+    Args:
+        freqs: Frequenze (Hz)
+        allocations: Tabella di allocazioni
+        index: Indice corrispondente alla tabella
+
+    Returns:
+        Array di stringhe con la forma di freqs
+    """
+    names = np.array([a.name for a in allocations] + [''], dtype=object)
+    return names[index.first(freqs)]
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Verifica delle armoniche di un trasmettitore sui servizi protetti.
+
+Dato un array di frequenze di trasmissione calcola tutte le armoniche fino
+all'ordine richiesto, trova con un IntervalIndex quelle che cadono in bande
+protette (radiodiffusione FM, DVB-T, aeronautico, ...) e stima l'attenuazione
+che il filtro passa-basso d'uscita deve garantire.
+
+Il livello delle armoniche all'uscita dello stadio finale e i limiti per le
+emissioni spurie sono modelli semplificati a scopo didattico (ITU-R SM.329,
+servizio di amatore).
+"""
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from calcoli.allocazioni import (
+    ALLOCATIONS, AMATEUR, PROTECTED_ALLOCATIONS, PROTECTED_INDEX, Allocation,
+)
+from calcoli.intervalli import IntervalIndex
+
+
+def pa_harmonic_level_dbc(n, push_pull: bool = False) -> np.ndarray:
+    """
+    Livello tipico dell'armonica n all'uscita di un finale senza filtro (dBc).
+
+    Modello: 2ª armonica -25 dBc, 3ª -20 dBc, poi -6 dB per ogni ordine in piu'.
+    Un finale push-pull attenua di ulteriori 15 dB le armoniche pari.
+
+    Args:
+        n: Ordine dell'armonica (>= 2), scalare o array
+        push_pull: True per uno stadio finale push-pull
+
+    Returns:
+        Livello in dBc (negativo)
+    """
+    n = np.asarray(n, dtype=float)
+    level = np.where(n == 2, -25.0, -20.0 - 6.0 * (n - 3))
+    if push_pull:
+        level = np.where(n % 2 == 0, level - 15.0, level)
+    return level
+
+
+def spurious_limit_dbc(power_w, f_hz) -> np.ndarray:
+    """
+    Attenuazione minima delle emissioni spurie per il servizio di amatore (dB).
+
+    Sotto 30 MHz: 43 + 10 log10(P) oppure 50 dBc; sopra 30 MHz: 43 + 10 log10(P)
+    oppure 70 dBc, scegliendo il valore meno severo.
+
+    Args:
+        power_w: Potenza del trasmettitore (W)
+        f_hz: Frequenza della portante (Hz)
+
+    Returns:
+        Attenuazione richiesta rispetto alla portante (dB, positiva)
+    """
+    power_w = np.asarray(power_w, dtype=float)
+    ceiling = np.where(np.asarray(f_hz) < 30e6, 50.0, 70.0)
+    return np.minimum(43.0 + 10.0 * np.log10(power_w), ceiling)
+
+
+@dataclass(frozen=True)
+class HarmonicHits:
+    """Armoniche che cadono in allocazioni protette: un elemento per coppia colpita."""
+
+    tx_index: np.ndarray          # indice nella lista di frequenze TX
+    harmonic: np.ndarray          # ordine n
+    f_tx: np.ndarray              # Hz
+    f_harmonic: np.ndarray        # Hz
+    allocation: np.ndarray        # indice nella tabella delle allocazioni protette
+    required_db: np.ndarray       # attenuazione richiesta al filtro (dB)
+
+    def __len__(self) -> int:
+        return len(self.tx_index)
+
+
+def check_harmonics(
+    tx_freqs,
+    max_harmonic: int = 10,
+    power_w=100.0,
+    push_pull: bool = False,
+    protection_margin_db: float = 10.0,
+    index: IntervalIndex = PROTECTED_INDEX
+) -> HarmonicHits:
+    """
+    Trova tutte le armoniche 2..max_harmonic che cadono in bande protette.
+
+    L'attenuazione richiesta al filtro e' la differenza tra il livello
+    dell'armonica generata dal finale e il limite per le spurie, aumentata di
+    un margine per i servizi protetti (mai negativa).
+
+    Args:
+        tx_freqs: Frequenze di trasmissione (Hz), array 1D
+        max_harmonic: Ordine massimo delle armoniche
+        power_w: Potenza di trasmissione (W), scalare o array come tx_freqs
+        push_pull: True per uno stadio finale push-pull
+        protection_margin_db: Margine aggiuntivo nei servizi protetti (dB)
+        index: IntervalIndex delle allocazioni protette
+
+    Returns:
+        HarmonicHits con una riga per ogni coppia (armonica, allocazione)
+    """
+    f_tx = np.ravel(np.asarray(tx_freqs, dtype=float))
+    power = np.broadcast_to(np.asarray(power_w, dtype=float), f_tx.shape)
+    n = np.arange(2, max_harmonic + 1)
+
+    harmonics = f_tx[:, None] * n[None, :]                            # (T, H)
+    flat_idx, alloc = index.pairs(harmonics)
+    tx_idx, h_idx = np.unravel_index(flat_idx, harmonics.shape)
+
+    level = pa_harmonic_level_dbc(n[h_idx], push_pull)
+    limit = spurious_limit_dbc(power[tx_idx], f_tx[tx_idx])
+    required = np.maximum(level + limit + protection_margin_db, 0.0)
+
+    return HarmonicHits(
+        tx_index=tx_idx,
+        harmonic=n[h_idx],
+        f_tx=f_tx[tx_idx],
+        f_harmonic=harmonics[tx_idx, h_idx],
+        allocation=alloc,
+        required_db=required,
+    )
+
+
+def sample_bands(
+    allocations: Sequence[Allocation] = ALLOCATIONS,
+    step_hz: float = 1e3,
+    service: str = AMATEUR
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Campiona con passo costante tutte le bande di un servizio.
+
+    Args:
+        allocations: Tabella di allocazioni
+        step_hz: Passo di campionamento (Hz)
+        service: Servizio da campionare (default: bande radioamatoriali)
+
+    Returns:
+        Tupla (frequenze, indice della banda in allocations)
+    """
+    bands = [i for i, a in enumerate(allocations) if a.service == service]
+    freqs = [np.arange(allocations[i].f_min, allocations[i].f_max + step_hz / 2, step_hz)
+             for i in bands]
+    band_idx = np.repeat(bands, [len(f) for f in freqs])
+    return np.concatenate(freqs), band_idx
+
+
+def protected_names(hits: HarmonicHits,
+                    allocations: Sequence[Allocation] = PROTECTED_ALLOCATIONS) -> np.ndarray:
+    """Nomi delle allocazioni protette colpite, uno per riga di hits."""
+    names = np.array([a.name for a in allocations], dtype=object)
+    return names[hits.allocation]
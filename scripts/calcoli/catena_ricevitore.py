@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Calcolo in cascata degli stadi di un ricevitore.
+
+Dati guadagno, cifra di rumore, IIP3 e P1dB di ogni stadio calcola livelli
+cumulativi, cifra di rumore totale (formula di Friis), segnale minimo
+rilevabile (MDS), IIP3 e P1dB in cascata e gamma dinamica.
+
+Tutte le funzioni accettano array con l'asse degli stadi come ultimo asse:
+un array (N, S) descrive N configurazioni candidate di S stadi, valutate
+insieme in un'unica chiamata vettoriale.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Densita' di rumore termico a 290 K (dBm/Hz)
+THERMAL_NOISE_DBM_HZ = -174.0
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Uno stadio della catena. IIP3 e P1dB sono riferiti all'ingresso dello stadio."""
+
+    name: str
+    gain_db: float
+    nf_db: float
+    iip3_dbm: float = np.inf
+    ip1db_dbm: float = np.inf
+    description: str = ''
+
+
+@dataclass(frozen=True)
+class CascadeResult:
+    """Risultati del calcolo in cascata. Gli array per stadio hanno forma (..., S)."""
+
+    level_dbm: np.ndarray         # livello all'uscita di ogni stadio
+    gain_db: np.ndarray           # guadagno cumulativo fino all'uscita di ogni stadio
+    nf_db: np.ndarray             # cifra di rumore cumulativa (Friis)
+    iip3_dbm: np.ndarray          # IIP3 cumulativo riferito all'antenna
+    ip1db_dbm: np.ndarray         # P1dB cumulativo riferito all'antenna
+    mds_dbm: np.ndarray           # segnale minimo rilevabile (...,)
+    sfdr_db: np.ndarray           # gamma dinamica libera da spurie (...,)
+    blocking_dr_db: np.ndarray    # gamma dinamica di bloccaggio (...,)
+
+    @property
+    def total_gain_db(self) -> np.ndarray:
+        """Guadagno totale della catena (dB)."""
+        return self.gain_db[..., -1]
+
+    @property
+    def total_nf_db(self) -> np.ndarray:
+        """Cifra di rumore totale (dB)."""
+        return self.nf_db[..., -1]
+
+    @property
+    def total_iip3_dbm(self) -> np.ndarray:
+        """IIP3 della catena riferito all'antenna (dBm)."""
+        return self.iip3_dbm[..., -1]
+
+    @property
+    def total_ip1db_dbm(self) -> np.ndarray:
+        """P1dB della catena riferito all'antenna (dBm)."""
+        return self.ip1db_dbm[..., -1]
+
+
+def db_to_linear(x_db) -> np.ndarray:
+    """Converte dB in rapporto lineare di potenza."""
+    return 10.0 ** (np.asarray(x_db, dtype=float) / 10.0)
+
+
+def linear_to_db(x) -> np.ndarray:
+    """Converte un rapporto lineare di potenza in dB."""
+    with np.errstate(divide='ignore'):
+        return 10.0 * np.log10(x)
+
+
+def stages_to_arrays(stages: Sequence[Stage]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converte una lista di Stage negli array usati da cascade.
+
+    Args:
+        stages: Sequenza di stadi
+
+    Returns:
+        Tupla (gain_db, nf_db, iip3_dbm, ip1db_dbm), ciascuno di forma (S,)
+    """
+    return (np.array([s.gain_db for s in stages], dtype=float),
+            np.array([s.nf_db for s in stages], dtype=float),
+            np.array([s.iip3_dbm for s in stages], dtype=float),
+            np.array([s.ip1db_dbm for s in stages], dtype=float))
+
+
+def _cascade_intercept(intercept_dbm: np.ndarray, gain_before: np.ndarray) -> np.ndarray:
+    """1/P_tot = sum(G_prima_i / P_i): combina punti d'intercetta riferiti all'ingresso."""
+    inverse = np.cumsum(gain_before / db_to_linear(intercept_dbm), axis=-1)
+    return -linear_to_db(inverse)
+
+
+def cascade(
+    gain_db,
+    nf_db,
+    iip3_dbm=np.inf,
+    ip1db_dbm=np.inf,
+    input_dbm: float = -93.0,
+    bandwidth_hz: float = 2400.0,
+    snr_db: float = 0.0
+) -> CascadeResult:
+    """
+    Calcola le prestazioni in cascata di una catena di stadi.
+
+    Gli ingressi sono broadcast fra loro; l'ultimo asse indicizza gli stadi
+    nell'ordine del segnale. Per gli stadi passivi NF = perdita e IIP3/P1dB
+    possono essere lasciati a infinito.
+
+    Args:
+        gain_db: Guadagno di ogni stadio (dB)
+        nf_db: Cifra di rumore di ogni stadio (dB)
+        iip3_dbm: IIP3 di ogni stadio, riferito al suo ingresso (dBm)
+        ip1db_dbm: P1dB di ogni stadio, riferito al suo ingresso (dBm)
+        input_dbm: Livello del segnale in antenna (dBm)
+        bandwidth_hz: Banda di rumore del ricevitore (Hz)
+        snr_db: Rapporto S/N richiesto per l'MDS (0 dB = definizione classica)
+
+    Returns:
+        CascadeResult con livelli, NF, IIP3, P1dB cumulativi e gamme dinamiche
+    """
+    gain_db, nf_db, iip3_dbm, ip1db_dbm = np.broadcast_arrays(
+        np.asarray(gain_db, dtype=float), np.asarray(nf_db, dtype=float),
+        np.asarray(iip3_dbm, dtype=float), np.asarray(ip1db_dbm, dtype=float))
+
+    cum_gain_db = np.cumsum(gain_db, axis=-1)
+    # Guadagno disponibile prima di ogni stadio (1 per il primo)
+    gain_before = db_to_linear(np.concatenate(
+        [np.zeros(gain_db.shape[:-1] + (1,)), cum_gain_db[..., :-1]], axis=-1))
+
+    # Formula di Friis: F = F1 + (F2 - 1)/G1 + (F3 - 1)/(G1 G2) + ...
+    f_lin = db_to_linear(nf_db)
+    excess = (f_lin - 1.0) / gain_before
+    cum_nf_db = linear_to_db(1.0 + np.cumsum(excess, axis=-1))
+
+    cum_iip3 = _cascade_intercept(iip3_dbm, gain_before)
+    cum_ip1db = _cascade_intercept(ip1db_dbm, gain_before)
+
+    mds = THERMAL_NOISE_DBM_HZ + 10.0 * np.log10(bandwidth_hz) + cum_nf_db[..., -1] + snr_db
+    sfdr = 2.0 / 3.0 * (cum_iip3[..., -1] - mds)
+    blocking = cum_ip1db[..., -1] - mds
+
+    return CascadeResult(
+        level_dbm=input_dbm + cum_gain_db,
+        gain_db=cum_gain_db,
+        nf_db=cum_nf_db,
+        iip3_dbm=cum_iip3,
+        ip1db_dbm=cum_ip1db,
+        mds_dbm=mds,
+        sfdr_db=sfdr,
+        blocking_dr_db=blocking,
+    )
+
+
+def cascade_stages(stages: Sequence[Stage], input_dbm: float = -93.0,
+                   bandwidth_hz: float = 2400.0, snr_db: float = 0.0) -> CascadeResult:
+    """Come cascade, partendo da una lista di Stage."""
+    return cascade(*stages_to_arrays(stages), input_dbm=input_dbm,
+                   bandwidth_hz=bandwidth_hz, snr_db=snr_db)
+
+
+def sweep_stage(
+    stages: Sequence[Stage],
+    index: int,
+    gain_db: Optional[np.ndarray] = None,
+    nf_db: Optional[np.ndarray] = None,
+    iip3_dbm: Optional[np.ndarray] = None,
+    **kwargs
+) -> CascadeResult:
+    """
+    Varia i parametri di uno stadio e valuta tutte le combinazioni insieme.
+
+    I valori passati vengono combinati per broadcasting (ad es. gain_db di forma
+    (N, 1) e nf_db di forma (1, M) producono una griglia N x M di catene).
+
+    Args:
+        stages: Catena di riferimento
+        index: Indice dello stadio da variare
+        gain_db, nf_db, iip3_dbm: Valori alternativi (None = valore originale)
+        **kwargs: Parametri passati a cascade (input_dbm, bandwidth_hz, snr_db)
+
+    Returns:
+        CascadeResult con forma broadcast(valori) + (S,)
+    """
+    base = stages_to_arrays(stages)
+    overrides = (gain_db, nf_db, iip3_dbm, None)
+    shape = np.broadcast_shapes(*(np.shape(v) for v in overrides if v is not None))
+
+    arrays = []
+    for values, override in zip(base, overrides):
+        grid = np.broadcast_to(values, shape + values.shape).copy()
+        if override is not None:
+            grid[..., index] = override
+        arrays.append(grid)
+    return cascade(*arrays, **kwargs)
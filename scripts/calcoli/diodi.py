@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Modello I-V dei diodi a semiconduttore con resistenza serie.
+
+Il modello e' quello dei simulatori circuitali (SPICE), ridotto ai parametri
+utili negli esercizi:
+
+    I = Is(T) [exp(Vj / (n Vt)) - 1] - Ibv exp(-(BV + Vj) / (nbv Vt))
+    V = Vj + Rs I
+
+con Vj tensione sulla giunzione, Vt = kT/q tensione termica e BV tensione di
+rottura inversa (Zener/valanga). La relazione fra V ai morsetti e I e'
+implicita: current la risolve in forma chiusa con la funzione W di Lambert
+(calcolata in forma logaritmica, senza overflow) su interi array di tensioni,
+temperature e resistenze esterne.
+
+Parametri dei preset indicativi, ricavati da modelli SPICE pubblici.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# Costante di Boltzmann / carica dell'elettrone (V/K)
+K_OVER_Q = 8.617333e-5
+
+# Temperatura zero assoluto (°C)
+T_ZERO_C = -273.15
+
+# Temperatura nominale dei parametri (°C)
+T_NOMINAL_C = 27.0
+
+
+def thermal_voltage(temp_c=T_NOMINAL_C) -> np.ndarray:
+    """Tensione termica Vt = kT/q (V) alla temperatura in °C (25.9 mV a 27 °C)."""
+    return K_OVER_Q * (np.asarray(temp_c, dtype=float) - T_ZERO_C)
+
+
+@dataclass(frozen=True)
+class DiodeModel:
+    """Parametri del modello di diodo (unita' SI)."""
+
+    name: str
+    i_s: float                          # corrente di saturazione (A)
+    n: float = 1.0                      # fattore di idealita'
+    r_s: float = 0.0                    # resistenza serie (ohm)
+    bv: Optional[float] = None          # tensione di rottura inversa (V, positiva)
+    i_bv: float = 1e-3                  # corrente alla tensione di rottura (A)
+    n_bv: float = 1.0                   # idealita' del ginocchio inverso (r_z ~ n_bv Vt / I)
+    tc_bv: float = 0.0                  # coefficiente di temperatura di BV (1/K)
+    eg: float = 1.11                    # energia di gap (eV): Si 1.11, Ge 0.67, Schottky 0.69
+    xti: float = 3.0                    # esponente di temperatura di Is
+    label: str = ''
+
+    def saturation_current(self, temp_c=T_NOMINAL_C) -> np.ndarray:
+        """Is alla temperatura indicata (raddoppia circa ogni 5-10 °C nel silicio)."""
+        t = np.asarray(temp_c, dtype=float) - T_ZERO_C
+        ratio = t / (T_NOMINAL_C - T_ZERO_C)
+        return self.i_s * ratio ** (self.xti / self.n) * np.exp(
+            (ratio - 1) * self.eg / (self.n * K_OVER_Q * t))
+
+    def breakdown_voltage(self, temp_c=T_NOMINAL_C) -> Optional[np.ndarray]:
+        """BV alla temperatura indicata, None se il modello non ha rottura inversa."""
+        if self.bv is None:
+            return None
+        return self.bv * (1 + self.tc_bv * (np.asarray(temp_c, dtype=float) - T_NOMINAL_C))
+
+
+DIODES = {
+    '1N4148': DiodeModel('1N4148', i_s=2.52e-9, n=1.752, r_s=0.568, bv=100.0, i_bv=100e-6,
+                         label='1N4148 (Si, segnale)'),
+    '1N4007': DiodeModel('1N4007', i_s=7.03e-9, n=1.808, r_s=0.034, bv=1000.0, i_bv=5e-6,
+                         label='1N4007 (Si, raddrizzatore)'),
+    '1N5817': DiodeModel('1N5817', i_s=3.17e-5, n=1.373, r_s=0.051, bv=20.0, i_bv=1e-3,
+                         eg=0.69, xti=2.0, label='1N5817 (Schottky)'),
+    '1N34A': DiodeModel('1N34A', i_s=2e-7, n=1.3, r_s=7.0, bv=60.0, i_bv=150e-6,
+                        eg=0.67, label='1N34A (Ge, rivelatore)'),
+    '1N4733': DiodeModel('1N4733', i_s=1e-14, n=1.0, r_s=1.0, bv=5.1, i_bv=49e-3, n_bv=3.0,
+                         tc_bv=1e-4, label='1N4733 (Zener 5.1 V)'),
+    '1N4742': DiodeModel('1N4742', i_s=1e-14, n=1.0, r_s=1.0, bv=12.0, i_bv=21e-3, n_bv=3.5,
+                         tc_bv=7.5e-4, label='1N4742 (Zener 12 V)'),
+    # LED: Is scelta per la tensione diretta tipica a 20 mA
+    'LED-IR': DiodeModel('LED-IR', i_s=1.5e-15, n=1.5, r_s=1.5, bv=5.0, i_bv=10e-6,
+                         eg=1.4, label='LED infrarosso (1.2 V)'),
+    'LED-R': DiodeModel('LED-R', i_s=1.6e-17, n=2.0, r_s=2.0, bv=5.0, i_bv=10e-6,
+                        eg=1.9, label='LED rosso (1.8 V)'),
+    'LED-G': DiodeModel('LED-G', i_s=4.6e-20, n=2.0, r_s=3.0, bv=5.0, i_bv=10e-6,
+                        eg=2.2, label='LED verde (2.1 V)'),
+    'LED-B': DiodeModel('LED-B', i_s=9.8e-20, n=2.8, r_s=5.0, bv=5.0, i_bv=10e-6,
+                        eg=2.7, label='LED blu (3.0 V)'),
+}
+
+
+def diode(name: str) -> DiodeModel:
+    """Preset con il nome indicato (vedi DIODES)."""
+    try:
+        return DIODES[name]
+    except KeyError:
+        raise ValueError(f"Diodo sconosciuto: {name!r} "
+                         f"(disponibili: {', '.join(DIODES)})") from None
+
+
+def lambertw_exp(x, tol: float = 1e-14, max_iter: int = 50) -> np.ndarray:
+    """
+    W(exp(x)), ramo principale della funzione W di Lambert con argomento esponenziale.
+
+    Lavorare con l'esponente evita l'overflow di exp(x) per diodi in forte
+    conduzione: con u = ln W si risolve e^u + u = x (funzione convessa e
+    crescente) con il metodo di Newton.
+
+    Args:
+        x: Esponente dell'argomento, array di forma qualsiasi
+
+    Returns:
+        w tale che w e^w = e^x
+    """
+    x = np.asarray(x, dtype=float)
+    big = x > 1
+    u = np.where(big, np.log(np.where(big, x - np.log(np.where(big, x, 2.0)), 1.0)), x)
+    for _ in range(max_iter):
+        eu = np.exp(u)
+        step = (eu + u - x) / (eu + 1)
+        u = u - step
+        if np.all(np.abs(step) <= tol * np.maximum(1.0, np.abs(u))):
+            break
+    return np.exp(u)
+
+
+def current(model: DiodeModel, v, temp_c=T_NOMINAL_C, r_ext=0.0) -> np.ndarray:
+    """
+    Corrente nel diodo con tensione v applicata tramite la resistenza r_ext.
+
+    L'equazione implicita Vj + (Rs + r_ext) I(Vj) = v si risolve in forma
+    chiusa con la funzione W di Lambert, separatamente per la polarizzazione
+    diretta e per quella inversa (il termine di rottura e quello diretto non
+    sono mai significativi insieme). Con r_ext e v pari alla resistenza e alla
+    tensione di Thevenin del resto del circuito si ottiene il punto di lavoro
+    (vedi operating_point).
+
+    Args:
+        model: Modello del diodo
+        v: Tensione applicata (V), array di forma qualsiasi
+        temp_c: Temperatura (°C), combinata per broadcasting
+        r_ext: Resistenza esterna in serie (ohm), combinata per broadcasting
+
+    Returns:
+        Corrente (A) con la forma del broadcasting degli ingressi
+
+    Example:
+        >>> i = current(diode('1N4148'), [-5.0, 0.6, 0.7])
+        >>> [f"{x:.3g}" for x in i]
+        ['-2.52e-09', '0.00139', '0.0112']
+    """
+    v, temp_c, r_ext = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (v, temp_c, r_ext)))
+    r = model.r_s + r_ext
+    has_r = r > 0
+    r_safe = np.where(has_r, r, 1.0)
+    vt = thermal_voltage(temp_c)
+    i_s = model.saturation_current(temp_c)
+
+    # Diretta: (R y / a) e^(R y / a) = (R Is / a) e^((v + R Is) / a), con y = I + Is.
+    # Da w = e^(x - w) la corrente si riscrive come Is (e^(Vj / a) - 1) con
+    # Vj = v + R Is - a w, precisa anche per correnti vicine a zero.
+    a = model.n * vt
+    with np.errstate(over='ignore', divide='ignore'):
+        w = lambertw_exp(np.log(r_safe * i_s / a) + (v + r_safe * i_s) / a)
+        v_j = np.where(has_r, v + r_safe * i_s - a * w, v)
+        i = i_s * np.expm1(v_j / a)
+
+    bv = model.breakdown_voltage(temp_c)
+    if bv is not None:
+        # Inversa: stessa forma con z = -(I + Is), corrente di rottura
+        b = model.n_bv * vt
+        with np.errstate(over='ignore', divide='ignore'):
+            x = np.log(r_safe * model.i_bv / b) - (bv + v + r_safe * i_s) / b
+            w = np.where(has_r, lambertw_exp(x), 0.0)
+            z = model.i_bv * np.exp(-(bv + v + np.where(has_r, r_safe * i_s, 0.0)) / b - w)
+        i = np.where(v < 0, i - z, i)
+    return i
+
+
+def voltage(model: DiodeModel, i, temp_c=T_NOMINAL_C) -> np.ndarray:
+    """
+    Tensione ai morsetti con corrente diretta i imposta (forma esplicita).
+
+    Vale per correnti positive, dove il termine di rottura e' trascurabile.
+
+    Args:
+        model: Modello del diodo
+        i: Corrente diretta (A, > 0)
+        temp_c: Temperatura (°C)
+
+    Returns:
+        Tensione (V)
+    """
+    i = np.asarray(i, dtype=float)
+    if np.any(i <= 0):
+        raise ValueError("La corrente deve essere positiva (polarizzazione diretta)")
+    nvt = model.n * thermal_voltage(temp_c)
+    return nvt * np.log1p(i / model.saturation_current(temp_c)) + model.r_s * i
+
+
+def operating_point(
+    model: DiodeModel,
+    v_source,
+    r_source,
+    r_load=np.inf,
+    temp_c=T_NOMINAL_C
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Punto di lavoro di un diodo alimentato da v_source tramite r_source, con
+    un eventuale carico r_load in parallelo (stabilizzatore Zener, LED con
+    resistenza di limitazione, ...).
+
+    Un diodo Zener va montato in inversa: passare v_source negativa oppure
+    usare zener_regulator.
+
+    Returns:
+        Tupla (tensione sul diodo in V, corrente nel diodo in A)
+    """
+    v_source, r_source, r_load = (np.asarray(x, dtype=float) for x in (v_source, r_source, r_load))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        divider = np.where(np.isinf(r_load), 1.0, r_load / (r_source + r_load))
+        r_th = np.where(np.isinf(r_load), r_source, r_source * r_load / (r_source + r_load))
+    v_th = v_source * divider
+    i = current(model, v_th, temp_c, r_th)
+    return v_th - r_th * i, i
+
+
+def zener_regulator(
+    model: DiodeModel,
+    v_in,
+    r_s,
+    r_load,
+    temp_c=T_NOMINAL_C
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stabilizzatore Zener: resistenza serie r_s e carico r_load in parallelo allo Zener.
+
+    Returns:
+        Tupla (tensione d'uscita in V, corrente nello Zener in A, corrente nel carico in A)
+    """
+    v_d, i_d = operating_point(model, -np.asarray(v_in, dtype=float), r_s, r_load, temp_c)
+    v_out = -v_d
+    return v_out, -i_d, v_out / np.asarray(r_load, dtype=float)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Esposizione ai campi elettromagnetici (EMF) attorno a un'antenna trasmittente.
+
+Calcola densita' di potenza e campo elettrico in campo lontano su griglie
+spaziali 2D/3D (broadcasting NumPy), li confronta con i livelli di
+riferimento in funzione della frequenza e risolve la distanza di rispetto per
+interi lotti di configurazioni di stazione.
+
+Modello (approccio "worst case" tipo FCC OET-65):
+
+    S = P * G * d * F(el) * Gamma^2 / (4 pi r^2)        E = sqrt(Z0 * S)
+
+con P potenza, G guadagno d'antenna, d fattore di utilizzo (modo di
+emissione e tempo in trasmissione), F diagramma di radiazione relativo nel
+piano verticale e Gamma fattore di riflessione del suolo sul campo (1.6 e'
+il valore cautelativo usuale). Il diagramma e' simmetrico in azimut, quindi
+una griglia 3D si riduce alla distanza orizzontale hypot(x, y).
+
+Le formule di campo lontano sovrastimano il campo vicino all'antenna
+(r < lambda / 2 pi): i risultati sono cautelativi, non una misura.
+"""
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+# Impedenza caratteristica del vuoto (ohm)
+Z0 = 376.73
+
+# Fattore di riflessione del suolo sul campo (cautelativo)
+GROUND_REFLECTION = 1.6
+
+# Fattore di utilizzo tipico per modo di emissione (rapporto potenza media / PEP)
+MODE_DUTY = {
+    'SSB': 0.2,
+    'CW': 0.4,
+    'FM': 1.0,
+    'Digi': 1.0,
+}
+
+
+def _limit_icnirp(mhz: np.ndarray) -> np.ndarray:
+    """ICNIRP 1998, livelli di riferimento per la popolazione (V/m)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.select([mhz < 1.0, mhz < 10.0, mhz < 400.0, mhz < 2000.0],
+                         [87.0, 87.0 / np.sqrt(mhz), 28.0, 1.375 * np.sqrt(mhz)], 61.0)
+
+
+def _limit_dpcm(mhz: np.ndarray) -> np.ndarray:
+    """DPCM 8 luglio 2003, limiti di esposizione (V/m)."""
+    return np.select([mhz <= 3.0, mhz <= 3000.0], [60.0, 20.0], 40.0)
+
+
+def _attention_dpcm(mhz: np.ndarray) -> np.ndarray:
+    """DPCM 8 luglio 2003, valore di attenzione (permanenze > 4 ore, V/m)."""
+    return np.full(mhz.shape, 6.0)
+
+
+EXPOSURE_STANDARDS = {
+    'icnirp': _limit_icnirp,
+    'dpcm': _limit_dpcm,
+    'dpcm-attenzione': _attention_dpcm,
+}
+
+
+def e_field_limit(f_hz, standard: str = 'dpcm') -> np.ndarray:
+    """
+    Livello di riferimento del campo elettrico alla frequenza f_hz.
+
+    Args:
+        f_hz: Frequenza (Hz), scalare o array
+        standard: 'dpcm' (limiti di esposizione), 'dpcm-attenzione' o 'icnirp'
+
+    Returns:
+        Campo elettrico limite (V/m, valore efficace) con la forma di f_hz
+    """
+    try:
+        limit = EXPOSURE_STANDARDS[standard]
+    except KeyError:
+        raise ValueError(f"Norma sconosciuta: {standard!r} "
+                         f"(disponibili: {', '.join(EXPOSURE_STANDARDS)})") from None
+    return limit(np.asarray(f_hz, dtype=float) / 1e6)
+
+
+def power_density_limit(f_hz, standard: str = 'dpcm') -> np.ndarray:
+    """Densita' di potenza equivalente al limite di campo, S = E^2 / Z0 (W/m^2)."""
+    return e_field_limit(f_hz, standard) ** 2 / Z0
+
+
+def e_field(power_density) -> np.ndarray:
+    """Campo elettrico efficace in campo lontano da una densita' di potenza (V/m)."""
+    return np.sqrt(Z0 * np.asarray(power_density, dtype=float))
+
+
+def vertical_pattern(elevation_rad, beamwidth_deg=np.inf) -> np.ndarray:
+    """
+    Diagramma di radiazione relativo (potenza) nel piano verticale.
+
+    Modello cos(el)^n con n scelto per ottenere l'apertura a -3 dB richiesta;
+    beamwidth_deg = inf restituisce un diagramma isotropo. Un dipolo a mezz'onda
+    verticale ha circa 78 gradi.
+
+    Args:
+        elevation_rad: Angolo di elevazione rispetto all'orizzonte (rad)
+        beamwidth_deg: Apertura a meta' potenza nel piano verticale (gradi)
+
+    Returns:
+        Guadagno relativo fra 0 e 1
+    """
+    half = np.radians(np.minimum(np.asarray(beamwidth_deg, dtype=float), 179.0)) / 2
+    n = np.where(np.isfinite(beamwidth_deg), np.log(0.5) / np.log(np.cos(half)), 0.0)
+    return np.abs(np.cos(elevation_rad)) ** n
+
+
+@dataclass(frozen=True)
+class Station:
+    """Configurazione di stazione: trasmettitore e antenna."""
+
+    name: str
+    f_hz: float
+    power_w: float
+    gain_dbi: float = 2.15
+    height_m: float = 10.0
+    beamwidth_deg: float = 78.0
+    duty_cycle: float = 1.0
+
+
+def stations_to_arrays(stations: Sequence[Station]) -> Tuple[np.ndarray, ...]:
+    """
+    Converte una lista di Station in array (K,).
+
+    Returns:
+        Tupla (f_hz, power_w, gain_dbi, height_m, beamwidth_deg, duty_cycle)
+    """
+    fields = ('f_hz', 'power_w', 'gain_dbi', 'height_m', 'beamwidth_deg', 'duty_cycle')
+    return tuple(np.array([getattr(s, f) for s in stations], dtype=float) for f in fields)
+
+
+def power_density(
+    x, y, z,
+    power_w,
+    gain_dbi=2.15,
+    height_m=10.0,
+    beamwidth_deg=78.0,
+    duty_cycle=1.0,
+    reflection_factor: float = GROUND_REFLECTION
+) -> np.ndarray:
+    """
+    Densita' di potenza media nei punti (x, y, z), antenna in (0, 0, height_m).
+
+    Tutti gli argomenti vengono combinati per broadcasting: ad esempio parametri
+    di stazione di forma (K, 1, 1) e una griglia (1, Nz, Nx) danno K mappe.
+
+    Args:
+        x, y, z: Coordinate dei punti (m), z = altezza dal suolo
+        power_w: Potenza al connettore d'antenna (W, PEP)
+        gain_dbi: Guadagno massimo dell'antenna (dBi)
+        height_m: Altezza dell'antenna (m)
+        beamwidth_deg: Apertura verticale a -3 dB (gradi, inf = isotropa)
+        duty_cycle: Fattore di utilizzo (vedi MODE_DUTY)
+        reflection_factor: Fattore di riflessione del suolo sul campo
+
+    Returns:
+        Densita' di potenza (W/m^2)
+    """
+    horizontal = np.hypot(x, y)
+    dz = np.asarray(z, dtype=float) - height_m
+    r2 = horizontal ** 2 + dz ** 2
+    gain = 10.0 ** (np.asarray(gain_dbi, dtype=float) / 10.0)
+    pattern = vertical_pattern(np.arctan2(dz, horizontal), beamwidth_deg)
+    eirp = np.asarray(power_w, dtype=float) * gain * duty_cycle
+    with np.errstate(divide='ignore'):
+        return eirp * pattern * reflection_factor ** 2 / (4 * np.pi * r2)
+
+
+def compliance_distance(
+    f_hz,
+    power_w,
+    gain_dbi=2.15,
+    duty_cycle=1.0,
+    reflection_factor: float = GROUND_REFLECTION,
+    standard: str = 'dpcm'
+) -> np.ndarray:
+    """
+    Distanza di rispetto nella direzione di massima irradiazione.
+
+    r = sqrt(P * G * d * Gamma^2 / (4 pi S_lim)), valutata per broadcasting su
+    interi lotti di configurazioni (bande x potenze x antenne, ...).
+
+    Args:
+        f_hz: Frequenza (Hz)
+        power_w: Potenza (W, PEP)
+        gain_dbi: Guadagno d'antenna (dBi)
+        duty_cycle: Fattore di utilizzo
+        reflection_factor: Fattore di riflessione del suolo sul campo
+        standard: Norma di riferimento (vedi e_field_limit)
+
+    Returns:
+        Distanza (m)
+    """
+    gain = 10.0 ** (np.asarray(gain_dbi, dtype=float) / 10.0)
+    eirp = np.asarray(power_w, dtype=float) * gain * duty_cycle * reflection_factor ** 2
+    return np.sqrt(eirp / (4 * np.pi * power_density_limit(f_hz, standard)))
+
+
+def exposure_maps(
+    stations: Sequence[Station],
+    x, z,
+    reflection_factor: float = GROUND_REFLECTION,
+    standard: str = 'dpcm'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mappe di campo elettrico in un piano verticale per piu' stazioni insieme.
+
+    Args:
+        stations: Configurazioni di stazione (K)
+        x: Distanze orizzontali dall'antenna (m), array 1D (Nx)
+        z: Altezze dal suolo (m), array 1D (Nz)
+        reflection_factor: Fattore di riflessione del suolo sul campo
+        standard: Norma usata per il rapporto con il limite
+
+    Returns:
+        Tupla (campo E in V/m, rapporto E / E_limite), entrambi di forma (K, Nz, Nx)
+    """
+    f, p, g, h, bw, d = (a[:, None, None] for a in stations_to_arrays(stations))
+    s = power_density(np.asarray(x)[None, None, :], 0.0, np.asarray(z)[None, :, None],
+                      p, g, h, bw, d, reflection_factor)
+    e = e_field(s)
+    return e, e / e_field_limit(f, standard)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Zone tempo-corrente IEC 60479-1 (corrente alternata 50/60 Hz).
+
+Le curve limite a, b, c1, c2, c3 sono date per punti e interpolate in scala
+log-log; fuori dall'intervallo tabellato restano costanti. Il classificatore
+assegna una zona (AC-1 ... AC-4.3) a interi array di coppie
+(corrente, durata) con un confronto vettoriale contro tutte le curve, cosi' la
+stessa fonte serve per la figura, gli esercizi e i calcolatori.
+
+Valori semplificati a scopo didattico.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Curve:
+    """Curva limite I(t) definita per punti (t in ms, I in mA)."""
+
+    name: str
+    t_ms: Tuple[float, ...]
+    i_ma: Tuple[float, ...]
+    label: str = ''
+
+    def __call__(self, t_ms) -> np.ndarray:
+        """Corrente limite (mA) alle durate t_ms, interpolata in log-log."""
+        log_t = np.log10(np.asarray(t_ms, dtype=float))
+        return 10.0 ** np.interp(log_t, np.log10(self.t_ms), np.log10(self.i_ma))
+
+
+# Curve in ordine crescente di corrente: ogni zona sta fra due curve consecutive
+CURVES = (
+    Curve('a', (10, 10000), (0.5, 0.5), 'Soglia percezione'),
+    Curve('b', (10, 10000), (10, 10), 'Soglia "let-go"'),
+    Curve('c1', (10, 30, 100, 300, 1000, 3000, 10000), (500, 300, 150, 90, 50, 35, 30),
+          'c1: Fibrillazione 0%'),
+    Curve('c2', (10, 30, 100, 300, 1000, 3000, 10000), (1000, 500, 250, 130, 80, 50, 40),
+          'c2: Fibrillazione 5%'),
+    Curve('c3', (10, 30, 100, 300, 1000, 3000, 10000), (2000, 1000, 500, 250, 150, 80, 60),
+          'c3: Fibrillazione 50%'),
+)
+
+ZONES = ('AC-1', 'AC-2', 'AC-3', 'AC-4.1', 'AC-4.2', 'AC-4.3')
+
+ZONE_DESCRIPTIONS = {
+    'AC-1': 'Percezione possibile, nessuna reazione',
+    'AC-2': 'Percezione e contrazioni involontarie, nessun effetto pericoloso',
+    'AC-3': 'Contrazioni muscolari forti, effetti reversibili',
+    'AC-4.1': 'Fibrillazione ventricolare fino al 5%',
+    'AC-4.2': 'Fibrillazione ventricolare fino al 50%',
+    'AC-4.3': 'Fibrillazione ventricolare oltre il 50%',
+}
+
+
+def curve(name: str) -> Curve:
+    """Curva limite con il nome indicato ('a', 'b', 'c1', 'c2', 'c3')."""
+    for c in CURVES:
+        if c.name == name:
+            return c
+    raise ValueError(f"Curva sconosciuta: {name!r}")
+
+
+def boundaries(t_ms) -> np.ndarray:
+    """
+    Correnti limite di tutte le curve alle durate indicate.
+
+    Args:
+        t_ms: Durate (ms), array di forma qualsiasi
+
+    Returns:
+        Array di forma t_ms.shape + (len(CURVES),) in mA
+    """
+    return np.stack([c(t_ms) for c in CURVES], axis=-1)
+
+
+def classify(current_ma, duration_ms) -> np.ndarray:
+    """
+    Indice della zona in ZONES per ogni coppia (corrente, durata).
+
+    Una coppia che cade esattamente su una curva appartiene alla zona superiore.
+
+    Args:
+        current_ma: Corrente attraverso il corpo (mA)
+        duration_ms: Durata del passaggio di corrente (ms)
+
+    Returns:
+        Array di interi 0..len(ZONES)-1 con la forma del broadcasting degli ingressi
+
+    Example:
+        >>> [ZONES[z] for z in classify([0.2, 5, 30, 300], 1000)]
+        ['AC-1', 'AC-2', 'AC-3', 'AC-4.3']
+    """
+    current = np.asarray(current_ma, dtype=float)
+    current, duration = np.broadcast_arrays(current, np.asarray(duration_ms, dtype=float))
+    return np.sum(current[..., None] >= boundaries(duration), axis=-1)
+
+
+def zone_of(current_ma, duration_ms) -> np.ndarray:
+    """Nome della zona (ad es. 'AC-3') per ogni coppia (corrente, durata)."""
+    return np.array(ZONES, dtype=object)[classify(current_ma, duration_ms)]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Calcolo dei prodotti di intermodulazione fra N portanti.
+
+Enumera tutti i prodotti |sum(k_i * f_i)| con sum(|k_i|) <= ordine, li
+deduplica e li ordina con NumPy e segnala quelli che cadono in allocazioni
+radioamatoriali o di radiodiffusione.
+
+L'enumerazione procede per ordine crescente: i prodotti di ordine k sono i
+prodotti di ordine k-1 piu' o meno una portante, deduplicati a ogni passo.
+Per ogni frequenza si conserva la combinazione di ordine minimo (quella piu'
+forte), cosi' anche decine di portanti restano gestibili senza cicli Python
+sulle combinazioni.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from calcoli.allocazioni import ALLOCATIONS, ALLOCATION_INDEX, Allocation
+from calcoli.intervalli import IntervalIndex
+
+
+@dataclass(frozen=True)
+class IntermodProducts:
+    """Prodotti di intermodulazione ordinati per frequenza."""
+
+    carriers: np.ndarray      # (N,) Hz
+    freqs: np.ndarray         # (M,) Hz, ordinate
+    order: np.ndarray         # (M,) ordine sum(|k_i|)
+    coeffs: np.ndarray        # (M, N) coefficienti k_i
+
+    def __len__(self) -> int:
+        return len(self.freqs)
+
+    def select(self, mask: np.ndarray) -> 'IntermodProducts':
+        """Restituisce il sottoinsieme dei prodotti indicati da mask."""
+        return IntermodProducts(self.carriers, self.freqs[mask], self.order[mask], self.coeffs[mask])
+
+    @property
+    def odd_inband(self) -> np.ndarray:
+        """True per i prodotti dispari con |sum(k_i)| = 1, che cadono vicino alle portanti."""
+        return np.abs(self.coeffs.sum(axis=1)) == 1
+
+    @property
+    def oriented_coeffs(self) -> np.ndarray:
+        """Coefficienti con segno scelto in modo che sum(k_i) >= 0."""
+        flip = np.where(self.coeffs.sum(axis=1) < 0, -1, 1).astype(self.coeffs.dtype)
+        return self.coeffs * flip[:, None]
+
+    @property
+    def signed_freqs(self) -> np.ndarray:
+        """sum(k_i * f_i) con i coefficienti orientati: scostamento con segno dei prodotti in banda."""
+        return self.oriented_coeffs @ self.carriers
+
+    def labels(self, names: Optional[Sequence[str]] = None) -> list:
+        """
+        Etichette leggibili dei prodotti, ad es. '2f1-f2'.
+
+        Args:
+            names: Nomi delle portanti (default f1, f2, ...)
+
+        Returns:
+            Lista di stringhe, una per prodotto
+        """
+        return [product_label(k, names) for k in self.oriented_coeffs]
+
+
+def product_label(coeffs: Sequence[int], names: Optional[Sequence[str]] = None) -> str:
+    """
+    Formatta una combinazione di coefficienti come '2f1-f2' (termini positivi per primi).
+
+    Args:
+        coeffs: Coefficienti k_i
+        names: Nomi delle portanti (default f1, f2, ...)
+
+    Returns:
+        Stringa della combinazione
+    """
+    if names is None:
+        names = [f'f{i + 1}' for i in range(len(coeffs))]
+    terms = sorted(((k, name) for k, name in zip(coeffs, names) if k != 0),
+                   key=lambda term: term[0] < 0)
+    text = ''
+    for k, name in terms:
+        sign = '-' if k < 0 else '+'
+        mag = '' if abs(k) == 1 else str(abs(k))
+        text += f'{sign}{mag}{name}'
+    return text.lstrip('+')
+
+
+def intermod_products(
+    carriers: Sequence[float],
+    max_order: int = 3,
+    resolution: float = 1.0,
+    f_max: Optional[float] = None,
+    include_carriers: bool = False
+) -> IntermodProducts:
+    """
+    Enumera i prodotti di intermodulazione fino a max_order.
+
+    Args:
+        carriers: Frequenze delle portanti (Hz)
+        max_order: Ordine massimo sum(|k_i|)
+        resolution: Risoluzione in Hz per considerare uguali due prodotti
+        f_max: Frequenza massima di interesse (Hz); i prodotti intermedi che non
+            possono piu' rientrare sotto f_max vengono scartati subito
+        include_carriers: Se True mantiene anche le portanti (ordine 1)
+
+    Returns:
+        IntermodProducts ordinati per frequenza (esclusa la continua)
+    """
+    f = np.asarray(carriers, dtype=float)
+    n = len(f)
+    if n == 0 or max_order < 1:
+        raise ValueError("Servono almeno una portante e max_order >= 1")
+
+    steps = np.concatenate([f, -f])                                   # (2N,)
+    step_coeffs = np.concatenate([np.eye(n, dtype=np.int16), -np.eye(n, dtype=np.int16)])
+
+    values = f.copy()
+    coeffs = np.eye(n, dtype=np.int16)
+    orders = np.ones(n, dtype=np.int16)
+    known = np.unique(np.round(values / resolution))
+    frontier_v, frontier_c = values, coeffs
+
+    for order in range(2, max_order + 1):
+        cand_v = (frontier_v[:, None] + steps[None, :]).ravel()
+        cand_c = (frontier_c[:, None, :] + step_coeffs[None, :, :]).reshape(-1, n)
+
+        # Solo frequenze positive: |v| con coefficienti negati dove serve
+        neg = cand_v < 0
+        cand_v = np.abs(cand_v)
+        cand_c[neg] = -cand_c[neg]
+
+        keep = cand_v >= resolution / 2
+        if f_max is not None:
+            keep &= cand_v <= f_max + (max_order - order) * f.max()
+        cand_v, cand_c = cand_v[keep], cand_c[keep]
+
+        # Deduplica e scarta i valori gia' ottenuti con ordine inferiore
+        keys, first = np.unique(np.round(cand_v / resolution), return_index=True)
+        new = ~np.isin(keys, known, assume_unique=True)
+        first = first[new]
+        frontier_v, frontier_c = cand_v[first], cand_c[first]
+        known = np.union1d(known, keys[new])
+
+        values = np.concatenate([values, frontier_v])
+        coeffs = np.concatenate([coeffs, frontier_c])
+        orders = np.concatenate([orders, np.full(len(frontier_v), order, dtype=np.int16)])
+
+    keep = np.ones(len(values), dtype=bool) if include_carriers else orders > 1
+    if f_max is not None:
+        keep &= values <= f_max
+    idx = np.flatnonzero(keep)
+    idx = idx[np.argsort(values[idx], kind='stable')]
+    return IntermodProducts(f, values[idx], orders[idx], coeffs[idx])
+
+
+def allocation_hits(
+    products: IntermodProducts,
+    allocations: Sequence[Allocation] = ALLOCATIONS,
+    index: IntervalIndex = ALLOCATION_INDEX,
+    service: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Prodotti che cadono dentro allocazioni della tabella.
+
+    Args:
+        products: Prodotti di intermodulazione
+        allocations: Tabella di allocazioni
+        index: IntervalIndex della tabella
+        service: Se indicato, considera solo le allocazioni di quel servizio
+
+    Returns:
+        Tupla (indici prodotti, indici allocazioni) delle coppie colpite
+    """
+    prod_idx, alloc_idx = index.pairs(products.freqs)
+    if service is not None:
+        services = np.array([a.service for a in allocations])
+        mask = services[alloc_idx] == service
+        prod_idx, alloc_idx = prod_idx[mask], alloc_idx[mask]
+    return prod_idx, alloc_idx
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Indice di intervalli di frequenza ordinato, per ricerche vettoriali.
+
+Gli intervalli (anche sovrapposti) vengono scomposti in segmenti elementari
+delimitati dagli estremi ordinati; ogni segmento conosce gli intervalli che lo
+coprono. Una ricerca e' quindi un np.searchsorted (O(log n)) seguito da una
+lettura di tabella, e si applica a interi array di frequenze in una volta.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    Indice di intervalli chiusi [start, end].
+
+    Args:
+        starts: Estremi inferiori degli intervalli
+        ends: Estremi superiori degli intervalli (>= starts)
+
+    Example:
+        >>> index = IntervalIndex([7.0e6, 7.1e6], [7.2e6, 7.3e6])
+        >>> index.first([7.15e6, 8e6])
+        array([ 0, -1])
+    """
+
+    def __init__(self, starts: Sequence[float], ends: Sequence[float]):
+        self.starts = np.asarray(starts, dtype=float)
+        self.ends = np.asarray(ends, dtype=float)
+        if self.starts.shape != self.ends.shape or self.starts.ndim != 1:
+            raise ValueError("starts ed ends devono essere array 1D della stessa lunghezza")
+        if len(self.starts) == 0:
+            raise ValueError("L'indice richiede almeno un intervallo")
+        if np.any(self.ends < self.starts):
+            raise ValueError("Ogni intervallo deve avere end >= start")
+
+        # Estremi ordinati: il segmento i copre [edges[i], edges[i+1]]
+        self.edges = np.unique(np.concatenate([self.starts, self.ends]))
+        seg_lo = self.edges[:-1, None]
+        seg_hi = self.edges[1:, None]
+        self._cover = (self.starts <= seg_lo) & (self.ends >= seg_hi)       # (segmenti, intervalli)
+        # Gli estremi stessi appartengono a tutti gli intervalli che li contengono
+        self._edge_cover = (self.starts <= self.edges[:, None]) & (self.ends >= self.edges[:, None])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def contains(self, freqs) -> np.ndarray:
+        """
+        Matrice di appartenenza frequenza-intervallo.
+
+        Args:
+            freqs: Frequenze da cercare (array di forma qualsiasi)
+
+        Returns:
+            Array booleano di forma freqs.shape + (n_intervalli,)
+        """
+        freqs = np.asarray(freqs, dtype=float)
+        result = np.zeros(freqs.shape + (len(self),), dtype=bool)
+        n_seg = len(self.edges) - 1
+        pos = np.searchsorted(self.edges, freqs, side='right') - 1
+        on_edge = (pos >= 0) & (self.edges[np.clip(pos, 0, None)] == freqs)
+        inside = (pos >= 0) & (pos < n_seg)
+
+        result[inside] = self._cover[pos[inside]]
+        result[on_edge] = self._edge_cover[pos[on_edge]]
+        return result
+
+    def first(self, freqs) -> np.ndarray:
+        """
+        Indice del primo intervallo che contiene ogni frequenza (-1 se nessuno).
+
+        Args:
+            freqs: Frequenze da cercare
+
+        Returns:
+            Array di indici interi con la forma di freqs
+        """
+        hits = self.contains(freqs)
+        return np.where(hits.any(axis=-1), hits.argmax(axis=-1), -1)
+
+    def pairs(self, freqs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tutte le coppie (indice frequenza, indice intervallo) con appartenenza.
+
+        Args:
+            freqs: Array 1D di frequenze
+
+        Returns:
+            Tupla (indici frequenze, indici intervalli)
+        """
+        return np.nonzero(self.contains(np.ravel(freqs)))
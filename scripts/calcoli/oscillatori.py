@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Oscillatori LC e a quarzo: frequenza, reazione e avviamento.
+
+Colpitts, Hartley, Clapp e Pierce (quarzo) sono descritti come un
+amplificatore chiuso su una rete a Pi (elemento verso massa in uscita,
+elemento serie, elemento verso massa in ingresso): la frequenza e' quella di
+risonanza dell'anello, il rapporto di reazione beta e' la frazione della
+tensione d'uscita riportata all'ingresso e l'amplificatore deve avere
+guadagno almeno 1/beta (criterio di Barkhausen). Tutti i calcolatori sono
+vettoriali sui valori dei componenti.
+
+start_up simula nel tempo un circuito risonante parallelo con un elemento
+attivo a conduttanza negativa che satura (tanh): l'ampiezza cresce
+esponenzialmente finche' la saturazione riduce il guadagno d'anello a 1.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from calcoli.quarzo import Crystal
+
+
+@dataclass(frozen=True)
+class Oscillator:
+    """Risultato di un calcolatore: array con la forma del broadcasting dei componenti."""
+
+    kind: str
+    f_hz: np.ndarray            # frequenza di oscillazione (Hz)
+    feedback: np.ndarray        # beta, tensione riportata all'ingresso / tensione d'uscita
+    l_eff: np.ndarray           # induttanza equivalente dell'anello (H)
+    c_eff: np.ndarray           # capacita' equivalente dell'anello (F)
+
+    @property
+    def gain_min(self) -> np.ndarray:
+        """Guadagno minimo dell'amplificatore per l'innesco (1 / beta)."""
+        return 1 / self.feedback
+
+
+def _series(*c) -> np.ndarray:
+    """Capacita' in serie."""
+    return 1 / sum(1 / np.asarray(x, dtype=float) for x in c)
+
+
+def _f0(l, c) -> np.ndarray:
+    return 1 / (2 * np.pi * np.sqrt(l * c))
+
+
+def colpitts(l, c1, c2, c_stray=0.0) -> Oscillator:
+    """
+    Colpitts: partitore capacitivo C1 (uscita) - C2 (ingresso), L in serie.
+
+    Args:
+        l: Induttanza (H)
+        c1: Capacita' lato uscita (F)
+        c2: Capacita' lato ingresso (F)
+        c_stray: Capacita' parassita del transistor, in parallelo a C1 e C2 (F)
+
+    Returns:
+        Oscillator con beta = C1 / C2
+
+    Example:
+        >>> o = colpitts(2.2e-6, 470e-12, 470e-12)
+        >>> round(float(o.f_hz) / 1e6, 2), float(o.gain_min)
+        (7.0, 1.0)
+    """
+    l = np.asarray(l, dtype=float)
+    c1 = np.asarray(c1, dtype=float) + c_stray
+    c2 = np.asarray(c2, dtype=float) + c_stray
+    c = _series(c1, c2)
+    return Oscillator('colpitts', _f0(l, c), c1 / c2, l + 0 * c, c)
+
+
+def hartley(l1, l2, c, m=0.0) -> Oscillator:
+    """
+    Hartley: induttore con presa L1 (uscita) - L2 (ingresso), C in serie.
+
+    Args:
+        l1: Induttanza lato uscita (H)
+        l2: Induttanza lato ingresso (H)
+        c: Capacita' di accordo (F)
+        m: Mutua induttanza fra le due sezioni (H)
+
+    Returns:
+        Oscillator con beta = (L2 + M) / (L1 + M)
+    """
+    l1, l2, c, m = (np.asarray(x, dtype=float) for x in (l1, l2, c, m))
+    l = l1 + l2 + 2 * m
+    return Oscillator('hartley', _f0(l, c), (l2 + m) / (l1 + m), l, c + 0 * l)
+
+
+def clapp(l, c1, c2, c3, c_stray=0.0) -> Oscillator:
+    """
+    Clapp: Colpitts con C3 in serie a L.
+
+    Con C3 molto minore di C1 e C2 la frequenza dipende quasi solo da L e C3,
+    e le capacita' del transistor (c_stray) la spostano molto meno.
+
+    Args:
+        l: Induttanza (H)
+        c1, c2: Partitore capacitivo lato uscita e lato ingresso (F)
+        c3: Capacita' in serie all'induttore (F)
+        c_stray: Capacita' parassita in parallelo a C1 e C2 (F)
+
+    Returns:
+        Oscillator con beta = C1 / C2
+    """
+    l = np.asarray(l, dtype=float)
+    c1 = np.asarray(c1, dtype=float) + c_stray
+    c2 = np.asarray(c2, dtype=float) + c_stray
+    c = _series(c1, c2, c3)
+    return Oscillator('clapp', _f0(l, c), c1 / c2, l + 0 * c, c)
+
+
+def pierce(xtal: Crystal, c1, c2, c_stray=0.0) -> Oscillator:
+    """
+    Pierce: il quarzo prende il posto dell'induttore di un Colpitts.
+
+    La capacita' di carico vista dal quarzo e' C1 C2 / (C1 + C2) + c_stray e
+    la frequenza e' la sua load_frequency, poco sopra la risonanza serie.
+
+    Args:
+        xtal: Quarzo
+        c1, c2: Condensatori lato uscita e lato ingresso (F)
+        c_stray: Capacita' parassita in parallelo al quarzo (F)
+
+    Returns:
+        Oscillator con beta = C1 / C2
+    """
+    c1, c2 = (np.asarray(x, dtype=float) for x in (c1, c2))
+    c_load = _series(c1, c2) + c_stray
+    c_eff = _series(xtal.c_m, xtal.c_0 + c_load)
+    return Oscillator('pierce', xtal.load_frequency(c_load), c1 / c2,
+                      xtal.l_m + 0 * c_eff, c_eff)
+
+
+def pulling_range(xtal: Crystal, c_load_min, c_load_max):
+    """
+    Escursione di frequenza ottenibile variando la capacita' di carico.
+
+    Returns:
+        Tupla (scostamento minimo, massimo) in ppm rispetto a f_s
+    """
+    f_s = xtal.f_series
+    return ((xtal.load_frequency(c_load_max) / f_s - 1) * 1e6,
+            (xtal.load_frequency(c_load_min) / f_s - 1) * 1e6)
+
+
+@dataclass(frozen=True)
+class StartUp:
+    """Transitorio di avviamento: v di forma (..., T)."""
+
+    t: np.ndarray               # s
+    v: np.ndarray               # V, tensione sul circuito risonante
+    steps_per_period: int
+
+    @property
+    def envelope(self) -> np.ndarray:
+        """Ampiezza di picco in ogni periodo nominale, forma (..., n_periods)."""
+        n = self.v.shape[-1] // self.steps_per_period * self.steps_per_period
+        blocks = self.v[..., :n].reshape(self.v.shape[:-1] + (-1, self.steps_per_period))
+        return np.abs(blocks).max(axis=-1)
+
+    @property
+    def amplitude(self) -> np.ndarray:
+        """Ampiezza a regime (media dell'inviluppo sull'ultimo decimo della simulazione)."""
+        env = self.envelope
+        return env[..., -max(env.shape[-1] // 10, 1):].mean(axis=-1)
+
+    def frequency(self, last_periods: int = 10) -> np.ndarray:
+        """Frequenza misurata dagli attraversamenti dello zero negli ultimi periodi (Hz)."""
+        dt = self.t[1] - self.t[0]
+        v = self.v[..., -last_periods * self.steps_per_period:]
+        up = (v[..., :-1] < 0) & (v[..., 1:] >= 0)
+        # Istante interpolato di ogni attraversamento in salita
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frac = v[..., :-1] / (v[..., :-1] - v[..., 1:])
+        idx = np.arange(v.shape[-1] - 1)
+        times = np.where(up, (idx + frac) * dt, np.nan)
+        first = np.nanmin(times, axis=-1)
+        last = np.nanmax(times, axis=-1)
+        return (up.sum(axis=-1) - 1) / (last - first)
+
+
+def start_up(
+    l,
+    c,
+    r_tank,
+    loop_gain,
+    v_limit=1.0,
+    v0=1e-4,
+    n_periods: int = 200,
+    steps_per_period: int = 40
+) -> StartUp:
+    """
+    Avviamento di un oscillatore: circuito risonante parallelo R, L, C con
+    elemento attivo i = (G / R) V_lim tanh(v / V_lim).
+
+    Per v piccola l'elemento e' una conduttanza negativa G volte quella
+    delle perdite: l'ampiezza cresce come exp((G - 1) t / (2 R C)). Per v
+    dell'ordine di V_lim la corrente satura e l'ampiezza si stabilizza dove
+    il guadagno medio sul periodo torna a 1. Integrazione Runge-Kutta 4 a
+    passo fisso, in parallelo su tutti i casi.
+
+    Args:
+        l, c: Induttanza (H) e capacita' (F) del circuito risonante
+        r_tank: Resistenza parallelo delle perdite (ohm), R = Q sqrt(L/C)
+        loop_gain: Guadagno d'anello a piccolo segnale G (> 1 per innescare)
+        v_limit: Tensione di saturazione dell'elemento attivo (V)
+        v0: Tensione iniziale (rumore che innesca l'oscillazione, V)
+        n_periods: Periodi nominali simulati
+        steps_per_period: Passi di integrazione per periodo
+
+    Returns:
+        StartUp con la tensione sul circuito risonante
+    """
+    l, c, r, g, v_lim, v0 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (l, c, r_tank, loop_gain, v_limit, v0)))
+    period = 2 * np.pi * np.sqrt(l * c)
+    if np.ptp(period) > 1e-9 * period.max():
+        raise ValueError("Tutti i casi devono avere la stessa frequenza di risonanza")
+    h = float(period.flat[0]) / steps_per_period
+    n_steps = n_periods * steps_per_period
+
+    def f(v, i_l):
+        i_active = g / r * v_lim * np.tanh(v / v_lim)
+        return (i_active - v / r - i_l) / c, v / l
+
+    v, i_l = v0.copy(), np.zeros_like(v0)
+    out = np.empty(v.shape + (n_steps + 1,))
+    out[..., 0] = v
+    for k in range(1, n_steps + 1):
+        k1v, k1i = f(v, i_l)
+        k2v, k2i = f(v + h / 2 * k1v, i_l + h / 2 * k1i)
+        k3v, k3i = f(v + h / 2 * k2v, i_l + h / 2 * k2i)
+        k4v, k4i = f(v + h * k3v, i_l + h * k3i)
+        v = v + h / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+        i_l = i_l + h / 6 * (k1i + 2 * k2i + 2 * k3i + k4i)
+        out[..., k] = v
+    return StartUp(np.arange(n_steps + 1) * h, out, steps_per_period)
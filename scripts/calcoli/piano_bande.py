@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Piano delle bande radioamatoriali (IARU Regione 1 / Italia, classe A).
+
+Unica fonte dei dati usati dalle figure dei piani di frequenza e dalle
+verifiche di interferenza: bande con stato (primario/secondario) e potenza
+massima, segmenti per modo di emissione e frequenze standard dei modi
+digitali.
+
+La classe BandPlan tiene i dati in array NumPy con due IntervalIndex (bande e
+segmenti), cosi' la domanda "cosa e' permesso a questa frequenza, con questo
+modo e questa potenza?" si risolve con un searchsorted anche su interi array
+di frequenze, ad esempio per validare un log di stazione.
+
+I dati sono semplificati a scopo didattico: fa sempre fede il piano IARU
+aggiornato e la normativa nazionale.
+"""
+
+from dataclasses import dataclass
+from typing import NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from calcoli.intervalli import IntervalIndex
+
+
+# Stato dell'allocazione
+PRIMARY = 'primario'
+SECONDARY = 'secondario'
+
+# Tipi di segmento (e modi di emissione interrogabili)
+MODES = ('CW', 'Digi', 'SSB', 'FM', 'Beacon', 'Satellite', 'EME')
+
+# Emissioni ammesse in ogni tipo di segmento
+SEGMENT_EMISSIONS = {
+    'CW': ('CW',),
+    'Digi': ('CW', 'Digi'),
+    'SSB': ('CW', 'Digi', 'SSB'),
+    'FM': ('Digi', 'FM'),
+    'Beacon': ('Beacon',),
+    'Satellite': ('Satellite',),
+    'EME': ('CW', 'EME'),
+}
+
+
+@dataclass(frozen=True)
+class Band:
+    """Una banda radioamatoriale [f_min, f_max] in Hz."""
+
+    name: str
+    f_min: float
+    f_max: float
+    status: str
+    max_power_w: float
+    nickname: str = ''
+    notes: str = ''
+    eirp: bool = False            # potenza massima espressa come EIRP
+    channelized: bool = False     # uso solo su canali prefissati
+
+
+class Segment(NamedTuple):
+    """Segmento del piano di banda riservato a un modo, in Hz."""
+
+    band: str
+    f_min: float
+    f_max: float
+    mode: str
+    label: str = ''
+
+
+class Channel(NamedTuple):
+    """Frequenza (o intervallo) standard di un modo digitale o di un servizio, in Hz."""
+
+    band: str
+    mode: str
+    f_min: float
+    f_max: float
+
+
+BANDS = (
+    Band('160m', 1.810e6, 2.000e6, SECONDARY, 500, 'Top Band', 'Condivisa con altri servizi'),
+    Band('80m', 3.500e6, 3.800e6, PRIMARY, 500, 'Notte', 'Uso esclusivo radioamatori'),
+    Band('60m', 5.3515e6, 5.3665e6, SECONDARY, 15, 'Canalizzato', 'Canalizzato, 5 canali',
+         eirp=True, channelized=True),
+    Band('40m', 7.000e6, 7.200e6, PRIMARY, 500, 'DX 24h', 'Banda primaria mondiale'),
+    Band('30m', 10.100e6, 10.150e6, SECONDARY, 500, 'WARC', 'Solo CW e Digi, no fonia'),
+    Band('20m', 14.000e6, 14.350e6, PRIMARY, 500, 'DX principale', 'Banda DX principale'),
+    Band('17m', 18.068e6, 18.168e6, PRIMARY, 500, 'WARC', 'Banda WARC'),
+    Band('15m', 21.000e6, 21.450e6, PRIMARY, 500, 'Ciclo solare', 'Ottima per DX diurno'),
+    Band('12m', 24.890e6, 24.990e6, PRIMARY, 500, 'WARC', 'Banda WARC'),
+    Band('10m', 28.000e6, 29.700e6, PRIMARY, 500, 'Sporadica', 'Propagazione sporadica'),
+    Band('6m', 50.0e6, 52.0e6, SECONDARY, 500, 'Magic Band', '"Magic Band" - sporadic-E'),
+    Band('2m', 144.0e6, 146.0e6, PRIMARY, 500, 'VHF', 'VHF principale'),
+    Band('70cm', 430.0e6, 440.0e6, SECONDARY, 500, 'UHF', 'Condivisa, ISM'),
+    Band('23cm', 1240.0e6, 1300.0e6, SECONDARY, 500, 'SHF', 'Condivisa GNSS'),
+)
+
+
+def _segments(band: str, rows: Sequence[tuple]) -> Tuple[Segment, ...]:
+    """Converte righe (f_min MHz, f_max MHz, modo[, etichetta]) in Segment."""
+    return tuple(Segment(band, lo * 1e6, hi * 1e6, *rest) for lo, hi, *rest in rows)
+
+
+SEGMENTS = (
+    _segments('160m', [
+        (1.810, 1.838, 'CW', 'CW/QRP'),
+        (1.838, 1.843, 'Digi', 'Digi'),
+        (1.843, 2.000, 'SSB', 'Fonia'),
+    ])
+    + _segments('80m', [
+        (3.500, 3.570, 'CW', 'CW'),
+        (3.570, 3.600, 'Digi', 'Digi'),
+        (3.600, 3.650, 'SSB', 'Contest'),
+        (3.650, 3.700, 'SSB', 'Fonia'),
+        (3.700, 3.800, 'SSB', 'DX/Fonia'),
+    ])
+    + _segments('60m', [
+        (5.3515, 5.3665, 'SSB', '5 canali'),
+    ])
+    + _segments('40m', [
+        (7.000, 7.040, 'CW', 'CW/DX'),
+        (7.040, 7.060, 'Digi', 'Digi'),
+        (7.060, 7.100, 'SSB', 'Contest'),
+        (7.100, 7.200, 'SSB', 'Fonia'),
+    ])
+    + _segments('30m', [
+        (10.100, 10.130, 'CW', 'CW'),
+        (10.130, 10.150, 'Digi', 'Digi'),
+    ])
+    + _segments('20m', [
+        (14.000, 14.070, 'CW', 'CW/DX'),
+        (14.070, 14.099, 'Digi', 'Digi/FT8'),
+        (14.099, 14.101, 'Beacon', 'IBP'),
+        (14.101, 14.125, 'SSB', 'DX'),
+        (14.125, 14.300, 'SSB', 'Fonia'),
+        (14.300, 14.350, 'SSB', 'Emerg.'),
+    ])
+    + _segments('17m', [
+        (18.068, 18.095, 'CW', 'CW'),
+        (18.095, 18.109, 'Digi', 'Digi'),
+        (18.109, 18.111, 'Beacon', 'IBP'),
+        (18.111, 18.168, 'SSB', 'Fonia'),
+    ])
+    + _segments('15m', [
+        (21.000, 21.070, 'CW', 'CW/DX'),
+        (21.070, 21.149, 'Digi', 'Digi'),
+        (21.149, 21.151, 'Beacon', 'IBP'),
+        (21.151, 21.450, 'SSB', 'Fonia/DX'),
+    ])
+    + _segments('12m', [
+        (24.890, 24.915, 'CW', 'CW'),
+        (24.915, 24.929, 'Digi', 'Digi'),
+        (24.929, 24.931, 'Beacon', 'IBP'),
+        (24.931, 24.990, 'SSB', 'Fonia'),
+    ])
+    + _segments('10m', [
+        (28.000, 28.070, 'CW', 'CW'),
+        (28.070, 28.190, 'Digi', 'Digi'),
+        (28.190, 28.225, 'Beacon', 'IBP'),
+        (28.225, 28.300, 'SSB', 'DX'),
+        (28.300, 29.100, 'SSB', 'Fonia'),
+        (29.100, 29.200, 'FM', 'Simplex'),
+        (29.200, 29.700, 'FM', 'Ripetit.'),
+    ])
+    + _segments('6m', [
+        (50.000, 50.100, 'CW', 'CW'),
+        (50.100, 50.400, 'SSB', 'SSB/DX'),
+        (50.400, 50.500, 'Beacon', 'Beacon'),
+        (50.500, 51.400, 'Digi', 'Digi'),
+        (51.400, 52.000, 'FM', 'FM/Ripetit.'),
+    ])
+    + _segments('2m', [
+        (144.000, 144.025, 'EME'),
+        (144.025, 144.110, 'CW'),
+        (144.110, 144.150, 'SSB'),
+        (144.150, 144.180, 'CW'),
+        (144.180, 144.360, 'SSB'),
+        (144.360, 144.400, 'CW'),
+        (144.400, 144.490, 'Beacon'),
+        (144.490, 144.500, 'CW'),
+        (144.500, 144.800, 'FM'),
+        (144.800, 144.990, 'FM'),
+        (144.990, 145.194, 'Satellite'),
+        (145.194, 145.806, 'FM'),
+        (145.806, 146.000, 'Satellite'),
+    ])
+    + _segments('70cm', [
+        (430.000, 432.000, 'FM', 'Ripetitori/DV'),
+        (432.000, 432.025, 'EME'),
+        (432.025, 432.100, 'CW'),
+        (432.100, 432.400, 'SSB'),
+        (432.400, 432.500, 'Beacon'),
+        (432.500, 433.000, 'FM'),
+        (433.000, 433.400, 'FM'),
+        (433.400, 434.000, 'FM'),
+        (434.000, 435.000, 'Digi'),
+        (435.000, 438.000, 'Satellite'),
+        (438.000, 440.000, 'FM', 'Ripetitori'),
+    ])
+    + _segments('23cm', [
+        (1240.000, 1260.000, 'Digi'),
+        (1260.000, 1270.000, 'Satellite'),
+        (1270.000, 1290.000, 'FM'),
+        (1290.000, 1296.000, 'CW'),
+        (1296.000, 1296.150, 'EME'),
+        (1296.150, 1296.800, 'SSB'),
+        (1296.800, 1297.000, 'Beacon'),
+        (1297.000, 1298.000, 'FM'),
+        (1298.000, 1300.000, 'Digi'),
+    ])
+)
+
+
+def _channels(mode: str, rows: Sequence[tuple]) -> Tuple[Channel, ...]:
+    """Converte righe (banda, f MHz) o (banda, f_min MHz, f_max MHz) in Channel."""
+    return tuple(Channel(band, mode, lo * 1e6, (rest[0] if rest else lo) * 1e6)
+                 for band, lo, *rest in rows)
+
+
+# Frequenze standard dei modi digitali HF (per WSPR la frequenza di dial)
+DIGITAL_CHANNELS = (
+    _channels('FT8', [('160m', 1.840), ('80m', 3.573), ('60m', 5.357), ('40m', 7.074),
+                      ('30m', 10.136), ('20m', 14.074), ('17m', 18.100), ('15m', 21.074),
+                      ('12m', 24.915), ('10m', 28.074)])
+    + _channels('FT4', [('160m', 1.840), ('80m', 3.575), ('40m', 7.0475), ('30m', 10.140),
+                        ('20m', 14.080), ('17m', 18.104), ('15m', 21.140), ('12m', 24.919),
+                        ('10m', 28.180)])
+    + _channels('RTTY', [('160m', 1.838), ('80m', 3.580, 3.600), ('40m', 7.040, 7.050),
+                         ('30m', 10.130, 10.145), ('20m', 14.080, 14.099),
+                         ('17m', 18.100, 18.105), ('15m', 21.080, 21.120),
+                         ('12m', 24.920, 24.925), ('10m', 28.080, 28.150)])
+    + _channels('PSK31', [('160m', 1.838), ('80m', 3.580), ('40m', 7.040), ('30m', 10.142),
+                          ('20m', 14.070), ('17m', 18.100), ('15m', 21.070), ('12m', 24.920),
+                          ('10m', 28.120)])
+    + _channels('SSTV', [('80m', 3.730), ('40m', 7.171), ('20m', 14.230), ('17m', 18.163),
+                         ('15m', 21.340), ('12m', 24.975), ('10m', 28.680)])
+    + _channels('WSPR', [('160m', 1.8366), ('80m', 3.5686), ('40m', 7.0386), ('30m', 10.1387),
+                         ('20m', 14.0956), ('17m', 18.1046), ('15m', 21.0946),
+                         ('12m', 24.9246), ('10m', 28.1246)])
+    + _channels('MSK144', [('2m', 144.360)])
+)
+
+# Frequenze di riferimento per il traffico di emergenza
+EMERGENCY_CHANNELS = _channels('Emergenza', [('80m', 3.760), ('40m', 7.110), ('20m', 14.300),
+                                             ('2m', 145.500)])
+
+
+def format_mhz(f_hz: float, decimals: int = 3) -> str:
+    """
+    Frequenza in MHz come testo: almeno `decimals` cifre, una in piu' se serve.
+
+    Example:
+        >>> format_mhz(14.074e6), format_mhz(5.3515e6)
+        ('14.074', '5.3515')
+    """
+    text = f'{f_hz / 1e6:.{decimals + 1}f}'
+    return text[:-1] if text.endswith('0') else text
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    """Esito della verifica di un array di frequenze contro il piano di banda."""
+
+    band: np.ndarray          # indice della banda (-1 = fuori banda)
+    segment: np.ndarray       # indice del segmento (-1 = nessun segmento)
+    mode_ok: np.ndarray       # modo ammesso nel segmento
+    power_ok: np.ndarray      # potenza entro il limite della banda
+
+    @property
+    def in_band(self) -> np.ndarray:
+        """True per le frequenze dentro una banda radioamatoriale."""
+        return self.band >= 0
+
+    @property
+    def allowed(self) -> np.ndarray:
+        """True dove frequenza, modo e potenza sono tutti ammessi."""
+        return self.in_band & self.mode_ok & self.power_ok
+
+
+class BandPlan:
+    """
+    Piano di banda interrogabile in forma vettoriale.
+
+    Args:
+        bands: Bande, ordinate per frequenza
+        segments: Segmenti; ogni segmento deve cadere nella sua banda
+        channels: Frequenze standard dei modi digitali e dei servizi
+
+    Example:
+        >>> BAND_PLAN.check([14.074e6, 14.200e6, 27.0e6], mode='Digi').allowed
+        array([ True,  True, False])
+    """
+
+    def __init__(self, bands: Sequence[Band], segments: Sequence[Segment],
+                 channels: Sequence[Channel] = ()):
+        self.bands = tuple(bands)
+        self.segments = tuple(segments)
+        self.channels = tuple(channels)
+        self.names = tuple(b.name for b in self.bands)
+
+        self.band_min = np.array([b.f_min for b in self.bands], dtype=float)
+        self.band_max = np.array([b.f_max for b in self.bands], dtype=float)
+        self.max_power_w = np.array([b.max_power_w for b in self.bands], dtype=float)
+        self.eirp = np.array([b.eirp for b in self.bands])
+        self.primary = np.array([b.status == PRIMARY for b in self.bands])
+
+        self.seg_min = np.array([s.f_min for s in self.segments], dtype=float)
+        self.seg_max = np.array([s.f_max for s in self.segments], dtype=float)
+        self.seg_band = np.array([self._band_position(s.band) for s in self.segments], dtype=int)
+        self.seg_mode = np.array([self._mode_code(s.mode) for s in self.segments], dtype=int)
+        outside = ((self.seg_min < self.band_min[self.seg_band])
+                   | (self.seg_max > self.band_max[self.seg_band]))
+        if outside.any():
+            bad = self.segments[int(np.argmax(outside))]
+            raise ValueError(f"Segmento fuori dalla banda {bad.band}: {bad}")
+
+        self.band_index = IntervalIndex(self.band_min, self.band_max)
+        self.segment_index = IntervalIndex(self.seg_min, self.seg_max)
+        # Tabella tipo di segmento x emissione
+        self._emissions = np.array([[e in SEGMENT_EMISSIONS[m] for e in MODES] for m in MODES])
+
+    def _band_position(self, name: str) -> int:
+        try:
+            return self.names.index(name)
+        except ValueError:
+            raise ValueError(f"Banda sconosciuta: {name!r}") from None
+
+    @staticmethod
+    def _mode_code(mode: str) -> int:
+        try:
+            return MODES.index(mode)
+        except ValueError:
+            raise ValueError(f"Modo sconosciuto: {mode!r} (modi: {', '.join(MODES)})") from None
+
+    def band(self, name: str) -> Band:
+        """Banda con il nome indicato."""
+        return self.bands[self._band_position(name)]
+
+    def bands_between(self, f_lo: float, f_hi: float) -> Tuple[Band, ...]:
+        """Bande interamente comprese fra f_lo e f_hi (Hz)."""
+        return tuple(b for b in self.bands if b.f_min >= f_lo and b.f_max <= f_hi)
+
+    def segments_of(self, name: str) -> Tuple[Segment, ...]:
+        """Segmenti di una banda, in ordine di frequenza."""
+        return tuple(s for s in self.segments if s.band == name)
+
+    def channels_of(self, mode: str) -> Tuple[Channel, ...]:
+        """Frequenze standard di un modo digitale o di un servizio, in ordine di banda."""
+        return tuple(c for c in self.channels if c.mode == mode)
+
+    def modes_of(self, name: str) -> Tuple[str, ...]:
+        """Tipi di segmento presenti in una banda."""
+        present = {s.mode for s in self.segments_of(name)}
+        return tuple(m for m in MODES if m in present)
+
+    def band_of(self, freqs) -> np.ndarray:
+        """Indice della banda che contiene ogni frequenza (-1 se fuori banda)."""
+        return self.band_index.first(freqs)
+
+    def segment_of(self, freqs) -> np.ndarray:
+        """Indice del segmento che contiene ogni frequenza (-1 se nessuno)."""
+        return self.segment_index.first(freqs)
+
+    def check(self, freqs, mode=None, power_w=None, antenna_gain_dbi=0.0) -> PlanCheck:
+        """
+        Verifica frequenze, modi e potenze contro il piano.
+
+        Args:
+            freqs: Frequenze (Hz), array di forma qualsiasi
+            mode: Modo di emissione (stringa o array di stringhe come freqs);
+                None = non verificare il modo
+            power_w: Potenza del trasmettitore (W), scalare o array come freqs;
+                None = non verificare
+            antenna_gain_dbi: Guadagno d'antenna (dBi), scalare o array come
+                freqs; nelle bande con limite in EIRP (es. 60m) la potenza
+                confrontata e' power_w * 10^(G/10)
+
+        Returns:
+            PlanCheck con la forma di freqs
+
+        Example:
+            >>> BAND_PLAN.check([5.354e6, 14.2e6], power_w=10, antenna_gain_dbi=2.15).power_ok
+            array([False,  True])
+        """
+        freqs = np.asarray(freqs, dtype=float)
+        band = self.band_of(freqs)
+        segment = self.segment_of(freqs)
+
+        if mode is None:
+            mode_ok = np.ones(freqs.shape, dtype=bool)
+        else:
+            uniq, inverse = np.unique(np.asarray(mode), return_inverse=True)
+            codes = np.array([self._mode_code(m) for m in uniq])[inverse]
+            codes = np.broadcast_to(codes.reshape(np.shape(mode)), freqs.shape)
+            seg_mode = self.seg_mode[np.clip(segment, 0, None)]
+            mode_ok = (segment >= 0) & self._emissions[seg_mode, codes]
+
+        if power_w is None:
+            power_ok = np.ones(freqs.shape, dtype=bool)
+        else:
+            b = np.clip(band, 0, None)
+            limit = np.where(band >= 0, self.max_power_w[b], 0.0)
+            gain = np.where(self.eirp[b], 10 ** (np.asarray(antenna_gain_dbi, dtype=float) / 10), 1.0)
+            power_ok = np.asarray(power_w, dtype=float) * gain <= limit
+
+        return PlanCheck(band=band, segment=segment, mode_ok=mode_ok,
+                         power_ok=np.broadcast_to(power_ok, freqs.shape))
+
+    def allowed(self, freqs, mode=None, power_w=None, antenna_gain_dbi=0.0) -> np.ndarray:
+        """Scorciatoia per check(...).allowed."""
+        return self.check(freqs, mode, power_w, antenna_gain_dbi).allowed
+
+    def mode_ranges(self, mode: str) -> Tuple[Tuple[str, float, float], ...]:
+        """
+        Per ogni banda, il tratto continuo piu' ampio dedicato a un modo.
+
+        Segmenti adiacenti dello stesso modo vengono uniti.
+
+        Returns:
+            Tupla di (banda, f_min, f_max) in ordine di frequenza
+        """
+        code = self._mode_code(mode)
+        ranges = []
+        for b in range(len(self.bands)):
+            idx = np.flatnonzero((self.seg_band == b) & (self.seg_mode == code))
+            if len(idx) == 0:
+                continue
+            lo, hi = self.seg_min[idx], self.seg_max[idx]
+            # Nuovo tratto dove un segmento non inizia alla fine del precedente
+            start = np.concatenate([[True], lo[1:] != hi[:-1]])
+            run_lo = lo[start]
+            run_hi = np.maximum.reduceat(hi, np.flatnonzero(start))
+            best = np.argmax(run_hi - run_lo)
+            ranges.append((self.names[b], run_lo[best], run_hi[best]))
+        return tuple(ranges)
+
+
+BAND_PLAN = BandPlan(BANDS, SEGMENTS, DIGITAL_CHANNELS + EMERGENCY_CHANNELS)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Modello elettrico dei risonatori al quarzo (Butterworth-Van Dyke).
+
+Il cristallo e' un ramo serie L_m, C_m, R_m (la risonanza meccanica) in
+parallelo alla capacita' statica C_0 degli elettrodi. Ne derivano la
+risonanza serie f_s, quella parallelo f_p poco sopra, e la frequenza con una
+capacita' di carico C_L, che permette di "tirare" il quarzo di qualche
+decina di ppm. Tutte le grandezze accettano array di capacita' di carico e
+frequenze.
+
+I filtri a scala (ladder) di N quarzi uguali sono progettati col metodo di
+Dishal (coefficienti di accoppiamento k e Q esterni dal prototipo passa-basso
+di Butterworth o Chebyshev) e analizzati come rete a due porte (calcoli.reti)
+su tutto l'asse di frequenza: 10^5 punti di un filtro a 8 poli richiedono
+qualche decina di millisecondi.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from calcoli.reti import SERIES, Element, Network, abcd_to_s, lowpass_prototype, series, shunt
+
+
+@dataclass(frozen=True)
+class Crystal:
+    """Parametri del circuito equivalente (unita' SI)."""
+
+    name: str
+    l_m: float                  # induttanza motore (H)
+    c_m: float                  # capacita' motore (F)
+    r_m: float                  # resistenza motore (ohm)
+    c_0: float                  # capacita' statica (F)
+    label: str = ''
+
+    @property
+    def f_series(self) -> float:
+        """Risonanza serie f_s = 1 / (2 pi sqrt(L_m C_m)) (Hz)."""
+        return 1 / (2 * np.pi * np.sqrt(self.l_m * self.c_m))
+
+    @property
+    def f_parallel(self) -> float:
+        """Antirisonanza f_p = f_s sqrt(1 + C_m / C_0) (Hz)."""
+        return self.f_series * np.sqrt(1 + self.c_m / self.c_0)
+
+    @property
+    def q(self) -> float:
+        """Fattore di merito del ramo motore."""
+        return 2 * np.pi * self.f_series * self.l_m / self.r_m
+
+    def load_frequency(self, c_load) -> np.ndarray:
+        """
+        Frequenza di lavoro con la capacita' di carico c_load in serie (Hz).
+
+        f_L = f_s (1 + C_m / (2 (C_0 + C_L))), al primo ordine in
+        C_m / (C_0 + C_L) (errore sotto 1e-6 relativo per i quarzi tipici).
+        """
+        c_load = np.asarray(c_load, dtype=float)
+        return self.f_series * (1 + self.c_m / (2 * (self.c_0 + c_load)))
+
+    def pullability(self, c_load) -> np.ndarray:
+        """Sensibilita' df/dC_L in ppm/pF (negativa: piu' carico, frequenza piu' bassa)."""
+        c_load = np.asarray(c_load, dtype=float)
+        return -self.c_m / (2 * (self.c_0 + c_load) ** 2) * 1e6 * 1e-12
+
+    def impedance(self, f_hz) -> np.ndarray:
+        """Impedenza complessa del cristallo (ohm)."""
+        w = 2 * np.pi * np.asarray(f_hz, dtype=float)
+        z_motional = self.r_m + 1j * (w * self.l_m - 1 / (w * self.c_m))
+        return 1 / (1 / z_motional + 1j * w * self.c_0)
+
+
+def _crystal(name, f_s, c_m, r_m, c_0, label):
+    """Preset a partire dalla risonanza serie e dalla capacita' motore."""
+    l_m = 1 / ((2 * np.pi * f_s) ** 2 * c_m)
+    return Crystal(name, l_m=l_m, c_m=c_m, r_m=r_m, c_0=c_0, label=label)
+
+
+# Valori tipici di quarzi in fondamentale (taglio AT)
+CRYSTALS = {
+    '4MHz': _crystal('4MHz', 4.0e6, 15e-15, 40.0, 4.5e-12, 'Quarzo 4 MHz (HC-49)'),
+    '10MHz': _crystal('10MHz', 10.0e6, 20e-15, 12.0, 5.0e-12, 'Quarzo 10 MHz (HC-49)'),
+    '14.318MHz': _crystal('14.318MHz', 14.31818e6, 18e-15, 10.0, 4.5e-12,
+                          'Quarzo 14.318 MHz (HC-49)'),
+}
+
+
+def crystal(name: str) -> Crystal:
+    """Preset con il nome indicato (vedi CRYSTALS)."""
+    try:
+        return CRYSTALS[name]
+    except KeyError:
+        raise ValueError(f"Quarzo sconosciuto: {name!r} "
+                         f"(disponibili: {', '.join(CRYSTALS)})") from None
+
+
+@dataclass(frozen=True)
+class LadderFilter:
+    """
+    Filtro a scala: quarzi in serie, condensatori di accoppiamento verso massa.
+
+    Dall'ingresso all'uscita: R_in, C_tune[0], quarzo 1, C_coupling[0] verso
+    massa, C_tune[1], quarzo 2, ..., quarzo N, R_out. Le C_tune (inf = nessun
+    condensatore) riportano tutte le maglie alla stessa frequenza.
+    """
+
+    xtal: Crystal
+    bandwidth: float                # Hz
+    r_in: float                     # ohm
+    r_out: float                    # ohm
+    c_coupling: np.ndarray          # F, N - 1 valori
+    c_tune: np.ndarray              # F, N valori (inf = cortocircuito)
+
+    @property
+    def n(self) -> int:
+        return len(self.c_tune)
+
+
+def ladder_filter(xtal: Crystal, n: int, bandwidth: float, ripple_db: float = 0.0) -> LadderFilter:
+    """
+    Progetta un filtro a scala di n quarzi uguali (metodo di Dishal).
+
+    C_(i,i+1) = C_m f_s / (B k_(i,i+1)) e R = 2 pi B L_m / q, con
+    k = 1 / sqrt(g_i g_(i+1)) e q = g_1 (g_n g_(n+1) in uscita).
+
+    Args:
+        xtal: Quarzo (tutti uguali)
+        n: Numero di quarzi (poli)
+        bandwidth: Larghezza di banda (Hz; di ondulazione per Chebyshev, a -3 dB per Butterworth)
+        ripple_db: Ondulazione in banda (dB), 0 = Butterworth
+
+    Returns:
+        LadderFilter con i valori calcolati
+    """
+    if n < 2:
+        raise ValueError("Un filtro a scala richiede almeno 2 quarzi")
+    g = lowpass_prototype(n, ripple_db)
+    k = 1 / np.sqrt(g[1:n] * g[2:n + 1])
+    c_coupling = xtal.c_m * xtal.f_series / (bandwidth * k)
+
+    # Capacita' in serie in ogni maglia: C_m e i condensatori di accoppiamento adiacenti
+    inv = np.full(n, 1 / xtal.c_m)
+    inv[:-1] += 1 / c_coupling
+    inv[1:] += 1 / c_coupling
+    with np.errstate(divide='ignore'):
+        c_tune = 1 / (inv.max() - inv)
+
+    r_in = 2 * np.pi * bandwidth * xtal.l_m / g[1]
+    r_out = 2 * np.pi * bandwidth * xtal.l_m / (g[n] * g[n + 1])
+    return LadderFilter(xtal, bandwidth, r_in, r_out, c_coupling, c_tune)
+
+
+def ladder_network(design: LadderFilter) -> Network:
+    """Cascata dei componenti del filtro, senza le terminazioni."""
+    elements = []
+    for i in range(design.n):
+        if not np.isinf(design.c_tune[i]):
+            elements.append(series(c=design.c_tune[i], label=f'C_t{i + 1}'))
+        elements.append(Element(SERIES, z=design.xtal.impedance, label=f'X{i + 1}'))
+        if i < design.n - 1:
+            elements.append(shunt(c=design.c_coupling[i], label=f'C{i + 1}{i + 2}'))
+    return Network(elements, label=f'Filtro a scala {design.n} quarzi')
+
+
+def ladder_response(design: LadderFilter, f_hz) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Risposta del filtro a scala con le sue terminazioni.
+
+    Args:
+        design: Filtro (vedi ladder_filter)
+        f_hz: Frequenze (Hz), array di qualunque forma
+
+    Returns:
+        Tupla (S21 complesso, impedenza d'ingresso in ohm); |S21|^2 e' il
+        guadagno di potenza rispetto a un generatore adattato
+    """
+    network = ladder_network(design)
+    m = network.abcd(f_hz)
+    s21 = abcd_to_s(m, design.r_in, design.r_out)[..., 1, 0]
+    z_in = (m[..., 0, 0] * design.r_out + m[..., 0, 1]) / (m[..., 1, 0] * design.r_out + m[..., 1, 1])
+    return s21, z_in
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Reattanze e circuiti risonanti LC(R) serie e parallelo.
+
+Tutte le funzioni accettano scalari o array e combinano L, C, R e frequenza
+per broadcasting: una griglia di componenti (L di forma (NL, 1), C di forma
+(NC,)) o un intero asse di frequenze si calcolano in una sola chiamata. Le
+funzioni inverse rispondono a domande come "quale C risuona con questa L a
+14.2 MHz" per array di frequenze e componenti.
+
+Convenzioni: nel circuito serie R e' la resistenza in serie (0 = ideale), nel
+parallelo e' la resistenza in parallelo (inf = ideale).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+SERIES = 'series'
+PARALLEL = 'parallel'
+
+
+def _check_topology(topology: str) -> None:
+    if topology not in (SERIES, PARALLEL):
+        raise ValueError(f"Topologia non valida: {topology!r} (usare 'series' o 'parallel')")
+
+
+def reactance_l(f_hz, l) -> np.ndarray:
+    """Reattanza induttiva X_L = 2 pi f L (ohm)."""
+    return 2 * np.pi * np.asarray(f_hz, dtype=float) * np.asarray(l, dtype=float)
+
+
+def reactance_c(f_hz, c) -> np.ndarray:
+    """Reattanza capacitiva X_C = 1 / (2 pi f C) (ohm, positiva)."""
+    return 1 / (2 * np.pi * np.asarray(f_hz, dtype=float) * np.asarray(c, dtype=float))
+
+
+def resonant_frequency(l, c) -> np.ndarray:
+    """Frequenza di risonanza f0 = 1 / (2 pi sqrt(L C)) (Hz)."""
+    return 1 / (2 * np.pi * np.sqrt(np.asarray(l, dtype=float) * np.asarray(c, dtype=float)))
+
+
+def characteristic_impedance(l, c) -> np.ndarray:
+    """Impedenza caratteristica sqrt(L / C): la reattanza di L e di C alla risonanza (ohm)."""
+    return np.sqrt(np.asarray(l, dtype=float) / np.asarray(c, dtype=float))
+
+
+def capacitance_for(f_hz, l) -> np.ndarray:
+    """
+    Capacita' che risuona con l'induttanza l alla frequenza f_hz (F).
+
+    Example:
+        >>> round(float(capacitance_for(14.2e6, 1e-6)) * 1e12, 1)     # pF
+        125.6
+    """
+    w = 2 * np.pi * np.asarray(f_hz, dtype=float)
+    return 1 / (w ** 2 * np.asarray(l, dtype=float))
+
+
+def inductance_for(f_hz, c) -> np.ndarray:
+    """Induttanza che risuona con la capacita' c alla frequenza f_hz (H)."""
+    w = 2 * np.pi * np.asarray(f_hz, dtype=float)
+    return 1 / (w ** 2 * np.asarray(c, dtype=float))
+
+
+def quality_factor(r, l, c, topology: str = SERIES) -> np.ndarray:
+    """
+    Fattore di merito Q alla risonanza.
+
+    Serie: Q = sqrt(L/C) / R. Parallelo: Q = R / sqrt(L/C).
+    """
+    _check_topology(topology)
+    z0 = characteristic_impedance(l, c)
+    r = np.asarray(r, dtype=float)
+    with np.errstate(divide='ignore'):
+        return z0 / r if topology == SERIES else r / z0
+
+
+def bandwidth(r, l, c, topology: str = SERIES) -> np.ndarray:
+    """Larghezza di banda a -3 dB, BW = f0 / Q (Hz)."""
+    return resonant_frequency(l, c) / quality_factor(r, l, c, topology)
+
+
+def impedance(f_hz, l, c, r=None, topology: str = SERIES) -> np.ndarray:
+    """
+    Impedenza complessa di un circuito LC(R).
+
+    Args:
+        f_hz: Frequenze (Hz)
+        l: Induttanza (H)
+        c: Capacita' (F)
+        r: Resistenza (ohm); default 0 nel serie, inf nel parallelo
+        topology: 'series' o 'parallel'
+
+    Returns:
+        Z (ohm, complessa) con la forma del broadcasting degli ingressi
+    """
+    _check_topology(topology)
+    x = reactance_l(f_hz, l) - reactance_c(f_hz, c)
+    if topology == SERIES:
+        return (0.0 if r is None else np.asarray(r, dtype=float)) + 1j * x
+    w = 2 * np.pi * np.asarray(f_hz, dtype=float)
+    g = 0.0 if r is None else 1 / np.asarray(r, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 1 / (g + 1j * (w * np.asarray(c, dtype=float) - 1 / (w * np.asarray(l, dtype=float))))
+
+
+def tuning_range(l, c_min, c_max) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Frequenze estreme coperte da un'induttanza con un condensatore variabile.
+
+    Returns:
+        Tupla (f_min, f_max) in Hz
+    """
+    return resonant_frequency(l, c_max), resonant_frequency(l, c_min)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Pianificatore di frequenze per ricevitori supereterodina.
+
+Calcola frequenza dell'oscillatore locale, frequenza immagine, prodotti di
+miscelazione m*f_LO +/- n*f_RF e risposte spurie su tutta una banda, in forma
+vettoriale. La funzione plan_superhet valuta in una sola chiamata tutte le
+combinazioni banda x frequenza intermedia candidata.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from calcoli.piano_bande import BAND_PLAN
+
+
+# Bande HF radioamatoriali a sintonia continua (esclusa la 60m canalizzata), in Hz
+AMATEUR_BANDS_HF: Dict[str, Tuple[float, float]] = {
+    b.name: (b.f_min, b.f_max) for b in BAND_PLAN.bands_between(0.0, 30e6) if not b.channelized
+}
+
+# Frequenze intermedie tipiche (Hz)
+COMMON_IF: Tuple[float, ...] = (455e3, 4.9152e6, 8.215e6, 9.0e6, 10.7e6, 45.0e6)
+
+_INJECTION_SIGN = {'high': 1.0, 'low': -1.0}
+
+
+def _injection_sign(injection: str) -> float:
+    """Restituisce +1 per iniezione alta (f_LO > f_RF), -1 per iniezione bassa."""
+    try:
+        return _INJECTION_SIGN[injection]
+    except KeyError:
+        raise ValueError(f"Iniezione non valida: {injection!r} (usare 'high' o 'low')") from None
+
+
+def lo_frequency(f_rf, f_if, injection: str = 'high') -> np.ndarray:
+    """
+    Frequenza dell'oscillatore locale per sintonizzare f_rf.
+
+    Con iniezione bassa e f_IF >= f_RF il LO dovrebbe avere frequenza nulla
+    o negativa: la combinazione non e' realizzabile e il risultato e' NaN
+    (invece di un'eccezione, cosi' le griglie banda x IF di plan_superhet
+    restano calcolabili e le combinazioni impossibili si riconoscono).
+
+    Args:
+        f_rf: Frequenza sintonizzata (Hz), scalare o array
+        f_if: Frequenza intermedia (Hz), scalare o array
+        injection: 'high' (f_LO = f_RF + f_IF) o 'low' (f_LO = f_RF - f_IF)
+
+    Returns:
+        Frequenza LO (Hz) con la forma del broadcasting degli ingressi,
+        NaN dove non realizzabile
+
+    Example:
+        >>> float(lo_frequency(7.1e6, 9e6, 'high')), float(lo_frequency(14.2e6, 9e6, 'low'))
+        (16100000.0, 5200000.0)
+        >>> lo_frequency(1.9e6, 10.7e6, 'low')
+        array(nan)
+    """
+    sign = _injection_sign(injection)
+    f_lo = np.asarray(f_rf, dtype=float) + sign * np.asarray(f_if, dtype=float)
+    return np.where(f_lo > 0, f_lo, np.nan)
+
+
+def image_frequency(f_rf, f_if, injection: str = 'high') -> np.ndarray:
+    """
+    Frequenza immagine: si trova a f_IF dal LO, dalla parte opposta al segnale.
+
+    E' |2*f_LO - f_RF|: con iniezione bassa e f_IF > f_RF/2 l'immagine cade
+    sotto lo zero e viene ripiegata (la converte il prodotto somma
+    f_LO + f_in). NaN dove il LO non e' realizzabile (vedi lo_frequency).
+
+    Args:
+        f_rf: Frequenza sintonizzata (Hz)
+        f_if: Frequenza intermedia (Hz)
+        injection: 'high' o 'low'
+
+    Returns:
+        Frequenza immagine (Hz)
+
+    Example:
+        >>> float(image_frequency(7.1e6, 9e6, 'high')), float(image_frequency(3.6e6, 455e3, 'low'))
+        (25100000.0, 2690000.0)
+        >>> image_frequency([3.5e6, 1.9e6], 10.7e6, 'low')
+        array([nan, nan])
+    """
+    return np.abs(2.0 * lo_frequency(f_rf, f_if, injection) - np.asarray(f_rf, dtype=float))
+
+
+def mixing_terms(max_order: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Enumera i termini (m, n, s) dei prodotti |m*f_LO + s*n*f_RF| con m + n <= max_order.
+
+    I termini con m = 0 o n = 0 (armoniche del solo LO o del solo RF)
+    compaiono una volta sola, con s = +1.
+
+    Args:
+        max_order: Ordine massimo m + n (>= 1)
+
+    Returns:
+        Tupla (m, n, s) di array interi della stessa lunghezza K
+    """
+    if max_order < 1:
+        raise ValueError("max_order deve essere >= 1")
+
+    m, n = np.meshgrid(np.arange(max_order + 1), np.arange(max_order + 1), indexing='ij')
+    keep = (m + n >= 1) & (m + n <= max_order)
+    m, n = m[keep], n[keep]
+
+    both = (m > 0) & (n > 0)
+    m = np.concatenate([m, m[both]])
+    n = np.concatenate([n, n[both]])
+    s = np.concatenate([np.ones(keep.sum(), dtype=int), -np.ones(both.sum(), dtype=int)])
+    return m, n, s
+
+
+def mixing_products(f_lo, f_rf, max_order: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcola tutti i prodotti di miscelazione |m*f_LO +/- n*f_RF| fino a max_order.
+
+    Args:
+        f_lo: Frequenza LO (Hz), scalare o array
+        f_rf: Frequenza RF (Hz), scalare o array (broadcast con f_lo)
+        max_order: Ordine massimo m + n
+
+    Returns:
+        Tupla (prodotti, m, n, s): prodotti ha forma broadcast(f_lo, f_rf) + (K,)
+    """
+    m, n, s = mixing_terms(max_order)
+    f_lo = np.asarray(f_lo, dtype=float)[..., None]
+    f_rf = np.asarray(f_rf, dtype=float)[..., None]
+    return np.abs(m * f_lo + s * n * f_rf), m, n, s
+
+
+def spurious_responses(f_tuned, f_if, injection: str = 'high',
+                       max_order: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Frequenze d'ingresso che il mixer converte sulla frequenza intermedia.
+
+    Per ogni termine (m, n, s) con n >= 1 risolve m*f_LO + s*n*f_in = +/-f_IF.
+    Le soluzioni non fisiche (f_in <= 0) sono restituite come NaN. La risposta
+    desiderata e la frequenza immagine sono i due termini con m = n = 1, s = -1.
+
+    Args:
+        f_tuned: Frequenza sintonizzata (Hz), scalare o array
+        f_if: Frequenza intermedia (Hz), scalare o array
+        injection: 'high' o 'low'
+        max_order: Ordine massimo m + n
+
+    Returns:
+        Tupla (f_in, m, n): f_in ha forma broadcast(f_tuned, f_if) + (2K,)
+    """
+    m, n, s = mixing_terms(max_order)
+    rf_terms = n > 0
+    m, n, s = m[rf_terms], n[rf_terms], s[rf_terms]
+
+    f_if = np.asarray(f_if, dtype=float)
+    f_lo = lo_frequency(f_tuned, f_if, injection)[..., None]
+    f_if = np.broadcast_to(f_if, f_lo.shape[:-1])[..., None]
+
+    f_in = np.concatenate([(f_if - m * f_lo) / (s * n),
+                           (-f_if - m * f_lo) / (s * n)], axis=-1)
+    f_in = np.where(f_in > 0, f_in, np.nan)
+    return f_in, np.concatenate([m, m]), np.concatenate([n, n])
+
+
+@dataclass(frozen=True)
+class SuperhetPlan:
+    """Risultato di plan_superhet: array con assi (banda, IF, punto di sintonia)."""
+
+    band_names: Tuple[str, ...]
+    band_edges: np.ndarray        # (B, 2) Hz
+    if_frequencies: np.ndarray    # (I,) Hz
+    injection: str
+    f_tuned: np.ndarray           # (B, P) Hz
+    f_lo: np.ndarray              # (B, I, P) Hz
+    f_image: np.ndarray           # (B, I, P) Hz
+    image_margin: np.ndarray      # (B, I) Hz, distanza minima immagine-banda (<0 se dentro, NaN se non realizzabile)
+    spur_inputs: np.ndarray       # (B, I, P, R) Hz, risposte spurie (NaN se fuori banda)
+    spur_m: np.ndarray            # (R,)
+    spur_n: np.ndarray            # (R,)
+    birdies: np.ndarray           # (B, I, P) bool, prodotti interni nella banda passante IF
+
+    @property
+    def feasible(self) -> np.ndarray:
+        """True se il LO e' realizzabile su tutta la banda (B, I); falso solo con iniezione bassa e f_IF >= f_RF."""
+        return np.isfinite(self.f_lo).all(axis=-1)
+
+    @property
+    def image_in_band(self) -> np.ndarray:
+        """True se la frequenza immagine cade dentro la banda (B, I)."""
+        return self.image_margin < 0
+
+    @property
+    def spur_count(self) -> np.ndarray:
+        """Numero di termini spuri (m, n) che producono risposte in banda (B, I), NaN se non realizzabile."""
+        count = np.isfinite(self.spur_inputs).any(axis=2).sum(axis=-1)
+        return np.where(self.feasible, count, np.nan)
+
+    @property
+    def birdie_fraction(self) -> np.ndarray:
+        """Frazione dei punti di sintonia con birdie interni (B, I), NaN se non realizzabile."""
+        return np.where(self.feasible, self.birdies.mean(axis=-1), np.nan)
+
+
+def plan_superhet(
+    bands: Dict[str, Tuple[float, float]] = AMATEUR_BANDS_HF,
+    if_frequencies: Sequence[float] = COMMON_IF,
+    injection: str = 'high',
+    max_order: int = 5,
+    if_bandwidth: float = 3e3,
+    points: int = 201
+) -> SuperhetPlan:
+    """
+    Valuta tutte le combinazioni banda x IF in una sola chiamata vettoriale.
+
+    Per ogni banda la sintonia viene campionata su `points` frequenze. Per ogni
+    punto si calcolano LO, immagine, risposte spurie che cadono dentro la banda
+    (escluse risposta desiderata e immagine) e birdie, cioe' prodotti
+    |m*f_LO +/- n*f_RF| del segnale sintonizzato che cadono nella banda passante
+    IF (f_IF +/- if_bandwidth/2) diversi dal prodotto desiderato.
+
+    Le combinazioni banda x IF non realizzabili (iniezione bassa con f_IF
+    non inferiore alla frequenza sintonizzata, vedi lo_frequency) hanno LO e
+    immagine NaN, image_margin, spur_count e birdie_fraction NaN e
+    feasible falso.
+
+    Args:
+        bands: Dizionario nome -> (f_min, f_max) in Hz
+        if_frequencies: Frequenze intermedie candidate (Hz)
+        injection: 'high' o 'low'
+        max_order: Ordine massimo m + n dei prodotti
+        if_bandwidth: Larghezza di banda del filtro IF (Hz)
+        points: Punti di sintonia per banda
+
+    Returns:
+        SuperhetPlan con i risultati
+
+    Example:
+        >>> plan = plan_superhet(if_frequencies=[455e3, 10.7e6], injection='low', points=11)
+        >>> bool(plan.feasible[plan.band_names.index('160m'), 1]), bool(plan.feasible[:, 0].all())
+        (False, True)
+        >>> bool(np.nanmin(plan.f_lo) > 0), bool(np.isnan(plan.spur_count[0, 1]))
+        (True, True)
+    """
+    names = tuple(bands)
+    edges = np.array([bands[name] for name in names], dtype=float)
+    f_if = np.asarray(if_frequencies, dtype=float)
+
+    u = np.linspace(0.0, 1.0, points)
+    f_tuned = edges[:, :1] + (edges[:, 1:] - edges[:, :1]) * u          # (B, P)
+    tuned = f_tuned[:, None, :]                                         # (B, 1, P)
+    if_grid = f_if[None, :, None]                                       # (1, I, 1)
+    lo_, hi_ = edges[:, 0, None, None], edges[:, 1, None, None]
+
+    f_lo = lo_frequency(tuned, if_grid, injection)
+    f_image = image_frequency(tuned, if_grid, injection)
+    image_margin = np.maximum(f_image - hi_, lo_ - f_image).min(axis=-1)
+
+    # Risposte spurie in banda (escluse desiderata e immagine)
+    f_in, m, n = spurious_responses(tuned, if_grid, injection, max_order)
+    main = (m == 1) & (n == 1)
+    f_in, m, n = f_in[..., ~main], m[~main], n[~main]
+    in_band = (f_in >= lo_[..., None]) & (f_in <= hi_[..., None])
+    spur_inputs = np.where(in_band, f_in, np.nan)
+
+    # Birdie: prodotti interni del segnale sintonizzato nella banda passante IF
+    products, pm, pn, ps = mixing_products(f_lo, tuned, max_order)
+    desired = (pm == 1) & (pn == 1) & (ps == -1)
+    in_if = np.abs(products - if_grid[..., None]) <= if_bandwidth / 2
+    birdies = (in_if & ~desired).any(axis=-1)
+
+    return SuperhetPlan(
+        band_names=names,
+        band_edges=edges,
+        if_frequencies=f_if,
+        injection=injection,
+        f_tuned=f_tuned,
+        f_lo=f_lo,
+        f_image=f_image,
+        image_margin=image_margin,
+        spur_inputs=spur_inputs,
+        spur_m=m,
+        spur_n=n,
+        birdies=birdies,
+    )
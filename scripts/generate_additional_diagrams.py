@@ -3,11 +3,12 @@
 Script per generare diagrammi aggiuntivi per il capitolo 2 - versione semplificata
 """
 
-import schemdraw
 import schemdraw.elements as elm
 import os
 
+from calcoli.diodi import diode, zener_regulator
 from utils import get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 # Directory di output
 OUTPUT_DIR = get_output_dir("03_circuiti")
@@ -22,7 +23,7 @@ def draw_simple_circuits():
     """Disegna circuiti semplici"""
     
     # Partitore di tensione
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_in')
     d1 += elm.Resistor().label('R1').right()
     d1 += elm.Resistor().label('R2').down()
@@ -31,7 +32,7 @@ def draw_simple_circuits():
     d1.save('../images/circuito_partitore_tensione.svg')
     
     # Filtro RC passa-basso
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('V_in')
     d2 += elm.Resistor().label('R').right()
     d2 += elm.Capacitor().label('C').down()
@@ -40,17 +41,18 @@ def draw_simple_circuits():
     d2 += elm.Label('V_out')
     d2.save('../images/filtro_passa_basso_rc.svg')
     
-    # Stabilizzatore Zener
-    d3 = schemdraw.Drawing(unit=3)
-    d3 += elm.SourceV().label('V_in')
-    d3 += elm.Resistor().label('R_s').right()
-    d3 += elm.Zener().label('D_z').down()
+    # Stabilizzatore Zener (valori d'esempio, uscita calcolata col modello del diodo)
+    v_out, i_z, _ = zener_regulator(diode('1N4733'), 12.0, 220.0, 1000.0)
+    d3 = CachedDrawing(unit=3)
+    d3 += elm.SourceV().label('V_in\n12 V')
+    d3 += elm.Resistor().label('R_s\n220 Ω').right()
+    d3 += elm.Zener().label(f'D_z 5.1 V\nI_z = {i_z * 1000:.0f} mA').down()
     d3 += elm.Ground()
     d3 += elm.Line().right()
-    d3 += elm.Label('V_out')
-    d3 += elm.Resistor().label('R_L').down()
+    d3 += elm.Label(f'V_out ≈ {v_out:.2f} V')
+    d3 += elm.Resistor().label('R_L\n1 kΩ').down()
     d3 += elm.Ground()
-    d3.save('../images/circuito_stabilizzatore_zener.svg')
+    d3.save(OUTPUT_DIR / 'circuito_stabilizzatore_zener.svg')
     
     print("Circuiti semplici generati")
 
@@ -58,21 +60,21 @@ def draw_component_variations():
     """Disegna variazioni dei componenti"""
     
     # Resistori diversi
-    d1 = schemdraw.Drawing(unit=2)
+    d1 = CachedDrawing(unit=2)
     d1 += elm.Resistor().label('Standard')
     d1 += elm.ResistorVar().label('Variabile').right()
     d1 += elm.Potentiometer().label('Potenziometro').right()
     d1.save('../images/tipologie_resistori.svg')
     
     # Condensatori diversi
-    d2 = schemdraw.Drawing(unit=2)
+    d2 = CachedDrawing(unit=2)
     d2 += elm.Capacitor().label('Fisso')
     d2 += elm.CapacitorVar().label('Variabile').right()
     d2 += elm.CapacitorTrim().label('Trim').right()
     d2.save('../images/tipologie_condensatori.svg')
     
     # Diodi diversi
-    d3 = schemdraw.Drawing(unit=2)
+    d3 = CachedDrawing(unit=2)
     d3 += elm.Diode().label('Standard')
     d3 += elm.Zener().label('Zener').right()
     d3 += elm.LED().label('LED').right()
@@ -85,7 +87,7 @@ def draw_basic_circuits():
     """Disegna circuiti base di esempio"""
     
     # Circuito RL serie
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('V_in')
     d1 += elm.Resistor().label('R').right()
     d1 += elm.Inductor().label('L').right()
@@ -94,7 +96,7 @@ def draw_basic_circuits():
     d1.save('../images/circuito_serie_rl.svg')
     
     # Circuito RLC serie
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('V_in')
     d2 += elm.Resistor().label('R').right()
     d2 += elm.Inductor().label('L').right()
@@ -104,7 +106,7 @@ def draw_basic_circuits():
     d2.save('../images/circuito_serie_rlc.svg')
     
     # Circuito con diodo di protezione
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceV().label('V_in')
     d3 += elm.Resistor().label('R').right()
     d3 += elm.Diode().label('D_protezione').down()
@@ -128,6 +130,7 @@ def main():
     draw_basic_circuits()
     
     print("Tutti i diagrammi aggiuntivi sono stati generati con successo!")
+    print(schematic_cache_report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,10 +4,10 @@ Script per generare diagrammi di amplificatori per il Capitolo 3.
 Amplificatori transistor, op-amp, RF, differenziali e push-pull.
 """
 
-import schemdraw
 import schemdraw.elements as elm
 
 from utils import get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 
 # Directory di output
@@ -17,7 +17,7 @@ OUTPUT_DIR = get_output_dir('03_circuiti')
 def draw_simple_amplifiers():
     """Disegna circuiti di amplificatori semplici."""
     # Amplificatore base con transistor
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_cc')
     d1 += elm.Resistor().label('R_c').right()
     d1 += elm.BjtNpn().label('Q1').right()
@@ -30,7 +30,7 @@ def draw_simple_amplifiers():
     d1.save(OUTPUT_DIR / 'amplificatore_base_transistor.svg')
 
     # Amplificatore con op-amp
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.Opamp().label('U1').right()
     d2 += elm.Resistor().label('R_in').left()
     d2 += elm.Line().right()
@@ -41,7 +41,7 @@ def draw_simple_amplifiers():
     d2.save(OUTPUT_DIR / 'amplificatore_opamp.svg')
 
     # Amplificatore RF
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceSin().label('V_in')
     d3 += elm.Capacitor().label('C_in').right()
     d3 += elm.BjtNpn().label('Q_RF').right()
@@ -57,7 +57,7 @@ def draw_simple_amplifiers():
 def draw_amplifier_configurations():
     """Disegna configurazioni di amplificatori."""
     # Amplificatore differenziale
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.Opamp().label('U1').right()
     d1 += elm.Resistor().label('R1').left()
     d1 += elm.Line().up()
@@ -71,7 +71,7 @@ def draw_amplifier_configurations():
     d1.save(OUTPUT_DIR / 'amplificatore_differenziale.svg')
 
     # Amplificatore push-pull
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('V_in')
     d2 += elm.BjtNpn().label('Q1').right()
     d2 += elm.BjtPnp().label('Q2').down()
@@ -92,6 +92,7 @@ def main():
     draw_amplifier_configurations()
 
     print(f"\nTutti i diagrammi salvati in: {OUTPUT_DIR}")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
@@ -4,10 +4,10 @@ Script per generare diagrammi elettrici per il Capitolo 3 - Circuiti.
 Circuiti RLC, filtri, risonanti e impedenza.
 """
 
-import schemdraw
 import schemdraw.elements as elm
 
 from utils import get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 
 # Directory di output
@@ -17,7 +17,7 @@ OUTPUT_DIR = get_output_dir('03_circuiti')
 def draw_circuit_combinations():
     """Disegna circuiti di combinazione di componenti."""
     # Circuito con trasformatore accoppiato
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_in')
     d1 += elm.Resistor().label('R1').right()
     d1 += elm.Capacitor().label('C1').right()
@@ -32,7 +32,7 @@ def draw_circuit_combinations():
     d1.save(OUTPUT_DIR / 'circuito_trasformatore_accoppiamento.svg')
 
     # Circuito RLC parallelo
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('V_in')
     d2 += elm.Resistor().label('R').right()
     d2.push()
@@ -48,7 +48,7 @@ def draw_circuit_combinations():
     d2.save(OUTPUT_DIR / 'circuito_rlc_parallelo.svg')
 
     # Ponte di Wheatstone semplificato
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceV().label('V_in')
     d3.push()
     d3 += elm.Resistor().label('R1').right()
@@ -70,7 +70,7 @@ def draw_circuit_combinations():
 def draw_filter_circuits():
     """Disegna circuiti di filtri."""
     # Filtro passa-basso RC dettagliato
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('V_in')
     d1 += elm.Resistor().label('R').right()
     d1 += elm.Capacitor().label('C').down()
@@ -82,7 +82,7 @@ def draw_filter_circuits():
     d1.save(OUTPUT_DIR / 'filtro_passa_basso_rc_dettagliato.svg')
 
     # Filtro passa-alto CR
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('V_in')
     d2 += elm.Capacitor().label('C').right()
     d2 += elm.Resistor().label('R').down()
@@ -94,7 +94,7 @@ def draw_filter_circuits():
     d2.save(OUTPUT_DIR / 'filtro_passa_alto_cr_dettagliato.svg')
 
     # Filtro passa-banda RLC
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceSin().label('V_in')
     d3 += elm.Resistor().label('R_s').right()
     d3 += elm.Inductor().label('L').right()
@@ -112,7 +112,7 @@ def draw_filter_circuits():
 def draw_resonant_circuits():
     """Disegna circuiti risonanti."""
     # Circuito risonante serie
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('V_in')
     d1 += elm.Resistor().label('R').right()
     d1 += elm.Inductor().label('L').right()
@@ -122,7 +122,7 @@ def draw_resonant_circuits():
     d1.save(OUTPUT_DIR / 'circuito_risonante_serie.svg')
 
     # Circuito risonante parallelo
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('I_in')
     d2 += elm.Resistor().label('R').right()
     d2.push()
@@ -136,7 +136,7 @@ def draw_resonant_circuits():
     d2.save(OUTPUT_DIR / 'circuito_risonante_parallelo.svg')
 
     # Circuito tank
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceSin().label('V_in')
     d3.push()
     d3 += elm.Inductor().label('L').down()
@@ -154,7 +154,7 @@ def draw_resonant_circuits():
 def draw_impedance_circuits():
     """Disegna circuiti per calcolo di impedenza."""
     # Circuito complesso misto
-    d1 = schemdraw.Drawing(unit=2.5)
+    d1 = CachedDrawing(unit=2.5)
     d1 += elm.SourceSin().label('V_in')
     d1 += elm.Resistor().label('R1').right()
     d1.push()
@@ -172,7 +172,7 @@ def draw_impedance_circuits():
     d1.save(OUTPUT_DIR / 'circuito_impedenza_complesso.svg')
 
     # Circuito di matching
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('V_source')
     d2 += elm.Resistor().label('R_s').right()
     d2 += elm.Inductor().label('L_match').right()
@@ -196,6 +196,7 @@ def main():
     draw_impedance_circuits()
 
     print(f"\nTutti i diagrammi salvati in: {OUTPUT_DIR}")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
@@ -4,11 +4,11 @@ Script per generare diagrammi elettrici dei componenti usando schemdraw.
 Genera simboli di resistori, condensatori, induttori, diodi, transistor, etc.
 """
 
-import schemdraw
 import schemdraw.elements as elm
 from schemdraw import flow
 
 from utils import get_output_dir, setup_logging, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 
 # Directory di output
@@ -18,13 +18,13 @@ OUTPUT_DIR = get_output_dir('02_componenti')
 def draw_resistor():
     """Disegna un resistore con simbolo europeo e americano."""
     # Simbolo europeo (rettangolo)
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
     d += elm.Resistor().label('R')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_resistore_europeo.svg')
 
     # Simbolo americano (zigzag)
-    d2 = schemdraw.Drawing(unit=2.5)
+    d2 = CachedDrawing(unit=2.5)
     d2 += elm.ResistorIEEE().label('R')
     d2 += elm.Line().length(1).right()
     d2.save(OUTPUT_DIR / 'simbolo_resistore_americano.svg')
@@ -35,13 +35,13 @@ def draw_resistor():
 def draw_capacitor():
     """Disegna un condensatore non polarizzato e polarizzato."""
     # Condensatore non polarizzato
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
     d += elm.Capacitor().label('C')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_condensatore.svg')
 
     # Condensatore polarizzato
-    d2 = schemdraw.Drawing(unit=2.5)
+    d2 = CachedDrawing(unit=2.5)
     d2 += elm.Capacitor().label('C+')
     d2 += elm.Line().length(1).right()
     d2.save(OUTPUT_DIR / 'simbolo_condensatore_polarizzato.svg')
@@ -51,7 +51,7 @@ def draw_capacitor():
 
 def draw_inductor():
     """Disegna un induttore."""
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
     d += elm.Inductor().label('L')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_induttore.svg')
@@ -62,13 +62,13 @@ def draw_inductor():
 def draw_diode():
     """Disegna un diodo e LED."""
     # Diodo standard
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
     d += elm.Diode().label('D')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_diodo.svg')
 
     # LED
-    d2 = schemdraw.Drawing(unit=2.5)
+    d2 = CachedDrawing(unit=2.5)
     d2 += elm.LED().label('LED')
     d2 += elm.Line().length(1).right()
     d2.save(OUTPUT_DIR / 'simbolo_led.svg')
@@ -78,7 +78,7 @@ def draw_diode():
 
 def draw_transistor_bjt():
     """Disegna transistor BJT NPN e PNP."""
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
     d += elm.BjtNpn().label('Q')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_transistor_npn.svg')
@@ -88,7 +88,7 @@ def draw_transistor_bjt():
 
 def draw_transistor_mosfet():
     """Disegna transistor MOSFET."""
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
     d += elm.NMos().label('Q')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_transistor_mosfet.svg')
@@ -98,7 +98,7 @@ def draw_transistor_mosfet():
 
 def draw_transformer():
     """Disegna un trasformatore."""
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3)
     d += elm.Transformer().label('T')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_trasformatore.svg')
@@ -108,7 +108,7 @@ def draw_transformer():
 
 def draw_valve():
     """Disegna una valvola termoionica (triodo)."""
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3)
     d += elm.Ic().label('V').label('TRIODE', loc='bottom')
     d += elm.Line().length(1).right()
     d.save(OUTPUT_DIR / 'simbolo_valvola_triodo.svg')
@@ -119,7 +119,7 @@ def draw_valve():
 def draw_circuit_examples():
     """Disegna circuiti di esempio."""
     # Circuito serie RC
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3)
     d += elm.SourceV().label('V')
     d += elm.Resistor().label('R').right()
     d += elm.Capacitor().label('C').down()
@@ -128,7 +128,7 @@ def draw_circuit_examples():
     d.save(OUTPUT_DIR / 'circuito_serie_rc.svg')
 
     # Circuito raddrizzatore a ponte
-    d2 = schemdraw.Drawing(unit=2.5)
+    d2 = CachedDrawing(unit=2.5)
     d2 += elm.SourceV().label('AC')
     d2.push()
     d2 += elm.Diode().right().label('D1')
@@ -164,6 +164,7 @@ def main():
     draw_circuit_examples()
 
     print(f"\nTutti i diagrammi salvati in: {OUTPUT_DIR}")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
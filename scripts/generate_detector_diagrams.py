@@ -3,11 +3,11 @@
 Script per generare diagrammi di rivelatori per il Capitolo 3 (versione corretta)
 """
 
-import schemdraw
 import schemdraw.elements as elm
 import os
 
 from utils import get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 # Directory di output
 OUTPUT_DIR = get_output_dir("03_circuiti")
@@ -22,7 +22,7 @@ def draw_am_detectors():
     """Disegna rivelatori AM"""
     
     # Rivelatore AM a diodo
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('RF Input')
     d1 += elm.Capacitor().label('C_c').right()
     d1 += elm.Diode().label('D1').right()
@@ -35,7 +35,7 @@ def draw_am_detectors():
     d1.save(OUTPUT_DIR / 'rivelatore_am_diodo.svg')
     
     # Rivelatore AM a prodotto (usando op-amp come moltiplicatore)
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('RF Input')
     d2 += elm.Capacitor().label('C_in').right()
     d2 += elm.Opamp().label('Mixer').right()
@@ -53,7 +53,7 @@ def draw_fm_detectors():
     """Disegna rivelatori FM"""
     
     # Rivelatore FM a pendenza (slope detector)
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('RF Input')
     d1 += elm.Capacitor().label('C_c').right()
     d1 += elm.Inductor().label('L').right()
@@ -69,7 +69,7 @@ def draw_fm_detectors():
     d1.save(OUTPUT_DIR / 'rivelatore_fm_pendenza.svg')
     
     # Rivelatore Foster-Seeley semplificato
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('RF Input')
     d2 += elm.Transformer().label('T1').right()
     d2 += elm.Capacitor().label('C1').down()
@@ -94,7 +94,7 @@ def draw_ssb_detectors():
     """Disegna rivelatori SSB/CW"""
     
     # Rivelatore SSB con BFO
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('SSB Input')
     d1 += elm.Capacitor().label('C_in').right()
     d1 += elm.Opamp().label('Mixer').right()
@@ -107,7 +107,7 @@ def draw_ssb_detectors():
     d1.save(OUTPUT_DIR / 'rivelatore_ssb_bfo.svg')
     
     # Rivelatore CW con beat
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('CW Input')
     d2 += elm.Capacitor().label('C_in').right()
     d2 += elm.Opamp().label('Beat Detector').right()
@@ -125,7 +125,7 @@ def draw_receiver_block():
     """Disegna diagramma a blocchi di ricevitore"""
     
     # Ricevitore completo semplificato
-    d1 = schemdraw.Drawing(unit=2.5)
+    d1 = CachedDrawing(unit=2.5)
     d1 += elm.Antenna().label('Antenna')
     d1 += elm.Capacitor().label('C_rf').right()
     d1 += elm.Ic().label('RF Amp').right()
@@ -150,6 +150,7 @@ def main():
     draw_receiver_block()
     
     print("Tutti i diagrammi di rivelatori sono stati generati con successo!")
+    print(schematic_cache_report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,15 +1,18 @@
-import schemdraw
 import schemdraw.elements as elm
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 
+from calcoli.diodi import DiodeModel, current
+from calcoli.transitori import rc_step
+from schematics import CachedDrawing, schematic_cache_report
+
 # Ensure images directory exists
 os.makedirs('images', exist_ok=True)
 
 def generate_transformer():
     print("Generating Transformer diagram...")
-    with schemdraw.Drawing(file='images/grafico_trasformatore.svg', show=False) as d:
+    with CachedDrawing(file='images/grafico_trasformatore.svg', show=False) as d:
         d.config(fontsize=12)
         
         # Primary side
@@ -34,7 +37,7 @@ def generate_transformer():
 
 def generate_transistor_amp():
     print("Generating Transistor Amplifier diagram...")
-    with schemdraw.Drawing(file='images/grafico_transistor_amplificatore.svg', show=False) as d:
+    with CachedDrawing(file='images/grafico_transistor_amplificatore.svg', show=False) as d:
         d.config(fontsize=12)
         
         # Power rails
@@ -84,21 +87,10 @@ def generate_diode_curve():
     
     # Data
     v = np.linspace(-2, 1, 500)
-    i = np.zeros_like(v)
-    
-    # Shockley diode equation approximation
-    is_sat = 1e-9  # Saturation current
-    vt = 0.026     # Thermal voltage
-    n = 1.5        # Ideality factor
-    
-    # Forward bias
-    mask_fwd = v > 0
-    i[mask_fwd] = is_sat * (np.exp(v[mask_fwd] / (n * vt)) - 1)
-    
-    # Reverse breakdown (simplified)
-    v_breakdown = -1.5
-    mask_rev = v < v_breakdown
-    i[mask_rev] = -1e-3 * (np.exp(-(v[mask_rev] - v_breakdown) * 10)) 
+
+    # Diodo didattico: Shockley con resistenza serie e rottura inversa a -1.5 V
+    model = DiodeModel('didattico', i_s=1e-9, n=1.5, r_s=2.0, bv=1.5, i_bv=1e-3, n_bv=4.0)
+    i = current(model, v)
 
     # Plot
     plt.plot(v, i * 1000, 'b-', linewidth=2) # Current in mA
@@ -133,7 +125,7 @@ def generate_capacitor_charge():
     # Data
     t = np.linspace(0, 5, 500) # Time in units of tau
     v_max = 10
-    v = v_max * (1 - np.exp(-t))
+    v = rc_step(t, 1.0, 1.0, v_max).voltage # R = C = 1 -> tau = 1
     
     # Plot
     plt.plot(t, v, 'b-', linewidth=2)
@@ -165,7 +157,7 @@ def generate_capacitor_charge():
 
 def generate_symbol_resistor():
     """Generate an improved SVG showing resistor symbols (zig-zag and IEC rectangle)."""
-    with schemdraw.Drawing(file='images/symbol_resistor.svg', show=False) as d:
+    with CachedDrawing(file='images/symbol_resistor.svg', show=False) as d:
         d.config(unit=1.2, fontsize=14)
         # left lead
         d += elm.Line().left().length(0.6)
@@ -181,7 +173,7 @@ def generate_symbol_resistor():
 
 def generate_symbol_capacitor():
     """Generate an improved SVG with capacitor symbol and leads."""
-    with schemdraw.Drawing(file='images/symbol_capacitor.svg', show=False) as d:
+    with CachedDrawing(file='images/symbol_capacitor.svg', show=False) as d:
         d.config(unit=1.2, fontsize=14)
         d += elm.Line().left().length(0.6)
         d += elm.Capacitor().right().label('C', loc='bottom')
@@ -190,7 +182,7 @@ def generate_symbol_capacitor():
 
 def generate_symbol_inductor():
     """Generate an improved SVG with inductor symbol and leads."""
-    with schemdraw.Drawing(file='images/symbol_inductor.svg', show=False) as d:
+    with CachedDrawing(file='images/symbol_inductor.svg', show=False) as d:
         d.config(unit=1.2, fontsize=14)
         d += elm.Line().left().length(0.6)
         d += elm.Inductor().right().length(1.4).label('L', loc='bottom')
@@ -199,7 +191,7 @@ def generate_symbol_inductor():
 
 def generate_symbol_diode():
     """Generate an improved SVG with diode symbol and leads (showing polarity)."""
-    with schemdraw.Drawing(file='images/symbol_diode.svg', show=False) as d:
+    with CachedDrawing(file='images/symbol_diode.svg', show=False) as d:
         d.config(unit=1.2, fontsize=14)
         d += elm.Line().left().length(0.6)
         d += elm.Diode().right().label('D', loc='bottom')
@@ -208,7 +200,7 @@ def generate_symbol_diode():
 
 def generate_symbol_transistor():
     """Generate an improved SVG showing NPN and PNP transistor side by side."""
-    with schemdraw.Drawing(file='images/symbol_transistor.svg', show=False) as d:
+    with CachedDrawing(file='images/symbol_transistor.svg', show=False) as d:
         d.config(unit=1.2, fontsize=12)
         # NPN
         d += elm.BjtNpn().label('NPN', loc='bottom')
@@ -223,7 +215,7 @@ def generate_symbol_transistor():
 
 def generate_symbol_ic():
     """Generate an improved SVG representing an integrated circuit package with pins."""
-    with schemdraw.Drawing(file='images/symbol_ic.svg', show=False) as d:
+    with CachedDrawing(file='images/symbol_ic.svg', show=False) as d:
         d.config(unit=1.2, fontsize=12)
         # central box
         d += elm.RBox().label('IC', loc='center')
@@ -242,3 +234,4 @@ if __name__ == "__main__":
     generate_symbol_transistor()
     generate_symbol_ic()
     print("All diagrams generated successfully.")
+    print(schematic_cache_report())
@@ -4,10 +4,15 @@ Script per generare diagrammi di filtri per il Capitolo 3.
 Filtri passa-basso, passa-alto, cristallo e speciali.
 """
 
-import schemdraw
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
 import schemdraw.elements as elm
 
-from utils import get_output_dir, run_with_error_handling
+from calcoli.quarzo import crystal, ladder_filter, ladder_response
+from utils import format_si, get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 
 # Directory di output
@@ -17,7 +22,7 @@ OUTPUT_DIR = get_output_dir('03_circuiti')
 def draw_filter_circuits():
     """Disegna circuiti di filtri specifici."""
     # Filtro passa-basso LC di secondo ordine
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('V_in')
     d1 += elm.Inductor().label('L1').right()
     d1 += elm.Capacitor().label('C1').down()
@@ -32,7 +37,7 @@ def draw_filter_circuits():
     d1.save(OUTPUT_DIR / 'filtro_passa_basso_lc_secondo.svg')
 
     # Filtro passa-alto LC di secondo ordine
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('V_in')
     d2 += elm.Capacitor().label('C1').right()
     d2 += elm.Inductor().label('L1').down()
@@ -47,7 +52,7 @@ def draw_filter_circuits():
     d2.save(OUTPUT_DIR / 'filtro_passa_alto_lc_secondo.svg')
 
     # Filtro a pi
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceSin().label('V_in')
     d3.push()
     d3 += elm.Inductor().label('L_p1').down()
@@ -71,7 +76,7 @@ def draw_filter_circuits():
 def draw_crystal_filter():
     """Disegna circuiti con cristalli di quarzo."""
     # Circuito equivalente del cristallo
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.Capacitor().label('C_p').right()
     d1.push()
     d1 += elm.Inductor().label('L_m').right()
@@ -84,7 +89,7 @@ def draw_crystal_filter():
     d1.save(OUTPUT_DIR / 'circuito_cristallo_quarzo.svg')
 
     # Filtro a cristallo singolo
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('V_in')
     d2 += elm.Resistor().label('R_s').right()
     d2 += elm.Ic().label('XTAL').right()
@@ -99,10 +104,89 @@ def draw_crystal_filter():
     print("[OK] Circuiti a cristallo generati")
 
 
+def plot_crystal_filter_response():
+    """Impedenza del quarzo e risposta di filtri a scala SSB e CW."""
+    xtal = crystal('10MHz')
+    f_s = xtal.f_series
+    # Filtri a scala di quarzi uguali, Chebyshev 0.1 dB
+    filters = [
+        ('SSB 8 poli, 2.4 kHz', ladder_filter(xtal, 8, 2400, 0.1), 'tab:blue'),
+        ('SSB 4 poli, 2.4 kHz', ladder_filter(xtal, 4, 2400, 0.1), 'tab:green'),
+        ('CW 8 poli, 500 Hz', ladder_filter(xtal, 8, 500, 0.1), 'tab:red'),
+    ]
+    offset = np.linspace(-30e3, 30e3, 100_000)         # Hz da f_s
+    f = f_s + offset
+
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5.5))
+
+    # Impedenza del quarzo: risonanza serie (minimo) e parallelo (massimo)
+    ax = axes[0]
+    z = xtal.impedance(f)
+    ax.semilogy(offset / 1e3, np.abs(z), color='purple', linewidth=1.5)
+    ax.axvline(0, color='gray', linestyle=':')
+    ax.axvline((xtal.f_parallel - f_s) / 1e3, color='gray', linestyle=':')
+    ax.annotate(f'f_s: |Z| = R_m = {xtal.r_m:.0f} Ω', xy=(0, xtal.r_m), xytext=(-27, 30),
+                fontsize=9, arrowprops=dict(arrowstyle='->'))
+    ax.annotate(f'f_p = f_s + {(xtal.f_parallel - f_s) / 1e3:.1f} kHz',
+                xy=((xtal.f_parallel - f_s) / 1e3, np.abs(z).max()), xytext=(-27, 1e6),
+                fontsize=9, arrowprops=dict(arrowstyle='->'))
+    ax.set_xlabel('Scostamento da f_s (kHz)')
+    ax.set_ylabel('|Z| (Ω)')
+    ax.set_title(f'{xtal.label}\nL_m = {format_si(xtal.l_m, "H")}, '
+                 f'C_m = {format_si(xtal.c_m, "F")}, C_0 = {format_si(xtal.c_0, "F")}, '
+                 f'Q = {xtal.q:,.0f}', fontsize=10)
+    ax.grid(True, which='both', linestyle='--', alpha=0.4)
+
+    # Risposta su tutta la finestra: reiezione ultima limitata da C_0
+    ax = axes[1]
+    responses = []
+    for label, design, color in filters:
+        s21, _ = ladder_response(design, f)
+        gain_db = 20 * np.log10(np.abs(s21))
+        responses.append(gain_db)
+        ax.plot(offset / 1e3, gain_db, color=color, linewidth=1.2, label=label)
+    # Il modello non ha accoppiamenti parassiti: nei filtri reali la
+    # reiezione ultima si ferma di solito fra 80 e 100 dB
+    ax.axhspan(-140, -100, color='gray', alpha=0.15)
+    ax.text(-29, -120, 'Oltre il limite\npratico del montaggio',
+            fontsize=8, color='dimgray', va='center')
+    ax.set_ylim(-140, 5)
+    ax.set_xlabel('Scostamento da f_s (kHz)')
+    ax.set_ylabel('|S21| (dB)')
+    ax.set_title(f'Risposta e reiezione su ±30 kHz ({len(f):,} punti)')
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax.legend(fontsize=9, loc='upper left')
+
+    # Banda passante, centrata sul massimo di ogni filtro
+    ax = axes[2]
+    for (label, design, color), gain_db in zip(filters, responses):
+        center = offset[np.argmax(gain_db)]
+        loss = -gain_db.max()
+        ax.plot((offset - center) / 1e3, gain_db + loss, color=color, linewidth=1.5,
+                label=f'{label} (perdita {loss:.1f} dB)')
+    ax.axhline(-6, color='gray', linestyle=':')
+    ax.axhline(-60, color='gray', linestyle=':')
+    ax.set_xlim(-3, 3)
+    ax.set_ylim(-80, 3)
+    ax.set_xlabel('Scostamento dal centro banda (kHz)')
+    ax.set_ylabel('Attenuazione relativa (dB)')
+    ax.set_title('Banda passante e fianchi (-6 / -60 dB)')
+    ax.grid(True, linestyle='--', alpha=0.4)
+    ax.legend(fontsize=8, loc='lower center')
+
+    fig.suptitle('Filtri a scala con quarzi da 10 MHz (modello Butterworth-Van Dyke)',
+                 fontsize=13, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'filtro_cristallo_risposta.png', dpi=150, bbox_inches='tight')
+    plt.close()
+
+    print("[OK] Risposta dei filtri a cristallo generata")
+
+
 def draw_special_filters():
     """Disegna filtri speciali."""
     # Filtro Crossover (per audio)
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceSin().label('V_in')
     d1.push()
     # Via passa-alto (tweeter)
@@ -121,7 +205,7 @@ def draw_special_filters():
     d1.save(OUTPUT_DIR / 'filtro_crossover_audio.svg')
 
     # Filtro anti-aliasing
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceSin().label('Analog In')
     d2 += elm.Resistor().label('R1').right()
     d2 += elm.Capacitor().label('C1').down()
@@ -144,9 +228,11 @@ def main():
 
     draw_filter_circuits()
     draw_crystal_filter()
+    plot_crystal_filter_response()
     draw_special_filters()
 
     print(f"\nTutti i diagrammi salvati in: {OUTPUT_DIR}")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
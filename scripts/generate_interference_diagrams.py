@@ -4,7 +4,6 @@ Generazione schemi soppressione disturbi EMI/RFI.
 Filtri di linea, ferrite, disaccoppiamento, schermatura.
 """
 
-import schemdraw
 import schemdraw.elements as elm
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
@@ -12,6 +11,12 @@ from matplotlib.patches import FancyBboxPatch, Rectangle, FancyArrowPatch
 import numpy as np
 from pathlib import Path
 
+from calcoli.allocazioni import ALLOCATIONS, AMATEUR, BROADCAST
+from calcoli.intermodulazione import intermod_products, allocation_hits
+from calcoli.armoniche import check_harmonics, sample_bands, protected_names
+from calcoli.reti import Network, lowpass, series, shunt, trap
+from schematics import CachedDrawing, schematic_cache_report
+
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "09_disturbi"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -19,7 +24,7 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def schema_filtro_linea_ac():
     """Schema filtro EMI per linea AC (filtro di rete)."""
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
 
     # Ingresso AC
     d += elm.Dot().at((0, 2)).label('L\n(Fase)', loc='left', fontsize=9)
@@ -131,7 +136,7 @@ def schema_ferrite_cavo():
 
 def schema_disaccoppiamento():
     """Schema circuito disaccoppiamento alimentazione IC."""
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
 
     # Alimentazione principale
     d += elm.Dot().at((0, 3)).label('+Vcc\n(5V/12V)', loc='left', fontsize=9)
@@ -171,7 +176,7 @@ def schema_disaccoppiamento():
 
 def schema_filtro_armoniche_tx():
     """Schema filtro passa-basso per armoniche TX."""
-    d = schemdraw.Drawing(unit=2.5)
+    d = CachedDrawing(unit=2.5)
 
     # Ingresso da TX
     d += elm.Dot().at((0, 2)).label('TX\nOutput', loc='left', fontsize=9)
@@ -213,6 +218,59 @@ def schema_filtro_armoniche_tx():
     print(f"✓ Salvato: {OUTPUT_DIR / 'filtro_armoniche_tx.svg'}")
 
 
+def grafico_risposta_filtri():
+    """Perdita di inserzione del filtro di rete e del filtro armoniche TX."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+
+    # Filtro di rete con i valori dello schema: Cx 100 nF, Cy 2.2 nF, L1 di modo
+    # comune da 10 mH (autorisonanza con 20 pF). Il modo differenziale vede
+    # solo l'induttanza dispersa (~1%); il modo comune i due Cy in parallelo su
+    # 25 ohm (le due sezioni della LISN). I condensatori hanno 10-20 nH in serie.
+    f_rete = np.logspace(4, np.log10(30e6), 100_000)
+    differenziale = Network([shunt(c=100e-9, l=20e-9), series(l=100e-6),
+                             shunt(c=100e-9, l=20e-9)])
+    comune = Network([trap(l=10e-3, c=20e-12, r=20e3), shunt(c=4.4e-9, l=10e-9)])
+    ax1.semilogx(f_rete / 1e6, differenziale.insertion_loss(f_rete), color='#2563eb',
+                 linewidth=2, label='Modo differenziale (L-N, 50 Ω)')
+    ax1.semilogx(f_rete / 1e6, comune.insertion_loss(f_rete, 25.0), color='#dc2626',
+                 linewidth=2, label='Modo comune (L+N verso terra, 25 Ω)')
+    ax1.axvspan(0.15, 30, color='gray', alpha=0.1, label='Emissioni condotte (150 kHz-30 MHz)')
+    ax1.set_xlabel('Frequenza (MHz)')
+    ax1.set_ylabel('Perdita di inserzione (dB)')
+    ax1.set_title('Filtro di rete: Cx 100 nF, L1 10 mH, Cy 2.2 nF', fontweight='bold')
+    ax1.set_ylim(0, 120)
+    ax1.set_xticks([0.01, 0.1, 1, 10])
+    ax1.set_xticklabels(['0.01', '0.1', '1', '10'])
+    ax1.grid(True, which='both', alpha=0.3)
+    ax1.legend(loc='upper left', fontsize=9)
+
+    # Filtro passa-basso Chebyshev per i 40 m, induttori con Q = 200
+    f_tx = 7.1e6
+    f_arm = np.linspace(1e6, 60e6, 100_000)
+    harmonics = f_tx * np.arange(2, 9)
+    for poles, color in [(5, '#16a34a'), (7, '#7c3aed')]:
+        lpf = lowpass(8.5e6, poles, 0.1, q_inductor=200)
+        ax2.plot(f_arm / 1e6, lpf.insertion_loss(f_arm), color=color, linewidth=2,
+                 label=f'{poles} poli: perdita {lpf.insertion_loss(f_tx):.2f} dB a 7.1 MHz, '
+                       f'{lpf.insertion_loss(2 * f_tx):.0f} dB sulla 2ª armonica')
+        ax2.plot(harmonics / 1e6, lpf.insertion_loss(harmonics), 'o', color=color, markersize=5)
+    for k, f in enumerate(harmonics, start=2):
+        ax2.axvline(f / 1e6, color='gray', linestyle=':', alpha=0.7)
+        ax2.text(f / 1e6, 2, f'{k}ª', ha='center', fontsize=8, color='dimgray')
+    ax2.axvline(f_tx / 1e6, color='black', linestyle='--', alpha=0.6)
+    ax2.set_xlabel('Frequenza (MHz)')
+    ax2.set_ylabel('Perdita di inserzione (dB)')
+    ax2.set_title('Filtro armoniche TX 40 m (Chebyshev 0.1 dB, taglio 8.5 MHz)', fontweight='bold')
+    ax2.set_ylim(-2, 160)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend(loc='upper left', fontsize=9)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'filtri_emi_risposta.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'filtri_emi_risposta.png'}")
+
+
 def diagramma_schermatura_emi():
     """Diagramma concettuale schermatura EMI."""
     fig, ax = plt.subplots(figsize=(14, 8))
@@ -354,6 +412,131 @@ def schema_filtro_rete_completo():
     print(f"✓ Salvato: {OUTPUT_DIR / 'filtro_rete_funzionale.png'}")
 
 
+def diagramma_intermodulazione_sito():
+    """Prodotti di intermodulazione di un sito con piu' trasmettitori e bande colpite."""
+    # Sito tipico in quota: ripetitore 2m, ripetitore 70cm, radio FM, servizi VHF
+    carriers = {
+        'R2m': 145.7125e6,
+        'R70': 431.1e6,
+        'FM1': 98.4e6,
+        'FM2': 103.1e6,
+        'Marina': 156.8e6,
+        'PMR': 162.5e6,
+    }
+    names = list(carriers)
+    products = intermod_products(list(carriers.values()), max_order=5, resolution=1e3, f_max=500e6)
+    prod_idx, alloc_idx = allocation_hits(products)
+    services = np.array([a.service for a in ALLOCATIONS])
+    hit_service = np.full(len(products), '', dtype=object)
+    hit_service[prod_idx] = services[alloc_idx]
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 10), gridspec_kw={'height_ratios': [3, 1.3]})
+    fig.suptitle(f'Intermodulazione in un sito con {len(carriers)} trasmettitori '
+                 f'(prodotti fino al 5° ordine: {len(products)})', fontsize=14, fontweight='bold')
+
+    # Allocazioni sullo sfondo
+    for alloc in ALLOCATIONS:
+        if alloc.f_max < 30e6 or alloc.f_min > 500e6:
+            continue
+        color = '#bbf7d0' if alloc.service == AMATEUR else '#fde68a'
+        ax1.axvspan(alloc.f_min / 1e6, alloc.f_max / 1e6, color=color, alpha=0.6, zorder=0)
+        x_label = (max(alloc.f_min, 30e6) + min(alloc.f_max, 500e6)) / 2e6
+        ax1.text(x_label, 5.6, alloc.name, ha='center', fontsize=7, rotation=90, va='top')
+
+    style = {AMATEUR: ('#16a34a', 'In banda radioamatoriale'),
+             BROADCAST: ('#d97706', 'In banda radiodiffusione'),
+             '': ('#94a3b8', 'Fuori dalle allocazioni in tabella')}
+    for service, (color, label) in style.items():
+        mask = hit_service == service
+        ax1.vlines(products.freqs[mask] / 1e6, 0, 6 - products.order[mask], color=color,
+                   linewidth=1, alpha=0.8, label=f'{label} ({mask.sum()})')
+    ax1.vlines(np.array(list(carriers.values())) / 1e6, 0, 5.8, color='#dc2626', linewidth=3,
+               label='Portanti')
+    for name, f in carriers.items():
+        ax1.text(f / 1e6, 5.85, name, ha='center', va='bottom', fontsize=8, color='#dc2626',
+                 fontweight='bold', rotation=90)
+    ax1.set_xlim(30, 500)
+    ax1.set_ylim(0, 7)
+    ax1.set_yticks([1, 2, 3, 4])
+    ax1.set_yticklabels(['5° ordine', '4° ordine', '3° ordine', '2° ordine'])
+    ax1.set_xlabel('Frequenza (MHz)')
+    ax1.legend(loc='upper center', bbox_to_anchor=(0.62, 1), fontsize=8)
+    ax1.grid(True, alpha=0.3, axis='x')
+
+    # Tabella dei prodotti di 3° ordine che cadono in bande radioamatoriali
+    amateur = np.flatnonzero((hit_service == AMATEUR) & (products.order == 3))
+    labels = products.labels(names)
+    alloc_name = {p: ALLOCATIONS[a].name for p, a in zip(prod_idx, alloc_idx)}
+    rows = [[labels[i], f'{products.freqs[i] / 1e6:.4f}', alloc_name[i]] for i in amateur[:10]]
+    ax2.axis('off')
+    ax2.set_title('Prodotti di 3° ordine in bande radioamatoriali', fontsize=12, fontweight='bold')
+    if rows:
+        table = ax2.table(cellText=rows, colLabels=['Combinazione', 'Frequenza (MHz)', 'Banda'],
+                          loc='center', cellLoc='center', colWidths=[0.3, 0.2, 0.15])
+        table.auto_set_font_size(False)
+        table.set_fontsize(9)
+        table.scale(1, 1.4)
+        for j in range(3):
+            table[(0, j)].set_facecolor('#2c3e50')
+            table[(0, j)].set_text_props(color='white', fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'intermodulazione_sito.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'intermodulazione_sito.png'}")
+
+
+def diagramma_armoniche_servizi_protetti():
+    """Armoniche delle bande radioamatoriali nei servizi protetti e filtro richiesto."""
+    power_w = 100
+    max_harmonic = 10
+    tx_freqs, band_idx = sample_bands(step_hz=1e3)
+    hits = check_harmonics(tx_freqs, max_harmonic=max_harmonic, power_w=power_w)
+    names = protected_names(hits)
+
+    bands = [i for i, a in enumerate(ALLOCATIONS) if a.service == AMATEUR]
+    row_of = {b: r for r, b in enumerate(bands)}
+    rows = np.array([row_of[b] for b in band_idx[hits.tx_index]], dtype=int)
+    cols = hits.harmonic - 2
+
+    # Attenuazione massima richiesta per (banda, armonica) e servizio colpito
+    required = np.full((len(bands), max_harmonic - 1), np.nan)
+    np.fmax.at(required, (rows, cols), hits.required_db)
+    first_hit = {}
+    for r, c, name in zip(rows, cols, names):
+        first_hit.setdefault((r, c), name)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8), gridspec_kw={'width_ratios': [3, 1]})
+    fig.suptitle(f'Armoniche del trasmettitore nei servizi protetti ({power_w} W, '
+                 f'finale senza filtro)', fontsize=14, fontweight='bold')
+
+    im = ax1.imshow(required, cmap='YlOrRd', aspect='auto', vmin=0)
+    for (r, c), name in first_hit.items():
+        ax1.text(c, r, f'{name}\n{required[r, c]:.0f} dB', ha='center', va='center', fontsize=6.5)
+    ax1.set_xticks(range(max_harmonic - 1))
+    ax1.set_xticklabels([f'{n}ª' for n in range(2, max_harmonic + 1)])
+    ax1.set_yticks(range(len(bands)))
+    ax1.set_yticklabels([ALLOCATIONS[b].name for b in bands])
+    ax1.set_xlabel('Armonica')
+    ax1.set_title('Servizio colpito e attenuazione richiesta al filtro')
+    ax1.grid(False)
+    fig.colorbar(im, ax=ax1, label='Attenuazione richiesta (dB)')
+
+    worst = np.nan_to_num(np.fmax.reduce(required, axis=1))
+    ax2.barh(range(len(bands)), worst, color='#ef4444', edgecolor='black')
+    ax2.set_yticks(range(len(bands)))
+    ax2.set_yticklabels([ALLOCATIONS[b].name for b in bands])
+    ax2.invert_yaxis()
+    ax2.set_xlabel('dB')
+    ax2.set_title('Attenuazione minima del\nfiltro passa-basso')
+    ax2.grid(True, alpha=0.3, axis='x')
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'armoniche_servizi_protetti.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'armoniche_servizi_protetti.png'}")
+
+
 def main():
     """Genera tutti i diagrammi soppressione disturbi."""
     print("Generazione schemi soppressione disturbi EMI/RFI...")
@@ -363,10 +546,14 @@ def main():
     schema_ferrite_cavo()
     schema_disaccoppiamento()
     schema_filtro_armoniche_tx()
+    grafico_risposta_filtri()
     diagramma_schermatura_emi()
     schema_filtro_rete_completo()
+    diagramma_intermodulazione_sito()
+    diagramma_armoniche_servizi_protetti()
 
     print("\n✅ Tutti gli schemi sono stati generati con successo!")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
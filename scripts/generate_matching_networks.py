@@ -2,47 +2,117 @@
 """
 Generazione schemi circuitali per reti di adattamento impedenza.
 Genera L-match, Pi-match, T-match e balun usando schemdraw.
+
+I valori dei componenti delle reti L, Pi e T sono calcolati con
+calcoli.adattamento per un carico d'esempio; i disegni sono memorizzati per
+(topologia, valori arrotondati), cosi' carichi che portano agli stessi
+componenti riusano lo stesso schema. Le stesse reti, analizzate in frequenza
+con calcoli.reti, danno la banda di adattamento e l'attenuazione delle
+armoniche.
 """
 
-import schemdraw
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
 import schemdraw.elements as elm
 from pathlib import Path
 
+from calcoli.adattamento import MatchResult, impedance_to_gamma, l_match, pi_match, t_match
+from calcoli.reti import Network, Transformer, series, to_db
+from utils import format_si
+from schematics import CachedDrawing, schematic_cache_report
+
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "06_antenne"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Carico d'esempio: antenna a 7.1 MHz vista in fondo alla linea a 50 ohm
+R_SOURCE = 50.0
+Z_ANTENNA = 200 - 100j
+F_EXAMPLE = 7.1e6
+Q_EXAMPLE = 3.0
 
-def draw_l_match_lowpass():
+
+def format_impedance(z: complex) -> str:
+    """Impedenza complessa nella forma '200 - j100 Ω'."""
+    sign = '-' if z.imag < 0 else '+'
+    return f'{z.real:.4g} {sign} j{abs(z.imag):.4g} Ω'
+
+
+def network_svg(topology: str, parts: tuple, source_label: str, load_label: str,
+                title: str = '', variable: bool = False) -> bytes:
     """
-    Rete L-match passa-basso: L serie + C parallelo.
-    Usata per trasformare impedenza alta in bassa.
+    Schema di una rete di adattamento come SVG.
+
+    parts e' una tupla di (posizione, 'L'/'C', etichetta). Il rendering
+    passa da CachedDrawing: reti con la stessa topologia e gli stessi
+    valori arrotondati riusano l'SVG gia' calcolato.
     """
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3, show=False)
+    if title:
+        d += elm.Label().at((3, 2.2)).label(title, fontsize=14)
 
     # Ingresso
-    d += elm.Dot().label('IN\n50Ω', loc='left', fontsize=11)
+    d += elm.Dot().at((0, 0)).label(source_label, loc='left', fontsize=11)
     d += elm.Line().right().length(0.5)
 
-    # Induttore serie
-    d += elm.Inductor().right().label('L', loc='top', fontsize=12)
+    for position, kind, label in parts:
+        if kind == 'L':
+            element = elm.Inductor()
+        else:
+            element = elm.CapacitorVar() if variable else elm.Capacitor()
+        if position == 'series':
+            d += element.right().label(label, loc='top', fontsize=11)
+        else:
+            # Elemento in parallelo verso massa
+            d.push()
+            d += element.down().label(label, loc='bot', fontsize=11)
+            d += elm.Ground()
+            d.pop()
+            d += elm.Line().right().length(1.0)
 
-    # Nodo
-    d.push()
+    # Uscita
     d += elm.Line().right().length(0.5)
-    d += elm.Dot().label('OUT\nZ_L', loc='right', fontsize=11)
+    d += elm.Dot().label(load_label, loc='right', fontsize=11)
+    return d.get_imagedata('svg')
+
+
+def draw_network(result: MatchResult, index, filename: str, load_label: str,
+                 title: str = '', variable: bool = False) -> None:
+    """Salva lo schema della soluzione result[index] con i valori dei componenti."""
+    names = {'L': 0, 'C': 0}
+    components = result.components(index)
+    counts = {kind: sum(1 for _, k, _ in components if k == kind) for kind in names}
+    parts = []
+    for position, kind, value in components:
+        names[kind] += 1
+        name = kind + (str(names[kind]) if counts[kind] > 1 else '')
+        suffix = ' var' if variable else ''
+        value_label = format_si(value, 'H' if kind == 'L' else 'F')
+        parts.append((position, kind, f'{name}{suffix}\n{value_label}'))
+
+    svg = network_svg(result.topology, tuple(parts), f'IN\n{R_SOURCE:.0f}Ω', load_label,
+                      title, variable)
+    (OUTPUT_DIR / filename).write_bytes(svg)
+    print(f"✓ Salvato: {OUTPUT_DIR / filename}")
 
-    # Condensatore parallelo
-    d.pop()
-    d += elm.Capacitor().down().label('C', loc='right', fontsize=12)
-    d += elm.Ground()
 
-    # Linea di massa
-    d += elm.Line().left().length(2.5).at((0, -3))
-    d += elm.Ground().at((0, -3))
+def _first(mask: np.ndarray) -> int:
+    """Indice della prima soluzione selezionata da mask (forma (S,))."""
+    if not mask.any():
+        raise ValueError("Nessuna soluzione del tipo richiesto per il carico d'esempio")
+    return int(np.argmax(mask))
 
-    d.save(OUTPUT_DIR / 'rete_l_match_lowpass.svg')
-    print(f"✓ Salvato: {OUTPUT_DIR / 'rete_l_match_lowpass.svg'}")
+
+def draw_l_match_lowpass():
+    """
+    Rete L-match passa-basso: L serie + C parallelo.
+    Usata per trasformare impedenza alta in bassa.
+    """
+    result = l_match(Z_ANTENNA, F_EXAMPLE, R_SOURCE, 'L-shunt-load')
+    draw_network(result, _first(result.lowpass), 'rete_l_match_lowpass.svg',
+                 f'OUT\n{format_impedance(Z_ANTENNA)}')
 
 
 def draw_l_match_highpass():
@@ -50,27 +120,9 @@ def draw_l_match_highpass():
     Rete L-match passa-alto: C serie + L parallelo.
     Usata per trasformare impedenza bassa in alta.
     """
-    d = schemdraw.Drawing(unit=3)
-
-    # Ingresso
-    d += elm.Dot().label('IN\n50Ω', loc='left', fontsize=11)
-    d += elm.Line().right().length(0.5)
-
-    # Condensatore serie
-    d += elm.Capacitor().right().label('C', loc='top', fontsize=12)
-
-    # Nodo
-    d.push()
-    d += elm.Line().right().length(0.5)
-    d += elm.Dot().label('OUT\nZ_L', loc='right', fontsize=11)
-
-    # Induttore parallelo
-    d.pop()
-    d += elm.Inductor().down().label('L', loc='right', fontsize=12)
-    d += elm.Ground()
-
-    d.save(OUTPUT_DIR / 'rete_l_match_highpass.svg')
-    print(f"✓ Salvato: {OUTPUT_DIR / 'rete_l_match_highpass.svg'}")
+    result = l_match(Z_ANTENNA, F_EXAMPLE, R_SOURCE, 'L-shunt-load')
+    draw_network(result, _first(result.highpass), 'rete_l_match_highpass.svg',
+                 f'OUT\n{format_impedance(Z_ANTENNA)}')
 
 
 def draw_pi_match():
@@ -78,39 +130,9 @@ def draw_pi_match():
     Rete Pi-match: C parallelo - L serie - C parallelo.
     Configurazione classica per accordatori d'antenna.
     """
-    d = schemdraw.Drawing(unit=3)
-
-    # Ingresso
-    d += elm.Dot().label('IN\n50Ω', loc='left', fontsize=11)
-    d.push()
-    d += elm.Line().right().length(0.3)
-
-    # C1 parallelo
-    d.push()
-    d += elm.Capacitor().down().label('C1', loc='right', fontsize=12)
-    d += elm.Ground()
-    d.pop()
-
-    # L serie
-    d += elm.Inductor().right().label('L', loc='top', fontsize=12).length(3)
-
-    # C2 parallelo
-    d.push()
-    d += elm.Capacitor().down().label('C2', loc='right', fontsize=12)
-    d += elm.Ground()
-    d.pop()
-
-    # Uscita
-    d += elm.Line().right().length(0.3)
-    d += elm.Dot().label('OUT\nAntenna', loc='right', fontsize=11)
-
-    # Linea massa
-    d.pop()
-    d += elm.Line().down().length(3)
-    d += elm.Ground()
-
-    d.save(OUTPUT_DIR / 'rete_pi_match.svg')
-    print(f"✓ Salvato: {OUTPUT_DIR / 'rete_pi_match.svg'}")
+    result = pi_match(Z_ANTENNA, F_EXAMPLE, Q_EXAMPLE, R_SOURCE)
+    draw_network(result, _first(result.lowpass), 'rete_pi_match.svg',
+                 f'OUT\nAntenna\n{format_impedance(Z_ANTENNA)}')
 
 
 def draw_t_match():
@@ -118,30 +140,9 @@ def draw_t_match():
     Rete T-match: L serie - C parallelo - L serie.
     Alternativa al Pi-match con caratteristiche diverse.
     """
-    d = schemdraw.Drawing(unit=3)
-
-    # Ingresso
-    d += elm.Dot().label('IN\n50Ω', loc='left', fontsize=11)
-    d += elm.Line().right().length(0.3)
-
-    # L1 serie
-    d += elm.Inductor().right().label('L1', loc='top', fontsize=12)
-
-    # C parallelo centrale
-    d.push()
-    d += elm.Capacitor().down().label('C', loc='right', fontsize=12)
-    d += elm.Ground()
-    d.pop()
-
-    # L2 serie
-    d += elm.Inductor().right().label('L2', loc='top', fontsize=12)
-
-    # Uscita
-    d += elm.Line().right().length(0.3)
-    d += elm.Dot().label('OUT\nAntenna', loc='right', fontsize=11)
-
-    d.save(OUTPUT_DIR / 'rete_t_match.svg')
-    print(f"✓ Salvato: {OUTPUT_DIR / 'rete_t_match.svg'}")
+    result = t_match(Z_ANTENNA, F_EXAMPLE, Q_EXAMPLE, R_SOURCE)
+    draw_network(result, _first(result.lowpass), 'rete_t_match.svg',
+                 f'OUT\nAntenna\n{format_impedance(Z_ANTENNA)}')
 
 
 def draw_balun_1_1():
@@ -149,7 +150,7 @@ def draw_balun_1_1():
     Balun 1:1 - bilanciamento senza trasformazione impedenza.
     Connette coassiale sbilanciato ad antenna bilanciata.
     """
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3)
 
     # Titolo
     d += elm.Label().at((3, 2)).label('Balun 1:1', fontsize=14)
@@ -183,7 +184,7 @@ def draw_balun_4_1():
     Balun 4:1 - trasformazione impedenza 200Ω → 50Ω.
     Tipico per dipolo ripiegato.
     """
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3)
 
     # Titolo
     d += elm.Label().at((3, 2)).label('Balun 4:1', fontsize=14)
@@ -217,7 +218,7 @@ def draw_balun_current():
     Balun a corrente (choke balun) con ferrite.
     Blocca le correnti di modo comune.
     """
-    d = schemdraw.Drawing(unit=3)
+    d = CachedDrawing(unit=3)
 
     # Ingresso
     d += elm.Dot().at((0, 1)).label('Coax\ncentro', loc='left', fontsize=10)
@@ -248,45 +249,95 @@ def draw_balun_current():
 
 def draw_antenna_tuner_complete():
     """
-    Accordatore d'antenna completo tipo T con indicatori.
-    Schema didattico con etichette.
+    Accordatore d'antenna completo tipo T: C serie - L parallelo - C serie.
+    Schema didattico con la regolazione per il carico d'esempio.
     """
-    d = schemdraw.Drawing(unit=2.5)
-
-    # Ingresso da radio
-    d += elm.Dot().at((0, 0)).label('TX\n50Ω', loc='left', fontsize=10)
-    d += elm.Line().right().length(0.5)
-
-    # C1 variabile (ingresso)
-    d.push()
-    c1 = d.add(elm.Capacitor().down().label('C1\nvar', loc='right', fontsize=10))
-    d += elm.Ground()
-    d.pop()
+    result = t_match(Z_ANTENNA, F_EXAMPLE, Q_EXAMPLE, R_SOURCE)
+    draw_network(result, _first(result.highpass), 'accordatore_t_completo.svg',
+                 f'ANT\n{format_impedance(Z_ANTENNA)}',
+                 title=f'Accordatore T ({F_EXAMPLE / 1e6:.1f} MHz)', variable=True)
 
-    # L variabile (serie) - roller inductor
-    d += elm.Inductor().right().label('L var\n(roller)', loc='top', fontsize=10).length(2.5)
 
-    # C2 variabile (uscita)
-    d.push()
-    d += elm.Capacitor().down().label('C2\nvar', loc='right', fontsize=10)
-    d += elm.Ground()
-    d.pop()
+def antenna_impedance(f_hz):
+    """Carico d'esempio come R e C in serie: vale Z_ANTENNA a F_EXAMPLE."""
+    c = -1 / (2 * np.pi * F_EXAMPLE * Z_ANTENNA.imag)
+    return Z_ANTENNA.real + 1 / (2j * np.pi * np.asarray(f_hz) * c)
 
-    # Uscita antenna
-    d += elm.Line().right().length(0.5)
-    d += elm.Dot().label('ANT', loc='right', fontsize=11)
 
-    # Titolo
-    d += elm.Label().at((2, 2.5)).label('Accordatore T', fontsize=14)
+def plot_matching_bandwidth():
+    """
+    Banda di adattamento e attenuazione delle armoniche delle reti d'esempio.
 
-    d.save(OUTPUT_DIR / 'accordatore_t_completo.svg')
-    print(f"✓ Salvato: {OUTPUT_DIR / 'accordatore_t_completo.svg'}")
+    Il carico d'esempio e' modellato come R e C in serie, cosi' varia con la
+    frequenza come un'antenna corta; le reti sono regolate a F_EXAMPLE.
+    """
+    l_result = l_match(Z_ANTENNA, F_EXAMPLE, R_SOURCE, 'L-shunt-load')
+    pi_result = pi_match(Z_ANTENNA, F_EXAMPLE, Q_EXAMPLE, R_SOURCE)
+    pi_high_q = pi_match(Z_ANTENNA, F_EXAMPLE, 10.0, R_SOURCE)
+    t_result = t_match(Z_ANTENNA, F_EXAMPLE, Q_EXAMPLE, R_SOURCE)
+    # Trasformatore 1:2 in spire (4:1 in impedenza) con un induttore che annulla la reattanza del carico
+    l_cancel = -Z_ANTENNA.imag / (2 * np.pi * F_EXAMPLE)
+    balun = Network([Transformer(np.sqrt(R_SOURCE / Z_ANTENNA.real), l_mag=40e-6),
+                     series(l=l_cancel)])
+
+    networks = [
+        (f'L passa-basso (Q = {float(l_result.q[0]):.1f})',
+         l_result.network(_first(l_result.lowpass)), 'tab:blue'),
+        (f'L passa-alto (Q = {float(l_result.q[0]):.1f})',
+         l_result.network(_first(l_result.highpass)), 'tab:cyan'),
+        (f'Pi passa-basso (Q = {Q_EXAMPLE:g})', pi_result.network(_first(pi_result.lowpass)), 'tab:green'),
+        ('Pi passa-basso (Q = 10)', pi_high_q.network(_first(pi_high_q.lowpass)), 'tab:olive'),
+        (f'T passa-alto (Q = {Q_EXAMPLE:g})', t_result.network(_first(t_result.highpass)), 'tab:red'),
+        ('Trasformatore 4:1 + L serie', balun, 'tab:purple'),
+    ]
+
+    f_band = np.linspace(6.0e6, 8.2e6, 100_000)
+    f_wide = np.logspace(np.log10(1e6), np.log10(50e6), 100_000)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    for label, network, color in networks:
+        gamma = np.abs(impedance_to_gamma(network.input_impedance(f_band, antenna_impedance(f_band)),
+                                          R_SOURCE))
+        ax1.plot(f_band / 1e6, (1 + gamma) / (1 - gamma), color=color, linewidth=1.8, label=label)
+        # Rete senza perdite: la potenza non riflessa arriva tutta al carico
+        gamma = impedance_to_gamma(network.input_impedance(f_wide, antenna_impedance(f_wide)), R_SOURCE)
+        ax2.semilogx(f_wide / 1e6, to_db(np.sqrt(1 - np.abs(gamma) ** 2)), color=color,
+                     linewidth=1.5, label=label)
+
+    ax1.axhline(2, color='gray', linestyle=':')
+    ax1.axvspan(7.0, 7.2, color='gold', alpha=0.2, label='Banda 40 m')
+    ax1.set_ylim(1, 4)
+    ax1.set_xlabel('Frequenza (MHz)')
+    ax1.set_ylabel('SWR verso il trasmettitore')
+    ax1.set_title(f'Banda di adattamento (carico {format_impedance(Z_ANTENNA)} '
+                  f'a {F_EXAMPLE / 1e6:.1f} MHz)')
+    ax1.grid(True, linestyle='--', alpha=0.4)
+    ax1.legend(fontsize=8, loc='upper right')
+
+    for k in (2, 3, 5):
+        ax2.axvline(k * F_EXAMPLE / 1e6, color='gray', linestyle=':')
+        ax2.text(k * F_EXAMPLE / 1e6, -57, f'{k}ª arm.', fontsize=8, ha='center', color='dimgray',
+                 bbox=dict(facecolor='white', edgecolor='none', alpha=0.8))
+    ax2.set_ylim(-60, 1)
+    ax2.set_xticks([1, 2, 5, 10, 20, 50])
+    ax2.set_xticklabels(['1', '2', '5', '10', '20', '50'])
+    ax2.set_xlabel('Frequenza (MHz)')
+    ax2.set_ylabel('Potenza trasferita al carico (dB)')
+    ax2.set_title('Attenuazione fuori banda e armoniche')
+    ax2.grid(True, which='both', linestyle='--', alpha=0.4)
+
+    fig.suptitle('Reti di adattamento in frequenza', fontsize=13, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'banda_adattamento.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'banda_adattamento.png'}")
 
 
 def main():
     """Genera tutti i diagrammi delle reti di adattamento."""
     print("Generazione schemi reti di adattamento impedenza...")
-    print(f"Directory output: {OUTPUT_DIR}\n")
+    print(f"Directory output: {OUTPUT_DIR}")
+    print(f"Carico d'esempio: {format_impedance(Z_ANTENNA)} a {F_EXAMPLE / 1e6:.1f} MHz, "
+          f"Q = {Q_EXAMPLE:g}\n")
 
     draw_l_match_lowpass()
     draw_l_match_highpass()
@@ -296,8 +347,10 @@ def main():
     draw_balun_4_1()
     draw_balun_current()
     draw_antenna_tuner_complete()
+    plot_matching_bandwidth()
 
     print("\n✅ Tutti gli schemi sono stati generati con successo!")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
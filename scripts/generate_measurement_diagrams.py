@@ -6,81 +6,39 @@ Multimetro, oscilloscopio, analizzatore di spettro, ROSmetro, wattmetro.
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Rectangle
+from matplotlib.patches import FancyArrowPatch, Rectangle
 import numpy as np
 from pathlib import Path
 
+from calcoli.intermodulazione import intermod_products
+from utils import BlockDiagram
+from block_diagrams import draw_diagram, load_diagram
+
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "08_misure"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Specifiche JSON degli schemi a blocchi
+SPECS_DIR = Path(__file__).parent / 'schemi'
+
 # Configurazione stile
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.titlesize'] = 14
 plt.rcParams['figure.facecolor'] = 'white'
 
 
-def draw_block(ax, x, y, w, h, text, color='lightblue', fontsize=9):
-    """Disegna un blocco rettangolare con testo."""
-    rect = FancyBboxPatch((x - w/2, y - h/2), w, h,
-                          boxstyle="round,pad=0.02",
-                          facecolor=color, edgecolor='black', linewidth=1.5)
-    ax.add_patch(rect)
-    ax.text(x, y, text, ha='center', va='center', fontsize=fontsize,
-            fontweight='bold', wrap=True)
-
-
-def draw_arrow(ax, x1, y1, x2, y2, color='black'):
-    """Disegna una freccia tra due punti."""
-    ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                arrowprops=dict(arrowstyle='->', color=color, lw=1.5))
+def block_diagram(ax):
+    """Diagramma a blocchi nello stile degli schemi: bordi neri, senza ombre, frecce '->'."""
+    return BlockDiagram(ax, boxstyle="round,pad=0.02", border_color='black', shadow_color=None,
+                        label_color='black', zorder=1, arrow_style='->', arrow_color='black',
+                        arrow_width=1.5, mutation_scale=10)
 
 
 def schema_multimetro():
-    """Schema a blocchi multimetro digitale."""
-    fig, ax = plt.subplots(figsize=(14, 8))
-
-    # Blocchi principali
-    draw_block(ax, 1, 5, 1.8, 1.2, 'Ingresso\nV/A/Ω', 'lightyellow')
-    draw_block(ax, 3.5, 6, 2, 1, 'Selettore\nFunzione', 'lightgreen')
-    draw_block(ax, 3.5, 4, 2, 1, 'Attenuatore\nGamma', 'lightgreen')
-
-    draw_block(ax, 6, 5, 2, 1.2, 'Convertitore\nAC/DC', 'lightblue')
-    draw_block(ax, 9, 5, 2, 1.2, 'ADC\n(Convertitore\nA/D)', 'lightsalmon')
-    draw_block(ax, 12, 5, 2, 1.2, 'Microprocessore\nLogica', 'plum')
-    draw_block(ax, 12, 2.5, 2.5, 1.5, 'Display LCD\n"13.85 V"', 'lightgray')
-
-    draw_block(ax, 6, 2.5, 2, 1, 'Riferimento\nTensione', 'lightyellow')
-    draw_block(ax, 9, 2.5, 2, 1, 'Clock\nOscillatore', 'lightyellow')
-
-    # Frecce
-    draw_arrow(ax, 2, 5, 2.4, 5)
-    draw_arrow(ax, 4.6, 5.5, 4.9, 5.2)
-    draw_arrow(ax, 4.6, 4.5, 4.9, 4.8)
-    draw_arrow(ax, 7.1, 5, 7.9, 5)
-    draw_arrow(ax, 10.1, 5, 10.9, 5)
-    draw_arrow(ax, 12, 4.3, 12, 3.3)
-
-    draw_arrow(ax, 7.1, 2.5, 7.9, 4.4)
-    draw_arrow(ax, 10.1, 2.5, 10.9, 4.4)
-
-    # Input simboli
-    ax.plot([0.2, 0.2], [5.3, 4.7], 'r-', linewidth=3)
-    ax.text(0.2, 5.6, 'V/Ω/+', ha='center', fontsize=9, color='red')
-    ax.text(0.2, 4.4, 'COM', ha='center', fontsize=9)
-    ax.plot([0.2, 0.2], [5.3, 5.7], 'r-', linewidth=2)
-    ax.plot([0.2, 0.5], [5, 5], 'r-', linewidth=2)
-
-    # Titolo e note
-    ax.set_title('Schema a Blocchi - Multimetro Digitale', fontsize=14, fontweight='bold', pad=15)
-
-    ax.text(7, 7, 'Flusso segnale: Ingresso → Condizionamento → Conversione → Elaborazione → Display',
-            fontsize=10, ha='center', style='italic')
-
-    ax.set_xlim(-0.5, 14)
-    ax.set_ylim(1, 8)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    """Schema a blocchi multimetro digitale (da schemi/strumento_multimetro.json)."""
+    spec = load_diagram(SPECS_DIR / 'strumento_multimetro.json')
+    fig, ax = plt.subplots(figsize=spec.figsize)
+    draw_diagram(ax, spec)
 
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'schema_multimetro.png', dpi=150, bbox_inches='tight')
@@ -89,65 +47,10 @@ def schema_multimetro():
 
 
 def schema_oscilloscopio():
-    """Schema a blocchi oscilloscopio digitale."""
-    fig, ax = plt.subplots(figsize=(14, 10))
-
-    # Sezione ingresso (2 canali)
-    draw_block(ax, 1.5, 7, 1.5, 1, 'CH1\nInput', 'lightyellow')
-    draw_block(ax, 1.5, 5, 1.5, 1, 'CH2\nInput', 'lightyellow')
-
-    draw_block(ax, 3.5, 7, 1.8, 1, 'Attenuatore\nV/div', 'lightgreen')
-    draw_block(ax, 3.5, 5, 1.8, 1, 'Attenuatore\nV/div', 'lightgreen')
-
-    draw_block(ax, 5.8, 7, 1.8, 1, 'Amplificatore\nVerticale', 'lightblue')
-    draw_block(ax, 5.8, 5, 1.8, 1, 'Amplificatore\nVerticale', 'lightblue')
-
-    # ADC
-    draw_block(ax, 8.2, 6, 1.8, 2.5, 'ADC\n8-12 bit\n1-10 GS/s', 'lightsalmon')
-
-    # Memoria e processore
-    draw_block(ax, 10.5, 6, 2, 1.5, 'Memoria\nAcquisizione', 'plum')
-    draw_block(ax, 10.5, 3.5, 2, 1.5, 'DSP\nProcessore', 'plum')
-
-    # Display
-    draw_block(ax, 13, 5, 2.2, 3, 'Display\nLCD/LED\nTraccia', 'lightgray')
-
-    # Trigger
-    draw_block(ax, 5.8, 2.5, 2, 1.2, 'Circuito\nTrigger', 'lightcoral')
-    draw_block(ax, 3, 2.5, 1.8, 1, 'Trigger\nEsterno', 'lightyellow')
-
-    # Base tempi
-    draw_block(ax, 8.2, 2.5, 2, 1.2, 'Base Tempi\ns/div', 'lightgreen')
-
-    # Frecce canali
-    draw_arrow(ax, 2.3, 7, 2.5, 7)
-    draw_arrow(ax, 2.3, 5, 2.5, 5)
-    draw_arrow(ax, 4.5, 7, 4.8, 7)
-    draw_arrow(ax, 4.5, 5, 4.8, 5)
-    draw_arrow(ax, 6.8, 7, 7.2, 6.5)
-    draw_arrow(ax, 6.8, 5, 7.2, 5.5)
-    draw_arrow(ax, 9.2, 6, 9.4, 6)
-    draw_arrow(ax, 11.6, 6, 11.9, 5.5)
-    draw_arrow(ax, 11.6, 4, 11.9, 4.5)
-    draw_arrow(ax, 10.5, 5.2, 10.5, 4.3)
-
-    # Frecce trigger
-    draw_arrow(ax, 6.8, 5.5, 6.8, 3.2)
-    draw_arrow(ax, 4, 2.5, 4.7, 2.5)
-    draw_arrow(ax, 6.9, 2.5, 7.1, 2.5)
-    draw_arrow(ax, 9.3, 2.5, 9.4, 3.5)
-
-    # Controlli utente
-    ax.text(3.5, 8.3, 'Controlli Utente', fontsize=10, ha='center', fontweight='bold')
-    ax.add_patch(Rectangle((2.5, 8), 2, 0.5, fill=False, edgecolor='gray', linestyle='--'))
-
-    # Titolo
-    ax.set_title('Schema a Blocchi - Oscilloscopio Digitale (DSO)', fontsize=14, fontweight='bold', pad=15)
-
-    ax.set_xlim(0, 15)
-    ax.set_ylim(1, 9)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    """Schema a blocchi oscilloscopio digitale (da schemi/strumento_oscilloscopio.json)."""
+    spec = load_diagram(SPECS_DIR / 'strumento_oscilloscopio.json')
+    fig, ax = plt.subplots(figsize=spec.figsize)
+    draw_diagram(ax, spec)
 
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'schema_oscilloscopio.png', dpi=150, bbox_inches='tight')
@@ -156,61 +59,10 @@ def schema_oscilloscopio():
 
 
 def schema_analizzatore_spettro():
-    """Schema a blocchi analizzatore di spettro."""
-    fig, ax = plt.subplots(figsize=(14, 8))
-
-    # Ingresso RF
-    draw_block(ax, 1.5, 5, 1.5, 1, 'Ingresso\nRF', 'lightyellow')
-    draw_block(ax, 3.5, 5, 1.8, 1, 'Attenuatore\nRF', 'lightgreen')
-    draw_block(ax, 5.8, 5, 1.8, 1, 'Filtro\nPassa-basso', 'lightblue')
-
-    # Mixer e IF
-    draw_block(ax, 8, 5, 1.5, 1.2, 'Mixer', 'lightsalmon')
-    draw_block(ax, 8, 3, 1.8, 1, 'Oscillatore\nLocale (LO)', 'plum')
-    draw_block(ax, 10.2, 5, 1.8, 1, 'Filtro IF\n(RBW)', 'lightblue')
-
-    # Rivelatore e elaborazione
-    draw_block(ax, 12.5, 5, 1.5, 1, 'Rivelatore\nLogaritmico', 'lightsalmon')
-    draw_block(ax, 12.5, 3, 1.8, 1, 'Video\nFilter', 'lightgreen')
-
-    # Display
-    draw_block(ax, 12.5, 7, 2.5, 1.5, 'Display\nSpettro\ndBm vs MHz', 'lightgray')
-
-    # Sweep generator
-    draw_block(ax, 5, 2, 2, 1, 'Generatore\nSweep', 'plum')
-
-    # Frecce
-    draw_arrow(ax, 2.3, 5, 2.5, 5)
-    draw_arrow(ax, 4.5, 5, 4.8, 5)
-    draw_arrow(ax, 6.8, 5, 7.2, 5)
-    draw_arrow(ax, 8.8, 5, 9.2, 5)
-    draw_arrow(ax, 11.2, 5, 11.7, 5)
-    draw_arrow(ax, 12.5, 5.6, 12.5, 6.2)
-    draw_arrow(ax, 12.5, 4.4, 12.5, 3.6)
-
-    # Sweep e LO
-    draw_arrow(ax, 8, 3.6, 8, 4.3)
-    draw_arrow(ax, 6.1, 2, 7, 3)
-    draw_arrow(ax, 6.1, 2, 11.5, 7)
-
-    # Annotazioni
-    ax.text(8, 6.5, 'f_IF = f_RF - f_LO', fontsize=9, ha='center',
-            bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-    ax.text(10.2, 6.3, 'RBW\nRisoluzione', fontsize=8, ha='center', color='gray')
-
-    # Simbolo antenna ingresso
-    ax.plot([0.5, 0.5], [5.3, 4.7], 'k-', linewidth=2)
-    ax.plot([0.3, 0.7], [5.3, 5.3], 'k-', linewidth=2)
-    ax.plot([0.5, 0.9], [5, 5], 'k-', linewidth=2)
-
-    # Titolo
-    ax.set_title('Schema a Blocchi - Analizzatore di Spettro', fontsize=14, fontweight='bold', pad=15)
-
-    ax.set_xlim(0, 15)
-    ax.set_ylim(1, 8.5)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    """Schema a blocchi analizzatore di spettro (da schemi/strumento_analizzatore_spettro.json)."""
+    spec = load_diagram(SPECS_DIR / 'strumento_analizzatore_spettro.json')
+    fig, ax = plt.subplots(figsize=spec.figsize)
+    draw_diagram(ax, spec)
 
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'schema_analizzatore_spettro.png', dpi=150, bbox_inches='tight')
@@ -221,14 +73,15 @@ def schema_analizzatore_spettro():
 def schema_rosmetro():
     """Schema ROSmetro (ponte riflettometrico direzionale)."""
     fig, ax = plt.subplots(figsize=(12, 8))
+    diagram = block_diagram(ax)
 
     # Linea principale
-    ax.plot([1, 11], [5, 5], 'b-', linewidth=4)
+    diagram.line([1, 11], [5, 5], color='blue', linewidth=4)
     ax.text(6, 5.5, 'Linea di trasmissione 50Ω', ha='center', fontsize=10)
 
     # TX e Antenna
-    draw_block(ax, 1, 5, 1.5, 1.2, 'TX\n50Ω', 'lightyellow')
-    draw_block(ax, 11, 5, 1.5, 1.2, 'Antenna\nZ_L', 'lightgreen')
+    diagram.block(1, 5, 'TX\n50Ω', color='lightyellow', w=1.5, h=1.2)
+    diagram.block(11, 5, 'Antenna\nZ_L', color='lightgreen', w=1.5, h=1.2)
 
     # Accoppiatore direzionale
     ax.add_patch(Rectangle((4, 3.5), 4, 3, fill=True, facecolor='lightblue',
@@ -236,27 +89,27 @@ def schema_rosmetro():
     ax.text(6, 6.2, 'Accoppiatore Direzionale', ha='center', fontsize=10, fontweight='bold')
 
     # Porte accoppiatore
-    draw_block(ax, 4.5, 3, 1.2, 0.8, 'FWD', 'lightsalmon', fontsize=8)
-    draw_block(ax, 7.5, 3, 1.2, 0.8, 'REV', 'lightcoral', fontsize=8)
+    diagram.block(4.5, 3, 'FWD', color='lightsalmon', w=1.2, h=0.8, fontsize=8)
+    diagram.block(7.5, 3, 'REV', color='lightcoral', w=1.2, h=0.8, fontsize=8)
 
     # Rivelatori
-    draw_block(ax, 4.5, 1.5, 1.5, 0.8, 'Rivelatore\nDiodo', 'plum', fontsize=8)
-    draw_block(ax, 7.5, 1.5, 1.5, 0.8, 'Rivelatore\nDiodo', 'plum', fontsize=8)
+    diagram.block(4.5, 1.5, 'Rivelatore\nDiodo', color='plum', w=1.5, h=0.8, fontsize=8)
+    diagram.block(7.5, 1.5, 'Rivelatore\nDiodo', color='plum', w=1.5, h=0.8, fontsize=8)
 
     # Frecce accoppiamento
-    draw_arrow(ax, 4.5, 3.5, 4.5, 2.6)
-    draw_arrow(ax, 7.5, 3.5, 7.5, 2.6)
-    draw_arrow(ax, 4.5, 2, 4.5, 1.2)
-    draw_arrow(ax, 7.5, 2, 7.5, 1.2)
+    diagram.arrow(4.5, 3.5, 4.5, 2.6)
+    diagram.arrow(7.5, 3.5, 7.5, 2.6)
+    diagram.arrow(4.5, 2, 4.5, 1.2)
+    diagram.arrow(7.5, 2, 7.5, 1.2)
 
     # Meter
     ax.add_patch(mpatches.Wedge((6, 0.3), 1.5, 30, 150, facecolor='white', edgecolor='black', linewidth=2))
-    ax.plot([6, 6.8], [0.3, 1.2], 'r-', linewidth=2)  # Ago
+    diagram.line([6, 6.8], [0.3, 1.2], color='red', linewidth=2)  # Ago
     ax.text(6, -0.5, 'SWR Meter', ha='center', fontsize=10, fontweight='bold')
 
     # Frecce ai meter
-    draw_arrow(ax, 4.5, 1.1, 5.3, 0.5)
-    draw_arrow(ax, 7.5, 1.1, 6.7, 0.5)
+    diagram.arrow(4.5, 1.1, 5.3, 0.5)
+    diagram.arrow(7.5, 1.1, 6.7, 0.5)
 
     # Formule
     formula_box = dict(boxstyle='round', facecolor='lightyellow', alpha=0.9)
@@ -264,17 +117,16 @@ def schema_rosmetro():
             fontsize=9, ha='left', va='top', bbox=formula_box, family='monospace')
 
     # Direzioni potenza
-    ax.annotate('', xy=(3, 5.8), xytext=(2, 5.8),
-                arrowprops=dict(arrowstyle='->', color='green', lw=2))
+    diagram.arrow(2, 5.8, 3, 5.8, color='green', linewidth=2)
     ax.text(2.5, 6.2, 'P_fwd', fontsize=9, color='green', ha='center')
 
-    ax.annotate('', xy=(9, 4.2), xytext=(10, 4.2),
-                arrowprops=dict(arrowstyle='->', color='red', lw=2))
+    diagram.arrow(10, 4.2, 9, 4.2, color='red', linewidth=2)
     ax.text(9.5, 3.8, 'P_rev', fontsize=9, color='red', ha='center')
 
     # Titolo
     ax.set_title('Schema ROSmetro - Ponte Riflettometrico Direzionale', fontsize=14, fontweight='bold', pad=15)
 
+    diagram.render()
     ax.set_xlim(0, 13)
     ax.set_ylim(-1, 7.5)
     ax.set_aspect('equal')
@@ -287,53 +139,10 @@ def schema_rosmetro():
 
 
 def schema_wattmetro():
-    """Schema wattmetro a termocoppia/bolometro."""
-    fig, ax = plt.subplots(figsize=(12, 7))
-
-    # Ingresso RF
-    draw_block(ax, 1.5, 4, 1.5, 1, 'Ingresso\nRF', 'lightyellow')
-    draw_block(ax, 3.5, 4, 1.8, 1, 'Attenuatore\nCalibrato', 'lightgreen')
-
-    # Carico e sensore
-    draw_block(ax, 6, 4, 2, 1.5, 'Carico\nTermico\n50Ω', 'lightsalmon')
-
-    # Sensore termico
-    draw_block(ax, 6, 2, 2, 1, 'Termocoppia\no Termistore', 'plum')
-
-    # Amplificatore e display
-    draw_block(ax, 9, 3, 2, 1, 'Amplificatore\nDC', 'lightblue')
-    draw_block(ax, 11.5, 3, 2, 1.5, 'Display\nPotenza\nWatt/dBm', 'lightgray')
-
-    # Calibrazione
-    draw_block(ax, 9, 5.5, 2, 1, 'Riferimento\nCalibrazione', 'lightyellow')
-
-    # Frecce
-    draw_arrow(ax, 2.3, 4, 2.5, 4)
-    draw_arrow(ax, 4.5, 4, 4.9, 4)
-    draw_arrow(ax, 6, 3.2, 6, 2.6)
-    draw_arrow(ax, 7.1, 2, 7.9, 2.8)
-    draw_arrow(ax, 10.1, 3, 10.4, 3)
-    draw_arrow(ax, 9, 5, 9, 3.6)
-
-    # Simboli termici
-    ax.plot([5.5, 6.5], [3.8, 3.8], 'r-', linewidth=3)
-    ax.text(6, 3.5, '~', fontsize=20, ha='center', va='center', color='red')
-
-    # Formula
-    formula_box = dict(boxstyle='round', facecolor='lightyellow', alpha=0.9)
-    ax.text(3, 1, 'P = V²/R = I²R\n\nΔT ∝ P\n\nV_termo = k × ΔT',
-            fontsize=9, ha='left', va='top', bbox=formula_box, family='monospace')
-
-    # Annotazioni
-    ax.text(6, 5.5, 'Energia RF → Calore → Tensione DC', fontsize=10, ha='center', style='italic')
-
-    # Titolo
-    ax.set_title('Schema Wattmetro a Termocoppia', fontsize=14, fontweight='bold', pad=15)
-
-    ax.set_xlim(0, 14)
-    ax.set_ylim(0, 7)
-    ax.set_aspect('equal')
-    ax.axis('off')
+    """Schema wattmetro a termocoppia/bolometro (da schemi/strumento_wattmetro.json)."""
+    spec = load_diagram(SPECS_DIR / 'strumento_wattmetro.json')
+    fig, ax = plt.subplots(figsize=spec.figsize)
+    draw_diagram(ax, spec)
 
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'schema_wattmetro.png', dpi=150, bbox_inches='tight')
@@ -344,12 +153,13 @@ def schema_wattmetro():
 def setup_misura_potenza_tx():
     """Setup per misura potenza in uscita trasmettitore."""
     fig, ax = plt.subplots(figsize=(14, 7))
+    diagram = block_diagram(ax)
 
     # Trasmettitore
-    draw_block(ax, 1.5, 4, 2, 1.5, 'Trasmettitore\nTX', 'lightyellow')
+    diagram.block(1.5, 4, 'Trasmettitore\nTX', color='lightyellow', w=2, h=1.5)
 
     # Cavo coassiale 1
-    ax.plot([2.6, 4], [4, 4], 'b-', linewidth=4)
+    diagram.line([2.6, 4], [4, 4], color='blue', linewidth=4)
     ax.text(3.3, 4.5, '50Ω', ha='center', fontsize=9)
 
     # Wattmetro passante
@@ -359,19 +169,18 @@ def setup_misura_potenza_tx():
     ax.text(5.25, 3.3, 'Bird 43', ha='center', fontsize=8, style='italic')
 
     # Cavo coassiale 2
-    ax.plot([6.5, 8], [4, 4], 'b-', linewidth=4)
+    diagram.line([6.5, 8], [4, 4], color='blue', linewidth=4)
     ax.text(7.25, 4.5, '50Ω', ha='center', fontsize=9)
 
     # Carico fittizio
-    draw_block(ax, 9, 4, 2, 1.5, 'Carico\nFittizio\n50Ω', 'lightsalmon')
+    diagram.block(9, 4, 'Carico\nFittizio\n50Ω', color='lightsalmon', w=2, h=1.5)
 
     # Display wattmetro
-    draw_block(ax, 5.25, 6.5, 2, 1, 'Display\n100W', 'lightgray')
-    draw_arrow(ax, 5.25, 5.1, 5.25, 5.9)
+    diagram.block(5.25, 6.5, 'Display\n100W', color='lightgray', w=2, h=1)
+    diagram.arrow(5.25, 5.1, 5.25, 5.9)
 
     # Dissipazione calore
-    ax.annotate('', xy=(10.5, 5), xytext=(10.5, 3),
-                arrowprops=dict(arrowstyle='->', color='red', lw=2))
+    diagram.arrow(10.5, 3, 10.5, 5, color='red', linewidth=2)
     ax.text(11, 4, 'Calore', fontsize=9, color='red')
 
     # Note setup
@@ -390,6 +199,7 @@ def setup_misura_potenza_tx():
     ax.text(5.5, 2.5, 'Flusso RF', fontsize=9, color='green', ha='center')
 
     ax.set_title('Setup Misura Potenza in Uscita TX', fontsize=14, fontweight='bold', pad=15)
+    diagram.render()
     ax.set_xlim(0, 12)
     ax.set_ylim(0.5, 8)
     ax.set_aspect('equal')
@@ -404,12 +214,13 @@ def setup_misura_potenza_tx():
 def setup_misura_ros():
     """Setup per misura ROS/SWR antenna."""
     fig, ax = plt.subplots(figsize=(14, 8))
+    diagram = block_diagram(ax)
 
     # Trasmettitore
-    draw_block(ax, 1.5, 5, 2, 1.5, 'Trasmettitore\nTX\n(bassa pot.)', 'lightyellow')
+    diagram.block(1.5, 5, 'Trasmettitore\nTX\n(bassa pot.)', color='lightyellow', w=2, h=1.5)
 
     # Cavo coassiale 1
-    ax.plot([2.6, 4], [5, 5], 'b-', linewidth=4)
+    diagram.line([2.6, 4], [5, 5], color='blue', linewidth=4)
 
     # ROSmetro
     ax.add_patch(Rectangle((4, 3.8), 2.5, 2.4, fill=True, facecolor='lightblue',
@@ -421,24 +232,22 @@ def setup_misura_ros():
     ax.text(5.25, 4.3, 'SWR', ha='center', fontsize=7)
 
     # Cavo coassiale 2 (verso antenna)
-    ax.plot([6.5, 9], [5, 5], 'b-', linewidth=4)
+    diagram.line([6.5, 9], [5, 5], color='blue', linewidth=4)
     ax.text(7.75, 5.5, 'Cavo coassiale', ha='center', fontsize=9)
 
     # Antenna
     # Dipolo stilizzato
-    ax.plot([10, 10], [5, 6.5], 'k-', linewidth=3)
-    ax.plot([9, 11], [6.5, 6.5], 'k-', linewidth=3)
-    ax.plot([8.5, 9], [6.8, 6.5], 'k-', linewidth=2)
-    ax.plot([11, 11.5], [6.5, 6.8], 'k-', linewidth=2)
+    diagram.line([10, 10], [5, 6.5], linewidth=3)
+    diagram.line([9, 11], [6.5, 6.5], linewidth=3)
+    diagram.line([8.5, 9], [6.8, 6.5], linewidth=2)
+    diagram.line([11, 11.5], [6.5, 6.8], linewidth=2)
     ax.text(10, 7.3, 'Antenna\n(Dipolo)', ha='center', fontsize=10)
 
     # Frecce potenze
-    ax.annotate('', xy=(5.5, 6.5), xytext=(4.5, 6.5),
-                arrowprops=dict(arrowstyle='->', color='green', lw=2))
+    diagram.arrow(4.5, 6.5, 5.5, 6.5, color='green', linewidth=2)
     ax.text(5, 7, 'FWD', fontsize=9, color='green', ha='center')
 
-    ax.annotate('', xy=(4.5, 3.3), xytext=(5.5, 3.3),
-                arrowprops=dict(arrowstyle='->', color='red', lw=2))
+    diagram.arrow(5.5, 3.3, 4.5, 3.3, color='red', linewidth=2)
     ax.text(5, 2.9, 'REV', fontsize=9, color='red', ha='center')
 
     # Letture tipiche
@@ -461,6 +270,7 @@ def setup_misura_ros():
             fontsize=9, ha='left', va='top', bbox=note_box)
 
     ax.set_title('Setup Misura ROS (SWR) Antenna', fontsize=14, fontweight='bold', pad=15)
+    diagram.render()
     ax.set_xlim(0, 14)
     ax.set_ylim(1, 8)
     ax.set_aspect('equal')
@@ -475,71 +285,87 @@ def setup_misura_ros():
 def setup_test_due_toni():
     """Setup test due toni per linearità amplificatore."""
     fig, ax = plt.subplots(figsize=(14, 9))
+    diagram = block_diagram(ax)
+
+    # Toni di prova e prodotti IMD dispari vicini ai toni (3° e 5° ordine)
+    f1, f2 = 1000, 1700
+    products = intermod_products([f1, f2], max_order=5)
+    products = products.select(products.odd_inband)
 
     # Generatori
-    draw_block(ax, 1.5, 6, 2, 1.2, 'Generatore\nf1 = 1000 Hz', 'lightyellow')
-    draw_block(ax, 1.5, 4, 2, 1.2, 'Generatore\nf2 = 1700 Hz', 'lightyellow')
+    diagram.block(1.5, 6, f'Generatore\nf1 = {f1} Hz', color='lightyellow', w=2, h=1.2)
+    diagram.block(1.5, 4, f'Generatore\nf2 = {f2} Hz', color='lightyellow', w=2, h=1.2)
 
     # Sommatore
-    draw_block(ax, 4.5, 5, 1.5, 2, 'Σ\nMixer\nAudio', 'lightgreen')
+    diagram.block(4.5, 5, 'Σ\nMixer\nAudio', color='lightgreen', w=1.5, h=2)
 
     # Frecce ai sommatore
-    draw_arrow(ax, 2.6, 6, 3.7, 5.5)
-    draw_arrow(ax, 2.6, 4, 3.7, 4.5)
+    diagram.arrow(2.6, 6, 3.7, 5.5)
+    diagram.arrow(2.6, 4, 3.7, 4.5)
 
     # Trasmettitore SSB
-    draw_block(ax, 7, 5, 2.2, 1.5, 'TX SSB\nAmplificatore\nLineare', 'lightblue')
-    draw_arrow(ax, 5.3, 5, 5.8, 5)
+    diagram.block(7, 5, 'TX SSB\nAmplificatore\nLineare', color='lightblue', w=2.2, h=1.5)
+    diagram.arrow(5.3, 5, 5.8, 5)
 
     # Carico
-    draw_block(ax, 10, 5, 1.8, 1.2, 'Carico\n50Ω', 'lightsalmon')
-    draw_arrow(ax, 8.2, 5, 9, 5)
+    diagram.block(10, 5, 'Carico\n50Ω', color='lightsalmon', w=1.8, h=1.2)
+    diagram.arrow(8.2, 5, 9, 5)
+    diagram.render()
 
     # Accoppiatore
     ax.add_patch(Rectangle((9.3, 3.5), 1.5, 1, fill=True, facecolor='plum',
                             edgecolor='black', linewidth=1.5))
     ax.text(10.05, 4, 'Accop.', ha='center', fontsize=8)
-    ax.plot([10, 10], [4.4, 5], 'k-', linewidth=2)
+    diagram.line([10, 10], [4.4, 5], linewidth=2)
 
     # Analizzatore di spettro
-    draw_block(ax, 10, 2, 2.5, 1.5, 'Analizzatore\ndi Spettro', 'lightgray')
-    draw_arrow(ax, 10, 3.4, 10, 2.8)
+    diagram.block(10, 2, 'Analizzatore\ndi Spettro', color='lightgray', w=2.5, h=1.5)
+    diagram.arrow(10, 3.4, 10, 2.8)
+    diagram.render()
 
     # Spettro ideale
     ax.add_patch(Rectangle((0.5, 0.3), 5.5, 2.2, fill=True, facecolor='white',
                             edgecolor='black', linewidth=1.5))
     ax.text(3.25, 2.3, 'Spettro Ideale (lineare)', ha='center', fontsize=9, fontweight='bold')
 
+    # Asse frequenze audio (con segno: i prodotti possono cadere sotto 0 Hz,
+    # cioe' dall'altra parte della portante soppressa) -> coordinate dei riquadri
+    offsets = products.signed_freqs
+    f_lo = min(offsets.min(), 0) - 200
+    f_hi = max(offsets.max(), f2) + 200
+
+    def spectrum_x(f, x0, width):
+        return x0 + 0.3 + (width - 0.6) * (f - f_lo) / (f_hi - f_lo)
+
     # Barre spettro ideale
-    bar_x = [1.5, 2.5]
-    bar_h = [1.5, 1.5]
-    for x, h in zip(bar_x, bar_h):
-        ax.add_patch(Rectangle((x, 0.5), 0.3, h, facecolor='green', edgecolor='black'))
-    ax.text(1.65, 0.3, 'f1', ha='center', fontsize=8)
-    ax.text(2.65, 0.3, 'f2', ha='center', fontsize=8)
+    for f, name in ((f1, 'f1'), (f2, 'f2')):
+        x = spectrum_x(f, 0.5, 5.5)
+        ax.add_patch(Rectangle((x - 0.1, 0.5), 0.2, 1.5, facecolor='green', edgecolor='black'))
+        ax.text(x, 0.3, name, ha='center', fontsize=8)
 
     # Spettro con IMD
     ax.add_patch(Rectangle((6.5, 0.3), 6, 2.2, fill=True, facecolor='white',
                             edgecolor='black', linewidth=1.5))
     ax.text(9.5, 2.3, 'Spettro con Distorsione (IMD)', ha='center', fontsize=9, fontweight='bold')
 
-    # Barre spettro distorto
-    imd_x = [7.2, 8, 9, 10, 10.8, 11.6]
-    imd_h = [0.3, 0.6, 1.5, 1.5, 0.6, 0.3]
-    imd_c = ['red', 'red', 'green', 'green', 'red', 'red']
-    labels = ['2f1-f2', 'f1', 'f1', 'f2', 'f2', '2f2-f1']
-    for i, (x, h, c) in enumerate(zip(imd_x, imd_h, imd_c)):
-        ax.add_patch(Rectangle((x, 0.5), 0.3, h, facecolor=c, edgecolor='black'))
-
-    ax.text(7.35, 0.3, 'IMD3', ha='center', fontsize=7, color='red')
-    ax.text(9.15, 0.3, 'f1', ha='center', fontsize=7)
-    ax.text(10.15, 0.3, 'f2', ha='center', fontsize=7)
-    ax.text(11.75, 0.3, 'IMD3', ha='center', fontsize=7, color='red')
+    # Barre spettro distorto: altezza decrescente con l'ordine del prodotto
+    order_height = {3: 0.6, 5: 0.3}
+    for f, name in ((f1, 'f1'), (f2, 'f2')):
+        x = spectrum_x(f, 6.5, 6)
+        ax.add_patch(Rectangle((x - 0.1, 0.5), 0.2, 1.5, facecolor='green', edgecolor='black'))
+        ax.text(x, 0.3, name, ha='center', fontsize=7)
+    for f, order, label in zip(offsets, products.order, products.labels()):
+        x = spectrum_x(f, 6.5, 6)
+        height = order_height.get(int(order), 0.15)
+        ax.add_patch(Rectangle((x - 0.1, 0.5), 0.2, height, facecolor='red', edgecolor='black'))
+        ax.text(x, 0.3, f'IMD{order}', ha='center', fontsize=7, color='red')
+        ax.text(x, 0.6 + height, f'{label}\n{f:.0f} Hz', ha='center', fontsize=6, color='red')
 
     # Annotazione IMD
-    ax.annotate('', xy=(7.35, 1.3), xytext=(9.15, 1.8),
-                arrowprops=dict(arrowstyle='->', color='red', lw=1.5))
-    ax.text(8, 1.7, 'IMD3\n-30dB', ha='center', fontsize=8, color='red')
+    x_imd3 = spectrum_x(2 * f1 - f2, 6.5, 6)
+    x_f1 = spectrum_x(f1, 6.5, 6)
+    diagram.arrow(x_f1 - 0.1, 1.8, x_imd3 + 0.1, 1.3, color='red')
+    ax.text((x_imd3 + x_f1) / 2, 1.85, 'IMD3 -30dB', ha='center', fontsize=8, color='red')
 
     # Formula
     formula_box = dict(boxstyle='round', facecolor='lightyellow', alpha=0.9)
@@ -548,6 +374,7 @@ def setup_test_due_toni():
             fontsize=9, ha='left', bbox=formula_box)
 
     ax.set_title('Setup Test Due Toni - Verifica Linearità Amplificatore', fontsize=14, fontweight='bold', pad=15)
+    diagram.render()
     ax.set_xlim(0, 13)
     ax.set_ylim(-0.2, 8.5)
     ax.set_aspect('equal')
@@ -562,6 +389,7 @@ def setup_test_due_toni():
 def setup_sonde_oscilloscopio():
     """Posizionamento sonde oscilloscopio per misure RF."""
     fig, ax = plt.subplots(figsize=(14, 9))
+    diagram = block_diagram(ax)
 
     # Oscilloscopio
     ax.add_patch(Rectangle((9, 2), 4, 5, fill=True, facecolor='lightgray',
@@ -592,28 +420,28 @@ def setup_sonde_oscilloscopio():
     ax.text(4, 5.5, 'Circuito Sotto Test', ha='center', fontsize=11, fontweight='bold')
 
     # Componenti interni
-    draw_block(ax, 2.5, 4.5, 1.2, 0.8, 'Stadio\nIngresso', 'lightyellow', fontsize=7)
-    draw_block(ax, 4, 4.5, 1.2, 0.8, 'Filtro', 'lightblue', fontsize=7)
-    draw_block(ax, 5.5, 4.5, 1.2, 0.8, 'Amplif.', 'lightsalmon', fontsize=7)
+    diagram.block(2.5, 4.5, 'Stadio\nIngresso', color='lightyellow', w=1.2, h=0.8, fontsize=7)
+    diagram.block(4, 4.5, 'Filtro', color='lightblue', w=1.2, h=0.8, fontsize=7)
+    diagram.block(5.5, 4.5, 'Amplif.', color='lightsalmon', w=1.2, h=0.8, fontsize=7)
 
-    ax.plot([3.2, 3.3], [4.5, 4.5], 'k-', linewidth=2)
-    ax.plot([4.7, 4.8], [4.5, 4.5], 'k-', linewidth=2)
+    diagram.line([3.2, 3.3], [4.5, 4.5], linewidth=2)
+    diagram.line([4.7, 4.8], [4.5, 4.5], linewidth=2)
 
     # Sonda CH1 (ingresso)
-    ax.plot([2.5, 2.5, 8, 10.25], [4, 2, 2, 1.7], 'y-', linewidth=2.5)
+    diagram.line([2.5, 2.5, 8, 10.25], [4, 2, 2, 1.7], color='y', linewidth=2.5)
     ax.add_patch(mpatches.Circle((2.5, 4), 0.15, facecolor='yellow', edgecolor='black'))
     ax.text(2.5, 3.5, 'Sonda\nCH1', ha='center', fontsize=8, color='darkgoldenrod')
 
     # Sonda CH2 (uscita)
-    ax.plot([5.5, 5.5, 8.5, 11.25], [4, 1.2, 1.2, 1.7], 'c-', linewidth=2.5)
+    diagram.line([5.5, 5.5, 8.5, 11.25], [4, 1.2, 1.2, 1.7], color='c', linewidth=2.5)
     ax.add_patch(mpatches.Circle((5.5, 4), 0.15, facecolor='cyan', edgecolor='black'))
     ax.text(5.5, 3.5, 'Sonda\nCH2', ha='center', fontsize=8, color='darkcyan')
 
     # Massa comune
-    ax.plot([1.5, 1.5], [3, 1], 'k-', linewidth=2)
-    ax.plot([1.2, 1.8], [1, 1], 'k-', linewidth=2)
-    ax.plot([1.3, 1.7], [0.8, 0.8], 'k-', linewidth=1.5)
-    ax.plot([1.4, 1.6], [0.6, 0.6], 'k-', linewidth=1)
+    diagram.line([1.5, 1.5], [3, 1], linewidth=2)
+    diagram.line([1.2, 1.8], [1, 1], linewidth=2)
+    diagram.line([1.3, 1.7], [0.8, 0.8])
+    diagram.line([1.4, 1.6], [0.6, 0.6], linewidth=1)
     ax.text(1.5, 0.3, 'GND', ha='center', fontsize=8)
 
     # Clip massa sonde
@@ -641,6 +469,7 @@ def setup_sonde_oscilloscopio():
             fontsize=8, ha='left', va='top', bbox=probe_box)
 
     ax.set_title('Posizionamento Sonde Oscilloscopio', fontsize=14, fontweight='bold', pad=15)
+    diagram.render()
     ax.set_xlim(0, 14)
     ax.set_ylim(0, 9)
     ax.set_aspect('equal')
@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
 Script per generare diagrammi di oscillatori per il Capitolo 3 (versione minimale)
+
+Gli schemi Colpitts, Hartley, Clapp e Pierce riportano frequenza e guadagno
+minimo calcolati con calcoli.oscillatori; i grafici mostrano la stabilita'
+in frequenza e l'avviamento simulato nel tempo.
 """
 
-import schemdraw
+import matplotlib.pyplot as plt
+import numpy as np
+import schemdraw.dsp as dsp
 import schemdraw.elements as elm
 import os
 
-from utils import get_output_dir, run_with_error_handling
+from calcoli.oscillatori import clapp, colpitts, hartley, pierce, start_up
+from calcoli.quarzo import crystal
+from utils import format_si, get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 # Directory di output
 OUTPUT_DIR = get_output_dir("03_circuiti")
@@ -22,7 +31,7 @@ def draw_basic_oscillators():
     """Disegna oscillatori base senza riferimenti complessi"""
     
     # Oscillatore LC base
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_cc')
     d1 += elm.Resistor().label('R_c').right()
     d1 += elm.BjtNpn().label('Q1').right()
@@ -38,7 +47,7 @@ def draw_basic_oscillators():
     d1.save(OUTPUT_DIR / 'oscillatore_lc_base.svg')
     
     # Oscillatore a quarzo
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('V_in')
     d2 += elm.Resistor().label('R_f').right()
     d2 += elm.Ic().label('XTAL').right()
@@ -51,7 +60,7 @@ def draw_basic_oscillators():
     d2.save(OUTPUT_DIR / 'oscillatore_quarzo_base.svg')
     
     # VCO base
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceV().label('V_control')
     d3 += elm.Varactor().label('D_v').right()
     d3 += elm.Inductor().label('L').right()
@@ -69,7 +78,7 @@ def draw_resonant_circuits():
     """Disegna circuiti risonanti"""
     
     # Circuito LC risonante
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.Inductor().label('L').right()
     d1 += elm.Capacitor().label('C').down()
     d1 += elm.Ground()
@@ -80,7 +89,7 @@ def draw_resonant_circuits():
     d1.save(OUTPUT_DIR / 'circuito_risonante_lc.svg')
     
     # Circuito cristallo
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.Capacitor().label('C_p').right()
     d2 += elm.Inductor().label('L_m').right()
     d2 += elm.Capacitor().label('C_m').down()
@@ -93,6 +102,196 @@ def draw_resonant_circuits():
     
     print("Circuiti risonanti generati")
 
+# Oscillatori d'esempio: VFO per i 40 m e oscillatore di riferimento a quarzo
+OSCILLATORS = {
+    'colpitts': dict(design=colpitts(2.2e-6, 470e-12, 470e-12),
+                     tank=(('C', 'C1', 470e-12), ('L', 'L', 2.2e-6), ('C', 'C2', 470e-12))),
+    'hartley': dict(design=hartley(1.0e-6, 0.2e-6, 430e-12),
+                    tank=(('L', 'L1', 1.0e-6), ('C', 'C', 430e-12), ('L', 'L2', 0.2e-6))),
+    'clapp': dict(design=clapp(10e-6, 1000e-12, 1000e-12, 56e-12),
+                  tank=(('C', 'C1', 1000e-12), ('L+C', 'L, C3', (10e-6, 56e-12)),
+                        ('C', 'C2', 1000e-12))),
+    'pierce': dict(design=pierce(crystal('10MHz'), 33e-12, 33e-12),
+                   tank=(('C', 'C1', 33e-12), ('X', 'XTAL', 10e6), ('C', 'C2', 33e-12))),
+}
+
+
+def _value_label(kind, name, value):
+    """Etichetta di un componente dell'anello di reazione."""
+    if kind == 'L+C':
+        return f'{name}\n{format_si(value[0], "H")}, {format_si(value[1], "F")}'
+    unit = {'L': 'H', 'C': 'F', 'X': 'Hz'}[kind]
+    return f'{name}\n{format_si(value, unit, 4 if kind == "X" else 3)}'
+
+
+def draw_feedback_oscillator(name, design, tank):
+    """
+    Amplificatore chiuso su una rete a Pi: elemento verso massa in uscita,
+    elemento serie, elemento verso massa in ingresso. Frequenza e guadagno
+    minimo sono quelli calcolati per i componenti indicati.
+    """
+    def element(kind):
+        return {'L': elm.Inductor, 'C': elm.Capacitor, 'X': elm.Crystal}[kind]()
+
+    d = CachedDrawing(unit=3, show=False)
+
+    # Rete a Pi, da destra (uscita) a sinistra (ingresso)
+    d += elm.Dot().at((0, 0))
+    node_out = d.here
+    out_kind, out_name, out_value = tank[0]
+    d.push()
+    d += element(out_kind).down().label(_value_label(out_kind, out_name, out_value),
+                                        loc='bot', fontsize=10)
+    d += elm.Ground()
+    d.pop()
+
+    series_kind, series_name, series_value = tank[1]
+    if series_kind == 'L+C':
+        d += elm.Capacitor().left().label(f'C3\n{format_si(series_value[1], "F")}', fontsize=10)
+        d += elm.Inductor().left().label(f'L\n{format_si(series_value[0], "H")}', fontsize=10)
+    else:
+        d += element(series_kind).left().length(4).label(
+            _value_label(series_kind, series_name, series_value), fontsize=10)
+    d += elm.Dot()
+    node_in = d.here
+
+    in_kind, in_name, in_value = tank[2]
+    d.push()
+    d += element(in_kind).down().label(_value_label(in_kind, in_name, in_value),
+                                       loc='bot', fontsize=10)
+    d += elm.Ground()
+    d.pop()
+
+    # Amplificatore sopra la rete, chiuso ad anello
+    y_amp = 2.2
+    d += elm.Line().left().length(1)
+    d += elm.Line().up().toy(y_amp)
+    d += elm.Line().right().tox(node_in[0] + (node_out[0] - node_in[0]) / 2 - 1)
+    amp = d.add(dsp.Amp().right().anchor('input')
+                .label(f'A ≥ {float(design.gain_min):.2g}', loc='bottom', fontsize=11))
+    d += elm.Line().at(amp.out).right().tox(node_out[0] + 1)
+    d += elm.Line().down().toy(node_out[1])
+    d += elm.Line().left().tox(node_out[0])
+    d += elm.Label().at((node_out[0] + 1.6, node_out[1])).label('OUT', fontsize=10)
+
+    digits = 7 if design.kind == 'pierce' else 4
+    d += elm.Label().at((node_in[0] + (node_out[0] - node_in[0]) / 2, y_amp + 1.4)).label(
+        f'{name.capitalize()}: f = {format_si(float(design.f_hz), "Hz", digits)}, '
+        f'β = {float(design.feedback):.2g}', fontsize=13)
+
+    filename = f'oscillatore_{name}.svg'
+    d.save(OUTPUT_DIR / filename)
+    print(f"✓ Salvato: {OUTPUT_DIR / filename}")
+
+
+def draw_feedback_oscillators():
+    """Schemi annotati di Colpitts, Hartley, Clapp e Pierce."""
+    for name, spec in OSCILLATORS.items():
+        draw_feedback_oscillator(name, spec['design'], spec['tank'])
+
+
+def plot_frequency_stability():
+    """Stabilita' della frequenza: capacita' parassite, carico del quarzo, reazione."""
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(17, 5))
+
+    # Colpitts e Clapp alla stessa frequenza: effetto delle capacita' del transistor
+    c_stray = np.linspace(0, 20e-12, 200)
+    for label, fn, color in [
+        ('Colpitts (L 2.2 μH, C1 = C2 = 470 pF)',
+         lambda cs: colpitts(2.2e-6, 470e-12, 470e-12, cs), 'tab:blue'),
+        ('Clapp (L 10 μH, C1 = C2 = 1 nF, C3 = 56 pF)',
+         lambda cs: clapp(10e-6, 1000e-12, 1000e-12, 56e-12, cs), 'tab:red'),
+    ]:
+        f = fn(c_stray).f_hz
+        ax1.plot(c_stray * 1e12, (f / f[0] - 1) * 1e6, color=color, linewidth=2,
+                 label=f'{label}\nf₀ = {f[0] / 1e6:.2f} MHz')
+    ax1.set_xlabel('Capacità parassita del transistor (pF)')
+    ax1.set_ylabel('Scostamento di frequenza (ppm)')
+    ax1.set_title('Il Clapp è meno sensibile al transistor')
+    ax1.grid(True, linestyle='--', alpha=0.5)
+    ax1.legend(fontsize=8)
+
+    # Quarzo: frequenza in funzione della capacita' di carico (Pierce)
+    c_load = np.linspace(5e-12, 50e-12, 300)
+    for name, color in [('4MHz', 'tab:green'), ('10MHz', 'tab:orange'), ('14.318MHz', 'tab:purple')]:
+        xtal = crystal(name)
+        offset = (xtal.load_frequency(c_load) / xtal.f_series - 1) * 1e6
+        ax2.plot(c_load * 1e12, offset, color=color, linewidth=2, label=xtal.label)
+    xtal = crystal('10MHz')
+    c_pierce = np.array([22e-12, 33e-12, 47e-12, 68e-12])
+    osc = pierce(xtal, c_pierce, c_pierce)
+    ax2.plot(c_pierce / 2 * 1e12, (osc.f_hz / xtal.f_series - 1) * 1e6, 'ko', markersize=5,
+             label='Pierce 10 MHz, C1 = C2 = 22-68 pF')
+    ax2.set_xlabel('Capacità di carico C_L (pF)')
+    ax2.set_ylabel('f - f_s (ppm)')
+    ax2.set_title('"Tiraggio" del quarzo con la capacità di carico')
+    ax2.grid(True, linestyle='--', alpha=0.5)
+    ax2.legend(fontsize=8)
+
+    # Guadagno minimo in funzione del partitore capacitivo
+    ratio = np.logspace(-1, 1, 200)
+    design = colpitts(2.2e-6, 470e-12 * ratio, 470e-12)
+    ax3.loglog(ratio, design.gain_min, color='tab:blue', linewidth=2, label='Guadagno minimo 1/β')
+    ax3b = ax3.twinx()
+    ax3b.semilogx(ratio, design.f_hz / 1e6, color='tab:red', linewidth=2, label='Frequenza')
+    ax3.set_xlabel('C1 / C2')
+    ax3.set_ylabel('Guadagno minimo per l\'innesco', color='tab:blue')
+    ax3b.set_ylabel('Frequenza (MHz)', color='tab:red')
+    ax3.set_title('Colpitts: il partitore fissa la reazione β = C1/C2')
+    ax3.grid(True, which='both', linestyle='--', alpha=0.5)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'oscillatori_stabilita.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'oscillatori_stabilita.png'}")
+
+
+def plot_start_up():
+    """Avviamento simulato: crescita esponenziale e limitazione dell'ampiezza."""
+    design = OSCILLATORS['colpitts']['design']
+    l, c = float(design.l_eff), float(design.c_eff)
+    q_tank = 20.0
+    r_tank = q_tank * np.sqrt(l / c)
+    gains = np.geomspace(1.1, 5.0, 24)
+    shown = np.array([1.5, 2.0, 4.0])
+    result = start_up(l, c, r_tank, np.concatenate([shown, gains]), n_periods=240)
+    periods = result.t * float(design.f_hz)
+
+    fig = plt.figure(figsize=(15, 7))
+    grid = fig.add_gridspec(3, 2, width_ratios=[1.4, 1])
+    colors = ['tab:blue', 'tab:orange', 'tab:red']
+    for k, (gain, color) in enumerate(zip(shown, colors)):
+        ax = fig.add_subplot(grid[k, 0])
+        ax.plot(periods, result.v[k], color=color, linewidth=0.6)
+        ax.set_ylabel('v (V)')
+        ax.set_xlim(0, periods[-1])
+        ax.text(0.01, 0.85, f'G = {gain:g}: ampiezza {result.amplitude[k]:.2f} V',
+                transform=ax.transAxes, fontsize=9,
+                bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
+        ax.grid(True, linestyle='--', alpha=0.4)
+        if k == 0:
+            ax.set_title(f'Forma d\'onda all\'avviamento (f₀ = {float(design.f_hz) / 1e6:.2f} MHz, '
+                         f'Q = {q_tank:.0f})')
+    ax.set_xlabel('Tempo (periodi)')
+
+    ax = fig.add_subplot(grid[:, 1])
+    envelope = result.envelope[len(shown):]
+    cmap = plt.cm.plasma(np.linspace(0, 1, len(gains)))
+    for gain, env, color in zip(gains, envelope, cmap):
+        ax.semilogy(np.arange(env.size) + 0.5, env, color=color, linewidth=1.2)
+    sm = plt.cm.ScalarMappable(cmap='plasma', norm=plt.Normalize(gains[0], gains[-1]))
+    fig.colorbar(sm, ax=ax, label='Guadagno d\'anello G')
+    ax.set_xlabel('Tempo (periodi)')
+    ax.set_ylabel('Ampiezza di picco (V)')
+    ax.set_title('Inviluppo: crescita e^((G-1)ω₀t/2Q), poi limitazione')
+    ax.grid(True, which='both', linestyle='--', alpha=0.4)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'oscillatore_avvio.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'oscillatore_avvio.png'}")
+
+
 def main():
     """Funzione principale che genera tutti i diagrammi di oscillatori"""
     print("Inizio generazione diagrammi di oscillatori...")
@@ -100,8 +299,12 @@ def main():
     setup_output_directory()
     draw_basic_oscillators()
     draw_resonant_circuits()
+    draw_feedback_oscillators()
+    plot_frequency_stability()
+    plot_start_up()
     
     print("Tutti i diagrammi di oscillatori sono stati generati con successo!")
+    print(schematic_cache_report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
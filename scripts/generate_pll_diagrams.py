@@ -9,12 +9,17 @@ from matplotlib.patches import FancyBboxPatch, Rectangle
 import numpy as np
 from pathlib import Path
 
-from utils import get_output_dir, run_with_error_handling, COLORS_BLOCK_DIAGRAM
+from utils import get_output_dir, run_with_error_handling, save_figure, BlockDiagram, COLORS_BLOCK_DIAGRAM, \
+    WEB_OUTPUTS
+from block_diagrams import draw_diagram, load_diagram
 
 
 # Directory di output
 OUTPUT_DIR = get_output_dir('03_circuiti')
 
+# Specifiche JSON degli schemi a blocchi
+SPECS_DIR = Path(__file__).parent / 'schemi'
+
 # Configurazione stile
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.titlesize'] = 12
@@ -45,19 +50,10 @@ def plot_pll_basic():
     block_w = 0.14
     block_h = 0.10
 
-    def draw_block(x, y, label, sublabel, color):
-        shadow = FancyBboxPatch((x - block_w/2 + 0.003, y - block_h/2 - 0.003),
-                                block_w, block_h, boxstyle="round,pad=0.008,rounding_size=0.015",
-                                facecolor=colors['shadow'], edgecolor='none', zorder=1)
-        ax.add_patch(shadow)
-        rect = FancyBboxPatch((x - block_w/2, y - block_h/2), block_w, block_h,
-                              boxstyle="round,pad=0.008,rounding_size=0.015",
-                              facecolor=color, edgecolor=colors['border'], linewidth=2, zorder=2)
-        ax.add_patch(rect)
-        ax.text(x, y + 0.02, label, ha='center', va='center', fontsize=10,
-                fontweight='bold', color='#1e293b', zorder=3)
-        ax.text(x, y - 0.025, sublabel, ha='center', va='center', fontsize=8,
-                color='#475569', zorder=3)
+    diagram = BlockDiagram(ax, block_w, block_h, boxstyle="round,pad=0.008,rounding_size=0.015",
+                           border_color=colors['border'], linewidth=2,
+                           shadow_color=colors['shadow'], shadow_offset=0.003,
+                           fontsize=10, sub_fontsize=8, label_dy=(0.02, -0.025))
 
     # Posizioni
     y_main = 0.55
@@ -73,38 +69,35 @@ def plot_pll_basic():
     # Ingresso riferimento
     ax.text(x_ref - 0.06, y_main, 'f_ref', fontsize=11, ha='center', va='center',
             fontweight='bold', color='#1e40af')
-    ax.annotate('', xy=(x_pd - block_w/2 - 0.01, y_main), xytext=(x_ref, y_main),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2.5, mutation_scale=15))
+    diagram.arrow(x_ref, y_main, x_pd - block_w/2 - 0.01, y_main, linewidth=2.5, mutation_scale=15)
 
     # Blocchi principali
-    draw_block(x_pd, y_main, 'RIVELATORE', 'di Fase (PD)', colors['detector'])
-    draw_block(x_lf, y_main, 'FILTRO', 'di Anello (LF)', colors['filter'])
-    draw_block(x_vco, y_main, 'VCO', 'Osc. Controllato', colors['vco'])
+    diagram.block(x_pd, y_main, 'RIVELATORE', 'di Fase (PD)', colors['detector'])
+    diagram.block(x_lf, y_main, 'FILTRO', 'di Anello (LF)', colors['filter'])
+    diagram.block(x_vco, y_main, 'VCO', 'Osc. Controllato', colors['vco'])
 
     # Frecce catena principale
     for x1, x2 in [(x_pd, x_lf), (x_lf, x_vco)]:
-        ax.annotate('', xy=(x2 - block_w/2 - 0.01, y_main), xytext=(x1 + block_w/2 + 0.01, y_main),
-                    arrowprops=dict(arrowstyle='-|>', color='#22c55e', lw=2, mutation_scale=12))
+        diagram.arrow(x1 + block_w/2 + 0.01, y_main, x2 - block_w/2 - 0.01, y_main, color='#22c55e')
 
     # Uscita
-    ax.annotate('', xy=(x_out, y_main), xytext=(x_vco + block_w/2 + 0.01, y_main),
-                arrowprops=dict(arrowstyle='-|>', color='#22c55e', lw=2.5, mutation_scale=15))
+    diagram.arrow(x_vco + block_w/2 + 0.01, y_main, x_out, y_main, color='#22c55e', linewidth=2.5,
+                  mutation_scale=15)
     ax.text(x_out + 0.04, y_main, 'f_out', fontsize=11, ha='center', va='center',
             fontweight='bold', color='#166534')
 
     # Divisore di frequenza (feedback)
-    draw_block(x_div, y_fb, 'DIVISORE', ':N', colors['divider'])
+    diagram.block(x_div, y_fb, 'DIVISORE', ':N', colors['divider'])
 
     # Linee feedback
-    ax.plot([x_vco, x_vco], [y_main - block_h/2 - 0.01, y_fb + 0.06], color='#8b5cf6', lw=2)
-    ax.plot([x_vco, x_div + block_w/2 + 0.01], [y_fb + 0.06, y_fb + 0.06], color='#8b5cf6', lw=2)
-    ax.annotate('', xy=(x_div + block_w/2 + 0.01, y_fb), xytext=(x_div + block_w/2 + 0.01, y_fb + 0.06),
-                arrowprops=dict(arrowstyle='-|>', color='#8b5cf6', lw=2, mutation_scale=12))
+    diagram.line([x_vco, x_vco], [y_main - block_h/2 - 0.01, y_fb + 0.06], color='#8b5cf6')
+    diagram.line([x_vco, x_div + block_w/2 + 0.01], [y_fb + 0.06, y_fb + 0.06], color='#8b5cf6')
+    diagram.arrow(x_div + block_w/2 + 0.01, y_fb + 0.06, x_div + block_w/2 + 0.01, y_fb,
+                  color='#8b5cf6')
 
-    ax.plot([x_div - block_w/2 - 0.01, x_pd - 0.02], [y_fb, y_fb], color='#8b5cf6', lw=2)
-    ax.plot([x_pd - 0.02, x_pd - 0.02], [y_fb, y_main - block_h/2 - 0.01], color='#8b5cf6', lw=2)
-    ax.annotate('', xy=(x_pd - 0.02, y_main - block_h/2 - 0.01), xytext=(x_pd - 0.02, y_fb),
-                arrowprops=dict(arrowstyle='-|>', color='#8b5cf6', lw=2, mutation_scale=12))
+    diagram.line([x_div - block_w/2 - 0.01, x_pd - 0.02], [y_fb, y_fb], color='#8b5cf6')
+    diagram.line([x_pd - 0.02, x_pd - 0.02], [y_fb, y_main - block_h/2 - 0.01], color='#8b5cf6')
+    diagram.arrow(x_pd - 0.02, y_fb, x_pd - 0.02, y_main - block_h/2 - 0.01, color='#8b5cf6')
 
     # Annotazioni segnali
     signals = [
@@ -142,6 +135,7 @@ def plot_pll_basic():
         ax.text(x_leg + 0.025, 0.12, label, fontsize=8, va='center')
         x_leg += 0.12
 
+    diagram.render()
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
     ax.axis('off')
@@ -153,91 +147,13 @@ def plot_pll_basic():
 
 
 def plot_pll_synthesizer():
-    """Schema sintetizzatore di frequenza con PLL."""
-    fig, ax = plt.subplots(figsize=(14, 8))
-    ax.set_facecolor('#fef3c7')
-
-    ax.text(0.5, 0.94, 'Sintetizzatore di Frequenza', fontsize=18, fontweight='bold',
-            ha='center', transform=ax.transAxes, color='#92400e')
-    ax.text(0.5, 0.89, 'Applicazione tipica PLL per ricetrasmettitori', fontsize=11,
-            ha='center', transform=ax.transAxes, color='#4a5568')
-
-    colors = {
-        'xtal': '#dbeafe',
-        'pll': '#bbf7d0',
-        'vco': '#fecaca',
-        'mix': '#ddd6fe',
-        'border': '#374151',
-        'shadow': '#94a3b8',
-    }
-
-    block_w = 0.12
-    block_h = 0.09
-
-    def draw_block(x, y, label, sublabel, color, w=None):
-        w = w or block_w
-        shadow = FancyBboxPatch((x - w/2 + 0.002, y - block_h/2 - 0.002),
-                                w, block_h, boxstyle="round,pad=0.006,rounding_size=0.012",
-                                facecolor=colors['shadow'], edgecolor='none', zorder=1)
-        ax.add_patch(shadow)
-        rect = FancyBboxPatch((x - w/2, y - block_h/2), w, block_h,
-                              boxstyle="round,pad=0.006,rounding_size=0.012",
-                              facecolor=color, edgecolor=colors['border'], linewidth=1.5, zorder=2)
-        ax.add_patch(rect)
-        ax.text(x, y + 0.018, label, ha='center', va='center', fontsize=9,
-                fontweight='bold', color='#1e293b', zorder=3)
-        ax.text(x, y - 0.018, sublabel, ha='center', va='center', fontsize=7,
-                color='#475569', zorder=3)
-
-    y_main = 0.55
-    y_pll = 0.30
+    """Schema sintetizzatore di frequenza con PLL (da schemi/pll_sintetizzatore.json)."""
+    spec = load_diagram(SPECS_DIR / 'pll_sintetizzatore.json')
+    fig, ax = plt.subplots(figsize=spec.figsize)
+    draw_diagram(ax, spec)
 
-    # Blocchi
-    draw_block(0.12, y_main, 'XTAL', '10 MHz', colors['xtal'])
-    draw_block(0.30, y_main, 'PLL 1', 'x10', colors['pll'])
-    draw_block(0.50, y_main, 'VCO', '90-110 MHz', colors['vco'], w=0.14)
-    draw_block(0.70, y_main, 'MIXER', 'Upconv.', colors['mix'])
-    draw_block(0.88, y_main, 'OUT', '144 MHz', colors['pll'])
-
-    # PLL programmabile
-    draw_block(0.50, y_pll, 'PLL 2', 'Programm.', colors['pll'])
-    draw_block(0.30, y_pll, 'uC', 'Controllo', colors['xtal'])
-
-    # Frecce
-    for x1, x2 in [(0.12, 0.30), (0.30, 0.50), (0.50, 0.70), (0.70, 0.88)]:
-        ax.annotate('', xy=(x2 - block_w/2 - 0.01, y_main), xytext=(x1 + block_w/2 + 0.01, y_main),
-                    arrowprops=dict(arrowstyle='-|>', color='#22c55e', lw=2, mutation_scale=12))
-
-    # Feedback PLL2
-    ax.plot([0.50, 0.50], [y_main - block_h/2 - 0.01, y_pll + block_h/2 + 0.01], color='#8b5cf6', lw=1.5)
-    ax.annotate('', xy=(0.30 + block_w/2 + 0.01, y_pll), xytext=(0.50 - block_w/2 - 0.01, y_pll),
-                arrowprops=dict(arrowstyle='<|-', color='#ef4444', lw=1.5, mutation_scale=10))
-
-    # Frequenze
-    freqs = [
-        (0.12, y_main + 0.07, '10 MHz'),
-        (0.30, y_main + 0.07, '100 MHz'),
-        (0.50, y_main + 0.07, '90-110 MHz'),
-        (0.88, y_main + 0.07, '144 MHz'),
-    ]
-    for x, y, text in freqs:
-        ax.text(x, y, text, fontsize=8, ha='center', fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.15', facecolor='#dcfce7', edgecolor='#16a34a', linewidth=0.8))
-
-    # Info box
-    info = 'Sintesi indiretta:\nVCO controllato da PLL\nRisoluzione = f_ref / N\nTipico: 1-10 kHz step'
-    ax.text(0.15, 0.72, info, fontsize=8, ha='left', va='center',
-            color='#92400e', linespacing=1.4,
-            bbox=dict(boxstyle='round,pad=0.4', facecolor='white', edgecolor='#d97706', linewidth=1.5))
-
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    plt.savefig(OUTPUT_DIR / 'pll_sintetizzatore.png', dpi=150, bbox_inches='tight',
-                facecolor='#fef3c7', edgecolor='none')
-    plt.close()
-    print("[OK] Salvato: pll_sintetizzatore.png")
+    save_figure(fig, '03_circuiti', 'pll_sintetizzatore.png', facecolor=ax.get_facecolor(),
+                fixed_layout=True, inputs=spec, outputs=WEB_OUTPUTS)
 
 
 def plot_vco_detail():
@@ -4,33 +4,57 @@ Script per generare diagrammi di alimentazioni per il Capitolo 3.
 Raddrizzatori, regolatori, switching e protezioni.
 """
 
-import schemdraw
+import matplotlib.pyplot as plt
+import numpy as np
 import schemdraw.elements as elm
 
+from calcoli.alimentatori import RECTIFIERS, boost, buck, rectifier, ripple_estimate
+from calcoli.diodi import DIODES, current, diode, operating_point, zener_regulator
 from utils import get_output_dir, run_with_error_handling
+from schematics import CachedDrawing, schematic_cache_report
 
 
 # Directory di output
 OUTPUT_DIR = get_output_dir('03_circuiti')
 
+# Raddrizzatore di esempio: secondario 12 V efficaci, carico 1 kOhm
+RECTIFIER_V_RMS = 12.0
+RECTIFIER_R_LOAD = 1000.0
+
+RECTIFIER_LABELS = {
+    'half-wave': 'Semionda',
+    'full-wave': 'Onda intera (presa centrale)',
+    'bridge': 'Ponte di Graetz',
+}
+
+# Stabilizzatore Zener di esempio
+ZENER = '1N4733'
+ZENER_V_IN = 12.0
+ZENER_R_S = 220.0
+ZENER_R_LOAD = 1000.0
+
 
 def draw_power_supply_circuits():
     """Disegna circuiti di alimentazione."""
+    # Tensione di picco in uscita: picco del secondario meno la caduta sul diodo
+    v_peak = RECTIFIER_V_RMS * np.sqrt(2)
+    v_d, _ = operating_point(diode('1N4007'), v_peak, RECTIFIER_R_LOAD)
+
     # Raddrizzatore a semionda con filtro
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('AC')
-    d1 += elm.Transformer().label('T1').right()
-    d1 += elm.Diode().label('D1').right()
+    d1 += elm.Transformer().label(f'T1\n{RECTIFIER_V_RMS:.0f} V').right()
+    d1 += elm.Diode().label(f'D1\nV_F = {v_d:.2f} V').right()
     d1 += elm.Capacitor().label('C1').down()
     d1 += elm.Ground()
     d1 += elm.Line().right()
-    d1 += elm.Label('V_out')
+    d1 += elm.Label(f'V_out ≈ {v_peak - v_d:.1f} V')
     d1 += elm.Resistor().label('R_L').down()
     d1 += elm.Ground()
     d1.save(OUTPUT_DIR / 'raddrizzatore_semionda_filtro.svg')
 
     # Alimentatore lineare completo
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('AC 230V')
     d2 += elm.Transformer().label('T1').right()
     d2 += elm.Diode().label('D1').right()
@@ -51,7 +75,7 @@ def draw_power_supply_circuits():
     d2.save(OUTPUT_DIR / 'alimentatore_lineare_completo.svg')
 
     # Regolatore lineare serie
-    d3 = schemdraw.Drawing(unit=3)
+    d3 = CachedDrawing(unit=3)
     d3 += elm.SourceV().label('V_in')
     d3 += elm.Resistor().label('R_s').right()
     d3 += elm.BjtNpn().label('Q1').right()
@@ -71,7 +95,7 @@ def draw_power_supply_circuits():
 def draw_switching_power_supply():
     """Disegna alimentatore switching."""
     # Convertitore buck (step-down)
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_in')
     d1 += elm.NMos().label('Q1').right()
     d1 += elm.Diode().label('D1').down()
@@ -86,7 +110,7 @@ def draw_switching_power_supply():
     d1.save(OUTPUT_DIR / 'convertitore_buck.svg')
 
     # Convertitore boost (step-up)
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('V_in')
     d2 += elm.Inductor().label('L1').right()
     d2 += elm.NMos().label('Q1').down()
@@ -106,7 +130,7 @@ def draw_switching_power_supply():
 def draw_protection_circuits():
     """Disegna circuiti di protezione."""
     # Protezione sovratensione con fusibile e Zener
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_in')
     d1 += elm.Fuse().label('F1').right()
     d1 += elm.Zener().label('D_z').down()
@@ -118,7 +142,7 @@ def draw_protection_circuits():
     d1.save(OUTPUT_DIR / 'protezione_sovratensione.svg')
 
     # Limitatore di corrente
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('V_in')
     d2 += elm.Resistor().label('R_sense').right()
     d2 += elm.BjtNpn().label('Q_limit').down()
@@ -135,7 +159,7 @@ def draw_protection_circuits():
 def draw_battery_charger():
     """Disegna circuito di caricabatterie."""
     # Caricabatterie Li-ion lineare
-    d1 = schemdraw.Drawing(unit=3)
+    d1 = CachedDrawing(unit=3)
     d1 += elm.SourceV().label('V_in')
     d1 += elm.Ic().label(' Charger ').right()
     d1 += elm.Resistor().label('R_sense').right()
@@ -148,7 +172,7 @@ def draw_battery_charger():
     d1.save(OUTPUT_DIR / 'caricabatterie_liion.svg')
 
     # Caricabatterie CC-CV semplificato
-    d2 = schemdraw.Drawing(unit=3)
+    d2 = CachedDrawing(unit=3)
     d2 += elm.SourceV().label('V_in')
     d2 += elm.Opamp().label('U1').right()
     d2 += elm.NMos().label('Q1').down()
@@ -164,6 +188,224 @@ def draw_battery_charger():
     print("[OK] Circuiti di caricabatterie generati")
 
 
+def plot_diode_characteristics():
+    """Curve I-V dei diodi più comuni e deriva termica, dal modello calcoli.diodi."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
+
+    v = np.linspace(0, 3.5, 2000)
+    names = ['1N34A', '1N5817', '1N4148', '1N4007', 'LED-IR', 'LED-R', 'LED-G', 'LED-B']
+    colors = ['#8c564b', '#9467bd', '#1f77b4', '#17becf', '#7f7f7f', 'red', 'green', 'blue']
+    for name, color in zip(names, colors):
+        ax1.plot(v, current(DIODES[name], v) * 1000, color=color, linewidth=2,
+                 label=DIODES[name].label)
+    ax1.axhline(20, color='gray', linestyle=':', linewidth=1)
+    ax1.set_xlim(0, 3.5)
+    ax1.set_ylim(0, 50)
+    ax1.set_xlabel('Tensione diretta (V)')
+    ax1.set_ylabel('Corrente (mA)')
+    ax1.set_title('Polarizzazione diretta: la soglia dipende dal materiale')
+    ax1.legend(loc='upper right', fontsize=8)
+    ax1.grid(True, linestyle='--', alpha=0.5)
+
+    # Stesso diodo a temperature diverse: una sola chiamata (temperature x tensioni)
+    temps = np.linspace(-20, 100, 7)
+    v_t = np.linspace(0.2, 1.0, 800)
+    i_t = current(diode('1N4148'), v_t[None, :], temp_c=temps[:, None]) * 1000
+    cmap = plt.cm.coolwarm(np.linspace(0, 1, len(temps)))
+    for t_c, i_row, color in zip(temps, i_t, cmap):
+        ax2.plot(v_t, i_row, color=color, linewidth=2, label=f'{t_c:.0f} °C')
+    ax2.set_xlim(0.2, 1.0)
+    ax2.set_ylim(0, 50)
+    ax2.set_xlabel('Tensione diretta (V)')
+    ax2.set_ylabel('Corrente (mA)')
+    ax2.set_title('1N4148: a corrente costante V_F cala di circa 2 mV/°C')
+    ax2.legend(title='Temperatura', loc='upper left', fontsize=8)
+    ax2.grid(True, linestyle='--', alpha=0.5)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'caratteristiche_diodi.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'caratteristiche_diodi.png'}")
+
+
+def plot_zener_regulation():
+    """Regolazione di linea e di carico dello stabilizzatore Zener."""
+    zener = diode(ZENER)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
+
+    # Regolazione di linea: tensioni d'ingresso x carichi in una sola chiamata
+    v_in = np.linspace(0, 20, 1000)
+    loads = np.array([100.0, 220.0, 470.0, 1000.0, np.inf])
+    v_out, _, _ = zener_regulator(zener, v_in[None, :], ZENER_R_S, loads[:, None])
+    for r_l, row in zip(loads, v_out):
+        label = 'a vuoto' if np.isinf(r_l) else f'R_L = {r_l:.0f} Ω'
+        ax1.plot(v_in, row, linewidth=2, label=label)
+    ax1.plot(v_in, v_in, color='gray', linestyle=':', linewidth=1, label='V_out = V_in')
+    ax1.set_xlim(0, 20)
+    ax1.set_ylim(0, 7)
+    ax1.set_xlabel('Tensione d\'ingresso (V)')
+    ax1.set_ylabel('Tensione d\'uscita (V)')
+    ax1.set_title(f'Regolazione di linea ({zener.label}, R_s = {ZENER_R_S:.0f} Ω)')
+    ax1.legend(loc='lower right', fontsize=8)
+    ax1.grid(True, linestyle='--', alpha=0.5)
+
+    # Regolazione di carico a diverse temperature
+    r_load = np.logspace(1.5, 4, 1000)
+    temps = np.array([-20.0, 27.0, 85.0])
+    v_out, i_z, i_load = zener_regulator(zener, ZENER_V_IN, ZENER_R_S,
+                                         r_load[None, :], temps[:, None])
+    for t_c, v_row, i_row, color in zip(temps, v_out, i_load, ['blue', 'black', 'red']):
+        ax2.plot(i_row * 1000, v_row, color=color, linewidth=2, label=f'{t_c:.0f} °C')
+    i_max = (ZENER_V_IN - zener.bv) / ZENER_R_S * 1000
+    ax2.axvline(i_max, color='gray', linestyle='--', linewidth=1)
+    ax2.text(i_max - 1, 2.0, 'tutta la corrente\nva nel carico', ha='right', fontsize=9)
+    ax2.set_ylim(0, 6)
+    ax2.set_xlabel('Corrente nel carico (mA)')
+    ax2.set_ylabel('Tensione d\'uscita (V)')
+    ax2.set_title(f'Regolazione di carico (V_in = {ZENER_V_IN:.0f} V, deriva termica minima)')
+    ax2.legend(title='Temperatura', loc='lower left', fontsize=8)
+    ax2.grid(True, linestyle='--', alpha=0.5)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'stabilizzatore_zener_regolazione.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'stabilizzatore_zener_regolazione.png'}")
+
+
+def plot_rectifier_waveforms():
+    """Forme d'onda dei tre raddrizzatori con filtro capacitivo, dall'accensione."""
+    fig, axes = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
+    c, r_load = 2200e-6, 47.0
+
+    for ax, topology in zip(axes, RECTIFIERS):
+        res = rectifier(topology, RECTIFIER_V_RMS, c, r_load=r_load, n_cycles=6)
+        t_ms = res.t * 1000
+        ax.plot(t_ms, res.v_rectified, color='gray', linestyle='--', linewidth=1,
+                label='Tensione raddrizzata (senza filtro)')
+        ax.plot(t_ms, res.v_out, color='blue', linewidth=2, label='V_out sul condensatore')
+        ax.set_ylabel('Tensione (V)')
+        ax.set_ylim(0, 20)
+        ax.grid(True, linestyle='--', alpha=0.5)
+
+        ax_i = ax.twinx()
+        ax_i.fill_between(t_ms, res.i_diode, color='red', alpha=0.3, label='Corrente nei diodi')
+        ax_i.set_ylabel('Corrente diodi (A)', color='red')
+        ax_i.set_ylim(0, 10)
+
+        # Valori a regime sull'ultimo periodo
+        steady = rectifier(topology, RECTIFIER_V_RMS, c, r_load=r_load, n_cycles=4,
+                           record_cycles=1, start='peak')
+        ax.set_title(f'{RECTIFIER_LABELS[topology]}: V_dc = {steady.v_dc:.1f} V, '
+                     f'ripple = {steady.ripple:.2f} V, diodi in conduzione '
+                     f'{steady.conduction * 100:.0f}% del tempo', fontsize=11)
+        if ax is axes[0]:
+            lines, labels = ax.get_legend_handles_labels()
+            lines_i, labels_i = ax_i.get_legend_handles_labels()
+            ax.legend(lines + lines_i, labels + labels_i, loc='upper right', fontsize=8)
+
+    axes[-1].set_xlabel('Tempo (ms)')
+    fig.suptitle(f'Raddrizzatori con filtro capacitivo ({RECTIFIER_V_RMS:.0f} V eff., '
+                 f'C = {c * 1e6:.0f} μF, R_L = {r_load:.0f} Ω)', fontsize=13, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'raddrizzatori_forme_onda.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'raddrizzatori_forme_onda.png'}")
+
+
+def plot_ripple_sweep():
+    """Ondulazione e tensione continua in funzione della corrente di carico."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
+    i_load = np.linspace(0.02, 2.0, 1500)
+
+    # Ponte: 4 capacita' x 1500 correnti simulate insieme
+    capacitors = np.array([470e-6, 1000e-6, 2200e-6, 4700e-6])
+    res = rectifier('bridge', RECTIFIER_V_RMS, capacitors[:, None], i_load=i_load,
+                    n_cycles=3, record_cycles=1, start='peak')
+    colors = plt.cm.viridis(np.linspace(0, 0.85, len(capacitors)))
+    for c, ripple, color in zip(capacitors, res.ripple, colors):
+        ax1.plot(i_load, ripple, color=color, linewidth=2, label=f'C = {c * 1e6:.0f} μF')
+        ax1.plot(i_load, ripple_estimate(i_load, c), color=color, linestyle=':', linewidth=1.2)
+    ax1.plot([], [], color='gray', linestyle=':', label='Stima I / (2 f C)')
+    ax1.set_xlim(0, 2)
+    ax1.set_ylim(0, 8)
+    ax1.set_xlabel('Corrente di carico (A)')
+    ax1.set_ylabel('Ondulazione picco-picco (V)')
+    ax1.set_title(f'Ponte di Graetz, {RECTIFIER_V_RMS:.0f} V eff.: ondulazione')
+    ax1.legend(loc='upper left', fontsize=8)
+    ax1.grid(True, linestyle='--', alpha=0.5)
+
+    # Confronto fra topologie a parita' di condensatore
+    c = 2200e-6
+    for topology, color in zip(RECTIFIERS, ['red', 'orange', 'blue']):
+        res = rectifier(topology, RECTIFIER_V_RMS, c, i_load=i_load,
+                        n_cycles=3, record_cycles=1, start='peak')
+        ax2.plot(i_load, res.v_dc, color=color, linewidth=2, label=RECTIFIER_LABELS[topology])
+        ax2.fill_between(i_load, res.v_out.min(axis=-1), res.v_out.max(axis=-1),
+                         color=color, alpha=0.12)
+    ax2.set_xlim(0, 2)
+    ax2.set_ylim(0, 18)
+    ax2.set_xlabel('Corrente di carico (A)')
+    ax2.set_ylabel('Tensione d\'uscita (V)')
+    ax2.set_title(f'V_dc media e fascia di ondulazione (C = {c * 1e6:.0f} μF)')
+    ax2.legend(loc='lower left', fontsize=8)
+    ax2.grid(True, linestyle='--', alpha=0.5)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'ripple_carico.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'ripple_carico.png'}")
+
+
+def plot_converter_waveforms():
+    """Corrente nell'induttore e rapporto di conversione di buck e boost ideali."""
+    fig, axes = plt.subplots(2, 2, figsize=(14, 9))
+    v_in, l, c, f_sw = 12.0, 47e-6, 100e-6, 100e3
+
+    for col, (name, convert, loads) in enumerate([
+        ('Buck', buck, np.array([5.0, 50.0])),
+        ('Boost', boost, np.array([20.0, 500.0])),
+    ]):
+        ax = axes[0, col]
+        res = convert(v_in, 0.5, l, c, loads, f_sw)
+        for r_load, i_l, i_d, ccm, color in zip(loads, res.i_inductor, res.i_diode, res.ccm,
+                                                ['blue', 'red']):
+            mode = 'CCM' if ccm else 'DCM'
+            ax.plot(res.t * 1e6, i_l, color=color, linewidth=2,
+                    label=f'I_L, R_L = {r_load:.0f} Ω ({mode})')
+            ax.fill_between(res.t * 1e6, i_d, color=color, alpha=0.15)
+        ax.set_xlabel('Tempo (μs)')
+        ax.set_ylabel('Corrente (A)')
+        ax.set_title(f'{name}: corrente nell\'induttore (D = 0.5, area = corrente nel diodo)')
+        ax.legend(loc='upper right', fontsize=8)
+        ax.grid(True, linestyle='--', alpha=0.5)
+
+        # Rapporto di conversione: duty cycle x carichi in una sola chiamata
+        ax = axes[1, col]
+        duty = np.linspace(0.01, 0.9, 2000)
+        sweep_loads = np.array([2.0, 10.0, 50.0, 200.0, 1000.0])
+        sweep = convert(v_in, duty[None, :], l, c, sweep_loads[:, None], f_sw,
+                        n_periods=1, steps_per_period=20)
+        for r_load, ratio, ccm in zip(sweep_loads, sweep.ratio, sweep.ccm):
+            line, = ax.plot(duty, ratio, linewidth=2, label=f'R_L = {r_load:.0f} Ω')
+            ax.plot(duty[~ccm], ratio[~ccm], color=line.get_color(), linewidth=5, alpha=0.3)
+        ideal = duty if name == 'Buck' else 1 / (1 - duty)
+        ax.plot(duty, ideal, color='black', linestyle='--', linewidth=1.2, label='CCM ideale')
+        ax.set_ylim(0, 1.05 if name == 'Buck' else 10)
+        ax.set_xlim(0, 0.9)
+        ax.set_xlabel('Duty cycle D')
+        ax.set_ylabel('V_out / V_in')
+        ax.set_title(f'{name}: rapporto di conversione (tratto spesso = DCM)')
+        ax.legend(loc='upper left', fontsize=8)
+        ax.grid(True, linestyle='--', alpha=0.5)
+
+    fig.suptitle(f'Convertitori ideali (V_in = {v_in:.0f} V, L = {l * 1e6:.0f} μH, '
+                 f'f = {f_sw / 1e3:.0f} kHz)', fontsize=13, fontweight='bold')
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'convertitori_forme_onda.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'convertitori_forme_onda.png'}")
+
+
 def main():
     """Funzione principale che genera tutti i diagrammi di alimentazione."""
     print(f"Generazione diagrammi alimentazione in: {OUTPUT_DIR}\n")
@@ -172,8 +414,14 @@ def main():
     draw_switching_power_supply()
     draw_protection_circuits()
     draw_battery_charger()
+    plot_diode_characteristics()
+    plot_zener_regulation()
+    plot_rectifier_waveforms()
+    plot_ripple_sweep()
+    plot_converter_waveforms()
 
     print(f"\nTutti i diagrammi salvati in: {OUTPUT_DIR}")
+    print(schematic_cache_report())
 
 
 if __name__ == "__main__":
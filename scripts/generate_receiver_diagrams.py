@@ -10,186 +10,92 @@ from matplotlib.patches import Rectangle, FancyBboxPatch, FancyArrowPatch, Circl
 import numpy as np
 from pathlib import Path
 
+from calcoli.supereterodina import lo_frequency, image_frequency, plan_superhet
+from calcoli.catena_ricevitore import Stage, cascade_stages, sweep_stage
+from utils import BlockDiagram, WEB_OUTPUTS, enable_text_cache, save_figure, text_cache_report
+from block_diagrams import Block, DiagramSpec, Edge, Info, draw_diagram
+
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "04_ricevitori"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Catena ricevitore HF di esempio (banda 20m, SSB 2.4 kHz).
+# Dopo il filtro IF i segnali fuori canale sono eliminati: IIP3/P1dB non limitano.
+RX_STAGES = [
+    Stage('Presel.', -1, 1, description='Perdita 1dB'),
+    Stage('LNA', 20, 2, iip3_dbm=10, ip1db_dbm=0, description='Guadagno 20dB'),
+    Stage('Mixer', -6, 7, iip3_dbm=15, ip1db_dbm=5, description='Perdita 6dB'),
+    Stage('Filtro IF', -3, 3, description='Perdita 3dB'),
+    Stage('Amp IF 1', 40, 5, description='Guadagno 40dB'),
+    Stage('Amp IF 2', 20, 6, description='Guadagno 20dB'),
+    Stage('Rivelatore', -2, 2, description='Perdita 2dB'),
+    Stage('Amp AF', 20, 8, description='Guadagno 20dB'),
+]
+RX_INPUT_DBM = -93      # Segnale S5
+RX_BANDWIDTH_HZ = 2400
+
 # Configurazione stile
 plt.rcParams['font.size'] = 10
 plt.rcParams['axes.titlesize'] = 12
 plt.rcParams['figure.facecolor'] = 'white'
 
 
-def draw_block(ax, x, y, width, height, label, sublabel='', color='lightblue', fontsize=10):
-    """Disegna un blocco con etichetta."""
-    rect = FancyBboxPatch((x - width/2, y - height/2), width, height,
-                          boxstyle="round,pad=0.02,rounding_size=0.1",
-                          facecolor=color, edgecolor='black', linewidth=1.5)
-    ax.add_patch(rect)
-
-    if sublabel:
-        ax.text(x, y + 0.15, label, ha='center', va='center', fontsize=fontsize, fontweight='bold')
-        ax.text(x, y - 0.2, sublabel, ha='center', va='center', fontsize=fontsize-2, color='#555')
-    else:
-        ax.text(x, y, label, ha='center', va='center', fontsize=fontsize, fontweight='bold')
-
-
-def draw_arrow(ax, x1, y1, x2, y2, color='black'):
-    """Disegna una freccia."""
-    ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                arrowprops=dict(arrowstyle='->', color=color, lw=1.5))
+def superhet_spec(f_rf: float = 7.0e6, f_if: float = 455e3) -> DiagramSpec:
+    """Schema a blocchi della supereterodina a iniezione bassa per il piano indicato."""
+    f_lo = lo_frequency(f_rf, f_if, 'low')
+    f_img = image_frequency(f_rf, f_if, 'low')
+    if_note = f'{f_if / 1e3:.0f} kHz'
+    osc = dict(color='#ef4444', mutation_scale=10)
+
+    return DiagramSpec(
+        title='Ricevitore Supereterodina',
+        subtitle=f'Schema a blocchi - Banda 40m ({f_rf / 1e6:.0f} MHz)',
+        figsize=(16, 12),
+        blocks=(
+            Block('ant', 'ANTENNA', f'{f_rf / 1e6:.1f} MHz', 'antenna', row=0.8),
+            Block('presel', 'PRESEL.', 'BPF 6.5-7.5', 'rf', note=f'{f_rf / 1e6:.1f} MHz'),
+            Block('lna', 'LNA', '+15dB NF=2dB', 'rf'),
+            Block('mixer', 'MIXER', 'Conversione', 'mixer'),
+            Block('filtro', 'FILTRO IF', if_note, 'if'),
+            Block('amp', 'AMP IF', '+60dB AGC', 'if'),
+            Block('demod', 'DEMOD', 'AM/SSB/CW', 'audio'),
+            Block('audio', 'AUDIO', '+20dB', 'audio', note='0.3-3 kHz'),
+            Block('lo', 'OSC. LOCALE', f'VFO {f_lo / 1e6:.3f} MHz', 'osc', row=-1),
+            Block('bfo', 'BFO', f'{if_note} ±1.5k', 'osc', row=-1),
+        ),
+        edges=(
+            Edge('ant', 'presel'),
+            Edge('presel', 'lna'),
+            Edge('lna', 'mixer', note=f'{f_rf / 1e6:.1f} MHz'),
+            Edge('mixer', 'filtro', note=if_note),
+            Edge('filtro', 'amp'),
+            Edge('amp', 'demod'),
+            Edge('demod', 'audio'),
+            Edge('lo', 'mixer', **osc),
+            Edge('bfo', 'demod', **osc),
+            Edge('demod', 'amp', label='AGC', color='#22c55e', style='->'),
+        ),
+        infos=(
+            Info(f'f_IF = f_RF - f_LO\n{f_if / 1e3:.0f} = {f_rf / 1e3:.0f} - {f_lo / 1e3:.0f} kHz\n'
+                 f'Immagine: {f_img / 1e3:.0f} kHz', 0.40, 0.24, fontsize=10, fontweight='bold'),
+        ),
+        legend=(('rf', 'RF'), ('mixer', 'Mixer'), ('if', 'IF'), ('audio', 'Audio'),
+                ('osc', 'Oscillatori')),
+        palette=(('antenna', '#fed7aa'), ('if', '#ddd6fe')),
+        style=(('fontsize', 10),),
+        x_range=(0.12, 0.94),
+        y_main=0.62,
+    )
 
 
 def plot_superheterodyne_detailed():
-    """Schema dettagliato ricevitore supereterodina con layout ottimizzato."""
-    fig, ax = plt.subplots(figsize=(16, 12))
-
-    # Sfondo
-    ax.set_facecolor('#f8fafc')
-
-    # Titolo
-    ax.text(0.5, 0.96, 'Ricevitore Supereterodina', fontsize=20, fontweight='bold',
-            ha='center', transform=ax.transAxes, color='#1a365d')
-    ax.text(0.5, 0.92, 'Schema a blocchi - Banda 40m (7 MHz)', fontsize=12,
-            ha='center', transform=ax.transAxes, color='#4a5568')
-
-    # Colori
-    colors = {
-        'antenna': '#fed7aa',
-        'rf': '#bbf7d0',
-        'mixer': '#bfdbfe',
-        'if': '#ddd6fe',
-        'audio': '#fef08a',
-        'osc': '#fecaca',
-        'border': '#374151',
-    }
-
-    # Dimensioni blocchi
-    block_w = 0.11
-    block_h = 0.08
-
-    def draw_block(x, y, label, sublabel, color):
-        # Ombra
-        shadow = FancyBboxPatch((x - block_w/2 + 0.002, y - block_h/2 - 0.002),
-                                block_w, block_h, boxstyle="round,pad=0.005,rounding_size=0.01",
-                                facecolor='#94a3b8', edgecolor='none', zorder=1)
-        ax.add_patch(shadow)
-        # Blocco
-        rect = FancyBboxPatch((x - block_w/2, y - block_h/2), block_w, block_h,
-                              boxstyle="round,pad=0.005,rounding_size=0.01",
-                              facecolor=color, edgecolor=colors['border'], linewidth=1.5, zorder=2)
-        ax.add_patch(rect)
-        ax.text(x, y + 0.015, label, ha='center', va='center', fontsize=10,
-                fontweight='bold', color='#1e293b', zorder=3)
-        ax.text(x, y - 0.015, sublabel, ha='center', va='center', fontsize=7,
-                color='#475569', zorder=3)
-
-    # Layout a 3 righe:
-    # Riga 1: ANTENNA (centrata sopra PRESEL)
-    # Riga 2: PRESEL -> LNA -> MIXER -> FILTRO IF -> AMP IF -> DEMOD -> AUDIO
-    # Riga 3: OSC. LOCALE (sotto MIXER), BFO (sotto DEMOD)
-
-    y_top = 0.78    # Antenna
-    y_main = 0.62   # Catena principale
-    y_osc = 0.42    # Oscillatori
-
-    # Posizioni X della catena principale
-    x_presel = 0.12
-    x_lna = 0.26
-    x_mixer = 0.40
-    x_filtro = 0.54
-    x_amp = 0.68
-    x_demod = 0.82
-    x_audio = 0.94
-
-    # ANTENNA (sopra PRESEL)
-    draw_block(x_presel, y_top, 'ANTENNA', '7.0 MHz', colors['antenna'])
-
-    # Freccia da ANTENNA a PRESEL
-    ax.annotate('', xy=(x_presel, y_main + block_h/2 + 0.01), xytext=(x_presel, y_top - block_h/2 - 0.01),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
-
-    # Catena principale
-    main_blocks = [
-        (x_presel, y_main, 'PRESEL.', 'BPF 6.5-7.5', colors['rf']),
-        (x_lna, y_main, 'LNA', '+15dB NF=2dB', colors['rf']),
-        (x_mixer, y_main, 'MIXER', 'Conversione', colors['mixer']),
-        (x_filtro, y_main, 'FILTRO IF', '455 kHz', colors['if']),
-        (x_amp, y_main, 'AMP IF', '+60dB AGC', colors['if']),
-        (x_demod, y_main, 'DEMOD', 'AM/SSB/CW', colors['audio']),
-        (x_audio, y_main, 'AUDIO', '+20dB', colors['audio']),
-    ]
-
-    for x, y, label, sublabel, color in main_blocks:
-        draw_block(x, y, label, sublabel, color)
-
-    # Frecce tra blocchi catena principale
-    x_positions = [x_presel, x_lna, x_mixer, x_filtro, x_amp, x_demod, x_audio]
-    for i in range(len(x_positions) - 1):
-        x1 = x_positions[i] + block_w/2 + 0.005
-        x2 = x_positions[i+1] - block_w/2 - 0.005
-        ax.annotate('', xy=(x2, y_main), xytext=(x1, y_main),
-                    arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
-
-    # OSC. LOCALE (sotto MIXER)
-    draw_block(x_mixer, y_osc, 'OSC. LOCALE', 'VFO 6.545 MHz', colors['osc'])
-    ax.annotate('', xy=(x_mixer, y_main - block_h/2 - 0.01), xytext=(x_mixer, y_osc + block_h/2 + 0.01),
-                arrowprops=dict(arrowstyle='-|>', color='#ef4444', lw=2, mutation_scale=10))
-
-    # BFO (sotto DEMOD)
-    draw_block(x_demod, y_osc, 'BFO', '455 kHz ±1.5k', colors['osc'])
-    ax.annotate('', xy=(x_demod, y_main - block_h/2 - 0.01), xytext=(x_demod, y_osc + block_h/2 + 0.01),
-                arrowprops=dict(arrowstyle='-|>', color='#ef4444', lw=2, mutation_scale=10))
-
-    # AGC feedback
-    ax.annotate('', xy=(x_amp, y_main + block_h/2 + 0.015), xytext=(x_demod, y_main + block_h/2 + 0.015),
-                arrowprops=dict(arrowstyle='<-', color='#22c55e', lw=2, connectionstyle='arc3,rad=0.25'))
-    ax.text((x_amp + x_demod)/2, y_main + 0.09, 'AGC', fontsize=9, fontweight='bold', color='#22c55e', ha='center')
-
-    # Etichette frequenze sul percorso
-    freq_labels = [
-        (x_presel, y_main + 0.07, '7.0 MHz'),
-        ((x_lna + x_mixer)/2, y_main + 0.07, '7.0 MHz'),
-        ((x_mixer + x_filtro)/2, y_main + 0.07, '455 kHz'),
-        ((x_amp + x_demod)/2 - 0.02, y_main + 0.07, '455 kHz'),
-        (x_audio, y_main + 0.07, '0.3-3 kHz'),
-    ]
-    for x, y, text in freq_labels:
-        ax.text(x, y, text, fontsize=8, ha='center', va='center', fontweight='bold',
-               bbox=dict(boxstyle='round,pad=0.2', facecolor='#fef3c7', edgecolor='#d4a574', linewidth=0.8))
-
-    # Formula conversione (usando text con bbox)
-    formula_text = 'f_IF = f_RF - f_LO\n455 = 7000 - 6545 kHz'
-    ax.text(0.40, 0.24, formula_text, fontsize=10, ha='center', va='center',
-            color='#1e40af', fontweight='bold', linespacing=1.5,
-            bbox=dict(boxstyle='round,pad=0.5', facecolor='white',
-                     edgecolor='#3b82f6', linewidth=2))
+    """Schema dettagliato ricevitore supereterodina (banda 40m, IF 455 kHz)."""
+    spec = superhet_spec()
+    fig, ax = plt.subplots(figsize=spec.figsize)
+    draw_diagram(ax, spec)
 
-    # Legenda
-    legend_y = 0.08
-    legend_items = [
-        (colors['rf'], 'RF'),
-        (colors['mixer'], 'Mixer'),
-        (colors['if'], 'IF'),
-        (colors['audio'], 'Audio'),
-        (colors['osc'], 'Oscillatori'),
-    ]
-    ax.text(0.55, legend_y, 'Legenda:', fontsize=9, fontweight='bold', va='center')
-    x_leg = 0.62
-    for color, label in legend_items:
-        ax.add_patch(Rectangle((x_leg, legend_y - 0.012), 0.018, 0.024, facecolor=color,
-                               edgecolor='#374151', linewidth=1))
-        ax.text(x_leg + 0.022, legend_y, label, fontsize=8, va='center')
-        x_leg += 0.07
-
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis('off')
-
-    plt.savefig(OUTPUT_DIR / 'supereterodina_dettagliato.png', dpi=150, bbox_inches='tight',
-                facecolor='#f8fafc', edgecolor='none')
-    plt.close()
-    print(f"✓ Salvato: {OUTPUT_DIR / 'supereterodina_dettagliato.png'}")
+    save_figure(fig, '04_ricevitori', 'supereterodina_dettagliato.png',
+                facecolor=ax.get_facecolor(), fixed_layout=True, inputs=spec, outputs=WEB_OUTPUTS)
 
 
 def plot_sdr_receiver():
@@ -220,20 +126,9 @@ def plot_sdr_receiver():
     block_w = 0.10
     block_h = 0.07
 
-    def draw_block(x, y, label, sublabel, color):
-        shadow = FancyBboxPatch((x - block_w/2 + 0.002, y - block_h/2 - 0.002),
-                                block_w, block_h, boxstyle="round,pad=0.005,rounding_size=0.01",
-                                facecolor='#94a3b8', edgecolor='none', zorder=1)
-        ax.add_patch(shadow)
-        rect = FancyBboxPatch((x - block_w/2, y - block_h/2), block_w, block_h,
-                              boxstyle="round,pad=0.005,rounding_size=0.01",
-                              facecolor=color, edgecolor=colors['border'], linewidth=1.5, zorder=2)
-        ax.add_patch(rect)
-        ax.text(x, y + 0.012, label, ha='center', va='center', fontsize=9,
-                fontweight='bold', color='#1f2937', zorder=3)
-        if sublabel:
-            ax.text(x, y - 0.012, sublabel, ha='center', va='center', fontsize=7,
-                    color='#4b5563', zorder=3)
+    diagram = BlockDiagram(ax, block_w, block_h, border_color=colors['border'],
+                           label_color='#1f2937', sublabel_color='#4b5563',
+                           label_dy=(0.012, -0.012))
 
     # Layout:
     # Riga 1: ANTENNA (sopra LNA)
@@ -257,50 +152,45 @@ def plot_sdr_receiver():
     x_out = 0.94
 
     # ANTENNA (sopra LNA)
-    draw_block(x_lna, y_top, 'ANTENNA', 'RF IN', colors['antenna'])
-    ax.annotate('', xy=(x_lna, y_i + block_h/2 + 0.01), xytext=(x_lna, y_top - block_h/2 - 0.01),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
+    diagram.block(x_lna, y_top, 'ANTENNA', 'RF IN', colors['antenna'])
+    diagram.arrow(x_lna, y_top - block_h/2 - 0.01, x_lna, y_i + block_h/2 + 0.01)
 
     # LNA e BPF (comuni)
-    draw_block(x_lna, y_i, 'LNA', '+20dB', colors['analog'])
-    draw_block(x_bpf, y_i, 'BPF', 'Anti-alias', colors['analog'])
+    diagram.block(x_lna, y_i, 'LNA', '+20dB', colors['analog'])
+    diagram.block(x_bpf, y_i, 'BPF', 'Anti-alias', colors['analog'])
 
     # Freccia LNA -> BPF
-    ax.annotate('', xy=(x_bpf - block_w/2 - 0.005, y_i), xytext=(x_lna + block_w/2 + 0.005, y_i),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
+    diagram.arrow(x_lna + block_w/2 + 0.005, y_i, x_bpf - block_w/2 - 0.005, y_i)
 
     # Splitter (biforcazione verso I e Q)
-    ax.plot([x_bpf + block_w/2 + 0.01, x_split, x_split], [y_i, y_i, y_i], color='#3b82f6', lw=2)
-    ax.plot([x_split, x_split], [y_i, y_q], color='#3b82f6', lw=2)
-    ax.annotate('', xy=(x_mixer - block_w/2 - 0.005, y_i), xytext=(x_split + 0.01, y_i),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
-    ax.annotate('', xy=(x_mixer - block_w/2 - 0.005, y_q), xytext=(x_split + 0.01, y_q),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
+    diagram.line([x_bpf + block_w/2 + 0.01, x_split, x_split], [y_i, y_i, y_i])
+    diagram.line([x_split, x_split], [y_i, y_q])
+    diagram.arrow(x_split + 0.01, y_i, x_mixer - block_w/2 - 0.005, y_i)
+    diagram.arrow(x_split + 0.01, y_q, x_mixer - block_w/2 - 0.005, y_q)
 
     # Canale I
-    draw_block(x_mixer, y_i, 'MIXER I', '0 deg', colors['mixer'])
-    draw_block(x_lpf, y_i, 'LPF', 'Baseband', colors['analog'])
-    draw_block(x_adc, y_i, 'ADC', '16-bit', colors['digital'])
+    diagram.block(x_mixer, y_i, 'MIXER I', '0 deg', colors['mixer'])
+    diagram.block(x_lpf, y_i, 'LPF', 'Baseband', colors['analog'])
+    diagram.block(x_adc, y_i, 'ADC', '16-bit', colors['digital'])
 
     # Canale Q
-    draw_block(x_mixer, y_q, 'MIXER Q', '90 deg', colors['mixer'])
-    draw_block(x_lpf, y_q, 'LPF', 'Baseband', colors['analog'])
-    draw_block(x_adc, y_q, 'ADC', '16-bit', colors['digital'])
+    diagram.block(x_mixer, y_q, 'MIXER Q', '90 deg', colors['mixer'])
+    diagram.block(x_lpf, y_q, 'LPF', 'Baseband', colors['analog'])
+    diagram.block(x_adc, y_q, 'ADC', '16-bit', colors['digital'])
 
     # Frecce canali I e Q (MIXER -> LPF -> ADC)
     for y_ch in [y_i, y_q]:
         for x1, x2 in [(x_mixer, x_lpf), (x_lpf, x_adc)]:
-            ax.annotate('', xy=(x2 - block_w/2 - 0.005, y_ch), xytext=(x1 + block_w/2 + 0.005, y_ch),
-                        arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
+            diagram.arrow(x1 + block_w/2 + 0.005, y_ch, x2 - block_w/2 - 0.005, y_ch)
 
     # Oscillatore locale (tra i due mixer)
-    draw_block(x_mixer, y_osc, 'LO', 'DDS/PLL', colors['osc'])
+    diagram.block(x_mixer, y_osc, 'LO', 'DDS/PLL', colors['osc'])
 
     # Connessioni LO ai mixer
-    ax.annotate('', xy=(x_mixer, y_i - block_h/2 - 0.005), xytext=(x_mixer, y_osc + block_h/2 + 0.005),
-                arrowprops=dict(arrowstyle='-|>', color='#ef4444', lw=1.5, mutation_scale=10))
-    ax.annotate('', xy=(x_mixer, y_q + block_h/2 + 0.005), xytext=(x_mixer, y_osc - block_h/2 - 0.005),
-                arrowprops=dict(arrowstyle='-|>', color='#ef4444', lw=1.5, mutation_scale=10))
+    diagram.arrow(x_mixer, y_osc + block_h/2 + 0.005, x_mixer, y_i - block_h/2 - 0.005,
+                  color='#ef4444', linewidth=1.5, mutation_scale=10)
+    diagram.arrow(x_mixer, y_osc - block_h/2 - 0.005, x_mixer, y_q + block_h/2 + 0.005,
+                  color='#ef4444', linewidth=1.5, mutation_scale=10)
 
     # 90° phase shift label
     ax.text(x_mixer + 0.06, y_osc, '90°', fontsize=9, fontweight='bold', color='#ef4444',
@@ -322,10 +212,8 @@ def plot_sdr_receiver():
         ax.text(x_dsp, y_osc + 0.04 - i*0.04, feat, ha='center', fontsize=8, color='#374151', zorder=3)
 
     # Frecce da ADC a DSP
-    ax.annotate('', xy=(x_dsp - dsp_w/2 - 0.005, y_i), xytext=(x_adc + block_w/2 + 0.01, y_i),
-                arrowprops=dict(arrowstyle='-|>', color='#8b5cf6', lw=2, mutation_scale=12))
-    ax.annotate('', xy=(x_dsp - dsp_w/2 - 0.005, y_q), xytext=(x_adc + block_w/2 + 0.01, y_q),
-                arrowprops=dict(arrowstyle='-|>', color='#8b5cf6', lw=2, mutation_scale=12))
+    diagram.arrow(x_adc + block_w/2 + 0.01, y_i, x_dsp - dsp_w/2 - 0.005, y_i, color='#8b5cf6')
+    diagram.arrow(x_adc + block_w/2 + 0.01, y_q, x_dsp - dsp_w/2 - 0.005, y_q, color='#8b5cf6')
 
     # Etichette I e Q
     ax.text(x_adc + 0.08, y_i + 0.02, 'I', fontsize=11, fontweight='bold', color='#2563eb')
@@ -334,8 +222,7 @@ def plot_sdr_receiver():
     # Output
     ax.text(x_out, y_osc, 'USB\nAudio\nDisplay', fontsize=9, ha='center', va='center',
             bbox=dict(boxstyle='round,pad=0.3', facecolor='#e5e7eb', edgecolor='#374151', linewidth=1.5))
-    ax.annotate('', xy=(x_out - 0.045, y_osc), xytext=(x_dsp + dsp_w/2 + 0.01, y_osc),
-                arrowprops=dict(arrowstyle='-|>', color='#3b82f6', lw=2, mutation_scale=12))
+    diagram.arrow(x_dsp + dsp_w/2 + 0.01, y_osc, x_out - 0.045, y_osc)
 
     # Etichette canali (a sinistra)
     ax.text(x_split + 0.02, y_i + 0.045, 'Canale I (In-Phase)', fontsize=8, color='#2563eb', fontweight='bold')
@@ -364,6 +251,7 @@ def plot_sdr_receiver():
         ax.text(x_leg + 0.020, legend_y, label, fontsize=8, va='center')
         x_leg += 0.08
 
+    diagram.render()
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
     ax.axis('off')
@@ -384,17 +272,11 @@ def plot_signal_flow_dbm():
     ax.text(0.5, 0.92, 'Esempio: segnale debole S5 (-93 dBm) su banda 20m',
             fontsize=12, ha='center', transform=ax.transAxes, color='gray')
 
-    # Stadi e livelli
-    stages = [
-        ('Antenna', -93, 0, 'Segnale S5'),
-        ('Presel.', -94, -1, 'Perdita 1dB'),
-        ('LNA', -74, 20, 'Guadagno 20dB'),
-        ('Mixer', -80, -6, 'Perdita 6dB'),
-        ('Filtro IF', -83, -3, 'Perdita 3dB'),
-        ('Amp IF 1', -43, 40, 'Guadagno 40dB'),
-        ('Amp IF 2', -23, 20, 'Guadagno 20dB'),
-        ('Rivelatore', -25, -2, 'Perdita 2dB'),
-        ('Amp AF', -5, 20, 'Guadagno 20dB'),
+    # Stadi e livelli calcolati in cascata
+    result = cascade_stages(RX_STAGES, input_dbm=RX_INPUT_DBM, bandwidth_hz=RX_BANDWIDTH_HZ)
+    stages = [('Antenna', RX_INPUT_DBM, 0, 'Segnale S5')] + [
+        (st.name, level, st.gain_db, st.description)
+        for st, level in zip(RX_STAGES, result.level_dbm)
     ]
 
     # Grafico livelli
@@ -419,19 +301,19 @@ def plot_signal_flow_dbm():
     for i, (name, level, gain, desc) in enumerate(stages):
         color = 'green' if gain > 0 else 'red' if gain < 0 else 'gray'
         sign = '+' if gain > 0 else ''
-        ax.text(i, level + 3, f'{sign}{gain}dB', ha='center', fontsize=9,
+        ax.text(i, level + 3, f'{sign}{gain:g}dB', ha='center', fontsize=9,
                fontweight='bold', color=color)
         ax.text(i, -100, desc, ha='center', fontsize=8, rotation=45, color='gray')
 
     # Livelli di riferimento
-    ax.axhline(y=-93, color='orange', linestyle='--', alpha=0.7, label='Sensibilita tipica')
+    ax.axhline(y=result.mds_dbm, color='orange', linestyle='--', alpha=0.7, label='MDS (sensibilita)')
     ax.axhline(y=-10, color='red', linestyle='--', alpha=0.7, label='Saturazione')
     ax.axhline(y=0, color='purple', linestyle='--', alpha=0.7, label='1 mW (0 dBm)')
 
     # Range dinamico
-    ax.fill_between(x_positions, -120, levels, alpha=0.2, color='blue')
+    ax.fill_between(x_positions, -150, levels, alpha=0.2, color='blue')
 
-    ax.set_ylim(-110, 10)
+    ax.set_ylim(min(-110, result.mds_dbm - 5), 10)
     ax.set_xlim(-0.5, len(stages) - 0.5)
     ax.grid(True, alpha=0.3, axis='y')
     ax.legend(loc='lower right', fontsize=9)
@@ -439,11 +321,14 @@ def plot_signal_flow_dbm():
     # Tabella riassuntiva
     table_data = [
         ['Parametro', 'Valore'],
-        ['Segnale ingresso', '-93 dBm (S5)'],
-        ['Guadagno totale', '88 dB'],
-        ['Segnale uscita', '-5 dBm'],
-        ['Floor rumore', '-120 dBm'],
-        ['SNR uscita', '115 dB'],
+        ['Segnale ingresso', f'{RX_INPUT_DBM} dBm (S5)'],
+        ['Guadagno totale', f'{result.total_gain_db:.0f} dB'],
+        ['Segnale uscita', f'{result.level_dbm[-1]:.0f} dBm'],
+        ['Cifra di rumore', f'{result.total_nf_db:.1f} dB'],
+        [f'MDS ({RX_BANDWIDTH_HZ / 1e3:g} kHz)', f'{result.mds_dbm:.0f} dBm'],
+        ['SNR ingresso', f'{RX_INPUT_DBM - result.mds_dbm:.0f} dB'],
+        ['IIP3', f'{result.total_iip3_dbm:+.0f} dBm'],
+        ['Gamma dinamica (SFDR)', f'{result.sfdr_db:.0f} dB'],
     ]
 
     table_ax = fig.add_axes([0.72, 0.55, 0.22, 0.25])
@@ -469,6 +354,48 @@ def plot_signal_flow_dbm():
     print(f"✓ Salvato: {OUTPUT_DIR / 'flusso_segnale_dbm.png'}")
 
 
+def plot_cascade_sweep():
+    """Sensibilita' della catena al guadagno dell'LNA: NF totale e gamma dinamica."""
+    lna = 1
+    lna_gain = np.linspace(0, 30, 301)
+    lna_nf = np.array([1, 2, 4, 6])
+    lna_iip3 = np.array([0, 10, 20, 30])
+
+    nf_grid = sweep_stage(RX_STAGES, lna, gain_db=lna_gain[:, None], nf_db=lna_nf[None, :],
+                          bandwidth_hz=RX_BANDWIDTH_HZ)
+    ip3_grid = sweep_stage(RX_STAGES, lna, gain_db=lna_gain[:, None], iip3_dbm=lna_iip3[None, :],
+                           bandwidth_hz=RX_BANDWIDTH_HZ)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+    fig.suptitle('Guadagno dell\'LNA: compromesso tra sensibilita\' e gamma dinamica',
+                 fontsize=15, fontweight='bold')
+
+    for j, nf in enumerate(lna_nf):
+        ax1.plot(lna_gain, nf_grid.total_nf_db[:, j], linewidth=2, label=f'NF LNA = {nf} dB')
+    ax1.set_xlabel('Guadagno LNA (dB)')
+    ax1.set_ylabel('Cifra di rumore totale (dB)')
+    ax1.set_title('Formula di Friis: l\'LNA "maschera" il rumore del mixer')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    for j, ip3 in enumerate(lna_iip3):
+        sfdr = ip3_grid.sfdr_db[:, j]
+        line, = ax2.plot(lna_gain, sfdr, linewidth=2, label=f'IIP3 LNA = {ip3:+d} dBm')
+        best = np.argmax(sfdr)
+        ax2.plot(lna_gain[best], sfdr[best], 'o', color=line.get_color(), markersize=8)
+    ax2.set_xlabel('Guadagno LNA (dB)')
+    ax2.set_ylabel('SFDR (dB)')
+    ax2.set_title('Troppo guadagno peggiora l\'intermodulazione (punto = ottimo)')
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'catena_ricevitore_lna.png', dpi=150, bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'catena_ricevitore_lna.png'}")
+
+
 def plot_mixer_oscillator():
     """Schema dettagliato mixer e oscillatore locale."""
     fig, axes = plt.subplots(1, 2, figsize=(16, 8))
@@ -597,6 +524,61 @@ def plot_mixer_oscillator():
     print(f"✓ Salvato: {OUTPUT_DIR / 'mixer_oscillatore.png'}")
 
 
+def plot_spur_chart():
+    """Carta delle spurie: immagine e risposte spurie per ogni banda HF e IF candidata."""
+    plan = plan_superhet(injection='high', max_order=5)
+    if_labels = [f'{f / 1e6:g} MHz' if f >= 1e6 else f'{f / 1e3:g} kHz'
+                 for f in plan.if_frequencies]
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+    fig.suptitle('Scelta della Frequenza Intermedia - Immagine e Spurie (iniezione alta, ordine 5)',
+                 fontsize=15, fontweight='bold')
+
+    # Mappa spurie in banda (banda x IF)
+    counts = plan.spur_count
+    im = ax1.imshow(counts, cmap='OrRd', aspect='auto', vmin=0, vmax=max(3, np.nanmax(counts)))
+    for i in range(counts.shape[0]):
+        for j in range(counts.shape[1]):
+            # NaN: LO non realizzabile (solo con iniezione bassa)
+            label = f'{counts[i, j]:.0f}' if plan.feasible[i, j] else 'n/d'
+            if plan.image_in_band[i, j]:
+                label += '\nIMG!'
+            ax1.text(j, i, label, ha='center', va='center', fontsize=9,
+                     fontweight='bold' if plan.image_in_band[i, j] else 'normal')
+    ax1.set_xticks(range(len(if_labels)))
+    ax1.set_xticklabels(if_labels, rotation=30, ha='right')
+    ax1.set_yticks(range(len(plan.band_names)))
+    ax1.set_yticklabels(plan.band_names)
+    ax1.set_xlabel('Frequenza intermedia')
+    ax1.set_ylabel('Banda')
+    ax1.set_title('Risposte spurie (m, n) che cadono in banda')
+    ax1.grid(False)
+    fig.colorbar(im, ax=ax1, label='Numero di prodotti spuri')
+
+    # Distanza immagine-banda: quanta selettivita' serve al preselettore
+    margin_khz = np.clip(plan.image_margin / 1e3, 1, None)
+    y = np.arange(len(plan.band_names))
+    for j, label in enumerate(if_labels):
+        ax2.plot(margin_khz[:, j], y, 'o-', linewidth=2, markersize=6, label=f'IF {label}')
+    ax2.set_xscale('log')
+    ax2.set_yticks(y)
+    ax2.set_yticklabels(plan.band_names)
+    ax2.invert_yaxis()
+    ax2.set_xlabel('Distanza minima immagine - bordo banda (kHz, log)')
+    ax2.set_title('Separazione della frequenza immagine')
+    ax2.grid(True, alpha=0.3, which='both')
+    ax2.legend(fontsize=8, loc='lower right')
+    ax2.text(0.02, 0.98, 'IF alta = immagine lontana, preselettore semplice\n'
+             'IF bassa = immagine vicina, serve doppia conversione',
+             transform=ax2.transAxes, fontsize=9, color='#475569', va='top')
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'supereterodina_spurie.png', dpi=150, bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'supereterodina_spurie.png'}")
+
+
 def plot_receiver_comparison():
     """Tabella confronto architetture ricevitori."""
     fig, ax = plt.subplots(figsize=(16, 10))
@@ -663,13 +645,19 @@ def main():
     print("Generazione diagrammi ricevitori...")
     print(f"Directory output: {OUTPUT_DIR}\n")
 
+    # Le tabelle e gli schemi ripetono molte stringhe uguali fra una figura e l'altra
+    enable_text_cache()
+
     plot_superheterodyne_detailed()
     plot_sdr_receiver()
     plot_signal_flow_dbm()
+    plot_cascade_sweep()
     plot_mixer_oscillator()
+    plot_spur_chart()
     plot_receiver_comparison()
 
     print("\n✅ Tutti i diagrammi ricevitori sono stati generati!")
+    print(text_cache_report())
 
 
 if __name__ == "__main__":
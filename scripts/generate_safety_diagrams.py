@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 """
 Generazione diagrammi sicurezza elettrica.
-Curva IEC, messa a terra, differenziale, scaricatore antenna.
+Curva IEC, messa a terra, differenziale, scaricatore antenna,
+esposizione ai campi elettromagnetici.
 """
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, Rectangle, Circle, FancyArrowPatch, Polygon
+from matplotlib.patches import Rectangle, Circle, FancyArrowPatch, Polygon
 import numpy as np
 from pathlib import Path
+from matplotlib.colors import ListedColormap, LogNorm
+
+from calcoli.esposizione_rf import (
+    MODE_DUTY, Station, compliance_distance, e_field_limit, exposure_maps,
+)
+from calcoli.iec60479 import CURVES, ZONES, ZONE_DESCRIPTIONS, classify, curve
+from calcoli.piano_bande import BAND_PLAN
+from utils import BlockDiagram
 
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "10_protezione"
@@ -20,20 +29,11 @@ plt.rcParams['axes.titlesize'] = 14
 plt.rcParams['figure.facecolor'] = 'white'
 
 
-def draw_block(ax, x, y, w, h, text, color='lightblue', fontsize=9):
-    """Disegna un blocco rettangolare con testo."""
-    rect = FancyBboxPatch((x - w/2, y - h/2), w, h,
-                          boxstyle="round,pad=0.02",
-                          facecolor=color, edgecolor='black', linewidth=1.5)
-    ax.add_patch(rect)
-    ax.text(x, y, text, ha='center', va='center', fontsize=fontsize,
-            fontweight='bold', wrap=True)
-
-
-def draw_arrow(ax, x1, y1, x2, y2, color='black'):
-    """Disegna una freccia tra due punti."""
-    ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                arrowprops=dict(arrowstyle='->', color=color, lw=1.5))
+def block_diagram(ax):
+    """Diagramma a blocchi nello stile degli schemi: bordi neri, senza ombre, frecce '->'."""
+    return BlockDiagram(ax, boxstyle="round,pad=0.02", border_color='black', shadow_color=None,
+                        label_color='black', zorder=1, arrow_style='->', arrow_color='black',
+                        arrow_width=1.5, mutation_scale=10)
 
 
 def plot_curva_iec():
@@ -44,58 +44,36 @@ def plot_curva_iec():
     ax.set_xscale('log')
     ax.set_yscale('log')
 
-    # Zone IEC (approssimate)
-    # AC-1: Nessuna reazione
-    t_ac1 = np.array([10, 10000])
-    i_ac1 = np.array([0.5, 0.5])
-
-    # AC-2: Nessun effetto fisiologico pericoloso
-    t_ac2 = np.array([10, 10000])
-    i_ac2_low = np.array([0.5, 0.5])
-    i_ac2_high = np.array([10, 10])
-
-    # AC-3: Effetti reversibili
-    t_ac3 = np.logspace(1, 4, 50)
-    i_ac3_low = np.ones_like(t_ac3) * 10
-    i_ac3_high = 500 / np.sqrt(t_ac3 / 10)
-    i_ac3_high = np.clip(i_ac3_high, 30, 500)
-
-    # AC-4: Fibrillazione ventricolare possibile
-    # Limiti c1, c2, c3 della curva IEC
-    t_c1 = np.array([10, 30, 100, 300, 1000, 3000, 10000])
-    i_c1 = np.array([500, 300, 150, 90, 50, 35, 30])
-
-    t_c2 = np.array([10, 30, 100, 300, 1000, 3000, 10000])
-    i_c2 = np.array([1000, 500, 250, 130, 80, 50, 40])
-
-    t_c3 = np.array([10, 30, 100, 300, 1000, 3000, 10000])
-    i_c3 = np.array([2000, 1000, 500, 250, 150, 80, 60])
-
-    # Riempi le zone
-    ax.fill_between([10, 10000], 0.1, 0.5, color='green', alpha=0.3, label='AC-1: Percezione')
-    ax.fill_between([10, 10000], 0.5, 10, color='yellow', alpha=0.3, label='AC-2: Reazioni muscolari')
-    ax.fill_betweenx([30, 500], 10, 10000, color='orange', alpha=0.2)
+    # Zone IEC ombreggiate classificando una griglia fitta (t, I)
+    t = np.logspace(1, 4, 600)
+    i = np.logspace(-1, np.log10(5000), 600)
+    zones = classify(i[:, None], t[None, :])
+    zone_colors = ['#9be59b', '#fff59d', '#ffcc80', '#ef9a9a', '#e57373', '#c62828']
+    ax.pcolormesh(t, i, zones, cmap=ListedColormap(zone_colors), vmin=-0.5,
+                  vmax=len(ZONES) - 0.5, shading='auto', alpha=0.6, rasterized=True)
+    zone_patches = [mpatches.Patch(color=color, alpha=0.6, label=f'{zone}: {ZONE_DESCRIPTIONS[zone]}')
+                    for zone, color in zip(ZONES, zone_colors)]
 
     # Curve limite
-    ax.plot(t_c1, i_c1, 'r-', linewidth=2.5, label='c1: Fibrillazione 0%')
-    ax.plot(t_c2, i_c2, 'r--', linewidth=2, label='c2: Fibrillazione 5%')
-    ax.plot(t_c3, i_c3, 'r:', linewidth=2, label='c3: Fibrillazione 50%')
-
-    # Linea soglia percezione
-    ax.axhline(y=0.5, color='green', linestyle='-', linewidth=2, label='Soglia percezione')
-
-    # Linea soglia "let-go"
-    ax.axhline(y=10, color='orange', linestyle='-', linewidth=2, label='Soglia "let-go"')
+    styles = {'a': ('green', '-', 2), 'b': ('orange', '-', 2),
+              'c1': ('r', '-', 2.5), 'c2': ('r', '--', 2), 'c3': ('r', ':', 2)}
+    curve_lines = []
+    for c in CURVES:
+        color, style, width = styles[c.name]
+        curve_lines += ax.plot(t, c(t), color=color, linestyle=style, linewidth=width,
+                               label=c.label)
 
     # Zone
-    ax.text(100, 0.25, 'AC-1\nNessuna reazione', ha='center', fontsize=10, color='darkgreen')
-    ax.text(100, 3, 'AC-2\nEffetti non pericolosi', ha='center', fontsize=10, color='olive')
-    ax.text(100, 50, 'AC-3\nEffetti reversibili', ha='center', fontsize=10, color='darkorange')
-    ax.text(1000, 200, 'AC-4\nFibrillazione\nventricolare', ha='center', fontsize=10, color='darkred')
+    for t_text, i_text, text, color in [(100, 0.25, 'AC-1\nNessuna reazione', 'darkgreen'),
+                                        (100, 3, 'AC-2\nEffetti non pericolosi', 'olive'),
+                                        (30, 40, 'AC-3\nEffetti reversibili', 'darkorange'),
+                                        (40, 1500, 'AC-4\nFibrillazione\nventricolare', 'darkred')]:
+        ax.text(t_text, i_text, text, ha='center', fontsize=10, color=color)
 
     # Punti di riferimento
-    ax.plot([100], [30], 'ko', markersize=10)
-    ax.annotate('Soglia fibrillazione\n(100ms, 30mA)', xy=(100, 30), xytext=(300, 100),
+    i_c1 = curve('c1')(1000)
+    ax.plot([1000], [i_c1], 'ko', markersize=10)
+    ax.annotate(f'Soglia fibrillazione\n(1 s, {i_c1:.0f} mA)', xy=(1000, i_c1), xytext=(3000, 8),
                 arrowprops=dict(arrowstyle='->', color='black'),
                 fontsize=9, ha='center')
 
@@ -107,11 +85,11 @@ def plot_curva_iec():
     ax.set_xlim(10, 10000)
     ax.set_ylim(0.1, 5000)
     ax.grid(True, which='both', linestyle='--', alpha=0.5)
-    ax.legend(loc='upper right', fontsize=9)
+    ax.legend(handles=curve_lines + zone_patches, loc='upper right', fontsize=8)
 
     # Note
     note_box = dict(boxstyle='round', facecolor='lightyellow', alpha=0.9)
-    ax.text(15, 0.15, 'Note:\n• Corrente AC 50/60 Hz più pericolosa di DC\n• Resistenza corpo: 1000-5000Ω (pelle umida)\n• Percorso mano-piedi più pericoloso',
+    ax.text(1500, 0.15, 'Note:\n• Corrente AC 50/60 Hz più pericolosa di DC\n• Resistenza corpo: 1000-5000Ω (pelle umida)\n• Percorso mano-piedi più pericoloso',
             fontsize=8, va='bottom', bbox=note_box)
 
     plt.tight_layout()
@@ -123,6 +101,7 @@ def plot_curva_iec():
 def schema_messa_terra():
     """Schema impianto messa a terra stazione radioamatore."""
     fig, ax = plt.subplots(figsize=(14, 10))
+    diagram = block_diagram(ax)
 
     # Edificio
     ax.add_patch(Rectangle((1, 2), 8, 6, fill=True, facecolor='lightyellow',
@@ -130,75 +109,75 @@ def schema_messa_terra():
     ax.text(5, 7.5, 'Stazione Radioamatore', ha='center', fontsize=12, fontweight='bold')
 
     # Quadro elettrico
-    draw_block(ax, 2, 6.5, 1.8, 1, 'Quadro\nElettrico', 'lightgray')
+    diagram.block(2, 6.5, 'Quadro\nElettrico', color='lightgray', w=1.8, h=1)
 
     # Trasformatore/Alimentatore
-    draw_block(ax, 4.5, 6.5, 1.8, 1, 'Alimentatore\n13.8V', 'lightblue')
+    diagram.block(4.5, 6.5, 'Alimentatore\n13.8V', color='lightblue', w=1.8, h=1)
 
     # Radio
-    draw_block(ax, 7, 6.5, 1.5, 1, 'Radio\nTX/RX', 'lightgreen')
+    diagram.block(7, 6.5, 'Radio\nTX/RX', color='lightgreen', w=1.5, h=1)
 
     # Lineare
-    draw_block(ax, 7, 4.5, 1.5, 1, 'Amplif.\nLineare', 'lightsalmon')
+    diagram.block(7, 4.5, 'Amplif.\nLineare', color='lightsalmon', w=1.5, h=1)
 
     # Barra equipotenziale
-    ax.plot([1.5, 8.5], [3, 3], 'g-', linewidth=6)
+    diagram.line([1.5, 8.5], [3, 3], color='green', linewidth=6)
     ax.text(5, 3.4, 'Barra Equipotenziale di Terra', ha='center', fontsize=10, fontweight='bold', color='darkgreen')
 
     # Connessioni a barra equipotenziale
-    ax.plot([2, 2], [6, 3], 'g-', linewidth=2)  # Quadro
-    ax.plot([4.5, 4.5], [6, 3], 'g-', linewidth=2)  # Alimentatore
-    ax.plot([7, 7], [6, 3], 'g-', linewidth=2)  # Radio
-    ax.plot([7, 7], [4, 3], 'g-', linewidth=2)  # Lineare
+    diagram.line([2, 2], [6, 3], color='green', linewidth=2)  # Quadro
+    diagram.line([4.5, 4.5], [6, 3], color='green', linewidth=2)  # Alimentatore
+    diagram.line([7, 7], [6, 3], color='green', linewidth=2)  # Radio
+    diagram.line([7, 7], [4, 3], color='green', linewidth=2)  # Lineare
 
     # Antenna e traliccio
-    ax.plot([11, 11], [0, 8], 'k-', linewidth=4)  # Traliccio
+    diagram.line([11, 11], [0, 8], linewidth=4)  # Traliccio
     ax.text(11, 8.5, 'Traliccio', ha='center', fontsize=10)
 
     # Dipolo stilizzato
-    ax.plot([10, 12], [7.5, 7.5], 'k-', linewidth=3)
-    ax.plot([9.5, 10], [7.7, 7.5], 'k-', linewidth=2)
-    ax.plot([12, 12.5], [7.5, 7.7], 'k-', linewidth=2)
+    diagram.line([10, 12], [7.5, 7.5], linewidth=3)
+    diagram.line([9.5, 10], [7.7, 7.5], linewidth=2)
+    diagram.line([12, 12.5], [7.5, 7.7], linewidth=2)
     ax.text(11, 8, 'Antenna', ha='center', fontsize=9)
 
     # Cavo coassiale
-    ax.plot([8.5, 10.5], [6.5, 6.5], 'b-', linewidth=2)
-    ax.plot([10.5, 10.5], [6.5, 7.5], 'b-', linewidth=2)
+    diagram.line([8.5, 10.5], [6.5, 6.5], color='blue', linewidth=2)
+    diagram.line([10.5, 10.5], [6.5, 7.5], color='blue', linewidth=2)
     ax.text(9.5, 6.8, 'Coax', ha='center', fontsize=8, color='blue')
 
     # Scaricatore
-    draw_block(ax, 10.5, 5.5, 1, 0.8, 'Scaric.', 'plum', fontsize=8)
-    ax.plot([10.5, 10.5], [6, 6.5], 'b-', linewidth=2)
-    ax.plot([10.5, 10.5], [5, 3], 'g-', linewidth=2)
+    diagram.block(10.5, 5.5, 'Scaric.', color='plum', w=1, h=0.8, fontsize=8)
+    diagram.line([10.5, 10.5], [6, 6.5], color='blue', linewidth=2)
+    diagram.line([10.5, 10.5], [5, 3], color='green', linewidth=2)
 
     # Terra traliccio
-    ax.plot([11, 11], [0, 0], 'g-', linewidth=3)
-    ax.plot([11, 11], [0, -0.5], 'g-', linewidth=3)
+    diagram.line([11, 11], [0, 0], color='green', linewidth=3)
+    diagram.line([11, 11], [0, -0.5], color='green', linewidth=3)
 
     # Picchetti di terra
     picchetti_x = [3, 5, 7, 11]
     for x in picchetti_x:
         # Picchetto
         ax.add_patch(Rectangle((x-0.15, -1.5), 0.3, 1.5, facecolor='brown', edgecolor='black'))
-        ax.plot([x, x], [0, -0.3], 'g-', linewidth=2)
+        diagram.line([x, x], [0, -0.3], color='green', linewidth=2)
 
     # Conduttore di terra
-    ax.plot([1.5, 11.5], [0, 0], 'g-', linewidth=4)
+    diagram.line([1.5, 11.5], [0, 0], color='green', linewidth=4)
     ax.text(6.5, 0.3, 'Conduttore di Terra (Cu 16mm²)', ha='center', fontsize=9, color='darkgreen')
 
     # Collegamento da barra a conduttore
-    ax.plot([5, 5], [3, 0], 'g-', linewidth=3)
+    diagram.line([5, 5], [3, 0], color='green', linewidth=3)
 
     # Terreno
     ax.fill_between([0, 13], -2, 0, color='saddlebrown', alpha=0.3)
-    ax.plot([0, 13], [0, 0], 'k-', linewidth=1)
+    diagram.line([0, 13], [0, 0], linewidth=1)
     ax.text(1, -1, 'Terreno', fontsize=9, color='brown')
 
     # Simboli terra
     for x in picchetti_x:
-        ax.plot([x-0.3, x+0.3], [-1.7, -1.7], 'k-', linewidth=1)
-        ax.plot([x-0.2, x+0.2], [-1.85, -1.85], 'k-', linewidth=1)
-        ax.plot([x-0.1, x+0.1], [-2, -2], 'k-', linewidth=1)
+        diagram.line([x-0.3, x+0.3], [-1.7, -1.7], linewidth=1)
+        diagram.line([x-0.2, x+0.2], [-1.85, -1.85], linewidth=1)
+        diagram.line([x-0.1, x+0.1], [-2, -2], linewidth=1)
 
     # Legenda
     legend_box = dict(boxstyle='round', facecolor='white', alpha=0.9)
@@ -210,6 +189,7 @@ def schema_messa_terra():
             fontsize=9, va='top', bbox=legend_box)
 
     ax.set_title('Schema Impianto di Messa a Terra - Stazione Radioamatore', fontsize=14, fontweight='bold', pad=15)
+    diagram.render()
     ax.set_xlim(0, 13)
     ax.set_ylim(-2.5, 10)
     ax.set_aspect('equal')
@@ -224,6 +204,7 @@ def schema_messa_terra():
 def schema_differenziale():
     """Schema principio funzionamento interruttore differenziale."""
     fig, ax = plt.subplots(figsize=(14, 10))
+    diagram = block_diagram(ax)
 
     # Titolo
     ax.text(7, 9.5, 'Principio di Funzionamento - Interruttore Differenziale (ID)',
@@ -246,19 +227,17 @@ def schema_differenziale():
     # Avvolgimento differenziale
     ax.plot([3.5, 3.5], [6.8, 7.5], 'orange', linewidth=2)
     ax.plot([3.5, 4.5], [7.5, 7.5], 'orange', linewidth=2)
-    draw_block(ax, 4.5, 7.5, 0.8, 0.5, 'Relè', 'lightyellow', fontsize=7)
+    diagram.block(4.5, 7.5, 'Relè', color='lightyellow', w=0.8, h=0.5, fontsize=7)
 
     # Carico
-    draw_block(ax, 6, 6, 1.2, 1.5, 'Carico\n(R)', 'lightgreen')
-    ax.plot([6, 6], [6.75, 7], 'r-', linewidth=2)
-    ax.plot([6, 6], [5.25, 5], 'b-', linewidth=2)
+    diagram.block(6, 6, 'Carico\n(R)', color='lightgreen', w=1.2, h=1.5)
+    diagram.line([6, 6], [6.75, 7], color='red', linewidth=2)
+    diagram.line([6, 6], [5.25, 5], color='blue', linewidth=2)
 
     # Frecce corrente (uguali)
-    ax.annotate('', xy=(2.5, 7.3), xytext=(1.5, 7.3),
-                arrowprops=dict(arrowstyle='->', color='red', lw=2))
+    diagram.arrow(1.5, 7.3, 2.5, 7.3, color='red', linewidth=2)
     ax.text(2, 7.6, 'I₁', fontsize=10, color='red')
-    ax.annotate('', xy=(1.5, 4.7), xytext=(2.5, 4.7),
-                arrowprops=dict(arrowstyle='->', color='blue', lw=2))
+    diagram.arrow(2.5, 4.7, 1.5, 4.7, color='blue', linewidth=2)
     ax.text(2, 4.3, 'I₂', fontsize=10, color='blue')
 
     # Formula
@@ -269,8 +248,8 @@ def schema_differenziale():
     ax.text(10.5, 8.5, 'Guasto a Terra', ha='center', fontsize=11, fontweight='bold', color='red')
 
     # Linee L e N
-    ax.plot([8, 13], [7, 7], 'r-', linewidth=2)  # Fase
-    ax.plot([8, 13], [5, 5], 'b-', linewidth=2)  # Neutro
+    diagram.line([8, 13], [7, 7], color='red', linewidth=2)  # Fase
+    diagram.line([8, 13], [5, 5], color='blue', linewidth=2)  # Neutro
     ax.text(7.5, 7, 'L', ha='center', fontsize=10, color='red')
     ax.text(7.5, 5, 'N', ha='center', fontsize=10, color='blue')
 
@@ -281,31 +260,28 @@ def schema_differenziale():
     # Avvolgimento + relè (scattato)
     ax.plot([10.5, 10.5], [6.8, 7.5], 'orange', linewidth=2)
     ax.plot([10.5, 11.5], [7.5, 7.5], 'orange', linewidth=2)
-    draw_block(ax, 11.5, 7.5, 0.8, 0.5, 'Relè', 'lightsalmon', fontsize=7)
+    diagram.block(11.5, 7.5, 'Relè', color='lightsalmon', w=0.8, h=0.5, fontsize=7)
 
     # Carico con guasto
-    draw_block(ax, 13, 6, 1.2, 1.5, 'Carico\n(guasto)', 'lightcoral')
-    ax.plot([13, 13], [6.75, 7], 'r-', linewidth=2)
-    ax.plot([13, 13], [5.25, 5], 'b-', linewidth=2)
+    diagram.block(13, 6, 'Carico\n(guasto)', color='lightcoral', w=1.2, h=1.5)
+    diagram.line([13, 13], [6.75, 7], color='red', linewidth=2)
+    diagram.line([13, 13], [5.25, 5], color='blue', linewidth=2)
 
     # Corrente di dispersione verso terra
-    ax.plot([12.5, 12.5], [6, 3.5], 'g-', linewidth=2)
-    ax.annotate('', xy=(12.5, 3.5), xytext=(12.5, 5),
-                arrowprops=dict(arrowstyle='->', color='green', lw=2))
+    diagram.line([12.5, 12.5], [6, 3.5], color='green', linewidth=2)
+    diagram.arrow(12.5, 5, 12.5, 3.5, color='green', linewidth=2)
     ax.text(13, 4.2, 'I_guasto', fontsize=9, color='green')
 
     # Simbolo terra
-    ax.plot([12.2, 12.8], [3.5, 3.5], 'k-', linewidth=2)
-    ax.plot([12.3, 12.7], [3.3, 3.3], 'k-', linewidth=1.5)
-    ax.plot([12.4, 12.6], [3.1, 3.1], 'k-', linewidth=1)
+    diagram.line([12.2, 12.8], [3.5, 3.5], linewidth=2)
+    diagram.line([12.3, 12.7], [3.3, 3.3])
+    diagram.line([12.4, 12.6], [3.1, 3.1], linewidth=1)
     ax.text(12.5, 2.8, 'Terra', ha='center', fontsize=8)
 
     # Frecce corrente (diverse!)
-    ax.annotate('', xy=(9.5, 7.3), xytext=(8.5, 7.3),
-                arrowprops=dict(arrowstyle='->', color='red', lw=2))
+    diagram.arrow(8.5, 7.3, 9.5, 7.3, color='red', linewidth=2)
     ax.text(9, 7.6, 'I₁', fontsize=10, color='red')
-    ax.annotate('', xy=(8.5, 4.7), xytext=(9.5, 4.7),
-                arrowprops=dict(arrowstyle='->', color='blue', lw=2))
+    diagram.arrow(9.5, 4.7, 8.5, 4.7, color='blue', linewidth=2)
     ax.text(9, 4.3, 'I₂ < I₁', fontsize=10, color='blue')
 
     # Formula guasto
@@ -316,13 +292,13 @@ def schema_differenziale():
     # Testa
     ax.add_patch(Circle((11.5, 5), 0.3, facecolor='peachpuff', edgecolor='black'))
     # Corpo
-    ax.plot([11.5, 11.5], [4.7, 3.8], 'k-', linewidth=2)
+    diagram.line([11.5, 11.5], [4.7, 3.8], linewidth=2)
     # Braccia
-    ax.plot([11.5, 12.3], [4.5, 5.5], 'k-', linewidth=2)
-    ax.plot([11.5, 10.8], [4.5, 4.2], 'k-', linewidth=2)
+    diagram.line([11.5, 12.3], [4.5, 5.5], linewidth=2)
+    diagram.line([11.5, 10.8], [4.5, 4.2], linewidth=2)
     # Gambe
-    ax.plot([11.5, 11.2], [3.8, 3], 'k-', linewidth=2)
-    ax.plot([11.5, 11.8], [3.8, 3], 'k-', linewidth=2)
+    diagram.line([11.5, 11.2], [3.8, 3], linewidth=2)
+    diagram.line([11.5, 11.8], [3.8, 3], linewidth=2)
 
     # Nota esplicativa
     note_box = dict(boxstyle='round', facecolor='lightyellow', alpha=0.9)
@@ -336,6 +312,7 @@ def schema_differenziale():
     ax.text(1, 2.5, 'Tipi di ID:\n• 30mA: protezione persone\n• 300mA: protezione incendio\n• Classe AC/A/B: tipo corrente',
             fontsize=9, va='top', bbox=specs_box)
 
+    diagram.render()
     ax.set_xlim(0, 14)
     ax.set_ylim(0, 10)
     ax.set_aspect('equal')
@@ -350,20 +327,21 @@ def schema_differenziale():
 def schema_scaricatore():
     """Schema scaricatore antenna (gas discharge tube)."""
     fig, ax = plt.subplots(figsize=(14, 9))
+    diagram = block_diagram(ax)
 
     # Titolo
     ax.text(7, 8.5, 'Scaricatore per Protezione Antenna (Gas Discharge Tube)',
             ha='center', fontsize=14, fontweight='bold')
 
     # Antenna
-    ax.plot([2, 2], [6, 8], 'k-', linewidth=3)
-    ax.plot([1, 3], [8, 8], 'k-', linewidth=3)
-    ax.plot([0.5, 1], [8.2, 8], 'k-', linewidth=2)
-    ax.plot([3, 3.5], [8, 8.2], 'k-', linewidth=2)
+    diagram.line([2, 2], [6, 8], linewidth=3)
+    diagram.line([1, 3], [8, 8], linewidth=3)
+    diagram.line([0.5, 1], [8.2, 8], linewidth=2)
+    diagram.line([3, 3.5], [8, 8.2], linewidth=2)
     ax.text(2, 8.5, 'Antenna', ha='center', fontsize=10)
 
     # Cavo coassiale in entrata
-    ax.plot([2, 2], [6, 5], 'b-', linewidth=3)
+    diagram.line([2, 2], [6, 5], color='blue', linewidth=3)
     ax.text(2.5, 5.5, 'Coax', fontsize=9, color='blue')
 
     # Scaricatore (dettagliato)
@@ -382,8 +360,8 @@ def schema_scaricatore():
     ax.text(2, 3.6, 'GDT', ha='center', fontsize=9, fontweight='bold')
 
     # Elettrodi
-    ax.plot([1.7, 1.7], [3.2, 2.8], 'k-', linewidth=3)
-    ax.plot([2.3, 2.3], [3.2, 2.8], 'k-', linewidth=3)
+    diagram.line([1.7, 1.7], [3.2, 2.8], linewidth=3)
+    diagram.line([2.3, 2.3], [3.2, 2.8], linewidth=3)
 
     # Gap simbolico
     ax.plot([1.9, 2.1], [3.5, 3.5], 'orange', linewidth=2)
@@ -393,22 +371,22 @@ def schema_scaricatore():
     ax.text(2, 1.8, 'OUT', ha='center', fontsize=8)
 
     # Collegamento a terra
-    ax.plot([0.8, 0.8], [3.5, 1], 'g-', linewidth=3)
-    ax.plot([0.5, 1.1], [1, 1], 'k-', linewidth=2)
-    ax.plot([0.6, 1], [0.8, 0.8], 'k-', linewidth=1.5)
-    ax.plot([0.7, 0.9], [0.6, 0.6], 'k-', linewidth=1)
+    diagram.line([0.8, 0.8], [3.5, 1], color='green', linewidth=3)
+    diagram.line([0.5, 1.1], [1, 1], linewidth=2)
+    diagram.line([0.6, 1], [0.8, 0.8])
+    diagram.line([0.7, 0.9], [0.6, 0.6], linewidth=1)
     ax.text(0.8, 0.3, 'Terra', ha='center', fontsize=9)
 
     # Freccia verso terra dal GDT
-    ax.plot([1.5, 0.8], [3.5, 3.5], 'g-', linewidth=2)
+    diagram.line([1.5, 0.8], [3.5, 3.5], color='green', linewidth=2)
 
     # Cavo verso radio
-    ax.plot([2, 2], [2, 1], 'b-', linewidth=3)
-    ax.plot([2, 5], [1, 1], 'b-', linewidth=3)
+    diagram.line([2, 2], [2, 1], color='blue', linewidth=3)
+    diagram.line([2, 5], [1, 1], color='blue', linewidth=3)
 
     # Radio
-    draw_block(ax, 6, 1, 1.5, 1.2, 'Radio\nTX/RX', 'lightgreen')
-    ax.plot([5, 5.2], [1, 1], 'b-', linewidth=3)
+    diagram.block(6, 1, 'Radio\nTX/RX', color='lightgreen', w=1.5, h=1.2)
+    diagram.line([5, 5.2], [1, 1], color='blue', linewidth=3)
 
     # === Diagramma funzionamento ===
     ax.text(10, 7.5, 'Principio di Funzionamento', ha='center', fontsize=11, fontweight='bold')
@@ -426,8 +404,7 @@ def schema_scaricatore():
     ax.text(10, 3.8, 'Gas ionizzato - Scarica a terra', ha='center', fontsize=9)
 
     # Freccia fulmine
-    ax.annotate('', xy=(5, 7), xytext=(4, 8),
-                arrowprops=dict(arrowstyle='->', color='yellow', lw=4))
+    diagram.arrow(4, 8, 5, 7, color='yellow', linewidth=4)
     ax.text(4.5, 7.8, 'Fulmine', fontsize=9, color='darkorange', fontweight='bold')
 
     # Caratteristiche tecniche
@@ -448,6 +425,7 @@ def schema_scaricatore():
                   '• Proteggere anche\n  linee di controllo',
             ha='left', fontsize=9, va='top', bbox=install_box)
 
+    diagram.render()
     ax.set_xlim(-0.5, 13)
     ax.set_ylim(-0.5, 9)
     ax.set_aspect('equal')
@@ -459,6 +437,116 @@ def schema_scaricatore():
     print(f"✓ Salvato: {OUTPUT_DIR / 'schema_scaricatore.png'}")
 
 
+# Stazioni tipiche per le mappe di esposizione
+RF_STATIONS = [
+    Station('Dipolo 40m, 400 W CW', 7.1e6, 400, 2.15, 10.0, 78, MODE_DUTY['CW']),
+    Station('Dipolo 20m, 100 W SSB', 14.2e6, 100, 2.15, 10.0, 78, MODE_DUTY['SSB']),
+    Station('Yagi 6m, 200 W FT8', 50.3e6, 200, 10.0, 10.0, 45, 0.5 * MODE_DUTY['Digi']),
+    Station('Collineare 2m, 50 W FM', 145.5e6, 50, 6.0, 8.0, 30, MODE_DUTY['FM']),
+    Station('Yagi 2m, 300 W SSB', 144.3e6, 300, 13.0, 10.0, 30, MODE_DUTY['SSB']),
+    Station('Yagi 70cm, 100 W FM', 432.5e6, 100, 14.0, 6.0, 25, MODE_DUTY['FM']),
+]
+
+
+def plot_zone_esposizione_rf():
+    """Mappe del campo elettrico attorno all'antenna e zone di rispetto per piu' stazioni."""
+    x = np.linspace(0.0, 40.0, 401)
+    z = np.linspace(0.0, 20.0, 201)
+    # Tutte le stazioni in un'unica chiamata vettoriale: (K, Nz, Nx)
+    e, ratio = exposure_maps(RF_STATIONS, x, z, standard='dpcm')
+    attention = e / e_field_limit([s.f_hz for s in RF_STATIONS], 'dpcm-attenzione')[:, None, None]
+
+    fig, axes = plt.subplots(2, 3, figsize=(16, 9), sharex=True, sharey=True)
+    norm = LogNorm(vmin=0.3, vmax=300)
+    for ax, station, e_map, r_map, a_map in zip(axes.flat, RF_STATIONS, e, ratio, attention):
+        mesh = ax.pcolormesh(x, z, np.clip(e_map, 0.3, 300), norm=norm, cmap='inferno_r',
+                             shading='auto')
+        ax.contour(x, z, r_map, levels=[1.0], colors='red', linewidths=2)
+        ax.contour(x, z, a_map, levels=[1.0], colors='deepskyblue', linewidths=1.5,
+                   linestyles='--')
+        ax.plot([0], [station.height_m], marker='^', color='black', markersize=10)
+        ax.axhline(2.0, color='gray', linestyle=':', linewidth=1)
+
+        d_limit = compliance_distance(station.f_hz, station.power_w, station.gain_dbi,
+                                      station.duty_cycle, standard='dpcm')
+        d_att = compliance_distance(station.f_hz, station.power_w, station.gain_dbi,
+                                    station.duty_cycle, standard='dpcm-attenzione')
+        ax.set_title(station.name, fontsize=11, fontweight='bold')
+        ax.text(0.97, 0.95, f'Limite: {d_limit:.1f} m\nAttenzione: {d_att:.1f} m',
+                transform=ax.transAxes, ha='right', va='top', fontsize=9,
+                bbox=dict(boxstyle='round', facecolor='white', alpha=0.85))
+
+    for ax in axes[-1]:
+        ax.set_xlabel('Distanza orizzontale (m)')
+    for ax in axes[:, 0]:
+        ax.set_ylabel('Altezza dal suolo (m)')
+
+    cbar = fig.colorbar(mesh, ax=axes, shrink=0.85, pad=0.02)
+    cbar.set_label('Campo elettrico medio (V/m)')
+
+    handles = [
+        plt.Line2D([], [], color='red', linewidth=2, label='Limite di esposizione (DPCM 2003)'),
+        plt.Line2D([], [], color='deepskyblue', linestyle='--', linewidth=1.5,
+                   label='Valore di attenzione 6 V/m'),
+        plt.Line2D([], [], color='gray', linestyle=':', label='Altezza persona (2 m)'),
+        plt.Line2D([], [], color='black', marker='^', linestyle='', label='Antenna'),
+    ]
+    fig.legend(handles=handles, loc='lower center', ncol=4, fontsize=10,
+               bbox_to_anchor=(0.45, -0.03))
+    fig.suptitle('Zone di Rispetto per l\'Esposizione ai Campi RF\n'
+                 '(campo lontano, riflessione del suolo 1.6, potenza media per modo di emissione)',
+                 fontsize=14, fontweight='bold')
+
+    plt.savefig(OUTPUT_DIR / 'esposizione_rf_zone.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'esposizione_rf_zone.png'}")
+
+
+def plot_distanze_rispetto_rf():
+    """Limiti di campo in frequenza e distanze di rispetto per tutte le bande."""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+
+    f = np.logspace(np.log10(1e6), np.log10(2e9), 500)
+    for standard, label, style in [('icnirp', 'ICNIRP 1998 (popolazione)', '-'),
+                                   ('dpcm', 'DPCM 2003 - limite di esposizione', '--'),
+                                   ('dpcm-attenzione', 'DPCM 2003 - valore di attenzione', ':')]:
+        ax1.plot(f / 1e6, e_field_limit(f, standard), style, linewidth=2, label=label)
+    for band in BAND_PLAN.bands:
+        ax1.axvspan(band.f_min / 1e6, band.f_max / 1e6, color='green', alpha=0.25)
+    ax1.set_xscale('log')
+    ax1.set_yscale('log')
+    ax1.set_ylim(3, 200)
+    ax1.set_xlabel('Frequenza (MHz)')
+    ax1.set_ylabel('Campo elettrico (V/m)')
+    ax1.set_title('Livelli di riferimento del campo elettrico', fontweight='bold')
+    ax1.grid(True, which='both', alpha=0.3)
+    ax1.legend(fontsize=9, loc='upper right')
+
+    # Lotto bande x potenze in una sola chiamata: (B, P)
+    centers = np.array([(b.f_min + b.f_max) / 2 for b in BAND_PLAN.bands])
+    powers = np.array([10, 100, 500])
+    distance = compliance_distance(centers[:, None], powers[None, :], 2.15,
+                                   duty_cycle=1.0, standard='icnirp')
+    # Nessuna barra oltre la potenza massima ammessa nella banda
+    distance[powers[None, :] > BAND_PLAN.max_power_w[:, None]] = np.nan
+    pos = np.arange(len(centers))
+    width = 0.27
+    for k, (power, color) in enumerate(zip(powers, ['#93c5fd', '#3b82f6', '#1e3a8a'])):
+        ax2.bar(pos + (k - 1) * width, distance[:, k], width, color=color, label=f'{power} W')
+    ax2.set_xticks(pos)
+    ax2.set_xticklabels([b.name for b in BAND_PLAN.bands], rotation=45)
+    ax2.set_ylabel('Distanza di rispetto (m)')
+    ax2.set_title('Distanza di rispetto ICNIRP, dipolo (2.15 dBi), portante continua',
+                  fontweight='bold', fontsize=11)
+    ax2.grid(True, axis='y', alpha=0.3)
+    ax2.legend(title='Potenza', fontsize=9)
+
+    plt.tight_layout()
+    plt.savefig(OUTPUT_DIR / 'esposizione_rf_distanze.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'esposizione_rf_distanze.png'}")
+
+
 def main():
     """Genera tutti i diagrammi di sicurezza elettrica."""
     print("Generazione diagrammi sicurezza elettrica...")
@@ -468,6 +556,8 @@ def main():
     schema_messa_terra()
     schema_differenziale()
     schema_scaricatore()
+    plot_zone_esposizione_rf()
+    plot_distanze_rispetto_rf()
 
     print("\n✅ Tutti i diagrammi sono stati generati con successo!")
 
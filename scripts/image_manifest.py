@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Manifest delle immagini generate, per le immagini responsive del sito.
+
+Per ogni immagine di images/ citata dalle pagine (PNG, SVG, GIF, JPEG a
+risoluzione 1x) elenca dimensioni in pixel, byte, hash e le varianti
+salvate accanto da save_figure (es. schema@2x.png, schema.webp, vedi
+OutputSpec). Il plugin remark del sito (website/src/remark/
+responsive-images.js) legge images/manifest.json e trasforma i
+riferimenti alle immagini in <picture> con srcset e width/height, cosi'
+il browser sceglie la variante adatta allo schermo e riserva lo spazio
+prima del caricamento.
+
+Uso: python image_manifest.py (dopo gli script di generazione e optimize_svgs.py)
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+from utils import IMAGES_DIR, format_si, run_with_error_handling
+
+IMAGE_MANIFEST = IMAGES_DIR / "manifest.json"
+
+# nome[@<scala>x].estensione, come da OutputSpec.filename
+_VARIANT_NAME = re.compile(r'^(?P<stem>.+?)(?:@(?P<scale>\d+(?:\.\d+)?)x)?\.(?P<format>png|webp|svg|gif|jpe?g)$')
+_SVG_SIZE = re.compile(r'<svg\b[^>]*?\swidth="([\d.]+)(pt|px)?"[^>]*?\sheight="([\d.]+)(pt|px)?"')
+
+# Pixel CSS per unita' SVG
+_SVG_UNITS = {'pt': 96 / 72, 'px': 1.0, None: 1.0}
+
+
+def image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Dimensioni in pixel (CSS per gli SVG); None se non determinabili.
+
+    Per i raster legge solo l'intestazione del file.
+    """
+    if path.suffix == '.svg':
+        match = _SVG_SIZE.search(path.read_text(encoding='utf-8', errors='replace')[:2000])
+        if not match:
+            return None
+        width, width_unit, height, height_unit = match.groups()
+        return (round(float(width) * _SVG_UNITS[width_unit]),
+                round(float(height) * _SVG_UNITS[height_unit]))
+    with Image.open(path) as image:
+        return image.size
+
+
+def _describe(path: Path, scale: float) -> Dict[str, Any]:
+    """Voce di un file: percorso relativo, formato, scala, dimensioni, byte, hash."""
+    data = path.read_bytes()
+    size = image_size(path)
+    entry = {
+        'file': path.relative_to(IMAGES_DIR).as_posix(),
+        'format': path.suffix[1:].lower().replace('jpeg', 'jpg'),
+        'scale': scale,
+        'bytes': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+    if size:
+        entry['width'], entry['height'] = size
+    return entry
+
+
+def build_manifest(root: Path = IMAGES_DIR) -> Dict[str, Dict[str, Any]]:
+    """
+    Manifest delle immagini sotto root.
+
+    Returns:
+        Per ogni immagine principale (chiave: percorso relativo a images/) la
+        sua voce e, in 'variants', quelle delle varianti con lo stesso nome
+        (altre scale, WebP), ordinate per formato e larghezza
+    """
+    groups: Dict[Tuple[Path, str], list] = {}
+    for path in sorted(Path(root).rglob('*')):
+        match = _VARIANT_NAME.match(path.name)
+        if not match or not path.is_file():
+            continue
+        scale = float(match['scale'] or 1)
+        groups.setdefault((path.parent, match['stem']), []).append((path, scale, match['format']))
+
+    manifest = {}
+    for files in groups.values():
+        entries = [_describe(path, scale) for path, scale, _ in files]
+        # Le pagine citano i file a 1x in un formato non WebP
+        primaries = [entry for entry in entries if entry['scale'] == 1 and entry['format'] != 'webp']
+        for primary in primaries:
+            variants = [entry for entry in entries if entry not in primaries]
+            variants.sort(key=lambda entry: (entry['format'], entry.get('width', 0)))
+            manifest[primary['file']] = dict(primary, variants=variants)
+    return manifest
+
+
+def write_manifest(manifest: Dict[str, Dict[str, Any]], path: Path = IMAGE_MANIFEST) -> None:
+    """Scrive il manifest (ordinato, per diff stabili fra una build e l'altra)."""
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+    tmp.replace(path)
+
+
+def main():
+    """Scrive images/manifest.json."""
+    manifest = build_manifest()
+    write_manifest(manifest)
+    variants = sum(len(entry['variants']) for entry in manifest.values())
+    total = sum(entry['bytes'] + sum(v['bytes'] for v in entry['variants']) for entry in manifest.values())
+    print(f"[OK] Salvato: {IMAGE_MANIFEST}")
+    print(f"Manifest immagini: {len(manifest)} immagini, {variants} varianti, {format_si(total, 'B')}")
+
+
+if __name__ == "__main__":
+    exit(run_with_error_handling(main, "image_manifest"))
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Ottimizzazione degli SVG generati (schemi schemdraw e grafici matplotlib).
+
+matplotlib scrive SVG leggibili ma prolissi: coordinate con sei decimali,
+lo stesso attributo style ripetuto su centinaia di elementi, metadati con
+la data, commenti e id per ogni gruppo. Questo passaggio, da eseguire dopo
+gli script di generazione, riscrive ogni SVG in images/ in forma compatta
+senza cambiarne l'aspetto:
+
+- arrotonda le coordinate dei percorsi e delle traslazioni a PRECISION
+  decimali (0.01 pt, invisibile anche sugli schermi ad alta densita');
+- sposta gli stili ripetuti in classi CSS nel <style> del file;
+- toglie metadati, DOCTYPE, commenti, id non referenziati e gruppi vuoti;
+- con symbols=True riunisce le definizioni dei glifi del testo, che
+  matplotlib emette in un <defs> per ogni etichetta, in un unico blocco di
+  simboli condivisi da tutte le etichette (riferiti con <use>).
+
+I file vengono elaborati in parallelo. Il risultato e' in cache in
+.build/svg/, con chiave l'hash del contenuto (metadati esclusi, cosi' la
+data di salvataggio non conta) e del codice di questo modulo; il manifest
+di build registra per ogni file l'hash prima e dopo, cosi' un file gia'
+ottimizzato non viene rielaborato e CachedDrawing non lo sovrascrive con
+la versione originale.
+
+Uso: python optimize_svgs.py [sottodirectory di images/ ...]
+"""
+
+import hashlib
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils import BUILD_DIR, IMAGES_DIR, format_si, load_manifest, run_with_error_handling, \
+    update_manifest_entries
+
+SVG_CACHE_DIR = BUILD_DIR / "svg"
+MANIFEST_SECTION = 'svg'
+
+# Decimali delle coordinate (in pt)
+PRECISION = 2
+
+_PROLOG = re.compile(r'<\?xml[^>]*\?>|<!DOCTYPE[^>]*>|<metadata>.*?</metadata>|<!--.*?-->', re.S)
+_TOKEN = re.compile(r'<(/?)([A-Za-z][\w:.-]*)((?:\s+[\w:.-]+="[^"]*")*)\s*(/?)>|[^<]+')
+_ATTR = re.compile(r'([\w:.-]+)="([^"]*)"')
+_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_REFERENCE = re.compile(r'(?:href="#|url\(#)([^")]+)')
+_TRANSLATE = re.compile(r'translate\(([^)]*)\)')
+_HEX6 = re.compile(r'#([0-9a-fA-F])\1([0-9a-fA-F])\2([0-9a-fA-F])\3\b')
+
+_NUMERIC_ATTRS = ('x', 'y', 'width', 'height')
+
+
+def _round(text: str, precision: int) -> str:
+    """Arrotonda tutti i numeri di text, senza zeri finali."""
+    def fmt(match):
+        value = f'{round(float(match.group()), precision):.{precision}f}'.rstrip('0').rstrip('.')
+        return '0' if value == '-0' else value
+    return _NUMBER.sub(fmt, text)
+
+
+def _compact_path(d: str, precision: int) -> str:
+    """
+    Dati di un percorso arrotondati, senza spazi superflui ne' comandi ripetuti.
+
+    Example:
+        >>> _compact_path('M 0 167 L 405.81 -0.001 L 405.816 -3 z', 2)
+        'M0 167L405.81 0 405.82-3z'
+    """
+    parts = []
+    previous = None
+    for command, args in re.findall(r'([A-Za-z])([^A-Za-z]*)', d):
+        args = ' '.join(_round(args, precision).split()).replace(' -', '-')
+        # Un comando uguale al precedente si puo' omettere (non M, che ripetuto vale L)
+        if command == previous and command not in 'Mm' and args:
+            parts.append(args if args[0] == '-' else ' ' + args)
+        else:
+            parts.append(command + args)
+        previous = command
+    return ''.join(parts)
+
+
+def _compact_style(style: str) -> str:
+    """Dichiarazioni CSS senza spazi superflui, colori #rrggbb abbreviati."""
+    declarations = (part.split(':', 1) for part in style.split(';') if part.strip())
+    style = ';'.join(f'{name.strip()}:{value.strip()}' for name, value in declarations)
+    return _HEX6.sub(r'#\1\2\3', style)
+
+
+def optimize_svg(data: bytes, precision: int = PRECISION, symbols: bool = True) -> bytes:
+    """
+    Versione compatta di un SVG scritto da matplotlib.
+
+    Args:
+        data: Contenuto del file SVG
+        precision: Decimali delle coordinate
+        symbols: Riunisce le definizioni dei glifi in un unico <defs>
+
+    Returns:
+        Il contenuto ottimizzato
+
+    Example:
+        >>> svg = (b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg">\\n'
+        ...        b' <!-- R1 -->\\n <g id="line2d_1">\\n'
+        ...        b'  <path d="M 0.123456 1 \\nL 2.5 1 \\n" style="fill: none; stroke: #000000"/>\\n'
+        ...        b'  <path d="M 3 4 \\nL 5 6 \\n" style="fill: none; stroke: #000000"/>\\n'
+        ...        b' </g>\\n</svg>\\n')
+        >>> print(optimize_svg(svg).decode())
+        <svg xmlns="http://www.w3.org/2000/svg"><defs><style>.s0{fill:none;stroke:#000}</style></defs><path d="M0.12 1L2.5 1" class="s0"/><path d="M3 4L5 6" class="s0"/></svg>
+    """
+    text = _PROLOG.sub('', data.decode('utf-8'))
+    referenced = set(_REFERENCE.findall(text))
+
+    # Prima passata: elementi come (chiusura, nome, attributi, autochiuso) o testo
+    tokens = []
+    styles = Counter()
+    defs_depth = 0
+    for match in _TOKEN.finditer(text):
+        closing, name, attrs, selfclosing = match.groups()
+        if not name:
+            tokens.append(match.group())
+            continue
+        attrs = dict(_ATTR.findall(attrs))
+        if attrs.get('id') is not None and attrs['id'] not in referenced:
+            del attrs['id']
+        if 'd' in attrs:
+            attrs['d'] = _compact_path(attrs['d'], precision)
+        if 'transform' in attrs:
+            attrs['transform'] = _TRANSLATE.sub(
+                lambda m: f'translate({_round(m.group(1), precision)})', attrs['transform'])
+        for key in _NUMERIC_ATTRS:
+            if _NUMBER.fullmatch(attrs.get(key, '')):
+                attrs[key] = _round(attrs[key], precision)
+        if name == 'style' and not closing:
+            attrs.pop('type', None)
+        if 'style' in attrs:
+            attrs['style'] = _compact_style(attrs['style'])
+            # Dentro <defs> gli stili restano in linea: gli elementi clonati
+            # da <use> non sempre ricevono le regole per classe
+            if not defs_depth and 'class' not in attrs:
+                styles[attrs['style']] += 1
+        if name == 'defs' and not selfclosing:
+            defs_depth += -1 if closing else 1
+        tokens.append((closing, name, attrs, selfclosing))
+
+    classes = {style: f's{i}' for i, (style, count) in
+               enumerate(styles.most_common()) if count > 1}
+    rules = ''.join(f'.{cls}{{{style}}}' for style, cls in classes.items())
+
+    # Seconda passata: scrittura, con i <defs> eventualmente riuniti in uno
+    out: List[str] = []
+    defs: List[str] = []
+    target = out
+    defs_depth = 0
+    text_depth = 0
+    in_style = False
+    unwrapped = []
+    for token in tokens:
+        if isinstance(token, str):
+            if text_depth:
+                target.append(token)
+            elif token.strip():
+                target.append(re.sub(r'\s*([{}:;,])\s*', r'\1', token.strip()) if in_style else token)
+            continue
+        closing, name, attrs, selfclosing = token
+        if name == 'defs':
+            if not selfclosing:
+                defs_depth += -1 if closing else 1
+            if symbols:
+                if defs_depth == 1 and not closing and not selfclosing:
+                    target = defs
+                    if not any(piece is defs for piece in out):
+                        out.append(defs)
+                elif defs_depth == 0:
+                    target = out
+                continue
+        if name == 'g':
+            if closing:
+                if unwrapped.pop():
+                    continue
+            elif not attrs:
+                if not selfclosing:
+                    unwrapped.append(True)
+                continue
+            elif not selfclosing:
+                unwrapped.append(False)
+        if name == 'text' and not selfclosing:
+            text_depth += -1 if closing else 1
+        if name == 'style':
+            in_style = not closing and not selfclosing
+        if not defs_depth and attrs.get('style') in classes:
+            attrs['class'] = classes[attrs.pop('style')]
+        attributes = ''.join(f' {key}="{value}"' for key, value in attrs.items())
+        target.append(f'<{closing}{name}{attributes}{selfclosing}>')
+
+    result = ''.join(f'<defs>{"".join(piece)}</defs>' if isinstance(piece, list) else piece
+                     for piece in out)
+    if rules:
+        if '</style>' in result:
+            result = result.replace('</style>', rules + '</style>', 1)
+        else:
+            result = re.sub(r'(<svg\b[^>]*>)', r'\1<defs><style>' + rules + '</style></defs>',
+                            result, count=1)
+    return result.encode('utf-8')
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _optimizer_digest(precision: int, symbols: bool) -> str:
+    """Impronta di questo modulo e delle opzioni: se cambia, i file vanno rielaborati."""
+    h = hashlib.sha256(Path(__file__).read_bytes())
+    h.update(repr((precision, symbols)).encode())
+    return h.hexdigest()
+
+
+def _cache_key(data: bytes, optimizer: str) -> str:
+    """Hash del contenuto senza metadati e dell'ottimizzatore."""
+    h = hashlib.sha256(optimizer.encode())
+    h.update(_PROLOG.sub('', data.decode('utf-8')).encode('utf-8'))
+    return h.hexdigest()
+
+
+def manifest_key(path) -> str:
+    """Chiave del file nel manifest: percorso relativo a images/."""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(IMAGES_DIR))
+    return Path(relative).as_posix()
+
+
+def is_optimized(path, source: bytes) -> bool:
+    """
+    Vero se path e' la versione ottimizzata di source.
+
+    Serve a chi genera di nuovo lo stesso SVG (es. dalla cache degli schemi)
+    per non sostituire il file ottimizzato con l'originale.
+    """
+    entry = load_manifest().get(MANIFEST_SECTION, {}).get(manifest_key(path))
+    try:
+        return (entry is not None and entry['source'] == _digest(source)
+                and entry['sha256'] == _digest(Path(path).read_bytes()))
+    except OSError:
+        return False
+
+
+def _optimize_file(path: Path, previous: Optional[Dict[str, Any]], optimizer: str,
+                   precision: int, symbols: bool) -> Dict[str, Any]:
+    """Ottimizza un file (nel processo di lavoro) e ne restituisce la voce di manifest."""
+    data = path.read_bytes()
+    digest = _digest(data)
+    entry = {'source': digest, 'bytes_in': len(data), 'optimizer': optimizer}
+    if previous and previous['sha256'] == digest:
+        if previous.get('optimizer') == optimizer:
+            return dict(previous, status='gia_ottimizzato')
+        # Ottimizzato con una versione precedente: si rielabora il file
+        # attuale, l'originale resta quello registrato
+        entry.update(source=previous['source'], bytes_in=previous['bytes_in'])
+
+    cached = SVG_CACHE_DIR / (_cache_key(data, optimizer) + '.svg')
+    if cached.exists():
+        optimized, status = cached.read_bytes(), 'cache'
+    else:
+        optimized, status = optimize_svg(data, precision, symbols), 'ottimizzato'
+        tmp = cached.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_bytes(optimized)
+        tmp.replace(cached)
+    if optimized != data:
+        path.write_bytes(optimized)
+    return dict(entry, sha256=_digest(optimized), bytes_out=len(optimized), status=status)
+
+
+def optimize_tree(
+    root: Path = IMAGES_DIR,
+    precision: int = PRECISION,
+    symbols: bool = True,
+    workers: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Ottimizza in parallelo tutti gli SVG sotto root.
+
+    Returns:
+        Per ogni file (chiave del manifest) hash prima/dopo, byte prima/dopo
+        e come e' stato ottenuto (ottimizzato, cache, gia_ottimizzato)
+    """
+    files = sorted(Path(root).rglob('*.svg'))
+    previous = load_manifest().get(MANIFEST_SECTION, {})
+    keys = [manifest_key(path) for path in files]
+    optimizer = _optimizer_digest(precision, symbols)
+    SVG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_optimize_file, files, [previous.get(key) for key in keys],
+                                *zip(*[(optimizer, precision, symbols)] * len(files))))
+    entries = dict(zip(keys, results))
+    update_manifest_entries(MANIFEST_SECTION, {
+        key: {k: v for k, v in entry.items() if k != 'status'} for key, entry in entries.items()
+    })
+    return entries
+
+
+def svg_report(entries: Dict[str, Dict[str, Any]]) -> str:
+    """Riepilogo su una riga: file, byte risparmiati, origine dei risultati."""
+    bytes_in = sum(entry['bytes_in'] for entry in entries.values())
+    bytes_out = sum(entry['bytes_out'] for entry in entries.values())
+    saved = 1 - bytes_out / bytes_in if bytes_in else 0.0
+    status = Counter(entry['status'] for entry in entries.values())
+    return (f"SVG: {len(entries)} file, {format_si(bytes_in, 'B')} -> {format_si(bytes_out, 'B')} "
+            f"(-{saved:.0%}); {status['ottimizzato']} ottimizzati, {status['cache']} dalla cache, "
+            f"{status['gia_ottimizzato']} gia' ottimizzati")
+
+
+def main():
+    """Ottimizza gli SVG di images/ (o delle sottodirectory indicate)."""
+    roots = [IMAGES_DIR / name for name in sys.argv[1:]] or [IMAGES_DIR]
+    for root in roots:
+        print(f"Ottimizzazione SVG in: {root}")
+        entries = optimize_tree(root)
+        for key, entry in entries.items():
+            if entry['status'] != 'gia_ottimizzato':
+                print(f"  {key}: {entry['bytes_in']} -> {entry['bytes_out']} byte")
+        print(svg_report(entries))
+
+
+if __name__ == "__main__":
+    exit(run_with_error_handling(main, "optimize_svgs"))
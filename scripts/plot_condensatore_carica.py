@@ -1,5 +1,12 @@
 import matplotlib.pyplot as plt
 import numpy as np
+from pathlib import Path
+
+from calcoli.transitori import damping_ratio, rc_step, rlc_series_step
+
+# Directory di output
+OUTPUT_DIR = Path(__file__).parent.parent / "images" / "01_elettronica"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Dati per il grafico: Carica e scarica di un condensatore
 R = 1000  # Resistenza di 1kΩ
@@ -10,17 +17,10 @@ tau = R * C  # Costante di tempo
 # Tempo da 0 a 5τ (quasi completa carica/scarica)
 t = np.linspace(0, 5 * tau, 1000)
 
-# Carica del condensatore (tensione che cresce esponenzialmente)
-V_charge = V_source * (1 - np.exp(-t / tau))
-
-# Scarica del condensatore (tensione che decade esponenzialmente)
-V_discharge = V_source * np.exp(-t / tau)
-
-# Corrente di carica (decresce esponenzialmente)
-I_charge = (V_source / R) * np.exp(-t / tau)
-
-# Corrente di scarica (negativa, decade in valore assoluto)
-I_discharge = -(V_source / R) * np.exp(-t / tau)
+# Carica (da 0 V verso V_source) e scarica (da V_source verso 0 V) in una sola chiamata
+response = rc_step(t, R, C, v_source=np.array([[V_source], [0.0]]), v0=np.array([[0.0], [V_source]]))
+V_charge, V_discharge = response.voltage
+I_charge, I_discharge = response.current
 
 # Crea il grafico con due subplot
 fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
@@ -50,5 +50,47 @@ ax2.axvline(x=tau * 1000, color='green', linestyle=':', alpha=0.5, label=f'τ =
 plt.tight_layout()
 
 # Salva l'immagine
-plt.savefig('/Users/giangio/Documents/GitHub/giangio/esame-radioamatori/images/01_elettronica/grafico_condensatore_carica.png', dpi=150)
-print("Grafico salvato in images/01_elettronica/grafico_condensatore_carica.png")
\ No newline at end of file
+plt.savefig(OUTPUT_DIR / 'grafico_condensatore_carica.png', dpi=150)
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'grafico_condensatore_carica.png'}")
+
+# Famiglie di curve: effetto di tau (RC) e del coefficiente di smorzamento (RLC serie)
+fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
+
+t_fam = np.linspace(0, 50e-3, 1000)
+C_values = np.logspace(np.log10(1e-6), np.log10(47e-6), 200)        # 200 condensatori
+family = rc_step(t_fam, R, C_values[:, None], V_source)
+colors = plt.cm.viridis(np.linspace(0, 1, len(C_values)))
+for v, color in zip(family.voltage, colors):
+    ax1.plot(t_fam * 1000, v, color=color, linewidth=0.6)
+sm = plt.cm.ScalarMappable(cmap='viridis', norm=plt.Normalize(R * C_values[0] * 1000, R * C_values[-1] * 1000))
+fig.colorbar(sm, ax=ax1, label='τ = RC (ms)')
+ax1.set_xlabel('Tempo (ms)')
+ax1.set_ylabel('Tensione sul condensatore (V)')
+ax1.set_title(f'Carica RC: effetto di τ (R = {R / 1000:.0f} kΩ, 200 valori di C)')
+ax1.grid(True, linestyle='--', alpha=0.7)
+
+L_rlc, C_rlc = 10e-3, 1e-6
+R_values = np.linspace(5, 600, 300)                                  # 300 resistenze
+zeta = damping_ratio(R_values, L_rlc, C_rlc)
+t_rlc = np.linspace(0, 2e-3, 1000)
+rlc = rlc_series_step(t_rlc, R_values[:, None], L_rlc, C_rlc, V_source)
+norm = plt.Normalize(zeta.min(), zeta.max())
+for v, z in zip(rlc.voltage, zeta):
+    ax2.plot(t_rlc * 1000, v, color=plt.cm.plasma(norm(z)), linewidth=0.5)
+for z_mark, style in [(0.1, ':'), (1.0, '-'), (2.5, '--')]:
+    r_mark = 2 * z_mark * np.sqrt(L_rlc / C_rlc)
+    ax2.plot(t_rlc * 1000, rlc_series_step(t_rlc, r_mark, L_rlc, C_rlc, V_source).voltage,
+             color='black', linestyle=style, linewidth=1.8, label=f'ζ = {z_mark:g}')
+sm = plt.cm.ScalarMappable(cmap='plasma', norm=norm)
+fig.colorbar(sm, ax=ax2, label='Coefficiente di smorzamento ζ')
+ax2.set_xlabel('Tempo (ms)')
+ax2.set_ylabel('Tensione sul condensatore (V)')
+ax2.set_title('RLC serie al gradino (L = 10 mH, C = 1 μF, 300 valori di R)')
+ax2.grid(True, linestyle='--', alpha=0.7)
+ax2.legend(loc='lower right')
+
+plt.tight_layout()
+plt.savefig(OUTPUT_DIR / 'grafico_transitori_rc_rlc.png', dpi=150)
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'grafico_transitori_rc_rlc.png'}")
\ No newline at end of file
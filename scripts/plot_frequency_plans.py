@@ -10,6 +10,9 @@ from matplotlib.patches import Rectangle
 import numpy as np
 from pathlib import Path
 
+from calcoli.piano_bande import BAND_PLAN, PRIMARY, SECONDARY, format_mhz
+from utils import enable_text_cache, text_cache_report
+
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "B_operativa"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -46,75 +49,20 @@ DIGITAL_COLORS = {
     'WSPR': '#F8B739',     # Oro
 }
 
+# Note per banda nella tabella dei modi digitali
+DIGITAL_NOTES = {
+    '160m': 'Limitato', '80m': 'Notte', '60m': 'Canalizzato', '40m': 'Molto attivo',
+    '30m': 'CW/Digi', '20m': 'Principale', '17m': 'WARC', '15m': 'Diurno',
+    '12m': 'WARC', '10m': 'Sporadico',
+}
+
 
 def plot_hf_bands():
     """Grafico allocazione bande HF radioamatore (1.8-30 MHz) - versione migliorata."""
     fig, ax = plt.subplots(figsize=(16, 14))
 
-    # Dati bande HF (Regione 1 - IARU) con frequenze tipiche
-    bands = [
-        # (nome, freq_min, freq_max, lambda, segmenti)
-        ('160m', 1.8, 2.0, '160m (Top Band)', [
-            (1.800, 1.838, 'CW', 'CW/QRP'),
-            (1.838, 1.843, 'Digi', 'Digi'),
-            (1.843, 2.000, 'SSB', 'Fonia'),
-        ]),
-        ('80m', 3.5, 3.8, '80m (Notte)', [
-            (3.500, 3.570, 'CW', 'CW'),
-            (3.570, 3.600, 'Digi', 'Digi'),
-            (3.600, 3.650, 'SSB', 'Contest'),
-            (3.650, 3.700, 'SSB', 'Fonia'),
-            (3.700, 3.800, 'SSB', 'DX/Fonia'),
-        ]),
-        ('60m', 5.3515, 5.3665, '60m (Canalizzato)', [
-            (5.3515, 5.3665, 'SSB', '5 canali'),
-        ]),
-        ('40m', 7.0, 7.2, '40m (DX 24h)', [
-            (7.000, 7.040, 'CW', 'CW/DX'),
-            (7.040, 7.060, 'Digi', 'Digi'),
-            (7.060, 7.100, 'SSB', 'Contest'),
-            (7.100, 7.200, 'SSB', 'Fonia'),
-        ]),
-        ('30m', 10.1, 10.15, '30m (WARC)', [
-            (10.100, 10.130, 'CW', 'CW'),
-            (10.130, 10.150, 'Digi', 'Digi'),
-        ]),
-        ('20m', 14.0, 14.35, '20m (DX principale)', [
-            (14.000, 14.070, 'CW', 'CW/DX'),
-            (14.070, 14.099, 'Digi', 'Digi/FT8'),
-            (14.099, 14.101, 'Beacon', 'IBP'),
-            (14.101, 14.125, 'SSB', 'DX'),
-            (14.125, 14.300, 'SSB', 'Fonia'),
-            (14.300, 14.350, 'SSB', 'Emerg.'),
-        ]),
-        ('17m', 18.068, 18.168, '17m (WARC)', [
-            (18.068, 18.095, 'CW', 'CW'),
-            (18.095, 18.109, 'Digi', 'Digi'),
-            (18.109, 18.111, 'Beacon', 'IBP'),
-            (18.111, 18.168, 'SSB', 'Fonia'),
-        ]),
-        ('15m', 21.0, 21.45, '15m (Ciclo solare)', [
-            (21.000, 21.070, 'CW', 'CW/DX'),
-            (21.070, 21.149, 'Digi', 'Digi'),
-            (21.149, 21.151, 'Beacon', 'IBP'),
-            (21.151, 21.450, 'SSB', 'Fonia/DX'),
-        ]),
-        ('12m', 24.89, 24.99, '12m (WARC)', [
-            (24.890, 24.915, 'CW', 'CW'),
-            (24.915, 24.929, 'Digi', 'Digi'),
-            (24.929, 24.931, 'Beacon', 'IBP'),
-            (24.931, 24.990, 'SSB', 'Fonia'),
-        ]),
-        ('10m', 28.0, 29.7, '10m (Sporadica)', [
-            (28.000, 28.070, 'CW', 'CW'),
-            (28.070, 28.190, 'Digi', 'Digi'),
-            (28.190, 28.225, 'Beacon', 'IBP'),
-            (28.225, 28.300, 'SSB', 'DX'),
-            (28.300, 29.100, 'SSB', 'Fonia'),
-            (29.100, 29.200, 'FM', 'Simplex'),
-            (29.200, 29.700, 'FM', 'Ripetit.'),
-        ]),
-    ]
+    # Bande HF dal piano di banda (Regione 1 - IARU)
+    bands = BAND_PLAN.bands_between(0.0, 30e6)
 
     y_pos = len(bands) + 0.5
     bar_height = 0.7
@@ -124,23 +72,25 @@ def plot_hf_bands():
     ax.text(6, y_pos + 1.5, 'Allocazione Bande HF Radioamatore', fontsize=16, fontweight='bold', ha='center')
     ax.text(6, y_pos + 0.9, 'IARU Regione 1 (Europa/Africa/Medio Oriente)', fontsize=11, ha='center', color='gray')
 
-    for band_name, freq_min, freq_max, description, segments in bands:
+    for band in bands:
         y_pos -= 1
+        freq_min, freq_max = band.f_min, band.f_max
 
         # Sfondo banda con bordo
         ax.add_patch(Rectangle((-0.2, y_pos - bar_height/2 - 0.1), bar_width + 3.5, bar_height + 0.2,
                                facecolor='#f8f9fa', edgecolor='#dee2e6', linewidth=1, zorder=0))
 
         # Etichetta banda (grande, a sinistra)
-        ax.text(-1.5, y_pos, band_name, ha='right', va='center', fontsize=14, fontweight='bold',
+        ax.text(-1.5, y_pos, band.name, ha='right', va='center', fontsize=14, fontweight='bold',
                 bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor='gray', linewidth=1))
 
         # Frequenze (sotto il nome)
-        ax.text(-1.5, y_pos - 0.4, f'{freq_min:.3f}-{freq_max:.3f}', ha='right', va='center',
+        ax.text(-1.5, y_pos - 0.4, f'{format_mhz(freq_min)}-{format_mhz(freq_max)}', ha='right', va='center',
                 fontsize=9, color='#666', family='monospace')
 
         # Disegna segmenti con etichette
-        for seg_min, seg_max, mode, label in segments:
+        for _, seg_min, seg_max, mode, label in BAND_PLAN.segments_of(band.name):
+            label = label or mode
             width = (seg_max - seg_min) / (freq_max - freq_min) * bar_width
             x_start = (seg_min - freq_min) / (freq_max - freq_min) * bar_width
 
@@ -154,7 +104,7 @@ def plot_hf_bands():
                        fontsize=8 if width > 1.5 else 7, fontweight='bold', color='black', zorder=2)
 
         # Descrizione banda (a destra)
-        ax.text(bar_width + 0.3, y_pos, description, ha='left', va='center', fontsize=10, color='#444')
+        ax.text(bar_width + 0.3, y_pos, f'{band.name} ({band.nickname})', ha='left', va='center', fontsize=10, color='#444')
 
     # Legenda più grande e visibile
     legend_patches = [
@@ -187,57 +137,12 @@ def plot_vhf_uhf_bands():
     """Grafico allocazione bande VHF/UHF (144, 432, 1296 MHz)."""
     fig, axes = plt.subplots(3, 1, figsize=(14, 10))
 
-    # Banda 2m (144 MHz)
-    segments_2m = [
-        (144.000, 144.025, 'EME'),
-        (144.025, 144.110, 'CW'),
-        (144.110, 144.150, 'SSB'),
-        (144.150, 144.180, 'CW'),
-        (144.180, 144.360, 'SSB'),
-        (144.360, 144.400, 'CW'),
-        (144.400, 144.490, 'Beacon'),
-        (144.490, 144.500, 'CW'),
-        (144.500, 144.800, 'FM'),
-        (144.800, 144.990, 'FM'),
-        (144.990, 145.194, 'Satellite'),
-        (145.194, 145.806, 'FM'),
-        (145.806, 146.000, 'Satellite'),
-    ]
-
-    # Banda 70cm (432 MHz)
-    segments_70cm = [
-        (432.000, 432.025, 'EME'),
-        (432.025, 432.100, 'CW'),
-        (432.100, 432.400, 'SSB'),
-        (432.400, 432.500, 'Beacon'),
-        (432.500, 433.000, 'FM'),
-        (433.000, 433.400, 'FM'),
-        (433.400, 434.000, 'FM'),
-        (434.000, 435.000, 'Digi'),
-        (435.000, 438.000, 'Satellite'),
-    ]
-
-    # Banda 23cm (1296 MHz)
-    segments_23cm = [
-        (1240.000, 1260.000, 'Digi'),
-        (1260.000, 1270.000, 'Satellite'),
-        (1270.000, 1290.000, 'FM'),
-        (1290.000, 1296.000, 'CW'),
-        (1296.000, 1296.150, 'EME'),
-        (1296.150, 1296.800, 'SSB'),
-        (1296.800, 1297.000, 'Beacon'),
-        (1297.000, 1298.000, 'FM'),
-        (1298.000, 1300.000, 'Digi'),
-    ]
-
-    all_bands = [
-        ('2m (144-146 MHz)', 144, 146, segments_2m),
-        ('70cm (432-438 MHz)', 432, 438, segments_70cm),
-        ('23cm (1240-1300 MHz)', 1240, 1300, segments_23cm),
-    ]
+    all_bands = [BAND_PLAN.band(name) for name in ('2m', '70cm', '23cm')]
 
-    for ax, (band_name, freq_min, freq_max, segments) in zip(axes, all_bands):
-        for seg_min, seg_max, mode in segments:
+    for ax, band in zip(axes, all_bands):
+        freq_min, freq_max = band.f_min / 1e6, band.f_max / 1e6
+        for _, seg_min, seg_max, mode, _ in BAND_PLAN.segments_of(band.name):
+            seg_min, seg_max = seg_min / 1e6, seg_max / 1e6
             # Normalizza a 0-1
             x_start = (seg_min - freq_min) / (freq_max - freq_min)
             width = (seg_max - seg_min) / (freq_max - freq_min)
@@ -252,7 +157,7 @@ def plot_vhf_uhf_bands():
 
         ax.set_xlim(0, 1)
         ax.set_ylim(0, 1)
-        ax.set_title(band_name, fontsize=12, fontweight='bold')
+        ax.set_title(f'{band.name} ({freq_min:g}-{freq_max:g} MHz)', fontsize=12, fontweight='bold')
 
         # Asse X con frequenze
         n_ticks = 6
@@ -343,23 +248,17 @@ def plot_power_limits():
     """Tabella visuale potenze massime per banda (Italia)."""
     fig, ax = plt.subplots(figsize=(12, 10))
 
-    # Dati potenze Italia (classe A)
-    power_data = [
-        ('160m', '1.8-2.0 MHz', 500, 'Si'),
-        ('80m', '3.5-3.8 MHz', 500, 'Si'),
-        ('60m', '5.3515-5.3665 MHz', 15, 'Canalizzato'),
-        ('40m', '7.0-7.2 MHz', 500, 'Si'),
-        ('30m', '10.1-10.15 MHz', 500, 'No SSB'),
-        ('20m', '14.0-14.35 MHz', 500, 'Si'),
-        ('17m', '18.068-18.168 MHz', 500, 'Si'),
-        ('15m', '21.0-21.45 MHz', 500, 'Si'),
-        ('12m', '24.89-24.99 MHz', 500, 'Si'),
-        ('10m', '28.0-29.7 MHz', 500, 'Si'),
-        ('6m', '50.0-52.0 MHz', 500, 'Si'),
-        ('2m', '144-146 MHz', 500, 'Si'),
-        ('70cm', '430-440 MHz', 500, 'Si'),
-        ('23cm', '1240-1300 MHz', 500, 'Si'),
-    ]
+    # Dati potenze Italia (classe A) dal piano di banda
+    power_data = []
+    for band in BAND_PLAN.bands:
+        if band.channelized:
+            note = 'Canalizzato'
+        elif 'SSB' not in BAND_PLAN.modes_of(band.name):
+            note = 'No SSB'
+        else:
+            note = 'Si'
+        power_data.append((band.name, f'{format_mhz(band.f_min)}-{format_mhz(band.f_max)} MHz',
+                           int(band.max_power_w), note))
 
     # Colori per livello potenza
     def get_power_color(power):
@@ -445,58 +344,16 @@ def plot_bands_by_modulation():
     """Visualizzazione bande raggruppate per tipo di modulazione."""
     fig, ax = plt.subplots(figsize=(14, 10))
 
-    # Raggruppamento per modulazione
-    modulations = {
-        'CW (A1A)\nTelegrafia': [
-            ('160m', 1.810, 1.838),
-            ('80m', 3.500, 3.570),
-            ('40m', 7.000, 7.040),
-            ('30m', 10.100, 10.130),
-            ('20m', 14.000, 14.070),
-            ('17m', 18.068, 18.095),
-            ('15m', 21.000, 21.070),
-            ('12m', 24.890, 24.915),
-            ('10m', 28.000, 28.070),
-            ('2m', 144.000, 144.150),
-            ('70cm', 432.000, 432.100),
-        ],
-        'SSB (J3E)\nVoce': [
-            ('160m', 1.840, 2.000),
-            ('80m', 3.600, 3.800),
-            ('40m', 7.060, 7.200),
-            ('20m', 14.101, 14.350),
-            ('17m', 18.111, 18.168),
-            ('15m', 21.151, 21.450),
-            ('12m', 24.931, 24.990),
-            ('10m', 28.300, 29.100),
-            ('2m', 144.150, 144.400),
-            ('70cm', 432.100, 432.400),
-        ],
-        'FM (F3E)\nLocale/Ripetitori': [
-            ('10m', 29.200, 29.700),
-            ('6m', 51.400, 52.000),
-            ('2m', 145.200, 145.800),
-            ('70cm', 433.000, 434.600),
-            ('23cm', 1297.000, 1298.000),
-        ],
-        'Digi\nFT8/RTTY/PSK': [
-            ('80m', 3.570, 3.600),
-            ('40m', 7.040, 7.060),
-            ('30m', 10.130, 10.150),
-            ('20m', 14.070, 14.099),
-            ('17m', 18.095, 18.109),
-            ('15m', 21.070, 21.149),
-            ('12m', 24.915, 24.929),
-            ('10m', 28.070, 28.190),
-        ],
+    # Raggruppamento per modulazione: tratto principale di ogni banda
+    mod_modes = {
+        'CW (A1A)\nTelegrafia': 'CW',
+        'SSB (J3E)\nVoce': 'SSB',
+        'FM (F3E)\nLocale/Ripetitori': 'FM',
+        'Digi\nFT8/RTTY/PSK': 'Digi',
     }
+    modulations = {name: BAND_PLAN.mode_ranges(mode) for name, mode in mod_modes.items()}
 
-    colors_mod = {
-        'CW (A1A)\nTelegrafia': '#FF6B6B',
-        'SSB (J3E)\nVoce': '#45B7D1',
-        'FM (F3E)\nLocale/Ripetitori': '#96CEB4',
-        'Digi\nFT8/RTTY/PSK': '#4ECDC4',
-    }
+    colors_mod = {name: COLORS[mode] for name, mode in mod_modes.items()}
 
     y_offset = 0
     for mod_name, segments in modulations.items():
@@ -518,7 +375,7 @@ def plot_bands_by_modulation():
                                   facecolor=colors_mod[mod_name], edgecolor='black', linewidth=0.5))
 
             # Frequenze
-            ax.text(2.5 + bar_width + 0.3, y, f'{f_min:.3f} - {f_max:.3f} MHz',
+            ax.text(2.5 + bar_width + 0.3, y, f'{format_mhz(f_min)} - {format_mhz(f_max)} MHz',
                    ha='left', va='center', fontsize=9)
 
         y_offset += len(segments) * 0.5 + 1
@@ -538,49 +395,71 @@ def plot_bands_by_application():
     """Visualizzazione bande raggruppate per applicazione - versione migliorata."""
     fig, ax = plt.subplots(figsize=(16, 18))
 
+    def band_range(name):
+        band = BAND_PLAN.band(name)
+        return f'{format_mhz(band.f_min)}-{format_mhz(band.f_max)} MHz'
+
+    def segment_range(f_hz):
+        """Tratto continuo di segmenti dello stesso modo che contiene f_hz."""
+        def same(a, b):
+            return (BAND_PLAN.seg_band[a] == BAND_PLAN.seg_band[b]
+                    and BAND_PLAN.seg_mode[a] == BAND_PLAN.seg_mode[b]
+                    and BAND_PLAN.seg_max[a] == BAND_PLAN.seg_min[b])
+
+        i = j = int(BAND_PLAN.segment_of(f_hz))
+        while i > 0 and same(i - 1, i):
+            i -= 1
+        while j + 1 < len(BAND_PLAN.segments) and same(j, j + 1):
+            j += 1
+        return f'{format_mhz(BAND_PLAN.seg_min[i])}-{format_mhz(BAND_PLAN.seg_max[j])} MHz'
+
+    def channel(band, mode):
+        c = next(c for c in BAND_PLAN.channels_of(mode) if c.band == band)
+        return f'{format_mhz(c.f_min)} MHz'
+
     applications = [
         ('DX (Lunga Distanza)', '#FFCCCC', [
-            ('160m', '1.8-2.0 MHz', 'Propagazione notturna, DX difficile'),
-            ('80m', '3.5-3.8 MHz', 'DX notturno, regionali'),
-            ('40m', '7.0-7.2 MHz', 'DX 24h, ottima per inizio'),
-            ('20m', '14.0-14.35 MHz', 'Banda DX per eccellenza'),
-            ('17m', '18.068-18.168 MHz', 'DX diurno, meno affollata'),
-            ('15m', '21.0-21.45 MHz', 'DX diurno, ciclo solare'),
-            ('12m', '24.89-24.99 MHz', 'DX quando aperta'),
-            ('10m', '28.0-29.7 MHz', 'DX ciclo solare alto'),
+            ('160m', band_range('160m'), 'Propagazione notturna, DX difficile'),
+            ('80m', band_range('80m'), 'DX notturno, regionali'),
+            ('40m', band_range('40m'), 'DX 24h, ottima per inizio'),
+            ('20m', band_range('20m'), 'Banda DX per eccellenza'),
+            ('17m', band_range('17m'), 'DX diurno, meno affollata'),
+            ('15m', band_range('15m'), 'DX diurno, ciclo solare'),
+            ('12m', band_range('12m'), 'DX quando aperta'),
+            ('10m', band_range('10m'), 'DX ciclo solare alto'),
         ]),
         ('Comunicazioni Locali', '#CCFFCC', [
-            ('2m FM', '145.2-145.8 MHz', 'Ripetitori, simplex locale'),
-            ('70cm FM', '433.0-434.6 MHz', 'Ripetitori, simplex'),
-            ('10m FM', '29.2-29.7 MHz', 'FM locale'),
-            ('6m', '51.4-52.0 MHz', 'Locale e sporadic-E'),
+            ('2m FM', segment_range(145.5e6), 'Ripetitori, simplex locale'),
+            ('70cm FM', segment_range(433.5e6), 'Ripetitori, simplex'),
+            ('10m FM', segment_range(29.5e6), 'FM locale'),
+            ('6m', segment_range(51.7e6), 'Locale e sporadic-E'),
         ]),
         ('Contest & Pile-up', '#CCCCFF', [
-            ('CW 40m', '7.000-7.040 MHz', 'Contest CW'),
-            ('CW 20m', '14.000-14.070 MHz', 'Contest CW principale'),
-            ('SSB 40m', '7.060-7.200 MHz', 'Contest SSB'),
-            ('SSB 20m', '14.150-14.350 MHz', 'Contest SSB principale'),
-            ('SSB 15m', '21.200-21.450 MHz', 'Contest SSB'),
+            ('CW 40m', segment_range(7.02e6), 'Contest CW'),
+            ('CW 20m', segment_range(14.03e6), 'Contest CW principale'),
+            ('SSB 40m', segment_range(7.15e6), 'Contest SSB'),
+            ('SSB 20m', segment_range(14.2e6), 'Contest SSB principale'),
+            ('SSB 15m', segment_range(21.3e6), 'Contest SSB'),
         ]),
         ('Modi Digitali (FT8/FT4)', '#FFFFCC', [
-            ('FT8 40m', '7.074 MHz', 'Frequenza standard FT8'),
-            ('FT8 20m', '14.074 MHz', 'FT8 piu attivo'),
-            ('FT8 15m', '21.074 MHz', 'FT8 diurno'),
-            ('FT8 10m', '28.074 MHz', 'FT8 quando aperta'),
-            ('FT4 20m', '14.080 MHz', 'FT4 contest'),
+            ('FT8 40m', channel('40m', 'FT8'), 'Frequenza standard FT8'),
+            ('FT8 20m', channel('20m', 'FT8'), 'FT8 piu attivo'),
+            ('FT8 15m', channel('15m', 'FT8'), 'FT8 diurno'),
+            ('FT8 10m', channel('10m', 'FT8'), 'FT8 quando aperta'),
+            ('FT4 20m', channel('20m', 'FT4'), 'FT4 contest'),
         ]),
         ('Sperimentazione', '#FFCCFF', [
-            ('EME 2m', '144.000-144.025 MHz', 'Riflessione lunare'),
-            ('EME 70cm', '432.000-432.025 MHz', 'Moonbounce UHF'),
-            ('Satellite', '145.8-146.0 MHz', 'Uplink satelliti'),
-            ('Satellite', '435-438 MHz', 'Downlink satelliti'),
-            ('Meteor Scatter', '144.360 MHz', 'MSK144'),
+            ('EME 2m', segment_range(144.01e6), 'Riflessione lunare'),
+            ('EME 70cm', segment_range(432.01e6), 'Moonbounce UHF'),
+            ('Satellite', segment_range(145.9e6), 'Uplink satelliti'),
+            ('Satellite', segment_range(436e6), 'Downlink satelliti'),
+            ('Meteor Scatter', channel('2m', 'MSK144'), 'MSK144'),
         ]),
         ('Emergenza/ARES', '#FFE5CC', [
-            ('80m', '3.760 MHz', 'Emergenza Italia'),
-            ('40m', '7.110 MHz', 'Emergenza IARU'),
-            ('20m', '14.300 MHz', 'Emergenza globale'),
-            ('2m', '145.500 MHz', 'Chiamata emergenza'),
+            ('80m', channel('80m', 'Emergenza'), 'Emergenza Italia'),
+            ('40m', channel('40m', 'Emergenza'), 'Emergenza IARU'),
+            ('20m', channel('20m', 'Emergenza'), 'Emergenza globale'),
+            ('2m', channel('2m', 'Emergenza'), 'Chiamata emergenza'),
         ]),
     ]
 
@@ -638,37 +517,20 @@ def plot_regulatory_overview():
     """Panoramica normativa bande radioamatori Italia."""
     fig, ax = plt.subplots(figsize=(14, 10))
 
-    # Dati normativi Italia
-    regulatory_data = [
-        {'band': '160m', 'freq': '1.810-2.000', 'status': 'Secondario', 'power': '500W',
-         'notes': 'Condivisa con altri servizi', 'color': '#FFCCCC'},
-        {'band': '80m', 'freq': '3.500-3.800', 'status': 'Primario', 'power': '500W',
-         'notes': 'Uso esclusivo radioamatori', 'color': '#CCFFCC'},
-        {'band': '60m', 'freq': '5.3515-5.3665', 'status': 'Secondario', 'power': '15W EIRP',
-         'notes': 'Canalizzato, 5 canali', 'color': '#FFCCCC'},
-        {'band': '40m', 'freq': '7.000-7.200', 'status': 'Primario', 'power': '500W',
-         'notes': 'Banda primaria mondiale', 'color': '#CCFFCC'},
-        {'band': '30m', 'freq': '10.100-10.150', 'status': 'Secondario', 'power': '500W',
-         'notes': 'Solo CW e Digi, no fonia', 'color': '#FFFFCC'},
-        {'band': '20m', 'freq': '14.000-14.350', 'status': 'Primario', 'power': '500W',
-         'notes': 'Banda DX principale', 'color': '#CCFFCC'},
-        {'band': '17m', 'freq': '18.068-18.168', 'status': 'Primario', 'power': '500W',
-         'notes': 'Banda WARC', 'color': '#CCFFCC'},
-        {'band': '15m', 'freq': '21.000-21.450', 'status': 'Primario', 'power': '500W',
-         'notes': 'Ottima per DX diurno', 'color': '#CCFFCC'},
-        {'band': '12m', 'freq': '24.890-24.990', 'status': 'Primario', 'power': '500W',
-         'notes': 'Banda WARC', 'color': '#CCFFCC'},
-        {'band': '10m', 'freq': '28.000-29.700', 'status': 'Primario', 'power': '500W',
-         'notes': 'Propagazione sporadica', 'color': '#CCFFCC'},
-        {'band': '6m', 'freq': '50.000-52.000', 'status': 'Secondario', 'power': '500W',
-         'notes': '"Magic Band" - sporadic-E', 'color': '#FFCCCC'},
-        {'band': '2m', 'freq': '144.000-146.000', 'status': 'Primario', 'power': '500W',
-         'notes': 'VHF principale', 'color': '#CCFFCC'},
-        {'band': '70cm', 'freq': '430.000-440.000', 'status': 'Secondario', 'power': '500W',
-         'notes': 'Condivisa, ISM', 'color': '#FFCCCC'},
-        {'band': '23cm', 'freq': '1240-1300', 'status': 'Secondario', 'power': '500W',
-         'notes': 'Condivisa GNSS', 'color': '#FFCCCC'},
-    ]
+    # Dati normativi Italia dal piano di banda
+    status_colors = {PRIMARY: '#CCFFCC', SECONDARY: '#FFCCCC'}
+    regulatory_data = []
+    for band in BAND_PLAN.bands:
+        modes = BAND_PLAN.modes_of(band.name)
+        limited = 'SSB' not in modes and 'FM' not in modes
+        regulatory_data.append({
+            'band': band.name,
+            'freq': f'{format_mhz(band.f_min)}-{format_mhz(band.f_max)}',
+            'status': band.status.capitalize(),
+            'power': f"{band.max_power_w:g}W{' EIRP' if band.eirp else ''}",
+            'notes': band.notes,
+            'color': '#FFFFCC' if limited else status_colors[band.status],
+        })
 
     # Intestazioni
     headers = ['Banda', 'Frequenze (MHz)', 'Status', 'Potenza', 'Note']
@@ -835,19 +697,22 @@ def plot_digital_frequencies():
     """Tabella frequenze standard modi digitali HF."""
     fig, ax = plt.subplots(figsize=(14, 12))
 
-    # Frequenze standard modi digitali per banda HF
+    # Frequenze standard modi digitali per banda HF, dal piano di banda
+    digital_modes = ('FT8', 'FT4', 'RTTY', 'PSK31', 'SSTV', 'WSPR')
+    channels = {(c.band, c.mode): c for c in BAND_PLAN.channels}
+
+    def channel_text(band, mode):
+        c = channels.get((band, mode))
+        if c is None:
+            return '-'
+        if c.f_max > c.f_min:
+            return f'{format_mhz(c.f_min)}-{format_mhz(c.f_max)}'
+        return format_mhz(c.f_min)
+
     digital_freqs = [
-        # (Banda, FT8, FT4, RTTY, PSK, SSTV, WSPR, Note)
-        ('160m', '1.840', '1.840', '1.838', '1.838', '-', '1.8366', 'Limitato'),
-        ('80m', '3.573', '3.575', '3.580-3.600', '3.580', '3.730', '3.5686', 'Notte'),
-        ('60m', '5.357', '-', '-', '-', '-', '5.2872', 'Canalizzato'),
-        ('40m', '7.074', '7.047.5', '7.040-7.050', '7.040', '7.171', '7.0386', 'Molto attivo'),
-        ('30m', '10.136', '10.140', '10.130-10.145', '10.142', '-', '10.1387', 'CW/Digi'),
-        ('20m', '14.074', '14.080', '14.080-14.099', '14.070', '14.230', '14.0956', 'Principale'),
-        ('17m', '18.100', '18.104', '18.100-18.105', '18.100', '18.163', '18.1046', 'WARC'),
-        ('15m', '21.074', '21.140', '21.080-21.120', '21.070', '21.340', '21.0946', 'Diurno'),
-        ('12m', '24.915', '24.919', '24.920-24.925', '24.920', '24.975', '24.9246', 'WARC'),
-        ('10m', '28.074', '28.180', '28.080-28.150', '28.120', '28.680', '28.1246', 'Sporadico'),
+        (band.name, *(channel_text(band.name, mode) for mode in digital_modes),
+         DIGITAL_NOTES.get(band.name, ''))
+        for band in BAND_PLAN.bands_between(0.0, 30e6)
     ]
 
     # Intestazioni
@@ -935,6 +800,9 @@ def main():
     print("Generazione visualizzazioni piani frequenze IARU...")
     print(f"Directory output: {OUTPUT_DIR}\n")
 
+    # Le tabelle e gli schemi ripetono molte stringhe uguali fra una figura e l'altra
+    enable_text_cache()
+
     plot_hf_bands()
     plot_vhf_uhf_bands()
     plot_mode_legend()
@@ -946,6 +814,7 @@ def main():
     plot_digital_frequencies()
 
     print("\n✅ Tutte le visualizzazioni sono state generate con successo!")
+    print(text_cache_report())
 
 
 if __name__ == "__main__":
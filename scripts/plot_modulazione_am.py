@@ -7,7 +7,8 @@ Mostra segnale modulante e segnale modulato.
 import matplotlib.pyplot as plt
 import numpy as np
 
-from utils import get_output_dir, setup_matplotlib_style, save_figure, run_with_error_handling
+from utils import get_output_dir, setup_matplotlib_style, save_figure, run_with_error_handling, \
+    WEB_OUTPUTS
 
 
 def plot_modulazione_am():
@@ -40,7 +41,7 @@ def plot_modulazione_am():
     ax2.grid(True)
 
     plt.tight_layout()
-    save_figure(fig, '01_elettronica', 'grafico_modulazione_am.png')
+    save_figure(fig, '01_elettronica', 'grafico_modulazione_am.png', outputs=WEB_OUTPUTS)
 
 
 def main():
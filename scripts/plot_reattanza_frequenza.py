@@ -1,5 +1,16 @@
 import matplotlib.pyplot as plt
 import numpy as np
+from pathlib import Path
+
+from calcoli.piano_bande import BAND_PLAN
+from calcoli.risonanza import (
+    capacitance_for, characteristic_impedance, impedance, inductance_for, quality_factor,
+    reactance_c, reactance_l, resonant_frequency,
+)
+
+# Directory di output
+OUTPUT_DIR = Path(__file__).parent.parent / "images" / "01_elettronica"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Dati per il grafico: Reattanza capacitiva e induttiva vs frequenza
 C = 100e-6  # Condensatore di 100μF
@@ -8,20 +19,17 @@ L = 10e-3   # Induttore di 10mH
 # Frequenza da 1Hz a 100kHz (scala logaritmica)
 f = np.logspace(0, 5, 1000)  # Da 10^0 a 10^5 Hz
 
-# Reattanza capacitiva: X_C = 1/(2πfC)
-X_C = 1 / (2 * np.pi * f * C)
-
-# Reattanza induttiva: X_L = 2πfL
-X_L = 2 * np.pi * f * L
+X_C = reactance_c(f, C)
+X_L = reactance_l(f, L)
 
 # Crea il grafico
 plt.figure(figsize=(10, 6))
 plt.semilogx(f, X_C, label=f'X_C (C = {C*1e6:.0f}μF)', color='blue', linewidth=2)
 plt.semilogx(f, X_L, label=f'X_L (L = {L*1e3:.0f}mH)', color='red', linewidth=2)
 
-# Trova la frequenza di risonanza (dove X_C = X_L)
-f_resonance = 1 / (2 * np.pi * np.sqrt(L * C))
-plt.axvline(x=f_resonance, color='green', linestyle='--', alpha=0.7, 
+# Frequenza di risonanza (dove X_C = X_L)
+f_resonance = resonant_frequency(L, C)
+plt.axvline(x=f_resonance, color='green', linestyle='--', alpha=0.7,
             label=f'Risonanza = {f_resonance:.1f}Hz')
 
 plt.xlabel('Frequenza (Hz)')
@@ -33,5 +41,125 @@ plt.ylim(0, 1000)  # Limita l'asse Y per migliore visualizzazione
 plt.tight_layout()
 
 # Salva l'immagine
-plt.savefig('/Users/giangio/Documents/GitHub/giangio/esame-radioamatori/images/01_elettronica/grafico_reattanza_frequenza.png', dpi=150)
-print("Grafico salvato in images/01_elettronica/grafico_reattanza_frequenza.png")
\ No newline at end of file
+plt.savefig(OUTPUT_DIR / 'grafico_reattanza_frequenza.png', dpi=150)
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'grafico_reattanza_frequenza.png'}")
+
+# Curve di risonanza: stesso L e C, resistenze diverse (Q diversi)
+fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
+Q_values = np.array([50.0, 20.0, 10.0, 5.0, 2.0])
+Z0 = characteristic_impedance(L, C)
+R_values = Z0 / Q_values            # resistenza serie
+R_parallel = Z0 * Q_values          # resistenza parallelo con lo stesso Q
+f_res = np.linspace(0.5, 1.5, 2000) * f_resonance
+Z_series = np.abs(impedance(f_res, L, C, R_values[:, None], 'series'))
+Z_parallel = np.abs(impedance(f_res, L, C, R_parallel[:, None], 'parallel'))
+colors = plt.cm.viridis(np.linspace(0, 0.85, len(R_values)))
+
+for R, Z, color in zip(R_values, Z_series, colors):
+    ax1.plot(f_res, Z, color=color, linewidth=2,
+             label=f'R = {R:.2g} Ω, Q = {quality_factor(R, L, C):.0f}')
+ax1.axvline(f_resonance, color='gray', linestyle=':')
+ax1.set_yscale('log')
+ax1.set_xlabel('Frequenza (Hz)')
+ax1.set_ylabel('|Z| (Ω)')
+ax1.set_title('Serie: impedenza minima (= R) alla risonanza')
+ax1.grid(True, which='both', linestyle='--', alpha=0.5)
+ax1.legend(fontsize=8)
+
+for R, Z, color in zip(R_parallel, Z_parallel, colors):
+    ax2.plot(f_res, Z, color=color, linewidth=2,
+             label=f'R = {R:.0f} Ω, Q = {quality_factor(R, L, C, "parallel"):.0f}')
+ax2.axvline(f_resonance, color='gray', linestyle=':')
+ax2.set_yscale('log')
+ax2.set_xlabel('Frequenza (Hz)')
+ax2.set_ylabel('|Z| (Ω)')
+ax2.set_title('Parallelo: impedenza massima (= R) alla risonanza')
+ax2.grid(True, which='both', linestyle='--', alpha=0.5)
+ax2.legend(fontsize=8)
+
+fig.suptitle(f'Circuiti risonanti LC (L = {L*1e3:.0f} mH, C = {C*1e6:.0f} μF, '
+             f'f₀ = {f_resonance:.1f} Hz)', fontsize=13, fontweight='bold')
+plt.tight_layout()
+plt.savefig(OUTPUT_DIR / 'grafico_risonanza_rlc.png', dpi=150, bbox_inches='tight')
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'grafico_risonanza_rlc.png'}")
+
+# Nomogramma di risonanza per tutte le bande radioamatoriali
+bands = list(BAND_PLAN.bands)
+fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8), gridspec_kw={'width_ratios': [1.2, 1]})
+
+L_axis = np.logspace(-8, -4, 400)           # 10 nH .. 100 μH
+C_MAX_NOMO = 20e-9
+band_colors = plt.cm.turbo(np.linspace(0.05, 0.95, len(bands)))
+for band, color in zip(bands, band_colors):
+    f_center = np.sqrt(band.f_min * band.f_max)
+    if band.channelized:
+        # Bande a canali (60m): troppo strette per una striscia, una curva tratteggiata
+        ax1.plot(L_axis * 1e6, capacitance_for(f_center, L_axis) * 1e12, color=color,
+                 linestyle='--', linewidth=1.2)
+    else:
+        # Una banda e' la striscia fra le curve LC = cost. dei suoi estremi
+        C_low = capacitance_for(band.f_max, L_axis)
+        C_high = capacitance_for(band.f_min, L_axis)
+        ax1.fill_between(L_axis * 1e6, C_low * 1e12, C_high * 1e12, color=color, alpha=0.9,
+                         linewidth=0.8, edgecolor=color)
+    # Etichetta dove la striscia entra nel grafico (bordo superiore o sinistro)
+    L_top = inductance_for(f_center, C_MAX_NOMO)
+    label_box = dict(boxstyle='round,pad=0.1', facecolor='white', edgecolor='none', alpha=0.8)
+    if L_top >= L_axis[0]:
+        ax1.text(L_top * 1.3e6, C_MAX_NOMO * 0.8e12, band.name, fontsize=8, color=color,
+                 fontweight='bold', ha='left', va='top', bbox=label_box)
+    else:
+        ax1.text(L_axis[0] * 1.08e6, capacitance_for(f_center, L_axis[0]) * 1e12, band.name,
+                 fontsize=8, color=color, fontweight='bold', ha='left', va='center', bbox=label_box)
+
+for z0, style in [(50.0, ':'), (500.0, '--'), (5000.0, '-.')]:
+    ax1.plot(L_axis * 1e6, L_axis / z0 ** 2 * 1e12, color='gray', linestyle=style,
+             linewidth=1, label=f'√(L/C) = {z0:.0f} Ω')
+
+# Esempio di calcolo inverso
+L_example, f_example = 1e-6, 14.2e6
+C_example = capacitance_for(f_example, L_example)
+ax1.plot(L_example * 1e6, C_example * 1e12, 'ko', markersize=7)
+ax1.annotate(f'{f_example / 1e6:.1f} MHz con {L_example * 1e6:.0f} μH\n→ C = {C_example * 1e12:.0f} pF',
+             xy=(L_example * 1e6, C_example * 1e12), xytext=(3, 1200),
+             fontsize=9, arrowprops=dict(arrowstyle='->', color='black'),
+             bbox=dict(boxstyle='round', facecolor='white', alpha=0.9))
+
+ax1.set_xscale('log')
+ax1.set_yscale('log')
+ax1.set_xlim(L_axis[0] * 1e6, L_axis[-1] * 1e6)
+ax1.set_ylim(0.5, C_MAX_NOMO * 1e12)
+ax1.set_xlabel('Induttanza (μH)')
+ax1.set_ylabel('Capacità (pF)')
+ax1.set_title('Coppie L-C che risuonano nelle bande radioamatoriali')
+ax1.grid(True, which='both', linestyle='--', alpha=0.3)
+ax1.legend(loc='upper right', fontsize=8, title='Impedenza caratteristica')
+
+# Tabella: capacita' per il centro di ogni banda con induttanze di valore normalizzato
+L_table = np.array([0.01, 0.022, 0.047, 0.1, 0.22, 0.47, 1.0, 2.2, 4.7, 10.0, 22.0]) * 1e-6
+f_center = np.array([np.sqrt(b.f_min * b.f_max) for b in bands])
+C_table = capacitance_for(f_center[:, None], L_table[None, :]) * 1e12     # (bande, L) in pF
+practical = (C_table >= 2.0) & (C_table <= 5000.0)
+
+ax2.imshow(np.where(practical, np.log10(C_table), np.nan), cmap='YlGnBu', aspect='auto',
+           vmin=0, vmax=4)
+for i in range(len(bands)):
+    for j in range(len(L_table)):
+        if practical[i, j]:
+            value = C_table[i, j]
+            text = f'{value:.0f}' if value >= 10 else f'{value:.1f}'
+            ax2.text(j, i, text, ha='center', va='center', fontsize=7,
+                     color='white' if value > 300 else 'black')
+ax2.set_xticks(range(len(L_table)))
+ax2.set_xticklabels([f'{l * 1e6:g}' for l in L_table], rotation=45)
+ax2.set_yticks(range(len(bands)))
+ax2.set_yticklabels([f'{b.name} ({f / 1e6:.4g} MHz)' for b, f in zip(bands, f_center)], fontsize=8)
+ax2.set_xlabel('Induttanza (μH)')
+ax2.set_title('C (pF) per risuonare a centro banda\n(vuoto: fuori da 2 pF - 5 nF)')
+
+plt.tight_layout()
+plt.savefig(OUTPUT_DIR / 'nomogramma_risonanza_bande.png', dpi=150, bbox_inches='tight')
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'nomogramma_risonanza_bande.png'}")
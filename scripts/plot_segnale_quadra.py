@@ -1,10 +1,19 @@
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.animation import FuncAnimation, PillowWriter
+from pathlib import Path
+
+from calcoli.fourier import SAWTOOTH, SQUARE, TRIANGLE, gibbs_overshoot, harmonic_table, partial_sums, pulse, thd
+
+# Directory di output
+OUTPUT_DIR = Path(__file__).parent.parent / "images" / "01_elettronica"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Segnale quadra
-t = np.linspace(0, 4*np.pi, 1000)
-freq = 1 / (2*np.pi)  # frequenza per periodo 2pi
-square_wave = np.sign(np.sin(2*np.pi * freq * t))
+t = np.linspace(0, 4*np.pi, 4000)
+square_wave = SQUARE.ideal(t)
 
 fig, ax = plt.subplots(figsize=(10, 6))
 ax.plot(t, square_wave, color='red', linewidth=2)
@@ -17,5 +26,104 @@ ax.set_yticks([-1, 0, 1])
 ax.set_yticklabels(['-1', '0', '1'])
 
 plt.tight_layout()
-plt.savefig('images/01_elettronica/grafico_segnale_quadra.png', dpi=150)
-plt.close()
\ No newline at end of file
+plt.savefig(OUTPUT_DIR / 'grafico_segnale_quadra.png', dpi=150)
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'grafico_segnale_quadra.png'}")
+
+# Sintesi per somma di armoniche: somme parziali e spettro di ogni forma d'onda
+waves = [SQUARE, TRIANGLE, SAWTOOTH, pulse(0.25)]
+orders = [1, 3, 9, 49]
+N_SPECTRUM = 16
+theta = np.linspace(-np.pi, 3 * np.pi, 4000)
+colors = plt.cm.viridis(np.linspace(0.15, 0.85, len(orders)))
+
+fig, axes = plt.subplots(len(waves), 2, figsize=(15, 3.4 * len(waves)),
+                         gridspec_kw={'width_ratios': [2.2, 1]})
+for (ax1, ax2), wave in zip(axes, waves):
+    ax1.plot(theta / (2 * np.pi), wave.ideal(theta), color='black', linewidth=1, linestyle='--',
+             label='Ideale')
+    for n, x, color in zip(orders, partial_sums(wave, orders, theta), colors):
+        ax1.plot(theta / (2 * np.pi), x, color=color, linewidth=1.5, label=f'fino alla {n}ª')
+    ax1.set_title(wave.label, fontweight='bold', loc='left')
+    ax1.set_ylabel('Ampiezza')
+    ax1.set_xlim(theta[0] / (2 * np.pi), theta[-1] / (2 * np.pi))
+    ax1.grid(True, linestyle='--', alpha=0.5)
+
+    table = harmonic_table(wave, N_SPECTRUM)
+    present = table['amplitude'] > 0
+    ax2.bar(table['order'][present], table['dbc'][present] + 60, bottom=-60, color='tab:blue',
+            width=0.6)
+    ax2.set_ylim(-60, 5)
+    ax2.set_xticks(range(1, N_SPECTRUM + 1, 2))
+    ax2.set_ylabel('dBc')
+    ax2.set_title(f'Armoniche (THD = {thd(wave):.0%})', fontsize=11)
+    ax2.grid(True, axis='y', linestyle='--', alpha=0.5)
+
+axes[0, 0].legend(loc='lower right', bbox_to_anchor=(1, 1), fontsize=8, ncol=5, frameon=False)
+axes[-1, 0].set_xlabel('Tempo (periodi)')
+axes[-1, 1].set_xlabel('Ordine armonica')
+fig.suptitle('Sintesi di Fourier: somme parziali e spettro delle armoniche', fontsize=14,
+             fontweight='bold')
+plt.tight_layout()
+plt.savefig(OUTPUT_DIR / 'sintesi_fourier.png', dpi=150, bbox_inches='tight')
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'sintesi_fourier.png'}")
+
+# Fenomeno di Gibbs: vicino al fronte la sovraelongazione resta ~9% del salto
+fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+theta_edge = np.linspace(-0.3, 0.6, 3000)
+gibbs_orders = [9, 49, 199]
+for n, x, color in zip(gibbs_orders, partial_sums(SQUARE, gibbs_orders, theta_edge),
+                       plt.cm.plasma([0.15, 0.5, 0.8])):
+    ax1.plot(theta_edge / (2 * np.pi) * 100, x, color=color, linewidth=1.5, label=f'fino alla {n}ª')
+ax1.plot(theta_edge / (2 * np.pi) * 100, SQUARE.ideal(theta_edge), 'k--', linewidth=1, label='Ideale')
+ax1.axhline(1 + 2 * 0.0895, color='gray', linestyle=':')
+ax1.text(-4.5, 1 + 2 * 0.0895 + 0.02, '+9% del salto', fontsize=9, color='dimgray')
+ax1.set_xlabel('Tempo dal fronte (% del periodo)')
+ax1.set_ylabel('Ampiezza')
+ax1.set_title('Onda quadra vicino al fronte di salita', fontweight='bold')
+ax1.grid(True, linestyle='--', alpha=0.5)
+ax1.legend(loc='lower right', fontsize=9)
+
+n_axis = np.arange(1, 402, 2)
+ax2.plot(n_axis, gibbs_overshoot(SQUARE, n_axis) * 100, color='tab:red', linewidth=2)
+ax2.axhline(8.95, color='gray', linestyle=':')
+ax2.set_xscale('log')
+ax2.set_xlabel('Armonica più alta inclusa')
+ax2.set_ylabel('Sovraelongazione (% del salto)')
+ax2.set_title('Più armoniche non riducono il picco', fontweight='bold')
+ax2.set_ylim(0, 15)
+ax2.grid(True, which='both', linestyle='--', alpha=0.5)
+
+plt.tight_layout()
+plt.savefig(OUTPUT_DIR / 'fenomeno_gibbs.png', dpi=150, bbox_inches='tight')
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'fenomeno_gibbs.png'}")
+
+# Animazione: un fotogramma per ogni armonica dispari aggiunta, tutti da una sola chiamata
+frame_orders = np.arange(1, 60, 2)
+theta_anim = np.linspace(0, 4 * np.pi, 1500)
+frames = partial_sums(SQUARE, frame_orders, theta_anim)
+
+fig, ax = plt.subplots(figsize=(8, 4))
+ax.plot(theta_anim / (2 * np.pi), SQUARE.ideal(theta_anim), 'k--', linewidth=1)
+line, = ax.plot([], [], color='tab:red', linewidth=2)
+title = ax.set_title('')
+ax.set_xlim(0, 2)
+ax.set_ylim(-1.4, 1.4)
+ax.set_xlabel('Tempo (periodi)')
+ax.set_ylabel('Ampiezza')
+ax.grid(True, linestyle='--', alpha=0.5)
+plt.tight_layout()
+
+
+def draw_frame(k):
+    line.set_data(theta_anim / (2 * np.pi), frames[k])
+    title.set_text(f'Onda quadra: armoniche dispari fino alla {frame_orders[k]}ª')
+    return line, title
+
+
+animation = FuncAnimation(fig, draw_frame, frames=len(frame_orders), blit=True)
+animation.save(OUTPUT_DIR / 'sintesi_quadra.gif', writer=PillowWriter(fps=4), dpi=80)
+plt.close()
+print(f"✓ Salvato: {OUTPUT_DIR / 'sintesi_quadra.gif'}")
@@ -7,7 +7,8 @@ Mostra ampiezza, periodo e frequenza.
 import matplotlib.pyplot as plt
 import numpy as np
 
-from utils import get_output_dir, setup_matplotlib_style, save_figure, run_with_error_handling
+from utils import get_output_dir, setup_matplotlib_style, save_figure, run_with_error_handling, \
+    WEB_OUTPUTS
 
 
 def plot_segnale_sinusoidale():
@@ -38,7 +39,7 @@ def plot_segnale_sinusoidale():
                 fontsize=10, color='green')
 
     plt.tight_layout()
-    save_figure(fig, '01_elettronica', 'grafico_segnale_sinusoidale.png')
+    save_figure(fig, '01_elettronica', 'grafico_segnale_sinusoidale.png', outputs=WEB_OUTPUTS)
 
 
 def main():
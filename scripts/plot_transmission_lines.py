@@ -6,10 +6,15 @@ Onde stazionarie, impedenza, carta di Smith, attenuazione cavi.
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.colors import LogNorm
 from matplotlib.patches import Circle, FancyArrowPatch
 import numpy as np
 from pathlib import Path
 
+from calcoli.adattamento import TUNERS, coverage, gamma_to_impedance
+from calcoli.piano_bande import BAND_PLAN
+from calcoli.reti import C0, Line, Network
+
 # Directory di output
 OUTPUT_DIR = Path(__file__).parent.parent / "images" / "06_antenne"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -89,13 +94,11 @@ def plot_impedenza_linea():
     # Caso 1: Carico reattivo (Z_L = 100 + j50)
     Z0 = 50
     Z_L = 100 + 50j
-    gamma = (Z_L - Z0) / (Z_L + Z0)
-    gamma_mag = np.abs(gamma)
-    gamma_phase = np.angle(gamma)
 
-    # Impedenza lungo la linea
-    beta_x = 2 * np.pi * x
-    Z_in = Z0 * (Z_L + 1j * Z0 * np.tan(beta_x)) / (Z0 + 1j * Z_L * np.tan(beta_x))
+    # Impedenza lungo la linea: un tratto senza perdite per ogni lunghezza x
+    # (frequenza scelta in modo che lambda = 1 m)
+    linea = Network([Line(Z0, length=x)])
+    Z_in = linea.input_impedance(C0, Z_L)
 
     ax1.plot(x, np.abs(Z_in), 'b-', linewidth=2, label='|Z| (modulo)')
     ax1.plot(x, np.real(Z_in), 'g--', linewidth=1.5, label='R (parte reale)')
@@ -119,10 +122,7 @@ def plot_impedenza_linea():
     ]
 
     for Z_L, label, color in carichi:
-        if Z_L == 0:
-            Z_in = 1j * Z0 * np.tan(beta_x)
-        else:
-            Z_in = Z0 * (Z_L + 1j * Z0 * np.tan(beta_x)) / (Z0 + 1j * Z_L * np.tan(beta_x))
+        Z_in = linea.input_impedance(C0, Z_L)
         ax2.plot(x, np.abs(Z_in), color=color, linewidth=2, label=label)
 
     ax2.set_title('Modulo impedenza per carichi diversi', fontweight='bold')
@@ -219,6 +219,77 @@ def plot_carta_smith():
     print(f"✓ Salvato: {OUTPUT_DIR / 'carta_smith.png'}")
 
 
+def smith_grid(ax, color='gray', linewidth=0.5):
+    """Griglia della carta di Smith (r e x costanti) ritagliata sul cerchio unitario."""
+    boundary = Circle((0, 0), 1, transform=ax.transData, fill=False, color='black', linewidth=1.2)
+    ax.add_patch(boundary)
+    t = np.linspace(0, 2 * np.pi, 400)
+    for r in [0.2, 0.5, 1, 2, 5]:
+        ax.plot(r / (1 + r) + np.cos(t) / (1 + r), np.sin(t) / (1 + r),
+                color=color, linewidth=linewidth)
+    for x in [0.2, 0.5, 1, 2, 5]:
+        for sign in (1, -1):
+            line, = ax.plot(1 + np.cos(t) / x, sign / x + np.sin(t) / x,
+                            color=color, linewidth=linewidth)
+            line.set_clip_path(boundary)
+    ax.plot([-1, 1], [0, 0], color=color, linewidth=linewidth)
+    ax.set_xlim(-1.05, 1.05)
+    ax.set_ylim(-1.05, 1.05)
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+
+def plot_copertura_accordatori(n_grid=400):
+    """
+    Mappa di copertura di accordatori T, Pi e L sulla carta di Smith.
+
+    Ogni mappa campiona ~1.25e5 carichi (griglia n_grid x n_grid del
+    coefficiente di riflessione); il colore e' il Q di nodo della regolazione
+    a perdite minime, il grigio indica i carichi fuori portata.
+    """
+    axis = np.linspace(-1, 1, n_grid)
+    gamma = axis[None, :] + 1j * axis[::-1, None]
+    inside = np.abs(gamma) < 0.999
+    z_load = gamma_to_impedance(gamma[inside])
+    bands = [BAND_PLAN.band(name) for name in ['80m', '40m', '20m', '10m']]
+    norm = LogNorm(vmin=1, vmax=30)
+
+    fig, axes = plt.subplots(len(TUNERS), len(bands), figsize=(16, 12.5), layout='constrained')
+    for row, tuner in zip(axes, TUNERS.values()):
+        for ax, band in zip(row, bands):
+            f_center = (band.f_min + band.f_max) / 2
+            result = coverage(tuner, z_load, f_center)
+
+            q_map = np.full(gamma.shape, np.nan)
+            q_map[inside] = result.q
+            out_map = np.full(gamma.shape, np.nan)
+            out_map[inside] = np.where(result.matched, np.nan, 1.0)
+
+            ax.imshow(out_map, extent=(-1, 1, -1, 1), cmap='Greys', vmin=0, vmax=4,
+                      interpolation='nearest')
+            image = ax.imshow(q_map, extent=(-1, 1, -1, 1), cmap='viridis_r', norm=norm,
+                              interpolation='nearest')
+            smith_grid(ax, color='white', linewidth=0.4)
+            swr3 = Circle((0, 0), 0.5, fill=False, color='red', linestyle='--', linewidth=1)
+            ax.add_patch(swr3)
+            ax.set_title(f'{band.name} ({f_center / 1e6:.2f} MHz): '
+                         f'{result.matched.mean() * 100:.0f}% adattabili', fontsize=10)
+        row[0].text(-0.08, 0.5, tuner.label.replace(' (', '\n('), transform=row[0].transAxes,
+                    rotation=90, ha='center', va='center', fontsize=11, fontweight='bold')
+
+    axes[0, 0].plot([], [], 'r--', label='ROS 3:1')
+    axes[0, 0].legend(loc='lower left', fontsize=8, bbox_to_anchor=(-0.05, -0.05))
+    colorbar = fig.colorbar(image, ax=axes, shrink=0.6)
+    colorbar.set_label('Q di nodo (perdite e tensioni sui componenti)')
+    fig.suptitle('Copertura degli accordatori d\'antenna sulla carta di Smith (Z₀ = 50 Ω)\n'
+                 'grigio: carico non adattabile con le escursioni dei componenti',
+                 fontsize=14, fontweight='bold')
+
+    plt.savefig(OUTPUT_DIR / 'copertura_accordatori.png', dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Salvato: {OUTPUT_DIR / 'copertura_accordatori.png'}")
+
+
 def plot_attenuazione_cavi():
     """
     Confronto attenuazione per diversi tipi di cavo coassiale.
@@ -310,6 +381,7 @@ def main():
     plot_onde_stazionarie()
     plot_impedenza_linea()
     plot_carta_smith()
+    plot_copertura_accordatori()
     plot_attenuazione_cavi()
     plot_velocita_propagazione()
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Cache degli schemi elettrici schemdraw.
+
+schemdraw posiziona gli elementi man mano che vengono aggiunti (operazione
+rapida), ma a ogni save ridisegna tutto con matplotlib e riserializza il
+file, anche se lo schema non e' cambiato. CachedDrawing si usa al posto di
+schemdraw.Drawing: al salvataggio calcola un'impronta degli elementi gia'
+posizionati (tipo, trasformazione, parametri e segmenti di ciascuno, piu' i
+parametri del disegno) e, se la stessa impronta e' gia' stata salvata, copia
+il file serializzato da .build/schemdraw/ invece di ridisegnarlo. Un SVG
+gia' ottimizzato da optimize_svgs a partire dallo stesso file resta com'e'.
+
+All'uscita di ogni script la cache viene ripulita: la sezione 'schemdraw'
+del manifest di build tiene i file usati da ciascuno script all'ultima
+esecuzione, e i file che nessuno script usa piu' (schemi modificati nel
+frattempo) vengono cancellati.
+"""
+
+import atexit
+import filecmp
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+import schemdraw
+from schemdraw import default_canvas
+
+from optimize_svgs import is_optimized
+from utils import BUILD_DIR, load_manifest, update_manifest
+
+SCHEMATIC_CACHE_DIR = BUILD_DIR / "schemdraw"
+
+_stats = {'riusi': 0, 'disegni': 0}
+# Nomi dei file della cache usati in questo processo
+_used = set()
+
+
+class CachedDrawing(schemdraw.Drawing):
+    """
+    schemdraw.Drawing che riusa il file salvato se lo schema non e' cambiato.
+
+    Vale per d.save(...), d.get_imagedata(...) e per
+    with CachedDrawing(file=...) as d.
+
+    Example:
+        >>> import schemdraw.elements as elm
+        >>> d1, d2 = CachedDrawing(unit=3), CachedDrawing(unit=3)
+        >>> r = d1.add(elm.Resistor().label('R1'))
+        >>> r = d2.add(elm.Resistor().label('R1'))
+        >>> d1.fingerprint('.svg') == d2.fingerprint('.svg')
+        True
+        >>> r = d2.add(elm.Capacitor().down())
+        >>> d1.fingerprint('.svg') == d2.fingerprint('.svg')
+        False
+    """
+
+    def fingerprint(self, suffix: str, transparent: bool = True, dpi: float = 72) -> str:
+        """Impronta SHA-256 degli elementi posizionati e delle opzioni di salvataggio."""
+        canvas = self.canvas or default_canvas.default_canvas
+        h = hashlib.sha256(repr((schemdraw.__version__, suffix, transparent, dpi, str(canvas),
+                                 sorted(self.dwgparams.items()), self.svgdefs)).encode())
+        for element in self.elements:
+            h.update(repr((
+                type(element).__qualname__,
+                vars(element.transform),
+                sorted(dict(element.params).items()),
+                [(type(segment).__name__, vars(segment)) for segment in element.segments],
+            )).encode())
+        return h.hexdigest()
+
+    def _cached_path(self, suffix: str, transparent: bool = True, dpi: float = 72) -> Path:
+        path = SCHEMATIC_CACHE_DIR / (self.fingerprint(suffix, transparent, dpi) + suffix)
+        _used.add(path.name)
+        return path
+
+    def save(self, fname, transparent: bool = True, dpi: float = 72) -> None:
+        """Come Drawing.save, ma copia il file dalla cache se l'impronta e' nota."""
+        path = Path(fname)
+        cached = self._cached_path(path.suffix, transparent, dpi)
+        if cached.exists():
+            if not _up_to_date(path, cached):
+                shutil.copyfile(cached, path)
+            _stats['riusi'] += 1
+            return
+        super().save(str(fname), transparent=transparent, dpi=dpi)
+        SCHEMATIC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, cached)
+        _stats['disegni'] += 1
+
+    def get_imagedata(self, fmt: str = 'svg') -> bytes:
+        """Come Drawing.get_imagedata, con la stessa cache di save."""
+        cached = self._cached_path('.' + fmt.lower().lstrip('.'), transparent=False)
+        if cached.exists():
+            _stats['riusi'] += 1
+            return cached.read_bytes()
+        data = super().get_imagedata(fmt)
+        SCHEMATIC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cached.write_bytes(data)
+        _stats['disegni'] += 1
+        return data
+
+
+def _up_to_date(path: Path, cached: Path) -> bool:
+    """Vero se path e' gia' il file in cache, o la sua versione ottimizzata da optimize_svgs."""
+    if not path.exists():
+        return False
+    return (filecmp.cmp(cached, path, shallow=False)
+            or path.suffix == '.svg' and is_optimized(path, cached.read_bytes()))
+
+
+def prune_schematic_cache() -> int:
+    """
+    Registra i file di cache usati da questo script e cancella quelli orfani.
+
+    Ogni schema modificato lascia in .build/schemdraw/ il file della vecchia
+    impronta. La voce dello script nella sezione 'schemdraw' del manifest
+    viene sostituita con i file usati in questo processo; poi si cancellano i
+    file che non compaiono nella voce di nessuno script. Eseguita
+    automaticamente all'uscita dei processi che hanno usato la cache.
+
+    Returns:
+        Numero di file cancellati
+    """
+    if not _used:
+        return 0
+    script = Path(getattr(sys.modules['__main__'], '__file__', None) or sys.argv[0]).name
+    update_manifest('schemdraw', script, {'files': sorted(_used)})
+    live = {name for entry in load_manifest().get('schemdraw', {}).values() for name in entry['files']}
+    removed = 0
+    for path in SCHEMATIC_CACHE_DIR.glob('*'):
+        if path.name not in live:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+atexit.register(prune_schematic_cache)
+
+
+def schematic_cache_report() -> str:
+    """Schemi riusati dalla cache e ridisegnati in questo processo, su una riga."""
+    total = _stats['riusi'] + _stats['disegni']
+    rate = _stats['riusi'] / total if total else 0.0
+    return f"Cache schemi: {_stats['riusi']}/{total} riusati ({rate:.0%}), {_stats['disegni']} ridisegnati"
@@ -4,13 +4,30 @@ Modulo utility per gli script di generazione immagini.
 Fornisce funzioni comuni per path, stili e logging.
 """
 
+import hashlib
+import inspect
+import io
+import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence
 
+import numpy as np
+import matplotlib
+import matplotlib.path as mpath
 import matplotlib.pyplot as plt
+import matplotlib.text as mtext
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg, get_hinting_flag
+from matplotlib.collections import LineCollection, PatchCollection, PathCollection
+from matplotlib.font_manager import FontProperties, findfont, get_font
 from matplotlib.patches import FancyBboxPatch, Rectangle
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D, Bbox, IdentityTransform
+from PIL import Image
 
 
 # =============================================================================
@@ -302,7 +319,7 @@ def draw_legend(
     y: float,
     items: list,
     fontsize: int = 9,
-    spacing: float = 0.08
+    spacing: Optional[float] = 0.08
 ) -> None:
     """
     Disegna una legenda orizzontale.
@@ -313,10 +330,16 @@ def draw_legend(
         y: Posizione Y
         items: Lista di tuple (colore, etichetta)
         fontsize: Dimensione font
-        spacing: Spaziatura tra elementi
+        spacing: Spaziatura tra elementi (None = in base alla larghezza delle
+            etichette, misurata con text_extent sui limiti attuali degli assi)
     """
     ax.text(x_start - 0.07, y, 'Legenda:', fontsize=fontsize, fontweight='bold', va='center')
 
+    if spacing is None:
+        x_min, x_max = ax.get_xlim()
+        data_per_pixel = (x_max - x_min) / ax.bbox.width
+        dpi = ax.figure.dpi
+
     x = x_start
     for color, label in items:
         ax.add_patch(Rectangle(
@@ -327,24 +350,689 @@ def draw_legend(
             linewidth=1
         ))
         ax.text(x + 0.022, y, label, fontsize=fontsize - 1, va='center')
-        x += spacing
+        if spacing is None:
+            x += 0.022 + text_extent(label, fontsize - 1, dpi=dpi)[0] * data_per_pixel + 0.025
+        else:
+            x += spacing
+
+
+@lru_cache(maxsize=None)
+def _label_path(text: str, fontsize: float, fontweight: str, linespacing: float = 1.2):
+    """
+    Tracciato di un testo centrato in (0, 0), in punti tipografici.
+
+    Riproduce l'impaginazione di ax.text(..., ha='center', va='center'):
+    righe centrate, interlinea fissa linespacing x (ascendente + discendente)
+    del font, ogni riga centrata nella propria fascia. Il risultato e' in
+    cache: le stesse etichette si ripetono in molti diagrammi.
+    """
+    prop = FontProperties(size=fontsize, weight=fontweight)
+    font = get_font(findfont(prop))
+    os2 = font.get_sfnt_table('OS/2')
+    units_per_em = font.get_sfnt_table('head')['unitsPerEm']
+    # matplotlib < 3.11 non espone i campi sTypo* della tabella OS/2: in quel
+    # caso si usa l'em, a cui ascendente - discendente tipografici sommano di
+    # norma (esattamente per DejaVu Sans)
+    typo_h = os2['sTypoAscender'] - os2['sTypoDescender'] if 'sTypoAscender' in os2 else units_per_em
+    line_h = linespacing * typo_h * fontsize / units_per_em
+
+    lines = text.split('\n')
+    parts = []
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        path = TextPath((0, 0), line, prop=prop)
+        ext = path.get_extents()
+        ascent, descent = ext.y1, -ext.y0
+        baseline = len(lines) * line_h / 2 - i * line_h - (line_h + ascent - descent) / 2
+        parts.append(path.transformed(Affine2D().translate(-(ext.x0 + ext.x1) / 2, baseline)))
+    if not parts:
+        return mpath.Path(np.zeros((1, 2)), [mpath.Path.MOVETO])
+    return mpath.Path.make_compound_path(*parts)
+
+
+class _LabelCollection(PathCollection):
+    """Testi come tracciati in punti, ancorati in coordinate dati."""
+
+    def get_window_extent(self, renderer=None):
+        return mpath.get_path_collection_extents(
+            self.get_transform(), self.get_paths(), [], self.get_offsets(),
+            self.get_offset_transform())
+
+
+class _ArrowCollection(PathCollection):
+    """
+    Frecce stile annotate: asta e punte calcolate in pixel al momento del disegno.
+
+    Le punte hanno dimensioni in punti (come FancyArrowPatch) e seguono
+    l'orientamento a schermo dell'asta, quindi si ricalcolano a ogni draw con
+    la trasformazione corrente degli assi e la risoluzione del renderer.
+    """
+
+    def __init__(self, arrows: List[tuple], shrink: float = 2.0, **kwargs):
+        super().__init__([], transform=IdentityTransform(), **kwargs)
+        self._arrows = arrows
+        self._shrink = shrink
+
+    @staticmethod
+    def _wedge(x0, y0, x1, y1, head_dist, cos_t, sin_t, linewidth):
+        """Punta in (x1, y1) di un'asta che arriva da (x0, y0), come ArrowStyle._Curve."""
+        dx, dy = x0 - x1, y0 - y1
+        dist = np.hypot(dx, dy) or 1.0
+        pad = 0.5 * linewidth / sin_t
+        ddx, ddy = pad * dx / dist, pad * dy / dist
+        dx, dy = dx / dist * head_dist, dy / dist * head_dist
+        tip = (x1 + ddx, y1 + ddy)
+        vertices = [(tip[0] + cos_t * dx + sin_t * dy, tip[1] - sin_t * dx + cos_t * dy),
+                    tip,
+                    (tip[0] + cos_t * dx - sin_t * dy, tip[1] + sin_t * dx + cos_t * dy)]
+        return vertices, ddx, ddy
+
+    def _update(self, renderer):
+        dpi_cor = renderer.points_to_pixels(1.0)
+        ends = self.axes.transData.transform(
+            np.array([(a[0], a[1], a[2], a[3]) for a in self._arrows]).reshape(-1, 2)).reshape(-1, 4)
+        paths, faces, edges, widths = [], [], [], []
+        for (x0, y0, x3, y3), (*_, color, lw, style, scale) in zip(ends, self._arrows):
+            length = np.hypot(x3 - x0, y3 - y0)
+            if length == 0:
+                continue
+            ux, uy = (x3 - x0) / length, (y3 - y0) / length
+            shrink = self._shrink * dpi_cor
+            x0, y0, x3, y3 = x0 + ux * shrink, y0 + uy * shrink, x3 - ux * shrink, y3 - uy * shrink
+
+            head_length, head_width = 0.4 * scale * dpi_cor, 0.2 * scale * dpi_cor
+            head_dist = np.hypot(head_length, head_width)
+            cos_t, sin_t = head_length / head_dist, head_width / head_dist
+            begin, end = style.split('-', 1)
+            heads = []
+            ddxa = ddya = ddxb = ddyb = 0.0
+            if begin:
+                vertices, ddxa, ddya = self._wedge(x3, y3, x0, y0, head_dist, cos_t, sin_t, lw * dpi_cor)
+                heads.append((vertices, begin == '<|'))
+            if end:
+                vertices, ddxb, ddyb = self._wedge(x0, y0, x3, y3, head_dist, cos_t, sin_t, lw * dpi_cor)
+                heads.append((vertices, end == '|>'))
+
+            paths.append(mpath.Path([(x0 + ddxa, y0 + ddya), (x3 + ddxb, y3 + ddyb)]))
+            faces.append('none')
+            for vertices, filled in heads:
+                if filled:
+                    paths.append(mpath.Path(vertices + [(0, 0)], [mpath.Path.MOVETO, mpath.Path.LINETO,
+                                                                 mpath.Path.LINETO, mpath.Path.CLOSEPOLY]))
+                    faces.append(color)
+                else:
+                    paths.append(mpath.Path(vertices))
+                    faces.append('none')
+            edges += [color] * (1 + len(heads))
+            widths += [lw] * (1 + len(heads))
+        self.set_paths(paths)
+        self.set_facecolor(faces)
+        self.set_edgecolor(edges)
+        self.set_linewidth(widths)
+
+    def draw(self, renderer):
+        self._update(renderer)
+        super().draw(renderer)
+
+    def get_window_extent(self, renderer=None):
+        if renderer is None:
+            renderer = self.figure.canvas.get_renderer()
+        self._update(renderer)
+        if not self.get_paths():
+            return Bbox.null()
+        return Bbox.union([path.get_extents() for path in self.get_paths()])
+
+
+class BlockDiagram:
+    """
+    Diagramma a blocchi disegnato con poche collezioni matplotlib.
+
+    I metodi block, arrow e line accumulano gli elementi; render li aggiunge
+    agli assi come una PatchCollection per le ombre, una per i blocchi, una
+    LineCollection per i collegamenti, una collezione per le frecce e una per
+    le etichette (testi convertiti in tracciati, in cache), invece di due patch
+    e uno o due testi per ogni blocco. Meno artisti rendono piu' veloci il
+    disegno e il calcolo di bbox_inches='tight'.
+
+    Example:
+        >>> fig, ax = plt.subplots()
+        >>> d = BlockDiagram(ax)
+        >>> d.block(0.3, 0.5, 'MIXER', 'Bilanciato', '#bfdbfe')
+        >>> d.block(0.6, 0.5, 'FILTRO', '2.4 kHz', '#ddd6fe')
+        >>> d.arrow(0.36, 0.5, 0.54, 0.5)
+        >>> len(d.render())
+        4
+    """
+
+    def __init__(
+        self,
+        ax,
+        block_w: float = 0.11,
+        block_h: float = 0.08,
+        boxstyle: str = 'round,pad=0.005,rounding_size=0.01',
+        border_color: str = '#374151',
+        linewidth: float = 1.5,
+        shadow_color: Optional[str] = '#94a3b8',
+        shadow_offset: float = 0.002,
+        fontsize: float = 9,
+        sub_fontsize: float = 7,
+        label_color: str = '#1e293b',
+        sublabel_color: str = '#475569',
+        label_dy: Sequence[float] = (0.015, -0.015),
+        zorder: float = 2,
+        arrow_style: str = '-|>',
+        arrow_color: str = '#3b82f6',
+        arrow_width: float = 2,
+        mutation_scale: float = 12
+    ) -> None:
+        """
+        Args:
+            ax: Axes matplotlib
+            block_w, block_h: Dimensioni predefinite dei blocchi
+            boxstyle: Stile FancyBboxPatch dei blocchi (e delle ombre)
+            border_color: Colore del bordo
+            linewidth: Spessore del bordo
+            shadow_color: Colore dell'ombra (None = senza ombra)
+            shadow_offset: Spostamento dell'ombra verso destra e in basso
+            fontsize: Dimensione font dell'etichetta (grassetto)
+            sub_fontsize: Dimensione font della sottoetichetta
+            label_color: Colore dell'etichetta
+            sublabel_color: Colore della sottoetichetta
+            label_dy: Spostamento verticale di etichetta e sottoetichetta
+                rispetto al centro, se il blocco ha una sottoetichetta
+            zorder: zorder dei blocchi (ombre sotto, etichette sopra)
+            arrow_style: Stile predefinito delle frecce ('-|>', '->', '<|-', '<|-|>', ...)
+            arrow_color: Colore predefinito delle frecce e delle linee
+            arrow_width: Spessore predefinito di frecce e linee
+            mutation_scale: Dimensione predefinita delle punte (punti)
+        """
+        self.ax = ax
+        self.block_w = block_w
+        self.block_h = block_h
+        self.boxstyle = boxstyle
+        self.border_color = border_color
+        self.linewidth = linewidth
+        self.shadow_color = shadow_color
+        self.shadow_offset = shadow_offset
+        self.fontsize = fontsize
+        self.sub_fontsize = sub_fontsize
+        self.label_color = label_color
+        self.sublabel_color = sublabel_color
+        self.label_dy = label_dy
+        self.zorder = zorder
+        self.arrow_style = arrow_style
+        self.arrow_color = arrow_color
+        self.arrow_width = arrow_width
+        self.mutation_scale = mutation_scale
+
+        self._blocks: List[tuple] = []
+        self._labels: List[tuple] = []
+        self._lines: List[tuple] = []
+        self._arrows: List[tuple] = []
+
+    def block(
+        self,
+        x: float,
+        y: float,
+        label: str,
+        sublabel: str = '',
+        color: str = '#bfdbfe',
+        w: Optional[float] = None,
+        h: Optional[float] = None,
+        fontsize: Optional[float] = None
+    ) -> None:
+        """
+        Aggiunge un blocco centrato in (x, y).
+
+        Args:
+            x, y: Centro del blocco
+            label: Etichetta principale (anche su piu' righe)
+            sublabel: Etichetta secondaria (opzionale)
+            color: Colore di riempimento
+            w, h: Dimensioni (predefinite: block_w, block_h)
+            fontsize: Dimensione font dell'etichetta (predefinita: fontsize)
+        """
+        w = w or self.block_w
+        h = h or self.block_h
+        self._blocks.append((x - w / 2, y - h / 2, w, h, color))
+        fontsize = fontsize or self.fontsize
+        if sublabel:
+            sub_fontsize = self.sub_fontsize + fontsize - self.fontsize
+            self._labels.append((x, y + self.label_dy[0], label, fontsize, 'bold', self.label_color))
+            self._labels.append((x, y + self.label_dy[1], sublabel, sub_fontsize, 'normal',
+                                 self.sublabel_color))
+        else:
+            self._labels.append((x, y, label, fontsize, 'bold', self.label_color))
+
+    def arrow(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        color: Optional[str] = None,
+        linewidth: Optional[float] = None,
+        style: Optional[str] = None,
+        mutation_scale: Optional[float] = None
+    ) -> None:
+        """
+        Aggiunge una freccia da (x1, y1) a (x2, y2), come ax.annotate('', ...).
+
+        Args:
+            x1, y1: Punto di partenza
+            x2, y2: Punto di arrivo
+            color: Colore della freccia
+            linewidth: Spessore linea
+            style: Stile della freccia ('-|>', '->', '<|-', '<|-|>', ...)
+            mutation_scale: Dimensione punta freccia (punti)
+        """
+        self._arrows.append((x1, y1, x2, y2, color or self.arrow_color,
+                             linewidth or self.arrow_width, style or self.arrow_style,
+                             mutation_scale or self.mutation_scale))
+
+    def line(
+        self,
+        xs: Sequence[float],
+        ys: Sequence[float],
+        color: Optional[str] = None,
+        linewidth: Optional[float] = None
+    ) -> None:
+        """Aggiunge una spezzata di collegamento (come ax.plot(xs, ys))."""
+        self._lines.append((np.column_stack([xs, ys]), color or self.arrow_color,
+                            linewidth or self.arrow_width))
+
+    def render(self) -> list:
+        """
+        Aggiunge agli assi le collezioni con gli elementi accumulati.
+
+        Gli elementi emessi vengono rimossi dall'accumulo: chiamate successive
+        aggiungono nuove collezioni sopra gli artisti creati nel frattempo con
+        lo stesso zorder, per mantenere la sovrapposizione voluta. Le frecce
+        si adattano ai limiti degli assi impostati anche dopo.
+
+        Returns:
+            Lista delle collezioni aggiunte
+        """
+        ax = self.ax
+        collections = []
+
+        if self._blocks:
+            def boxes(dx, dy):
+                return [FancyBboxPatch((x0 + dx, y0 + dy), w, h, boxstyle=self.boxstyle)
+                        for x0, y0, w, h, _ in self._blocks]
+
+            if self.shadow_color:
+                collections.append(ax.add_collection(PatchCollection(
+                    boxes(self.shadow_offset, -self.shadow_offset), facecolor=self.shadow_color,
+                    edgecolor='none', zorder=self.zorder - 1)))
+            collections.append(ax.add_collection(PatchCollection(
+                boxes(0, 0), facecolor=[b[4] for b in self._blocks], edgecolor=self.border_color,
+                linewidth=self.linewidth, zorder=self.zorder)))
+
+        if self._lines:
+            collections.append(ax.add_collection(LineCollection(
+                [pts for pts, _, _ in self._lines], colors=[c for _, c, _ in self._lines],
+                linewidths=[lw for _, _, lw in self._lines], capstyle='projecting',
+                joinstyle='round', zorder=2)))
+
+        if self._arrows:
+            collections.append(ax.add_collection(_ArrowCollection(
+                self._arrows, capstyle='butt', joinstyle='round', zorder=3, clip_on=False),
+                autolim=False))
+
+        if self._labels:
+            points_to_pixels = Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans
+            labels = _LabelCollection(
+                [_label_path(text, size, weight) for _, _, text, size, weight, _ in self._labels],
+                offsets=[(x, y) for x, y, *_ in self._labels], offset_transform=ax.transData,
+                facecolor=[c for *_, c in self._labels], edgecolor='none', linewidth=0,
+                zorder=3, clip_on=False)
+            labels.set_transform(points_to_pixels)
+            collections.append(ax.add_collection(labels, autolim=False))
+
+        self._blocks, self._labels, self._lines, self._arrows = [], [], [], []
+        return collections
+
+
+# =============================================================================
+# TEXT METRICS CACHE
+# =============================================================================
+
+# Misura dei testi originale di matplotlib: ha una cache per renderer, che si
+# perde a ogni figura e a ogni passata di bbox_inches='tight'. E' una funzione
+# privata: se una versione la rinomina o ne cambia la firma, la cache condivisa
+# resta spenta e i disegni usano la misura di matplotlib
+_mpl_text_metrics = getattr(mtext, '_get_text_metrics_with_cache', None)
+_MPL_TEXT_METRICS_PARAMS = ('renderer', 'text', 'fontprop', 'ismath', 'dpi')
+
+
+def _text_cache_supported() -> bool:
+    """True se la funzione privata di matplotlib esiste con la firma attesa."""
+    try:
+        return tuple(inspect.signature(_mpl_text_metrics).parameters) == _MPL_TEXT_METRICS_PARAMS
+    except (TypeError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _metrics_renderer(dpi: float) -> RendererAgg:
+    """Renderer Agg minimo usato solo per misurare i testi alla risoluzione dpi."""
+    return RendererAgg(1, 1, dpi)
+
+
+@lru_cache(maxsize=16384)
+def _text_metrics(text: str, prop: FontProperties, ismath, dpi: float, hinting: int) -> tuple:
+    """(larghezza, altezza, discendente) in pixel; hinting entra solo nella chiave."""
+    return _metrics_renderer(dpi).get_text_width_height_descent(text, prop, ismath)
+
+
+def _cached_text_metrics(renderer, text, fontprop, ismath, dpi):
+    # Le misure Agg dipendono solo da testo, font e risoluzione: una sola cache
+    # di processo serve tutte le figure. Altri renderer (SVG, PDF) e TeX no.
+    if type(renderer) is not RendererAgg or ismath == 'TeX':
+        return _mpl_text_metrics(renderer, text, fontprop, ismath, dpi)
+    return _text_metrics(text, fontprop.copy(), ismath, renderer.dpi, get_hinting_flag())
+
+
+def enable_text_cache() -> bool:
+    """
+    Condivide le misure dei testi fra tutte le figure del processo.
+
+    matplotlib misura ogni stringa una volta per renderer: ogni figura, e con
+    bbox_inches='tight' ogni salvataggio (una passata per il riquadro, una
+    per il file), riparte da zero. Dopo questa chiamata le misure Agg sono
+    in una cache unica per (testo, font, dpi), la stessa usata da
+    text_extent. Il risultato dei disegni non cambia.
+
+    Returns:
+        True se la cache e' attiva, False se la versione di matplotlib non
+        ha la funzione di misura attesa (in quel caso non cambia nulla)
+    """
+    if not _text_cache_supported():
+        return False
+    mtext._get_text_metrics_with_cache = _cached_text_metrics
+    return True
+
+
+def disable_text_cache() -> None:
+    """Ripristina la misura dei testi originale di matplotlib (vedi enable_text_cache)."""
+    if _mpl_text_metrics is not None:
+        mtext._get_text_metrics_with_cache = _mpl_text_metrics
+
+
+def text_extent(
+    text: str,
+    fontsize: Optional[float] = None,
+    fontweight: str = 'normal',
+    family: Optional[str] = None,
+    fontstyle: str = 'normal',
+    dpi: float = 72
+) -> tuple:
+    """
+    Dimensioni di una riga di testo, dalla cache condivisa con enable_text_cache.
+
+    Args:
+        text: Testo (una riga, senza mathtext)
+        fontsize: Dimensione font (predefinita: rcParams['font.size'])
+        fontweight, family, fontstyle: Come in ax.text
+        dpi: Risoluzione (72 = risultato in punti)
+
+    Returns:
+        Tupla (larghezza, altezza, discendente) in pixel a dpi
+
+    Example:
+        >>> w, h, d = text_extent('MIXER', 10, 'bold')
+        >>> text_extent('MIXER', 10, 'bold') == (w, h, d), w > text_extent('MIXER', 10)[0]
+        (True, True)
+    """
+    prop = FontProperties(size=fontsize, weight=fontweight, family=family, style=fontstyle)
+    return _text_metrics(text, prop, False, float(dpi), get_hinting_flag())
+
+
+def text_cache_stats() -> Dict[str, Any]:
+    """Richieste, riusi e dimensione delle cache di testi (misure e tracciati)."""
+    stats = {}
+    for name, cache in [('metriche', _text_metrics), ('tracciati', _label_path)]:
+        info = cache.cache_info()
+        requests = info.hits + info.misses
+        stats[name] = {'richieste': requests, 'riusi': info.hits, 'voci': info.currsize,
+                       'hit_rate': info.hits / requests if requests else 0.0}
+    return stats
+
+
+def text_cache_report() -> str:
+    """Riepilogo di text_cache_stats su una riga, per i log degli script."""
+    return 'Cache testi: ' + ', '.join(
+        f"{name} {s['riusi']}/{s['richieste']} riusi ({s['hit_rate']:.0%}, {s['voci']} voci)"
+        for name, s in text_cache_stats().items())
+
+
+# =============================================================================
+# FORMAT UTILITIES
+# =============================================================================
+
+SI_PREFIXES = [(1e9, 'G'), (1e6, 'M'), (1e3, 'k'), (1.0, ''), (1e-3, 'm'),
+               (1e-6, 'μ'), (1e-9, 'n'), (1e-12, 'p'), (1e-15, 'f')]
+
+
+def format_si(value: float, unit: str, digits: int = 3) -> str:
+    """
+    Formatta un valore con il prefisso SI adatto, per etichette di schemi e grafici.
+
+    Example:
+        >>> format_si(2.2e-6, 'H'), format_si(470e-12, 'F'), format_si(7.05e6, 'Hz', 4)
+        ('2.2 μH', '470 pF', '7.05 MHz')
+    """
+    magnitude = abs(value)
+    for scale, prefix in SI_PREFIXES:
+        if magnitude >= scale * 0.9995:
+            return f'{value / scale:.{digits}g} {prefix}{unit}'
+    scale, prefix = SI_PREFIXES[-1]
+    return f'{value / scale:.{digits}g} {prefix}{unit}'
 
 
 # =============================================================================
 # SAVE UTILITIES
 # =============================================================================
 
+# Dati di build non versionati (riquadri di salvataggio, cache)
+BUILD_DIR = PROJECT_ROOT / ".build"
+BUILD_MANIFEST = BUILD_DIR / "manifest.json"
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_manifest() -> Dict[str, Any]:
+    """Manifest di build (vuoto se assente o illeggibile)."""
+    try:
+        return json.loads(BUILD_MANIFEST.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def update_manifest(section: str, key: str, entry: Dict[str, Any]) -> None:
+    """Scrive una voce del manifest, rileggendolo per non perdere quelle degli altri script."""
+    update_manifest_entries(section, {key: entry})
+
+
+def update_manifest_entries(section: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Come update_manifest, per piu' voci della stessa sezione con una sola scrittura."""
+    manifest = load_manifest()
+    manifest.setdefault(section, {}).update(entries)
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = BUILD_MANIFEST.with_suffix('.tmp')
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+    tmp.replace(BUILD_MANIFEST)
+
+
+def _source_digest() -> str:
+    """Impronta dei sorgenti del progetto caricati (script, utils, calcoli, ...)."""
+    h = hashlib.sha256()
+    files = sorted({Path(m.__file__).resolve() for m in list(sys.modules.values())
+                    if getattr(m, '__file__', None) and Path(m.__file__).suffix == '.py'
+                    and SCRIPTS_DIR in Path(m.__file__).resolve().parents})
+    for path in files:
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+# Gruppi di rcParams che cambiano ingombro di testi, linee e assi (quelli
+# impostati da setup_matplotlib_style e dagli stili degli script)
+_LAYOUT_RC_PREFIXES = ('font.', 'text.', 'mathtext.', 'axes.', 'xtick.', 'ytick.', 'lines.',
+                       'patch.', 'legend.', 'figure.', 'savefig.pad_inches')
+
+
+def _style_digest() -> str:
+    """Impronta degli rcParams di impaginazione e del file del font predefinito."""
+    font = Path(findfont(FontProperties()))
+    stat = font.stat()
+    rc = sorted((k, repr(v)) for k, v in plt.rcParams.items() if k.startswith(_LAYOUT_RC_PREFIXES))
+    return hashlib.sha256(repr((rc, str(font), stat.st_size, stat.st_mtime_ns)).encode()).hexdigest()
+
+
+def _layout_digest(fig, dpi: float, inputs: Any) -> str:
+    """Impronta di cio' che determina il riquadro: sorgenti, stile, font, dati, dimensioni, dpi."""
+    h = hashlib.sha256(_source_digest().encode())
+    h.update(repr((inputs, tuple(fig.get_size_inches()), dpi, _style_digest(),
+                   matplotlib.__version__)).encode())
+    return h.hexdigest()
+
+
+def tight_bbox(fig, dpi: float) -> Bbox:
+    """
+    Riquadro di bbox_inches='tight' (in pollici, con il margine pad_inches).
+
+    Una passata di disegno senza rasterizzazione alla risoluzione dpi, come
+    quella che savefig esegue prima di salvare.
+    """
+    original_dpi = fig.dpi
+    fig.set_dpi(dpi)
+    try:
+        fig.draw_without_rendering()
+        return fig.get_tightbbox().padded(plt.rcParams['savefig.pad_inches'])
+    finally:
+        fig.set_dpi(original_dpi)
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """
+    Variante aggiuntiva di una figura salvata con save_figure.
+
+    Il nome deriva da quello principale: estensione del formato e, per
+    scale diversa da 1, il suffisso '@<scale>x' (es. schema@2x.webp).
+    """
+
+    format: str = 'png'
+    # Risoluzione rispetto al dpi di save_figure (2 = schermi ad alta densita')
+    scale: float = 1.0
+    # Qualita' per i formati con perdita (WebP, JPEG); None = predefinita di Pillow
+    quality: Optional[int] = None
+
+    def filename(self, filename: str) -> str:
+        """
+        Nome del file della variante.
+
+        Example:
+            >>> OutputSpec('webp', 2).filename('schema.png')
+            'schema@2x.webp'
+        """
+        stem = Path(filename).stem + (f'@{self.scale:g}x' if self.scale != 1 else '')
+        return f'{stem}.{self.format}'
+
+
+# Varianti per il sito: PNG per schermi ad alta densita' e WebP (da mezza
+# risoluzione, per gli schermi piccoli, a 2x)
+WEB_OUTPUTS = (
+    OutputSpec('png', 2),
+    OutputSpec('webp', 0.5, quality=90),
+    OutputSpec('webp', 1, quality=90),
+    OutputSpec('webp', 2, quality=90),
+)
+
+RASTER_FORMATS = {'png': 'PNG', 'webp': 'WEBP', 'jpg': 'JPEG', 'jpeg': 'JPEG'}
+
+
+def _encode_image(pixels: np.ndarray, filepath: Path, spec: OutputSpec) -> Path:
+    """Codifica i pixel RGBA di una figura gia' disegnata (in un thread di lavoro)."""
+    image = Image.fromarray(pixels, 'RGBA')
+    kwargs = {}
+    if spec.quality is not None:
+        kwargs['quality'] = spec.quality
+    if RASTER_FORMATS[spec.format] == 'JPEG':
+        image = image.convert('RGB')
+    image.save(filepath, RASTER_FORMATS[spec.format], **kwargs)
+    return filepath
+
+
+def _save_outputs(fig, filepath: Path, outputs: Sequence[OutputSpec], save_kwargs: Dict[str, Any],
+                  encoder: ThreadPoolExecutor) -> List[Path]:
+    """
+    Salva il file principale e le varianti, disegnando la figura una volta per risoluzione.
+
+    I formati raster alla stessa risoluzione riusano i pixel del renderer Agg
+    della passata di disegno; la codifica va nei thread di encoder mentre il
+    thread principale disegna la risoluzione successiva. I formati vettoriali
+    (SVG, PDF) si salvano con savefig.
+    """
+    dpi = save_kwargs['dpi']
+    primary = OutputSpec(filepath.suffix[1:].lower())
+    variants = [(primary, filepath)] + [(spec, filepath.with_name(spec.filename(filepath.name)))
+                                        for spec in outputs]
+    # Il file principale lo scrive sempre savefig, come senza varianti
+    variants = [variants[0]] + [(spec, path) for spec, path in variants[1:] if path != filepath]
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+
+    jobs = []
+    for spec, path in variants:
+        if spec.format not in RASTER_FORMATS:
+            fig.savefig(path, **dict(save_kwargs, dpi=dpi * spec.scale))
+    for scale in dict.fromkeys(spec.scale for spec, _ in variants if spec.format in RASTER_FORMATS):
+        group = [(spec, path) for spec, path in variants
+                 if spec.scale == scale and spec.format in RASTER_FORMATS]
+        # Una sola passata di disegno: il PNG (se c'e') con savefig, gli altri dai suoi pixel
+        drawn = next(((spec, path) for spec, path in group if spec.format == 'png'), None)
+        kwargs = dict(save_kwargs, dpi=dpi * scale)
+        if drawn:
+            fig.savefig(drawn[1], **kwargs)
+        else:
+            fig.savefig(io.BytesIO(), format='rgba', **kwargs)
+        pixels = np.array(fig.canvas.renderer.buffer_rgba())
+        jobs += [encoder.submit(_encode_image, pixels, path, spec)
+                 for spec, path in group if (spec, path) != drawn]
+    for job in jobs:
+        job.result()
+    return [path for _, path in variants]
+
+
 def save_figure(
     fig,
     subdir: str,
     filename: str,
     dpi: int = 150,
     facecolor: Optional[str] = None,
-    logger: Optional[logging.Logger] = None
+    logger: Optional[logging.Logger] = None,
+    fixed_layout: bool = False,
+    inputs: Any = (),
+    outputs: Sequence[OutputSpec] = ()
 ) -> Path:
     """
     Salva una figura nella directory appropriata.
 
+    Con fixed_layout il riquadro 'tight' viene calcolato una volta e salvato
+    nel manifest di build (.build/manifest.json): alle build successive la
+    figura si salva direttamente con quel riquadro, con una sola passata di
+    disegno invece di due, finche' non cambiano i sorgenti degli script, gli
+    rcParams di impaginazione, il font predefinito, le dimensioni, la
+    risoluzione o inputs.
+
+    Con outputs la stessa figura si salva anche in altri formati e
+    risoluzioni (es. WEB_OUTPUTS), tutti con lo stesso riquadro: una passata
+    di disegno per risoluzione, con le codifiche raster in parallelo.
+
     Args:
         fig: Figura matplotlib
         subdir: Sottodirectory in images/
@@ -352,9 +1040,13 @@ def save_figure(
         dpi: Risoluzione
         facecolor: Colore di sfondo (opzionale)
         logger: Logger per messaggi (opzionale)
+        fixed_layout: Riusa il riquadro del manifest se ancora valido
+        inputs: Dati della figura che non stanno nei sorgenti (parametri,
+            specifiche); ne conta il repr, quindi niente array lunghi
+        outputs: Varianti aggiuntive (formato, scala, qualita')
 
     Returns:
-        Path del file salvato
+        Path del file salvato (quello principale)
     """
     filepath = get_image_path(subdir, filename)
 
@@ -367,13 +1059,33 @@ def save_figure(
     if facecolor:
         save_kwargs['facecolor'] = facecolor
 
-    fig.savefig(filepath, **save_kwargs)
+    if fixed_layout:
+        key = f'{subdir}/{filename}'
+        digest = _layout_digest(fig, dpi, inputs)
+        entry = load_manifest().get('layout', {}).get(key)
+        if entry and entry['digest'] == digest:
+            save_kwargs['bbox_inches'] = Bbox(entry['bbox'])
+        else:
+            bbox = tight_bbox(fig, dpi)
+            save_kwargs['bbox_inches'] = bbox
+            update_manifest('layout', key, {'digest': digest, 'bbox': bbox.get_points().tolist()})
+
+    if outputs:
+        # Stesso riquadro per tutte le varianti, calcolato una volta sola
+        if save_kwargs['bbox_inches'] == 'tight':
+            save_kwargs['bbox_inches'] = tight_bbox(fig, dpi)
+        with ThreadPoolExecutor() as encoder:
+            saved = _save_outputs(fig, filepath, outputs, save_kwargs, encoder)
+    else:
+        fig.savefig(filepath, **save_kwargs)
+        saved = [filepath]
     plt.close(fig)
 
-    if logger:
-        logger.info(f"Salvato: {filepath}")
-    else:
-        print(f"[OK] Salvato: {filepath}")
+    for path in saved:
+        if logger:
+            logger.info(f"Salvato: {path}")
+        else:
+            print(f"[OK] Salvato: {path}")
 
     return filepath
 
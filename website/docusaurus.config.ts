@@ -3,6 +3,9 @@ import type {Config} from '@docusaurus/types';
 import type * as Preset from '@docusaurus/preset-classic';
 import remarkMath from 'remark-math';
 import rehypeKatex from 'rehype-katex';
+import remarkResponsiveImages from './src/remark/responsive-images';
+
+const baseUrl = '/esame-radioamatori/';
 
 const config: Config = {
   title: 'Esame Radioamatori',
@@ -14,7 +17,7 @@ const config: Config = {
   },
 
   url: 'https://iu6vyg.github.io',
-  baseUrl: '/esame-radioamatori/',
+  baseUrl,
 
   organizationName: 'IU6VYG',
   projectName: 'esame-radioamatori',
@@ -44,6 +47,8 @@ const config: Config = {
         docs: {
           sidebarPath: './sidebars.ts',
           routeBasePath: '/',
+          // Prima dei plugin di Docusaurus, che altrimenti gestirebbero le immagini
+          beforeDefaultRemarkPlugins: [[remarkResponsiveImages, {baseUrl}]],
           remarkPlugins: [remarkMath],
           rehypePlugins: [rehypeKatex],
           editUrl:
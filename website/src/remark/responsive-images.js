@@ -0,0 +1,116 @@
+/**
+ * Plugin remark: immagini responsive dal manifest degli script Python.
+ *
+ * Le pagine citano le immagini generate con ![alt](pathname:///images/...).
+ * scripts/image_manifest.py scrive static/images/manifest.json con
+ * dimensioni e varianti di ogni immagine (@0.5x, @2x, WebP, vedi
+ * save_figure in scripts/utils.py); qui i riferimenti presenti nel
+ * manifest diventano <picture> con srcset/sizes per WebP e formato
+ * originale, piu' width/height sull'<img>, cosi' il browser scarica la
+ * variante adatta allo schermo e riserva lo spazio prima del caricamento.
+ * Le immagini senza varianti (es. gli SVG) ricevono solo width/height.
+ *
+ * Senza manifest (immagini non ancora generate) le pagine restano come sono.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+
+// Larghezza occupata dall'immagine: tutto lo schermo sotto il breakpoint
+// della sidebar di Docusaurus, la colonna del testo sopra
+const DEFAULT_SIZES = '(max-width: 996px) 100vw, 800px';
+
+const manifestCache = {file: null, mtimeMs: 0, data: null};
+
+function loadManifest(file) {
+  try {
+    const {mtimeMs} = fs.statSync(file);
+    if (manifestCache.file !== file || manifestCache.mtimeMs !== mtimeMs) {
+      manifestCache.file = file;
+      manifestCache.mtimeMs = mtimeMs;
+      manifestCache.data = JSON.parse(fs.readFileSync(file, 'utf8'));
+    }
+    return manifestCache.data;
+  } catch {
+    return null;
+  }
+}
+
+function attributes(values) {
+  return Object.entries(values)
+    .filter(([, value]) => value !== undefined && value !== null)
+    .map(([name, value]) => ({type: 'mdxJsxAttribute', name, value: String(value)}));
+}
+
+function element(name, values, children = []) {
+  return {type: 'mdxJsxTextElement', name, attributes: attributes(values), children};
+}
+
+function srcSet(files, url) {
+  return files
+    .filter((file) => file.width)
+    .sort((a, b) => a.width - b.width)
+    .map((file) => `${url(file.file)} ${file.width}w`)
+    .join(', ');
+}
+
+/**
+ * @param {{manifest?: string, baseUrl?: string, sizes?: string}} options
+ *   manifest: percorso di images/manifest.json (predefinito
+ *   static/images/manifest.json rispetto alla directory del sito);
+ *   baseUrl: baseUrl del sito; sizes: attributo sizes delle immagini
+ */
+export default function remarkResponsiveImages(options = {}) {
+  const manifestFile = options.manifest ?? path.resolve('static/images/manifest.json');
+  const baseUrl = options.baseUrl ?? '/';
+  const sizes = options.sizes ?? DEFAULT_SIZES;
+  const prefixes = ['pathname:///images/', `${baseUrl}images/`, '/images/'];
+  const url = (file) => `${baseUrl}images/${encodeURI(file)}`;
+
+  function picture(node, manifest) {
+    const prefix = prefixes.find((p) => node.url.startsWith(p));
+    const entry = prefix && manifest[decodeURI(node.url.slice(prefix.length))];
+    if (!entry) {
+      return null;
+    }
+    const raster = [entry, ...entry.variants.filter((v) => v.format === entry.format)];
+    const webp = entry.variants.filter((v) => v.format === 'webp');
+    const img = element('img', {
+      src: url(entry.file),
+      srcSet: raster.length > 1 ? srcSet(raster, url) : undefined,
+      sizes: raster.length > 1 ? sizes : undefined,
+      width: entry.width,
+      height: entry.height,
+      alt: node.alt ?? '',
+      title: node.title,
+      loading: 'lazy',
+      decoding: 'async',
+      className: 'responsive-image',
+    });
+    if (!webp.length) {
+      return img;
+    }
+    return element('picture', {}, [
+      element('source', {type: 'image/webp', srcSet: srcSet(webp, url), sizes}),
+      img,
+    ]);
+  }
+
+  function transform(node, manifest) {
+    node.children?.forEach((child, index) => {
+      const replacement = child.type === 'image' ? picture(child, manifest) : null;
+      if (replacement) {
+        node.children[index] = replacement;
+      } else {
+        transform(child, manifest);
+      }
+    });
+  }
+
+  return (tree) => {
+    const manifest = loadManifest(manifestFile);
+    if (manifest) {
+      transform(tree, manifest);
+    }
+  };
+}